@@ -34,6 +34,8 @@ class Settings(BaseSettings):
     REDIS_PREFIX_CLOB_TRADE: str = "clob.trade.*"
     REDIS_PREFIX_CLOB_ORDERBOOK: str = "clob.orderbook.*"
     REDIS_PREFIX_COPY_TRADE: str = "copy_trade:*"
+    COPY_TRADE_DEDUP_TTL: int = 300  # Seconds a published copy trade tx_id is remembered (SET NX EX)
+    COPY_TRADE_DEDUP_MAX_ENTRIES: int = 50000  # In-process dedup memory cap
 
     # ========================================
     # Polling Configuration (Gamma API)
@@ -11,11 +11,15 @@ Features:
 - Auto-reconnect with exponential backoff
 - Singleton pattern (reuse connection)
 - JSON message serialization
+- Copy trades deduplicated by tx_id (bounded local memory + Redis SET NX EX,
+  shared by every indexer replica); the claim is released if the publish fails
 """
 
 import logging
 import json
+import time
 import asyncio
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import redis.asyncio as redis
@@ -46,8 +50,14 @@ class RedisPublisher:
         self.max_reconnect_delay = 30.0  # Max 30 seconds
         self.publish_count = 0
         self.publish_errors = 0
+        self.duplicate_count = 0
         self.last_error: Optional[str] = None
 
+        # Copy trade dedup: tx_id -> expiry, insertion order == expiry order (fixed TTL)
+        self.dedup_ttl = getattr(settings, 'COPY_TRADE_DEDUP_TTL', 300)
+        self.dedup_max_entries = getattr(settings, 'COPY_TRADE_DEDUP_MAX_ENTRIES', 50000)
+        self._published_tx_ids: "OrderedDict[str, float]" = OrderedDict()
+
     async def connect(self) -> bool:
         """
         Connect to Redis (non-blocking, retries on failure)
@@ -233,9 +243,15 @@ class RedisPublisher:
             True if published successfully
         """
         channel = f"copy_trade:{user_address.lower()}"
+        tx_id = f"{tx_hash}_{token_id}"
+
+        if not await self._claim_tx_id(tx_id):
+            self.duplicate_count += 1
+            logger.debug(f"⏭️ Skipped duplicate copy trade {tx_id[:20]}...")
+            return False
 
         message = {
-            "tx_id": f"{tx_hash}_{token_id}",  # Unique ID
+            "tx_id": tx_id,  # Unique ID
             "user_address": user_address.lower(),
             "position_id": token_id,  # For position tracking
             "market_id": market_id,
@@ -249,7 +265,53 @@ class RedisPublisher:
             "address_type": "onchain",  # vs "bot_user" or "external_leader"
         }
 
-        return await self.publish(channel, message)
+        published = await self.publish(channel, message)
+        if not published:
+            # Let the redelivery of this trade through
+            await self._release_tx_id(tx_id)
+        return published
+
+    async def _claim_tx_id(self, tx_id: str) -> bool:
+        """
+        First publisher to see a tx_id wins (O(1) local check, then Redis SET NX EX)
+
+        Returns:
+            True if the trade should be published
+        """
+        now = time.monotonic()
+        while self._published_tx_ids:
+            oldest_tx_id, expires_at = next(iter(self._published_tx_ids.items()))
+            if expires_at > now:
+                break
+            self._published_tx_ids.popitem(last=False)
+
+        if tx_id in self._published_tx_ids:
+            return False
+
+        if self.is_connected and self.redis_client:
+            try:
+                claimed = await self.redis_client.set(
+                    f"{settings.REDIS_PREFIX}dedup:copy_trade:{tx_id}", 1, nx=True, ex=self.dedup_ttl
+                )
+                if not claimed:
+                    return False
+            except Exception as e:
+                # Non-blocking: fall back to local memory
+                logger.debug(f"⚠️ Redis dedup claim failed for {tx_id[:20]}...: {e}")
+
+        self._published_tx_ids[tx_id] = now + self.dedup_ttl
+        while len(self._published_tx_ids) > self.dedup_max_entries:
+            self._published_tx_ids.popitem(last=False)
+        return True
+
+    async def _release_tx_id(self, tx_id: str) -> None:
+        """Drop the claim of a trade that could not be published (local + Redis)"""
+        self._published_tx_ids.pop(tx_id, None)
+        if self.is_connected and self.redis_client:
+            try:
+                await self.redis_client.delete(f"{settings.REDIS_PREFIX}dedup:copy_trade:{tx_id}")
+            except Exception as e:
+                logger.debug(f"⚠️ Redis dedup release failed for {tx_id[:20]}...: {e}")
 
     async def disconnect(self):
         """Disconnect from Redis"""
@@ -270,6 +332,8 @@ class RedisPublisher:
             "connected": self.is_connected,
             "publish_count": self.publish_count,
             "publish_errors": self.publish_errors,
+            "duplicate_count": self.duplicate_count,
+            "dedup_entries": len(self._published_tx_ids),
             "reconnect_attempts": self.reconnect_attempts,
             "last_error": self.last_error,
         }
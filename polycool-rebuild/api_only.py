@@ -32,7 +32,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"🔍 Database URL: {settings.database.effective_url}")
 
     if os.getenv("SKIP_DB", "false").lower() != "true":
-        await init_db()
+        await init_db(role="api")
         logger.info("✅ Database initialized")
     else:
         logger.warning("⚠️ Database initialization skipped (SKIP_DB=true)")
@@ -48,7 +48,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         cache_manager = getattr(app.state, "cache", None)
         if cache_manager:
             try:
-                cache_manager.redis.close()
+                await cache_manager.close()
             except Exception:  # pragma: no cover - defensive
                 logger.warning("⚠️ Failed to close cache manager cleanly")
 
@@ -33,7 +33,7 @@ async def _run_bot() -> None:
         # Only initialize DB if SKIP_DB=false (for local development/testing)
         from core.database.connection import init_db
         try:
-            await init_db()
+            await init_db(role="bot")
             logger.info("✅ Database initialized")
         except Exception as e:
             logger.warning(f"⚠️ Database initialization failed: {e}")
@@ -119,8 +119,7 @@ async def _run_bot() -> None:
             except Exception as e:
                 logger.warning(f"⚠️ Error stopping streamer: {e}")
 
-        cache_manager.redis.close()
-        cache_manager.redis.connection_pool.disconnect()
+        await cache_manager.close()
 
 
 def main() -> None:
@@ -1,32 +1,87 @@
 """
 Database connection and session management
+
+Connection strategy (DB_POOL_MODE):
+- queue: AsyncAdaptedQueuePool with pre-ping, sized per process role
+  (api / bot / workers, overridable with DB_POOL_SIZE / DB_MAX_OVERFLOW)
+- null: NullPool, a new connection for every session
+Server-side prepared statements are disabled unless DB_PREPARED_STATEMENTS=true,
+which keeps both modes safe behind PgBouncer transaction pooling.
 """
 import os
-from typing import AsyncGenerator
+from time import perf_counter
+from typing import Any, Dict, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from infrastructure.config.settings import settings
-
-# Create async engine with DB-specific parameters
-engine_kwargs = {
-    "echo": settings.debug,  # SQL logging in debug mode
+from infrastructure.utils.rate_metrics import LatencyStats
+
+# Default (pool_size, max_overflow) per process role
+ROLE_POOL_DEFAULTS = {
+    'api': (5, 10),
+    'workers': (8, 12),   # Streamer, pollers, copy-trade listener, TP/SL monitor
+    'bot': (2, 3),        # Bot goes through the API (SKIP_DB) - kept small
+    'default': (3, 5),
 }
 
-# Add pool parameters only for PostgreSQL, not for SQLite
-if not settings.database.effective_url.startswith("sqlite"):
-    # Use NullPool for PgBouncer compatibility - create new connection per request
-    from sqlalchemy.pool import NullPool
-    engine_kwargs.update({
-        "poolclass": NullPool,  # No connection pooling for PgBouncer
-    })
-
 # Engine will be created lazily in init_db() to avoid connection at import time
 engine = None
 async_session_factory = None
 
 
+class PoolMetrics:
+    """Connection pool metrics (checkout latency, in-use, overflow)"""
+
+    def __init__(self, window: int = 1000):
+        self.role = 'default'
+        self.mode = None
+        self.connects = 0
+        self.invalidations = 0
+        self.checkout_timeouts = 0
+        self.checkout_latency = LatencyStats(window)
+
+    @property
+    def checkouts(self) -> int:
+        return self.checkout_latency.count
+
+    def record_checkout(self, latency: float) -> None:
+        self.checkout_latency.record(latency)
+
+    def get_stats(self) -> Dict[str, Any]:
+        latency = self.checkout_latency.to_dict(precision=2)
+        stats = {
+            'role': self.role,
+            'mode': self.mode,
+            'checkouts': self.checkouts,
+            'connects': self.connects,
+            'invalidations': self.invalidations,
+            'checkout_timeouts': self.checkout_timeouts,
+            'checkout_ms_avg': latency['avg_ms'],
+            'checkout_ms_p95': latency['p95_ms'],
+            'checkout_ms_max': latency['max_ms'],
+        }
+
+        pool = engine.sync_engine.pool if engine is not None else None
+        if pool is not None and hasattr(pool, 'checkedout'):
+            stats.update({
+                'pool_size': pool.size(),
+                'in_use': pool.checkedout(),
+                'idle': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+            })
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Current connection pool metrics"""
+    return pool_metrics.get_stats()
+
+
 class DatabaseSession:
     """Context manager for database sessions (async only)"""
 
@@ -34,11 +89,21 @@ class DatabaseSession:
         self.session = None
 
     async def __aenter__(self):
-        """Async context manager entry"""
+        """Async context manager entry (checks out the connection up front to time it)"""
         global async_session_factory
         if async_session_factory is None:
             raise RuntimeError("Database not initialized. Call init_db() first.")
         self.session = async_session_factory()
+
+        start = perf_counter()
+        try:
+            await self.session.connection()
+        except Exception as e:
+            if type(e).__name__ == 'TimeoutError':  # sqlalchemy.exc.TimeoutError: pool exhausted
+                pool_metrics.checkout_timeouts += 1
+            await self.session.close()
+            raise
+        pool_metrics.record_checkout(perf_counter() - start)
         return self.session
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -65,9 +130,31 @@ def get_db() -> DatabaseSession:
 
 
 
-async def init_db() -> None:
+def _pool_kwargs(role: str) -> Dict[str, Any]:
+    """Engine pool arguments for the configured DB_POOL_MODE and process role"""
+    db_settings = settings.database
+    if db_settings.pool_mode == "null":
+        from sqlalchemy.pool import NullPool
+        return {"poolclass": NullPool}
+
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    default_size, default_overflow = ROLE_POOL_DEFAULTS.get(role, ROLE_POOL_DEFAULTS['default'])
+    return {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": db_settings.pool_size if db_settings.pool_size is not None else default_size,
+        "max_overflow": db_settings.max_overflow if db_settings.max_overflow is not None else default_overflow,
+        "pool_timeout": db_settings.pool_timeout,
+        "pool_recycle": db_settings.pool_recycle,  # PgBouncer / Supabase close idle server connections
+        "pool_pre_ping": True,
+    }
+
+
+async def init_db(role: str = "default") -> None:
     """
     Initialize database and create tables
+
+    Args:
+        role: Process role used for pool sizing ('api', 'bot', 'workers')
     """
     global engine, async_session_factory
 
@@ -79,11 +166,9 @@ async def init_db() -> None:
 
         # Add pool parameters only for PostgreSQL, not for SQLite
         if not settings.database.effective_url.startswith("sqlite"):
-            # Use NullPool for PgBouncer compatibility - create new connection per request
-            from sqlalchemy.pool import NullPool
-            engine_kwargs.update({
-                "poolclass": NullPool,  # No connection pooling for PgBouncer
-            })
+            engine_kwargs.update(_pool_kwargs(role))
+            pool_metrics.role = role
+            pool_metrics.mode = settings.database.pool_mode
 
         # Configure PostgreSQL connection based on environment
         database_url = settings.database.effective_url
@@ -140,7 +225,6 @@ async def init_db() -> None:
             # However, psycopg still uses prepared statements by default, so we need to disable them
             # for PgBouncer transaction pooling compatibility
             # Note: application_name and sslmode are set via URL parameters, not connect_args
-            # prepare_threshold=0 disables prepared statements (0 = never prepare)
 
             # Check if this is Supabase Pooler (needs longer timeout)
             is_supabase_pooler = "pooler.supabase.com" in database_url
@@ -152,8 +236,6 @@ async def init_db() -> None:
             }
 
         # Use async engine everywhere (both local and Railway)
-        # Note: We're using NullPool which creates a new connection for each request
-        # This helps avoid prepared statement conflicts with PgBouncer transaction pooling
         engine = create_async_engine(database_url, **engine_kwargs)
 
         # CRITICAL: Intercept connection creation to disable prepared statements
@@ -164,12 +246,22 @@ async def init_db() -> None:
         @event.listens_for(engine.sync_engine, "do_connect")
         def disable_prepared_statements_on_connect(dialect, conn_rec, cargs, cparams):
             """Intercept connection creation to disable prepared statements"""
-            # Add prepare_threshold=0 to connection parameters
-            # This should prevent psycopg from using prepared statements
-            cparams['prepare_threshold'] = 0
+            # psycopg: prepare_threshold=None never prepares (0 would prepare every query)
+            # Transaction pooling hands each transaction a different server connection,
+            # so a statement prepared on one is unknown on the next
+            if not settings.database.prepared_statements:
+                cparams['prepare_threshold'] = None
             # Return None to let SQLAlchemy create the connection normally
             return None
 
+        @event.listens_for(engine.sync_engine.pool, "connect")
+        def count_connect(dbapi_connection, connection_record):
+            pool_metrics.connects += 1
+
+        @event.listens_for(engine.sync_engine.pool, "invalidate")
+        def count_invalidate(dbapi_connection, connection_record, exception):
+            pool_metrics.invalidations += 1
+
         async_session_factory = sessionmaker(
             bind=engine,
             class_=AsyncSession,
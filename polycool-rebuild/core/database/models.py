@@ -21,7 +21,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 Base = declarative_base()
 
@@ -131,6 +131,11 @@ class Market(Base):
     end_date = Column(DateTime)
     is_active = Column(Boolean, default=True)
 
+    # Change detection (fingerprint of poller-written fields)
+    # Deferred: only the poller reads/writes it (raw SQL), so ORM selects of Market
+    # keep working while the content_hash migration is not applied
+    content_hash = deferred(Column(String(40)))
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -150,6 +155,57 @@ class Market(Base):
     )
 
 
+class MarketToken(Base):
+    """CLOB token -> market projection (maintained by the market bulk upsert)"""
+    __tablename__ = "market_tokens"
+
+    token_id = Column(String(100), primary_key=True)  # CLOB token id (position_id on-chain)
+    market_id = Column(String(100), ForeignKey("markets.id", ondelete="CASCADE"), nullable=False)
+    outcome_index = Column(Integer, nullable=False)  # Index in markets.clob_token_ids / outcomes
+    condition_id = Column(String(100))
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_market_tokens_market', 'market_id'),
+    )
+
+
+class MarketDisplayItem(Base):
+    """Listing projection: one row per event group or standalone open market (maintained from market writes)"""
+    __tablename__ = "market_display_items"
+
+    item_key = Column(Text, primary_key=True)  # 'event:<event_title>' or 'market:<id>'
+    item_type = Column(String(20), nullable=False)  # 'event_group' (2+ open markets) or 'individual'
+    category = Column(String(50))  # Category of the highest-volume market
+
+    event_title = Column(Text)
+    event_id = Column(String(100))
+    event_slug = Column(String(255))
+
+    market_ids = Column(JSONB, nullable=False)  # Open markets, by volume desc
+    market_count = Column(Integer, nullable=False)
+
+    # Listing sort keys
+    total_volume = Column(Float, nullable=False, default=0.0)
+    total_liquidity = Column(Float, nullable=False, default=0.0)
+    newest_at = Column(DateTime, nullable=False)  # Latest market created_at
+    ends_at = Column(DateTime, nullable=False)  # Earliest market end_date
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_display_items_volume', 'total_volume', 'item_key'),
+        Index('idx_display_items_liquidity', 'total_liquidity', 'item_key'),
+        Index('idx_display_items_newest', 'newest_at', 'item_key'),
+        Index('idx_display_items_ends', 'ends_at', 'item_key'),
+        Index('idx_display_items_category_volume', 'category', 'total_volume', 'item_key'),
+        Index('idx_display_items_category_liquidity', 'category', 'total_liquidity', 'item_key'),
+        Index('idx_display_items_category_newest', 'category', 'newest_at', 'item_key'),
+        Index('idx_display_items_category_ends', 'category', 'ends_at', 'item_key'),
+    )
+
+
 class Position(Base):
     """Position model - active and closed positions"""
     __tablename__ = "positions"
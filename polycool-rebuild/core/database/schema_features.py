@@ -0,0 +1,44 @@
+"""
+Schema Features - Optional parts of the schema added by migrations
+Code paths that depend on a migration fall back while it is missing; the
+feature is re-probed periodically so a migration applied after startup is
+picked up without a restart.
+"""
+from time import monotonic
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# SQLSTATE codes meaning "the migration is not applied" (anything else is a real error)
+UNDEFINED_TABLE = '42P01'
+UNDEFINED_COLUMN = '42703'
+MISSING_SCHEMA_CODES = {UNDEFINED_TABLE, UNDEFINED_COLUMN}
+
+
+def is_missing_schema_error(error: BaseException) -> bool:
+    """True for undefined table / column errors (SQLAlchemy-wrapped or raw DBAPI)"""
+    orig = getattr(error, 'orig', None) or error
+    code = getattr(orig, 'sqlstate', None) or getattr(orig, 'pgcode', None)
+    return code in MISSING_SCHEMA_CODES
+
+
+class SchemaFeature:
+    """
+    Availability of a migration-backed feature
+    - available: False only for recheck_interval seconds after a missing-schema error
+    - mark_missing(): switch to the fallback path until the next probe
+    """
+
+    def __init__(self, name: str, recheck_interval: float = 300):
+        self.name = name
+        self.recheck_interval = recheck_interval
+        self._missing_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return monotonic() >= self._missing_until
+
+    def mark_missing(self, error: BaseException) -> None:
+        self._missing_until = monotonic() + self.recheck_interval
+        logger.warning(f"⚠️ {self.name} unavailable (migration missing), rechecking in {self.recheck_interval}s: {error}")
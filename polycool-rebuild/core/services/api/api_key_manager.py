@@ -3,25 +3,9 @@ API Key Manager - Generate Polymarket API Credentials
 Handles creation of API keys for enhanced trading rates
 Adapted from telegram-bot-v2 for new architecture
 """
-import os
-import sys
 from typing import Dict, Optional
-from pathlib import Path
-
-# Add py_clob_client to path (same as clob_service)
-project_root = Path(__file__).parent.parent.parent.parent
-py_clob_client_path = os.path.join(project_root, 'py_clob_client')
-if py_clob_client_path not in sys.path:
-    sys.path.insert(0, py_clob_client_path)
-
-try:
-    from py_clob_client.client import ClobClient
-except ImportError:
-    try:
-        from polycool.py_clob_client.client import ClobClient
-    except ImportError:
-        raise ImportError("py_clob_client not found. Please ensure it's installed or in the project path.")
 
+from py_clob_client.client import ClobClient
 from py_clob_client.constants import POLYGON
 
 from infrastructure.logging.logger import get_logger
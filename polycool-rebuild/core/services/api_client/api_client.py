@@ -1026,6 +1026,27 @@ class APIClient:
 
         return result
 
+    async def update_market_prices_batch(self, updates: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Update prices of many markets in one API call (used by WebSocket streamer)
+
+        Args:
+            updates: dicts with 'id', 'outcome_prices', 'last_mid_price', 'last_trade_price'
+
+        Returns:
+            {'updated_ids': [...], 'markets_with_positions': int} or None on error
+        """
+        if not updates:
+            return None
+
+        result = await self._post("/markets/prices/batch", {"updates": updates})
+
+        if result:
+            await self.cache_manager.invalidate_pattern("api:market:*")
+            await self.cache_manager.invalidate_pattern("api:markets:*")
+
+        return result
+
     async def get_market(self, market_id: str) -> Optional[Dict[str, Any]]:
         """
         Get market by ID via API
@@ -20,7 +20,8 @@ try:
 except ImportError:
     # Fallback for newer web3 versions
     try:
-        from web3.middleware.geth_poa import geth_poa_middleware
+        # web3 v7
+        from web3.middleware import ExtraDataToPOAMiddleware as geth_poa_middleware
     except ImportError:
         # Last resort fallback
         geth_poa_middleware = None
@@ -1,18 +1,160 @@
 """
 Centralized cache management system
 Single source of truth for all caching operations
+- Async Redis client (redis.asyncio) shared by every CacheManager instance
+- Pipelined multi-key operations (get_many / set_many / delete_many)
+- Optional in-process near-cache (LRU + TTL) for hot data types, kept coherent
+  across processes through a Redis pub/sub invalidation channel
 """
+import asyncio
+import fnmatch
 import json
-from typing import Any, Optional, Union
-from datetime import datetime, timedelta
+import uuid
+from collections import OrderedDict, defaultdict
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-import redis
+import redis.asyncio as aioredis
 
 from infrastructure.config.settings import settings
 from infrastructure.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Pub/sub channel carrying near-cache invalidations between processes
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Data types served from the near-cache (hot, read-mostly)
+NEAR_CACHE_TYPES = {'market_detail', 'user_profile', 'watched_addresses'}
+
+_MISSING = object()
+
+
+class NearCache:
+    """
+    Process-wide LRU with per-entry TTL
+    Shared by all CacheManager instances of the process
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.origin_id = uuid.uuid4().hex  # Skip our own invalidation messages
+        self.invalidations_received = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            self._entries.pop(key, None)
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self._entries[key] = (monotonic() + min(ttl, self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def delete_pattern(self, pattern: str) -> None:
+        for key in [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'evictions': self.evictions,
+            'invalidations_received': self.invalidations_received,
+        }
+
+
+_shared_redis: Optional[aioredis.Redis] = None
+_shared_redis_refs = 0  # CacheManager instances holding _shared_redis
+_near_cache: Optional[NearCache] = None
+_invalidation_listener_started = False
+
+
+def _get_shared_redis() -> aioredis.Redis:
+    """One async connection pool per process (callers must not keep it, see _acquire_shared_redis)"""
+    global _shared_redis
+    if _shared_redis is None:
+        _shared_redis = aioredis.Redis.from_url(settings.redis.url, decode_responses=True)
+    return _shared_redis
+
+
+def _acquire_shared_redis() -> aioredis.Redis:
+    """Shared pool for a long-lived holder (reference counted, see _release_shared_redis)"""
+    global _shared_redis_refs
+    client = _get_shared_redis()
+    _shared_redis_refs += 1
+    return client
+
+
+async def _release_shared_redis(client: aioredis.Redis) -> None:
+    """Drop one reference, closing the pool with the last one"""
+    global _shared_redis, _shared_redis_refs
+    if client is _shared_redis:
+        _shared_redis_refs -= 1
+        if _shared_redis_refs > 0:
+            return
+        _shared_redis, _shared_redis_refs = None, 0
+    close = getattr(client, 'aclose', None) or client.close
+    await close()
+
+
+def _get_near_cache() -> Optional[NearCache]:
+    """Near-cache needs pub/sub to stay coherent across processes"""
+    global _near_cache
+    if _near_cache is None and settings.redis.near_cache_enabled and settings.redis.pubsub_enabled:
+        _near_cache = NearCache(
+            max_entries=settings.redis.near_cache_max_entries,
+            ttl=settings.redis.near_cache_ttl,
+        )
+    return _near_cache
+
+
+async def _on_invalidation(channel: str, data: str) -> None:
+    """Redis callback for cache:invalidate"""
+    near_cache = _near_cache
+    if near_cache is None:
+        return
+    payload = json.loads(data) if isinstance(data, str) else data
+    if payload.get('origin') == near_cache.origin_id:
+        return
+
+    near_cache.invalidations_received += 1
+    if payload.get('clear'):
+        near_cache.clear()
+    if payload.get('keys'):
+        near_cache.delete_many(payload['keys'])
+    if payload.get('pattern'):
+        near_cache.delete_pattern(payload['pattern'])
+
+
+async def _start_invalidation_listener() -> None:
+    global _invalidation_listener_started
+    try:
+        from core.services.redis_pubsub import get_redis_pubsub_service
+        await get_redis_pubsub_service().subscribe(INVALIDATION_CHANNEL, _on_invalidation)
+    except Exception as e:
+        _invalidation_listener_started = False
+        logger.warning(f"⚠️ Near-cache invalidation listener failed: {e}")
+
 
 class CacheManager:
     """
@@ -28,17 +170,23 @@ class CacheManager:
         'user_profile': settings.redis.ttl_user_data,  # Long (1h)
         'smart_trades': settings.redis.ttl_markets,    # Moyen (5min)
         'leaderboard': settings.redis.ttl_user_data,   # Long (1h)
+        'watched_addresses': settings.redis.ttl_markets,  # Moyen (5min)
     }
 
     def __init__(self):
-        """Initialize Redis connection"""
-        self.redis = redis.Redis.from_url(settings.redis.url, decode_responses=True)
+        """Initialize Redis connection (shared async pool)"""
+        self.redis = _acquire_shared_redis()
+        self.near_cache = _get_near_cache()
         self.stats = {
             'hits': 0,
+            'near_hits': 0,
             'misses': 0,
             'sets': 0,
             'invalidations': 0,
         }
+        self.type_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {'hits': 0, 'near_hits': 0, 'misses': 0}
+        )
 
     async def get(self, key: str, data_type: str = 'default') -> Optional[Any]:
         """
@@ -51,26 +199,68 @@ class CacheManager:
         Returns:
             Cached value or None if miss
         """
+        near_value = self._near_get(key, data_type)
+        if near_value is not _MISSING:
+            return near_value
+
         try:
-            value = self.redis.get(key)
+            value = await self.redis.get(key)
             if value is None:
-                self.stats['misses'] += 1
+                self._record_miss(data_type)
                 logger.debug(f"Cache miss: {key}")
                 return None
 
-            self.stats['hits'] += 1
+            self._record_hit(data_type)
             logger.debug(f"Cache hit: {key}")
 
-            # Parse JSON if needed
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+            self._near_set(key, value, data_type, self._get_ttl(data_type))
+            return self._deserialize(value)
 
         except Exception as e:
             logger.warning(f"Cache get error for key {key}: {e}")
             return None
 
+    async def get_many(self, keys: List[str], data_type: str = 'default') -> Dict[str, Any]:
+        """
+        Get several keys in one round-trip (near-cache first, then MGET)
+
+        Args:
+            keys: Cache keys
+            data_type: Type for TTL strategy / metrics
+
+        Returns:
+            Dictionary of key -> value for the keys found
+        """
+        found: Dict[str, Any] = {}
+        remote_keys = []
+        for key in dict.fromkeys(keys):
+            near_value = self._near_get(key, data_type)
+            if near_value is _MISSING:
+                remote_keys.append(key)
+            else:
+                found[key] = near_value
+
+        if not remote_keys:
+            return found
+
+        try:
+            values = await self.redis.mget(remote_keys)
+            ttl = self._get_ttl(data_type)
+            for key, value in zip(remote_keys, values):
+                if value is None:
+                    self._record_miss(data_type)
+                    continue
+                self._record_hit(data_type)
+                found[key] = self._deserialize(value)
+                self._near_set(key, value, data_type, ttl)
+
+            logger.debug(f"Cache get_many: {len(found)}/{len(keys)} hits")
+
+        except Exception as e:
+            logger.warning(f"Cache get_many error for {len(remote_keys)} keys: {e}")
+
+        return found
+
     async def set(
         self,
         key: str,
@@ -90,29 +280,50 @@ class CacheManager:
         Returns:
             True if successful, False otherwise
         """
+        return await self.set_many({key: value}, data_type, ttl) == 1
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        data_type: str = 'default',
+        ttl: Optional[int] = None
+    ) -> int:
+        """
+        Set several keys with the same TTL in one pipelined round-trip
+
+        Args:
+            items: Dictionary of key -> value (values JSON serialized)
+            data_type: Type for TTL strategy
+            ttl: Custom TTL in seconds (overrides data_type)
+
+        Returns:
+            Number of keys written
+        """
+        if not items:
+            return 0
         try:
-            # Determine TTL
             if ttl is None:
-                ttl = self.TTL_STRATEGY.get(data_type, 300)  # Default 5 minutes
+                ttl = self._get_ttl(data_type)
 
-            # Serialize value
-            if isinstance(value, (dict, list)):
-                serialized_value = json.dumps(value)
-            else:
-                serialized_value = str(value)
+            serialized = {key: self._serialize(value) for key, value in items.items()}
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in serialized.items():
+                pipe.setex(key, ttl, value)
+            if self._is_near_cached(data_type):
+                self._publish_invalidation(pipe, keys=list(serialized))
+            results = await pipe.execute()
 
-            # Set in Redis
-            result = self.redis.setex(key, ttl, serialized_value)
-            if result:
-                self.stats['sets'] += 1
-                logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
-                return True
+            written = sum(1 for result in results[:len(items)] if result)
+            self.stats['sets'] += written
+            for key, value in serialized.items():
+                self._near_set(key, value, data_type, ttl)
 
-            return False
+            logger.debug(f"Cache set: {len(items)} keys (TTL: {ttl}s)")
+            return written
 
         except Exception as e:
-            logger.warning(f"Cache set error for key {key}: {e}")
-            return False
+            logger.warning(f"Cache set error for {len(items)} keys: {e}")
+            return 0
 
     async def delete(self, key: str) -> bool:
         """
@@ -124,21 +335,39 @@ class CacheManager:
         Returns:
             True if key was deleted, False otherwise
         """
+        return await self.delete_many([key]) > 0
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several keys in one round-trip
+
+        Args:
+            keys: Cache keys to delete
+
+        Returns:
+            Number of keys deleted
+        """
+        if not keys:
+            return 0
+        if self.near_cache:
+            self.near_cache.delete_many(keys)
         try:
-            result = self.redis.delete(key)
-            if result > 0:
-                self.stats['invalidations'] += 1
-                logger.debug(f"Cache delete: {key}")
-                return True
-            return False
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(*keys)
+            if self.near_cache:
+                self._publish_invalidation(pipe, keys=list(keys))
+            result = (await pipe.execute())[0]
+            self.stats['invalidations'] += result
+            logger.debug(f"Cache delete: {len(keys)} keys ({result} existed)")
+            return result
 
         except Exception as e:
-            logger.warning(f"Cache delete error for key {key}: {e}")
-            return False
+            logger.warning(f"Cache delete error for {len(keys)} keys: {e}")
+            return 0
 
     async def invalidate_pattern(self, pattern: str) -> int:
         """
-        Invalidate all keys matching a pattern
+        Invalidate all keys matching a pattern (SCAN, non-blocking for Redis)
 
         Args:
             pattern: Redis pattern (e.g., "market:*")
@@ -146,14 +375,28 @@ class CacheManager:
         Returns:
             Number of keys invalidated
         """
+        if self.near_cache:
+            self.near_cache.delete_pattern(pattern)
         try:
-            keys = self.redis.keys(pattern)
-            if keys:
-                result = self.redis.delete(*keys)
+            result = 0
+            batch = []
+            async for key in self.redis.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    result += await self.redis.delete(*batch)
+                    batch = []
+            if batch:
+                result += await self.redis.delete(*batch)
+
+            if self.near_cache:
+                pipe = self.redis.pipeline(transaction=False)
+                self._publish_invalidation(pipe, pattern=pattern)
+                await pipe.execute()
+
+            if result:
                 self.stats['invalidations'] += result
                 logger.info(f"Cache pattern invalidate: {pattern} ({result} keys)")
-                return result
-            return 0
+            return result
 
         except Exception as e:
             logger.warning(f"Cache pattern invalidate error for {pattern}: {e}")
@@ -194,30 +437,56 @@ class CacheManager:
             return None
 
     def get_stats(self) -> dict:
-        """Get cache statistics"""
-        total_requests = self.stats['hits'] + self.stats['misses']
-        hit_rate = (self.stats['hits'] / total_requests * 100) if total_requests > 0 else 0
+        """Get cache statistics (hits include near-cache hits)"""
+        hits = self.stats['hits'] + self.stats['near_hits']
+        total_requests = hits + self.stats['misses']
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
+
+        by_type = {}
+        for data_type, counts in self.type_stats.items():
+            type_hits = counts['hits'] + counts['near_hits']
+            type_total = type_hits + counts['misses']
+            by_type[data_type] = {
+                **counts,
+                'hit_rate': round(type_hits / type_total * 100, 2) if type_total else 0,
+                'near_hit_rate': round(counts['near_hits'] / type_total * 100, 2) if type_total else 0,
+            }
 
         return {
-            'hits': self.stats['hits'],
+            'hits': hits,
+            'near_hits': self.stats['near_hits'],
             'misses': self.stats['misses'],
             'sets': self.stats['sets'],
             'invalidations': self.stats['invalidations'],
             'hit_rate': round(hit_rate, 2),
             'total_requests': total_requests,
+            'by_type': by_type,
+            'near_cache': self.near_cache.get_stats() if self.near_cache else None,
         }
 
     async def health_check(self) -> bool:
         """Check Redis connectivity"""
         try:
-            return self.redis.ping()
+            return await self.redis.ping()
         except Exception:
             return False
 
+    async def close(self) -> None:
+        """Release the shared Redis pool (closed once no CacheManager holds it)"""
+        if self.redis is None:
+            return
+        client, self.redis = self.redis, None
+        await _release_shared_redis(client)
+
     async def clear_all(self) -> bool:
         """Clear all cache data (dangerous!)"""
         try:
-            result = self.redis.flushdb()
+            result = await self.redis.flushdb()
+            if self.near_cache:
+                self.near_cache.clear()
+                pipe = self.redis.pipeline(transaction=False)
+                self._publish_invalidation(pipe, clear=True)
+                await pipe.execute()
             logger.warning("Cache cleared completely!")
             return result
         except Exception as e:
@@ -235,7 +504,7 @@ class CacheManager:
             Set of members (empty set if key doesn't exist)
         """
         try:
-            members = self.redis.smembers(key)
+            members = await self.redis.smembers(key)
             return set(members) if members else set()
         except Exception as e:
             logger.warning(f"Cache get_set error for key {key}: {e}")
@@ -267,12 +536,12 @@ class CacheManager:
             if not members:
                 return 0
 
-            # Add members to set
-            result = self.redis.sadd(key, *members)
-
-            # Set TTL if provided
+            # Add members to set (+ TTL) in one round-trip
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.sadd(key, *members)
             if ttl is not None:
-                self.redis.expire(key, ttl)
+                pipe.expire(key, ttl)
+            result = (await pipe.execute())[0]
 
             logger.debug(f"Cache add_to_set: {key} ({result} new members, TTL: {ttl}s)")
             return result
@@ -293,7 +562,75 @@ class CacheManager:
             True if member exists, False otherwise
         """
         try:
-            return bool(self.redis.sismember(key, member))
+            return bool(await self.redis.sismember(key, member))
         except Exception as e:
             logger.warning(f"Cache is_member error for key {key}: {e}")
             return False
+
+    def _get_ttl(self, data_type: str) -> int:
+        return self.TTL_STRATEGY.get(data_type, 300)  # Default 5 minutes
+
+    @staticmethod
+    def _serialize(value: Any) -> str:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return str(value)
+
+    @staticmethod
+    def _deserialize(value: str) -> Any:
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return value
+
+    def _is_near_cached(self, data_type: str) -> bool:
+        return self.near_cache is not None and data_type in NEAR_CACHE_TYPES
+
+    def _near_get(self, key: str, data_type: str) -> Any:
+        if not self._is_near_cached(data_type):
+            return _MISSING
+        raw = self.near_cache.get(key)
+        if raw is _MISSING:
+            return _MISSING
+        self.stats['near_hits'] += 1
+        self.type_stats[data_type]['near_hits'] += 1
+        logger.debug(f"Near-cache hit: {key}")
+        return self._deserialize(raw)  # Stored serialized: callers never share a mutable object
+
+    def _near_set(self, key: str, raw: str, data_type: str, ttl: int) -> None:
+        if not self._is_near_cached(data_type):
+            return
+        self._ensure_invalidation_listener()
+        self.near_cache.set(key, raw, ttl)
+
+    def _record_hit(self, data_type: str) -> None:
+        self.stats['hits'] += 1
+        self.type_stats[data_type]['hits'] += 1
+
+    def _record_miss(self, data_type: str) -> None:
+        self.stats['misses'] += 1
+        self.type_stats[data_type]['misses'] += 1
+
+    def _publish_invalidation(self, pipe, keys: Optional[List[str]] = None,
+                              pattern: Optional[str] = None, clear: bool = False) -> None:
+        """Queue a near-cache invalidation for other processes on a pipeline"""
+        payload = {'origin': self.near_cache.origin_id}
+        if keys:
+            payload['keys'] = keys
+        if pattern:
+            payload['pattern'] = pattern
+        if clear:
+            payload['clear'] = True
+        pipe.publish(INVALIDATION_CHANNEL, json.dumps(payload))
+
+    @staticmethod
+    def _ensure_invalidation_listener() -> None:
+        global _invalidation_listener_started
+        if _invalidation_listener_started:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        _invalidation_listener_started = True
+        asyncio.create_task(_start_invalidation_listener())
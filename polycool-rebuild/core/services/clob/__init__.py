@@ -2,6 +2,13 @@
 CLOB Service Module
 """
 from .clob_service import CLOBService, get_clob_service
+from .price_fetcher import PriceFetcher, get_price_fetcher
+from .order_book import LocalOrderBook, OrderBookMirror, get_order_book_mirror
+from .client_cache import ClientCache, get_client_cache
 
-__all__ = ['CLOBService', 'get_clob_service']
+__all__ = [
+    'CLOBService', 'get_clob_service', 'PriceFetcher', 'get_price_fetcher',
+    'LocalOrderBook', 'OrderBookMirror', 'get_order_book_mirror',
+    'ClientCache', 'get_client_cache',
+]
 
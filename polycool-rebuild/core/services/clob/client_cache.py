@@ -0,0 +1,251 @@
+"""
+Client Cache - Ready-to-trade ClobClient per user
+Building a client costs a user lookup (API or DB), key/secret decryption and
+signer derivation; a cached client skips all of it on the next order.
+- Bounded LRU with TTL, keyed by telegram user id (+ client kind)
+- One build in flight per user: concurrent orders share it
+- Invalidated when keys / API credentials change, in every process (pub/sub)
+- Tick size / neg risk / fee rate lookups shared by all clients per token
+"""
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from py_clob_client.client import ClobClient
+
+from infrastructure.config.settings import settings
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Pub/sub channel carrying client invalidations between processes
+CLIENT_INVALIDATION_CHANNEL = "clob:clients:invalidate"
+
+
+class SharedMarketParams:
+    """
+    Per-token tick size / neg risk / fee rate shared by every cached client
+    (ClobClient keeps them in private dicts; all clients get the same dicts).
+    Cleared in place every `ttl` seconds - tick sizes change near 0/1.
+    """
+
+    def __init__(self, ttl: int = 600):
+        self.ttl = ttl
+        self.tick_sizes: Dict[str, str] = {}
+        self.neg_risk: Dict[str, bool] = {}
+        self.fee_rates: Dict[str, int] = {}
+        self._expires_at = monotonic() + ttl
+
+    def attach(self, client: ClobClient) -> None:
+        self.maybe_expire()
+        # AsyncClobClient.from_client() picks these up too
+        client._tick_sizes = self.tick_sizes
+        client._neg_risk = self.neg_risk
+        client._fee_rates = self.fee_rates
+
+    def maybe_expire(self) -> None:
+        if monotonic() >= self._expires_at:
+            self.tick_sizes.clear()
+            self.neg_risk.clear()
+            self.fee_rates.clear()
+            self._expires_at = monotonic() + self.ttl
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'tick_sizes': len(self.tick_sizes),
+            'neg_risk': len(self.neg_risk),
+            'fee_rates': len(self.fee_rates),
+        }
+
+
+class ClientCache:
+    """
+    LRU + TTL cache of ClobClient instances
+    Only real clients are cached (mock / failed builds are retried next time).
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[int] = None):
+        """
+        Args:
+            max_size: Cached clients (LRU eviction beyond)
+            ttl: Seconds a client is reused before being rebuilt
+        """
+        self.max_size = max_size or settings.trading.clob_client_cache_size
+        self.ttl = ttl or settings.trading.clob_client_cache_ttl
+        self.market_params = SharedMarketParams()
+        self.origin_id = uuid.uuid4().hex  # Skip our own invalidation messages
+
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, ClobClient]]" = OrderedDict()
+        self._pending: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._generations: Dict[int, int] = {}  # Bumped on invalidation: in-flight builds aren't cached
+        self._listener_started = False
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get(
+        self,
+        telegram_user_id: int,
+        build: Callable[[], Awaitable[Any]],
+        kind: str = "default"
+    ) -> Any:
+        """
+        Cached client, or build() it (concurrent callers share one build)
+
+        Args:
+            telegram_user_id: Telegram user ID
+            build: Coroutine factory creating the client
+            kind: Client flavour (separate entries for differently built clients)
+        """
+        self._ensure_listener()
+        key = (telegram_user_id, kind)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._build(key, build))
+            self._pending[key] = task
+        else:
+            self.joined += 1
+        # A cancelled caller must not cancel the build other orders wait on
+        return await asyncio.shield(task)
+
+    def peek(self, telegram_user_id: int, kind: str = "default") -> Any:
+        """Cached client without building one (None on miss)"""
+        entry = self._entries.get((telegram_user_id, kind))
+        if entry is None or entry[0] <= monotonic():
+            return None
+        self._entries.move_to_end((telegram_user_id, kind))
+        self.hits += 1
+        return entry[1]
+
+    async def _build(self, key: Tuple[int, str], build: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generations.get(key[0], 0)
+        try:
+            client = await build()
+            if isinstance(client, ClobClient) and client.signer is not None:
+                self.market_params.attach(client)
+                if self._generations.get(key[0], 0) == generation:
+                    self._store(key, client)
+            return client
+        finally:
+            self._pending.pop(key, None)
+
+    def _store(self, key: Tuple[int, str], client: ClobClient) -> None:
+        self._entries[key] = (monotonic() + self.ttl, client)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def warm(
+        self,
+        telegram_user_ids: Iterable[int],
+        get_client: Callable[[int], Awaitable[Any]],
+        concurrency: int = 8
+    ) -> int:
+        """
+        Build the clients of several users ahead of their orders
+
+        Args:
+            telegram_user_ids: Users to warm
+            get_client: Cache-backed getter (e.g. CLOBService.create_user_client)
+            concurrency: Builds in parallel
+
+        Returns:
+            Number of users with a client ready
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _warm(telegram_user_id: int) -> bool:
+            async with semaphore:
+                try:
+                    return await get_client(telegram_user_id) is not None
+                except Exception as e:
+                    logger.debug(f"⚠️ Client warm-up failed for user {telegram_user_id}: {e}")
+                    return False
+
+        user_ids = list(dict.fromkeys(u for u in telegram_user_ids if u))
+        results = await asyncio.gather(*(_warm(u) for u in user_ids))
+        return sum(1 for ready in results if ready)
+
+    async def invalidate(self, telegram_user_id: int, publish: bool = True) -> None:
+        """Drop a user's clients here and (publish=True) in every other process"""
+        self._drop(telegram_user_id)
+        if not publish:
+            return
+        try:
+            from core.services.redis_pubsub import get_redis_pubsub_service
+            await get_redis_pubsub_service().publish(
+                CLIENT_INVALIDATION_CHANNEL,
+                {'telegram_user_id': telegram_user_id, 'origin': self.origin_id}
+            )
+        except Exception as e:
+            # Other processes fall back to the TTL
+            logger.warning(f"⚠️ Could not publish client invalidation for user {telegram_user_id}: {e}")
+
+    def _drop(self, telegram_user_id: int) -> None:
+        self._generations[telegram_user_id] = self._generations.get(telegram_user_id, 0) + 1
+        for key in [k for k in self._entries if k[0] == telegram_user_id]:
+            self._entries.pop(key, None)
+        self.invalidations += 1
+
+    async def _on_invalidation(self, channel: str, data: str) -> None:
+        """Redis callback for clob:clients:invalidate"""
+        payload = json.loads(data) if isinstance(data, str) else data
+        if payload.get('origin') == self.origin_id or payload.get('telegram_user_id') is None:
+            return
+        self._drop(int(payload['telegram_user_id']))
+
+    def _ensure_listener(self) -> None:
+        if self._listener_started or not settings.redis.pubsub_enabled:
+            return
+        self._listener_started = True
+        asyncio.create_task(self._start_listener())
+
+    async def _start_listener(self) -> None:
+        try:
+            from core.services.redis_pubsub import get_redis_pubsub_service
+            await get_redis_pubsub_service().subscribe(CLIENT_INVALIDATION_CHANNEL, self._on_invalidation)
+        except Exception as e:
+            self._listener_started = False
+            logger.warning(f"⚠️ Client invalidation listener failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'clients': len(self._entries),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'joined': self.joined,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'market_params': self.market_params.get_stats(),
+        }
+
+
+_client_cache: Optional[ClientCache] = None
+
+
+def get_client_cache() -> ClientCache:
+    """Get or create ClientCache instance"""
+    global _client_cache
+    if _client_cache is None:
+        _client_cache = ClientCache()
+    return _client_cache
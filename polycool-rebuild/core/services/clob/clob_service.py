@@ -3,21 +3,19 @@ CLOB Service - CLOB API integration for trading
 Handles order placement, cancellation, balance checks, and market data
 """
 from typing import Optional, Dict, List, Any
-import sys
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
 
-# Add py_clob_client to path (relative to project root)
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
-py_clob_client_path = os.path.join(project_root, 'py_clob_client')
-if py_clob_client_path not in sys.path:
-    sys.path.insert(0, py_clob_client_path)
-
+# py_clob_client fork at the repo root (installed by requirements.txt)
+from py_clob_client.client import ClobClient
 try:
-    from py_clob_client.client import ClobClient
+    # Coroutine twin of ClobClient on the pooled async transport
+    from py_clob_client.async_client import AsyncClobClient
 except ImportError:
-    # Fallback: try absolute import
-    from polycool.py_clob_client.client import ClobClient
+    AsyncClobClient = None
 from py_clob_client.constants import POLYGON
+from py_clob_client.utilities import price_valid
 from py_clob_client.clob_types import (
     ApiCreds,
     OrderArgs,
@@ -34,10 +32,15 @@ from core.services.user.user_service import user_service
 from core.services.wallet.wallet_service import wallet_service
 from core.services.encryption.encryption_service import encryption_service
 from core.services.position.outcome_helper import find_outcome_index
+from infrastructure.config.settings import settings
 from infrastructure.logging.logger import get_logger
+from .client_cache import get_client_cache
 
 logger = get_logger(__name__)
 
+# Orders accepted by one POST /orders call
+POST_ORDERS_BATCH_SIZE = 15
+
 
 class CLOBService:
     """
@@ -48,11 +51,42 @@ class CLOBService:
     def __init__(self):
         """Initialize CLOBService"""
         self.host = "https://clob.polymarket.com"
+        self._client_cache = get_client_cache()
+        self._sign_executor: Optional[ThreadPoolExecutor] = None
         logger.info("CLOBService initialized")
 
     async def _get_client_for_user(self, telegram_user_id: int) -> Optional[ClobClient]:
         """
-        Get ClobClient instance for a user
+        Get ClobClient instance for a user (cached, see ClientCache)
+
+        Args:
+            telegram_user_id: Telegram user ID
+
+        Returns:
+            ClobClient instance or None if error
+        """
+        # A full trading client (with API creds) serves here too
+        return self._client_cache.peek(telegram_user_id, "trading") or await self._client_cache.get(
+            telegram_user_id,
+            lambda: self._build_client_for_user(telegram_user_id)
+        )
+
+    async def warm_clients(self, telegram_user_ids: List[int]) -> int:
+        """
+        Build trading clients ahead of a burst of orders (e.g. copy-trade fan-out)
+
+        Returns:
+            Number of users with a client ready
+        """
+        return await self._client_cache.warm(telegram_user_ids, self.create_user_client)
+
+    async def invalidate_client(self, telegram_user_id: int) -> None:
+        """Drop a user's cached clients (keys or API credentials changed)"""
+        await self._client_cache.invalidate(telegram_user_id)
+
+    async def _build_client_for_user(self, telegram_user_id: int) -> Optional[ClobClient]:
+        """
+        Build ClobClient instance for a user
 
         Args:
             telegram_user_id: Telegram user ID
@@ -250,6 +284,24 @@ class CLOBService:
             logger.warning(f"🚨 Creating mock client due to unexpected error for user {telegram_user_id}")
             return self._create_mock_client("", "0x0000000000000000000000000000000000000000")
 
+    def _as_async(self, client) -> Optional["AsyncClobClient"]:
+        """
+        Async view of a ClobClient (shares signer, creds and order builder)
+        so network calls don't block the event loop
+
+        Returns:
+            AsyncClobClient or None (mock client / async transport unavailable)
+        """
+        if AsyncClobClient is None or not isinstance(client, ClobClient):
+            return None
+        return AsyncClobClient.from_client(client)
+
+    async def _clob_call(self, client, async_client, method: str, *args, **kwargs):
+        """Call a ClobClient network method on the async transport, or in a thread without it"""
+        if async_client:
+            return await getattr(async_client, method)(*args, **kwargs)
+        return await asyncio.to_thread(getattr(client, method), *args, **kwargs)
+
     def _create_mock_client(self, private_key: str, polygon_address: str):
         """
         Create a mock ClobClient for testing purposes when the real client fails
@@ -360,7 +412,7 @@ class CLOBService:
 
     async def get_orderbook(self, token_id: str) -> Optional[Dict]:
         """
-        Get orderbook for a token using REST API
+        Get orderbook for a token (local order book mirror, REST API fallback)
 
         Args:
             token_id: Token ID
@@ -369,6 +421,11 @@ class CLOBService:
             Orderbook dictionary or None if error
         """
         try:
+            from .order_book import get_order_book_mirror
+            book = await get_order_book_mirror().get_snapshot(token_id)
+            if book:
+                return book.to_dict()
+
             import httpx
 
             # Use direct REST API call (no auth needed)
@@ -396,34 +453,137 @@ class CLOBService:
             logger.error(f"❌ Error getting orderbook for token {token_id}: {e}")
             return None
 
-    async def get_market_prices(self, token_ids: List[str]) -> Dict[str, float]:
+    async def estimate_market_order(self, token_id: str, side: str, amount: float) -> Optional[Dict[str, Any]]:
         """
-        Get current prices for multiple tokens
+        Quote + expected fill of a market order from the local order book mirror
 
         Args:
-            token_ids: List of token IDs
+            token_id: Token ID
+            side: "BUY" (amount in USD) or "SELL" (amount in shares)
+            amount: Order amount
 
         Returns:
-            Dictionary mapping token_id to price
+            best_bid/best_ask/mid/spread + shares/cost/avg_price/worst_price/slippage_pct/filled,
+            or None if the token's book isn't mirrored
         """
         try:
-            # Create read-only client
-            client = ClobClient(host=self.host, chain_id=POLYGON)
+            from .order_book import get_order_book_mirror
+            book = await get_order_book_mirror().get_snapshot(token_id)
+            if not book:
+                return None
+            return {**book.quote(), **book.estimate_fill(side, amount)}
+        except Exception as e:
+            logger.warning(f"⚠️ Market order estimate failed for token {token_id[:20]}...: {e}")
+            return None
 
-            prices = {}
-            for token_id in token_ids:
-                try:
-                    # Get midpoint price
-                    price_data = client.get_midpoint(token_id)
-                    if price_data and isinstance(price_data, dict):
-                        prices[token_id] = float(price_data.get('midpoint', 0))
-                    else:
-                        prices[token_id] = 0.0
-                except Exception as e:
-                    logger.debug(f"Error getting price for token {token_id}: {e}")
-                    prices[token_id] = 0.0
+    async def _mirror_market_price(self, token_id: str, side: str, amount: float) -> float:
+        """Market-order price from the local order book (0 -> client fetches /book itself)"""
+        try:
+            from .order_book import get_order_book_mirror
+            price = await get_order_book_mirror().calculate_market_price(token_id, side, amount)
+            return price or 0
+        except Exception as e:
+            logger.debug(f"⚠️ Order book mirror price unavailable for {token_id[:20]}...: {e}")
+            return 0
+
+    async def sign_market_order(self, client, token_id: str, side: str, amount: float):
+        """
+        Build and sign a market order without posting it
+        Market params come from the shared caches, the price from the order book
+        mirror (or /book), and the EIP-712 signing runs in the signing thread pool.
+
+        Args:
+            client: ClobClient instance
+            token_id: Token ID to trade
+            side: 'BUY' (amount in USD) or 'SELL' (amount in shares)
+            amount: Order amount
+
+        Returns:
+            SignedOrder, or None if the client can't sign (mock client)
+        """
+        if not getattr(client, 'builder', None):
+            return None
+        async_client = self._as_async(client)
+
+        side = side.upper()
+        tick_size, neg_risk, fee_rate_bps = await asyncio.gather(
+            self._clob_call(client, async_client, 'get_tick_size', token_id),
+            self._clob_call(client, async_client, 'get_neg_risk', token_id),
+            self._clob_call(client, async_client, 'get_fee_rate_bps', token_id),
+        )
+        price = await self._mirror_market_price(token_id, side, amount)
+        if not price:
+            price = await self._clob_call(
+                client, async_client, 'calculate_market_price', token_id, side, amount, OrderType.FOK
+            )
+        if not price_valid(price, tick_size):
+            raise Exception(f"price ({price}), min: {tick_size} - max: {1 - float(tick_size)}")
+
+        order_args = MarketOrderArgs(
+            token_id=token_id,
+            amount=amount,
+            side=side,
+            price=price,
+            fee_rate_bps=fee_rate_bps or 0
+        )
+        options = CreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk)
+
+        if self._sign_executor is None:
+            self._sign_executor = ThreadPoolExecutor(
+                max_workers=settings.trading.copy_trade_sign_workers,
+                thread_name_prefix="order-sign"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._sign_executor, client.builder.create_market_order, order_args, options)
+
+    async def post_signed_orders(self, client, signed_orders: List[Any], order_type: str = 'FAK') -> List[Any]:
+        """
+        Post signed orders of one user (same API credentials)
+        Several orders go through POST /orders in batches of 15, a single one through POST /order.
 
-            return prices
+        Returns:
+            One response per order, in order (an error dict for orders of a failed request)
+        """
+        async_client = self._as_async(client)
+        order_type_enum = OrderType.FOK if order_type == 'FOK' else OrderType.FAK
+
+        if len(signed_orders) == 1:
+            try:
+                return [await self._clob_call(
+                    client, async_client, 'post_order', signed_orders[0], orderType=order_type_enum
+                )]
+            except Exception as e:
+                return [{'success': False, 'error': str(e)}]
+
+        responses: List[Any] = []
+        for i in range(0, len(signed_orders), POST_ORDERS_BATCH_SIZE):
+            chunk = signed_orders[i:i + POST_ORDERS_BATCH_SIZE]
+            try:
+                result = await self._clob_call(
+                    client, async_client, 'post_orders',
+                    [PostOrdersArgs(order=order, orderType=order_type_enum) for order in chunk]
+                )
+                if not isinstance(result, list) or len(result) != len(chunk):
+                    result = [{'success': False, 'error': f'Unexpected response: {result}'}] * len(chunk)
+            except Exception as e:
+                result = [{'success': False, 'error': str(e)}] * len(chunk)
+            responses.extend(result)
+        return responses
+
+    async def get_market_prices(self, token_ids: List[str]) -> Dict[str, float]:
+        """
+        Get current (midpoint) prices for multiple tokens
+        Batched /midpoints requests + price cache (see PriceFetcher)
+
+        Args:
+            token_ids: List of token IDs
+
+        Returns:
+            Dictionary mapping token_id to price (tokens without a price are omitted)
+        """
+        try:
+            from .price_fetcher import get_price_fetcher
+            return await get_price_fetcher().get_midpoints(token_ids)
 
         except Exception as e:
             logger.error(f"❌ Error getting market prices: {e}")
@@ -457,6 +617,8 @@ class CLOBService:
             if not client:
                 return None
 
+            async_client = self._as_async(client)
+
             # Convert order type
             order_type_enum = OrderType.GTC
             if order_type == "IOC" or order_type == "FAK":
@@ -472,9 +634,13 @@ class CLOBService:
                 order_args = MarketOrderArgs(
                     token_id=token_id,
                     side=side_str,
-                    amount=amount
+                    amount=amount,
+                    price=await self._mirror_market_price(token_id, side_str, amount)
                 )
-                order = client.create_market_order(order_args)
+                if async_client:
+                    order = await async_client.create_market_order(order_args)
+                else:
+                    order = client.create_market_order(order_args)
             else:
                 # Limit order
                 order_args = OrderArgs(
@@ -483,35 +649,34 @@ class CLOBService:
                     size=amount,  # Note: OrderArgs uses 'size', not 'amount'
                     price=price
                 )
-                order = client.create_order(order_args)
+                if async_client:
+                    order = await async_client.create_order(order_args)
+                else:
+                    order = client.create_order(order_args)
 
             # Post order
-            result = client.post_order(order, orderType=order_type_enum)
+            if async_client:
+                result = await async_client.post_order(order, orderType=order_type_enum)
+            else:
+                result = client.post_order(order, orderType=order_type_enum)
 
             if result:
                 # ✅ NOTIFY WebSocket Manager for real-time tracking
                 try:
                     # Get market_id from token_id
-                    from core.database.connection import get_db
-                    from sqlalchemy import select
-
-                    async with get_db() as db:
-                        from core.database.models import Market
-                        query = select(Market.id).where(
-                            Market.clob_token_ids.contains([token_id])
+                    from core.services.market_service.token_resolver import get_token_resolver
+                    token_info = await get_token_resolver().resolve(token_id)
+                    market_row = token_info.market_id if token_info else None
+
+                    if market_row:
+                        # Notify WebSocket Manager
+                        from core.services.websocket_manager import websocket_manager
+                        await websocket_manager.subscribe_user_to_market(
+                            telegram_user_id, market_row
                         )
-                        market_result = await db.execute(query)
-                        market_row = market_result.scalar_one_or_none()
-
-                        if market_row:
-                            # Notify WebSocket Manager
-                            from core.services.websocket_manager import websocket_manager
-                            await websocket_manager.subscribe_user_to_market(
-                                telegram_user_id, market_row
-                            )
-                            logger.info(f"📡 WebSocket subscription triggered for user {telegram_user_id} on market {market_row}")
-                        else:
-                            logger.warning(f"⚠️ Could not find market_id for token_id {token_id}")
+                        logger.info(f"📡 WebSocket subscription triggered for user {telegram_user_id} on market {market_row}")
+                    else:
+                        logger.warning(f"⚠️ Could not find market_id for token_id {token_id}")
 
                 except Exception as ws_error:
                     logger.warning(f"⚠️ WebSocket notification failed: {ws_error}")
@@ -692,7 +857,11 @@ class CLOBService:
             if not client:
                 return False
 
-            result = client.cancel(order_id)
+            async_client = self._as_async(client)
+            if async_client:
+                result = await async_client.cancel(order_id)
+            else:
+                result = client.cancel(order_id)
             return result is not None
 
         except Exception as e:
@@ -717,7 +886,11 @@ class CLOBService:
             if not client:
                 return False
 
-            result = client.cancel_all()
+            async_client = self._as_async(client)
+            if async_client:
+                result = await async_client.cancel_all()
+            else:
+                result = client.cancel_all()
             return result is not None
 
         except Exception as e:
@@ -746,7 +919,11 @@ class CLOBService:
 
             from py_clob_client.clob_types import OpenOrderParams
             params = OpenOrderParams(market=market) if market else None
-            orders = client.get_orders(params)
+            async_client = self._as_async(client)
+            if async_client:
+                orders = await async_client.get_orders(params)
+            else:
+                orders = client.get_orders(params)
 
             if orders and isinstance(orders, dict):
                 return orders.get('data', [])
@@ -816,6 +993,22 @@ class CLOBService:
             return None
 
     async def create_user_client(self, telegram_user_id: int):
+        """
+        ClobClient for user with their wallet and credentials (cached, see ClientCache)
+
+        Args:
+            telegram_user_id: Telegram user ID
+
+        Returns:
+            ClobClient instance or None if failed
+        """
+        return await self._client_cache.get(
+            telegram_user_id,
+            lambda: self._build_user_client(telegram_user_id),
+            kind="trading"
+        )
+
+    async def _build_user_client(self, telegram_user_id: int):
         """
         Create ClobClient for user with their wallet and credentials
 
@@ -994,13 +1187,18 @@ class CLOBService:
             market_order_args = MarketOrderArgs(
                 token_id=token_id,
                 amount=amount,  # Tokens/shares for SELL, USD for BUY
-                side=side_constant
+                side=side_constant,
+                price=await self._mirror_market_price(token_id, side_constant, amount)  # 0 -> client fetches the book
             )
 
             logger.info(f"📡 Creating market order with API auto-calculation...")
 
             # Create signed order (API calculates best price & tokens)
-            signed_order = client.create_market_order(market_order_args)
+            async_client = self._as_async(client)
+            if async_client:
+                signed_order = await async_client.create_market_order(market_order_args)
+            else:
+                signed_order = client.create_market_order(market_order_args)
 
             if not signed_order:
                 return {'success': False, 'error': 'Failed to create signed order'}
@@ -1011,79 +1209,14 @@ class CLOBService:
             order_type_enum = OrderType.FOK if order_type == 'FOK' else OrderType.FAK
 
             # Post order to CLOB
-            response = client.post_order(signed_order, orderType=order_type_enum)
+            if async_client:
+                response = await async_client.post_order(signed_order, orderType=order_type_enum)
+            else:
+                response = client.post_order(signed_order, orderType=order_type_enum)
 
             logger.info(f"📡 Order response: {response}")
 
-            # Parse response
-            if isinstance(response, dict):
-                if response.get('success') or response.get('orderId') or response.get('orderID'):
-                    order_id = response.get('orderId') or response.get('orderID')
-                    logger.info(f"✅ Order executed: {order_id}")
-
-                    # Map CLOB response to our format
-                    # For BUY orders: makingAmount = USD spent, takingAmount = shares received
-                    # For SELL orders: takingAmount = USD received, makingAmount = shares sold
-                    taking_amount_raw = float(response.get('takingAmount', 0))
-                    making_amount_raw = float(response.get('makingAmount', 0))
-
-                    # Initialize variables
-                    usd_spent = None
-                    usd_received = None
-
-                    if side.upper() == 'BUY':
-                        # BUY: makingAmount = USD spent, takingAmount = shares received
-                        tokens = taking_amount_raw  # shares received
-                        usd_spent = making_amount_raw  # USD spent
-                        # Calculate USD price per share for display: USD spent / shares received
-                        usd_price_per_share = making_amount_raw / taking_amount_raw if taking_amount_raw > 0 else 0
-                        logger.info(f"✅ Calculated USD price per share: ${usd_price_per_share:.6f} (USD {making_amount_raw:.6f} / shares {taking_amount_raw:.6f})")
-
-                        # Get Polymarket price (0-1 format) from market data for storage
-                        price = await self._get_market_price_for_outcome(market_id, outcome)
-                        if price is None:
-                            logger.warning(f"⚠️ Could not get Polymarket price from market data, using calculated approximation")
-                            # Fallback: approximate Polymarket price from execution
-                            # This is not ideal but better than 0
-                            price = usd_price_per_share if usd_price_per_share <= 1 else 0.5
-                    else:  # SELL
-                        # SELL: takingAmount = USD received, makingAmount = shares sold
-                        tokens = making_amount_raw  # shares sold
-                        usd_received = taking_amount_raw  # USD received
-                        # Calculate USD price per share for display: USD received / shares sold
-                        usd_price_per_share = taking_amount_raw / making_amount_raw if making_amount_raw > 0 else 0
-                        logger.info(f"✅ Calculated USD price per share: ${usd_price_per_share:.6f} (USD {taking_amount_raw:.6f} / shares {making_amount_raw:.6f})")
-
-                        # Get Polymarket price (0-1 format) from market data for storage
-                        price = await self._get_market_price_for_outcome(market_id, outcome)
-                        if price is None:
-                            logger.warning(f"⚠️ Could not get Polymarket price from market data, using calculated approximation")
-                            # Fallback: approximate Polymarket price from execution
-                            price = usd_price_per_share if usd_price_per_share <= 1 else 0.5
-
-                    # Validate Polymarket price is in range (0-1)
-                    if not (0 <= price <= 1):
-                        logger.error(f"❌ Invalid Polymarket price {price} (should be 0-1). Using 0.5 as fallback.")
-                        price = 0.5
-
-                    return {
-                        'success': True,
-                        'order_id': order_id,
-                        'tokens': tokens,  # Shares received/sold
-                        'price': price,  # Polymarket price (0-1 format) for storage
-                        'usd_price_per_share': usd_price_per_share,  # USD price per share for display
-                        'total_cost': tokens,  # total_cost stores SHARES, not USD (naming is misleading but kept for compatibility)
-                        'usd_spent': usd_spent if side.upper() == 'BUY' else None,
-                        'usd_received': usd_received if side.upper() == 'SELL' else None,
-                        'tx_hash': response.get('transactionHash') or response.get('transactionsHashes', [None])[0]
-                    }
-                else:
-                    error_msg = response.get('errorMsg') or response.get('error') or 'Unknown error'
-                    logger.error(f"❌ Order failed: {error_msg}")
-                    return {'success': False, 'error': error_msg}
-            else:
-                logger.warning(f"Unexpected response type: {type(response)}")
-                return {'success': False, 'error': f'Unexpected response: {response}'}
+            return await self.parse_market_order_response(response, side, market_id, outcome)
 
         except Exception as e:
             error_str = str(e)
@@ -1108,6 +1241,94 @@ class CLOBService:
 
             return {'success': False, 'error': error_str}
 
+    async def parse_market_order_response(
+        self,
+        response: Any,
+        side: str,
+        market_id: str = None,
+        outcome: str = None
+    ) -> Dict[str, Any]:
+        """
+        Map a CLOB post_order response to our order result format
+
+        Args:
+            response: post_order / post_orders item response
+            side: 'BUY' or 'SELL'
+            market_id: Market ID (Polymarket price lookup for storage)
+            outcome: Outcome traded
+
+        Returns:
+            Dict with success, order_id, tokens, price, usd_spent/usd_received, tx_hash (or error)
+        """
+        if isinstance(response, dict):
+            if response.get('success') or response.get('orderId') or response.get('orderID'):
+                order_id = response.get('orderId') or response.get('orderID')
+                logger.info(f"✅ Order executed: {order_id}")
+
+                # Map CLOB response to our format
+                # For BUY orders: makingAmount = USD spent, takingAmount = shares received
+                # For SELL orders: takingAmount = USD received, makingAmount = shares sold
+                taking_amount_raw = float(response.get('takingAmount', 0))
+                making_amount_raw = float(response.get('makingAmount', 0))
+
+                # Initialize variables
+                usd_spent = None
+                usd_received = None
+
+                if side.upper() == 'BUY':
+                    # BUY: makingAmount = USD spent, takingAmount = shares received
+                    tokens = taking_amount_raw  # shares received
+                    usd_spent = making_amount_raw  # USD spent
+                    # Calculate USD price per share for display: USD spent / shares received
+                    usd_price_per_share = making_amount_raw / taking_amount_raw if taking_amount_raw > 0 else 0
+                    logger.info(f"✅ Calculated USD price per share: ${usd_price_per_share:.6f} (USD {making_amount_raw:.6f} / shares {taking_amount_raw:.6f})")
+
+                    # Get Polymarket price (0-1 format) from market data for storage
+                    price = await self._get_market_price_for_outcome(market_id, outcome)
+                    if price is None:
+                        logger.warning(f"⚠️ Could not get Polymarket price from market data, using calculated approximation")
+                        # Fallback: approximate Polymarket price from execution
+                        # This is not ideal but better than 0
+                        price = usd_price_per_share if usd_price_per_share <= 1 else 0.5
+                else:  # SELL
+                    # SELL: takingAmount = USD received, makingAmount = shares sold
+                    tokens = making_amount_raw  # shares sold
+                    usd_received = taking_amount_raw  # USD received
+                    # Calculate USD price per share for display: USD received / shares sold
+                    usd_price_per_share = taking_amount_raw / making_amount_raw if making_amount_raw > 0 else 0
+                    logger.info(f"✅ Calculated USD price per share: ${usd_price_per_share:.6f} (USD {taking_amount_raw:.6f} / shares {making_amount_raw:.6f})")
+
+                    # Get Polymarket price (0-1 format) from market data for storage
+                    price = await self._get_market_price_for_outcome(market_id, outcome)
+                    if price is None:
+                        logger.warning(f"⚠️ Could not get Polymarket price from market data, using calculated approximation")
+                        # Fallback: approximate Polymarket price from execution
+                        price = usd_price_per_share if usd_price_per_share <= 1 else 0.5
+
+                # Validate Polymarket price is in range (0-1)
+                if not (0 <= price <= 1):
+                    logger.error(f"❌ Invalid Polymarket price {price} (should be 0-1). Using 0.5 as fallback.")
+                    price = 0.5
+
+                return {
+                    'success': True,
+                    'order_id': order_id,
+                    'tokens': tokens,  # Shares received/sold
+                    'price': price,  # Polymarket price (0-1 format) for storage
+                    'usd_price_per_share': usd_price_per_share,  # USD price per share for display
+                    'total_cost': tokens,  # total_cost stores SHARES, not USD (naming is misleading but kept for compatibility)
+                    'usd_spent': usd_spent if side.upper() == 'BUY' else None,
+                    'usd_received': usd_received if side.upper() == 'SELL' else None,
+                    'tx_hash': response.get('transactionHash') or response.get('transactionsHashes', [None])[0]
+                }
+            else:
+                error_msg = response.get('errorMsg') or response.get('error') or 'Unknown error'
+                logger.error(f"❌ Order failed: {error_msg}")
+                return {'success': False, 'error': error_msg}
+        else:
+            logger.warning(f"Unexpected response type: {type(response)}")
+            return {'success': False, 'error': f'Unexpected response: {response}'}
+
     async def get_token_price(self, token_id: str, market_id: str = None, client=None) -> Optional[Dict[str, Any]]:
         """
         Get current price for token using Polymarket Gamma API (not CLOB orderbook)
@@ -0,0 +1,259 @@
+"""
+Price Fetcher - Batched CLOB market data
+Token lists are chunked into the multi-token endpoints (/midpoints, /prices,
+/spreads, /last-trades-prices, /books), chunks run concurrently on the async
+transport, and midpoints / side prices are merged into the Redis price cache.
+A 500-token refresh is a handful of requests instead of 500.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import BookParams
+from py_clob_client.constants import POLYGON
+try:
+    from py_clob_client.async_client import AsyncClobClient
+except ImportError:
+    AsyncClobClient = None
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOB_HOST = "https://clob.polymarket.com"
+
+# Token cache keys (data_type 'prices' -> CACHE_TTL_PRICES)
+MIDPOINT_CACHE_KEY = "price:token:{token_id}"
+SIDE_PRICE_CACHE_KEY = "price:token:{token_id}:{side}"
+
+
+def _to_price(value: Any, *keys: str) -> Optional[float]:
+    """Float price from a raw value or the first matching key of a dict (None if invalid)"""
+    if isinstance(value, dict):
+        value = next((value[key] for key in keys if value.get(key) is not None), None)
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if 0 <= price <= 1 else None
+
+
+class PriceFetcher:
+    """
+    Batched, cached CLOB price lookups
+    - get_midpoints() / get_prices(): cache first, one batch request per chunk of misses
+    - get_spreads() / get_last_trade_prices() / get_order_books(): uncached batch reads
+    Missing or invalid tokens are left out of the result (never priced at 0).
+    """
+
+    def __init__(
+        self,
+        host: str = CLOB_HOST,
+        chunk_size: int = 100,
+        max_concurrency: int = 4
+    ):
+        """
+        Args:
+            host: CLOB API host
+            chunk_size: Tokens per batch request
+            max_concurrency: Batch requests in flight at once
+        """
+        self.host = host
+        self.chunk_size = chunk_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = ClobClient(host=host, chain_id=POLYGON)  # Read-only (L0)
+        self._async_client = AsyncClobClient.from_client(self._client) if AsyncClobClient else None
+        self._cache_manager = None
+
+        # Stats
+        self.requests = 0
+        self.tokens_requested = 0
+        self.cache_hits = 0
+        self.errors = 0
+
+    async def get_midpoints(self, token_ids: Iterable[str], use_cache: bool = True) -> Dict[str, float]:
+        """
+        Midpoint price per token
+
+        Args:
+            token_ids: CLOB token ids
+            use_cache: Serve recent prices from the price cache
+
+        Returns:
+            token_id -> midpoint
+        """
+        return await self._cached_batch(
+            token_ids,
+            lambda token_id: MIDPOINT_CACHE_KEY.format(token_id=token_id),
+            lambda chunk: self._fetch_midpoints(chunk),
+            use_cache
+        )
+
+    async def get_prices(self, token_ids: Iterable[str], side: str = "SELL", use_cache: bool = True) -> Dict[str, float]:
+        """
+        Best price on one side of the book per token
+
+        Args:
+            token_ids: CLOB token ids
+            side: "BUY" or "SELL"
+            use_cache: Serve recent prices from the price cache
+
+        Returns:
+            token_id -> price
+        """
+        side = side.upper()
+        return await self._cached_batch(
+            token_ids,
+            lambda token_id: SIDE_PRICE_CACHE_KEY.format(token_id=token_id, side=side),
+            lambda chunk: self._fetch_side_prices(chunk, side),
+            use_cache
+        )
+
+    async def get_spreads(self, token_ids: Iterable[str]) -> Dict[str, float]:
+        """Bid/ask spread per token"""
+        async def _fetch(chunk: List[str]) -> Dict[str, float]:
+            data = await self._call('get_spreads', [BookParams(token_id=t) for t in chunk])
+            spreads = {}
+            for token_id, value in (data or {}).items():
+                spread = _to_price(value, 'spread')
+                if spread is not None:
+                    spreads[str(token_id)] = spread
+            return spreads
+
+        return await self._batch(self._unique(token_ids), _fetch)
+
+    async def get_last_trade_prices(self, token_ids: Iterable[str]) -> Dict[str, float]:
+        """Last trade price per token"""
+        async def _fetch(chunk: List[str]) -> Dict[str, float]:
+            data = await self._call('get_last_trades_prices', [BookParams(token_id=t) for t in chunk])
+            prices = {}
+            for item in data or []:
+                price = _to_price(item, 'price')
+                if item.get('token_id') and price is not None:
+                    prices[str(item['token_id'])] = price
+            return prices
+
+        return await self._batch(self._unique(token_ids), _fetch)
+
+    async def get_order_books(self, token_ids: Iterable[str]) -> Dict[str, Any]:
+        """OrderBookSummary per token"""
+        async def _fetch(chunk: List[str]) -> Dict[str, Any]:
+            books = await self._call('get_order_books', [BookParams(token_id=t) for t in chunk])
+            return {str(book.asset_id): book for book in books or [] if getattr(book, 'asset_id', None)}
+
+        return await self._batch(self._unique(token_ids), _fetch)
+
+    async def _fetch_midpoints(self, chunk: List[str]) -> Dict[str, float]:
+        data = await self._call('get_midpoints', [BookParams(token_id=t) for t in chunk])
+        prices = {}
+        for token_id, value in (data or {}).items():
+            price = _to_price(value, 'mid', 'midpoint')
+            if price is not None:
+                prices[str(token_id)] = price
+        return prices
+
+    async def _fetch_side_prices(self, chunk: List[str], side: str) -> Dict[str, float]:
+        data = await self._call('get_prices', [BookParams(token_id=t, side=side) for t in chunk])
+        prices = {}
+        for token_id, value in (data or {}).items():
+            price = _to_price(value, side, 'price')
+            if price is not None:
+                prices[str(token_id)] = price
+        return prices
+
+    async def _cached_batch(
+        self,
+        token_ids: Iterable[str],
+        cache_key: Callable[[str], str],
+        fetch: Callable[[List[str]], Any],
+        use_cache: bool
+    ) -> Dict[str, float]:
+        """Price cache first, batch requests for the misses, then write them back"""
+        wanted = self._unique(token_ids)
+        if not wanted:
+            return {}
+
+        prices: Dict[str, float] = {}
+        cache_manager = self._get_cache_manager()
+        if use_cache and cache_manager:
+            keys = {cache_key(token_id): token_id for token_id in wanted}
+            for key, value in (await cache_manager.get_many(list(keys), 'prices')).items():
+                price = _to_price(value)
+                if price is not None:
+                    prices[keys[key]] = price
+            self.cache_hits += len(prices)
+
+        missing = [token_id for token_id in wanted if token_id not in prices]
+        if missing:
+            fetched = await self._batch(missing, fetch)
+            prices.update(fetched)
+            if fetched and cache_manager:
+                await cache_manager.set_many(
+                    {cache_key(token_id): price for token_id, price in fetched.items()},
+                    'prices'
+                )
+
+        return prices
+
+    async def _batch(self, token_ids: List[str], fetch: Callable[[List[str]], Any]) -> Dict[str, Any]:
+        """Run fetch() over chunks concurrently and merge (a failed chunk is skipped)"""
+        if not token_ids:
+            return {}
+
+        chunks = [token_ids[i:i + self.chunk_size] for i in range(0, len(token_ids), self.chunk_size)]
+        self.tokens_requested += len(token_ids)
+
+        async def _run(chunk: List[str]) -> Dict[str, Any]:
+            async with self._semaphore:
+                try:
+                    return await fetch(chunk)
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"⚠️ CLOB batch request failed for {len(chunk)} tokens: {e}")
+                    return {}
+
+        merged: Dict[str, Any] = {}
+        for result in await asyncio.gather(*(_run(chunk) for chunk in chunks)):
+            merged.update(result)
+
+        logger.debug(f"📊 CLOB batch: {len(merged)}/{len(token_ids)} tokens in {len(chunks)} requests")
+        return merged
+
+    async def _call(self, method: str, params: List[BookParams]) -> Any:
+        """Async transport when available, otherwise the sync client off the event loop"""
+        self.requests += 1
+        if self._async_client:
+            return await getattr(self._async_client, method)(params)
+        return await asyncio.to_thread(getattr(self._client, method), params)
+
+    def _get_cache_manager(self):
+        if self._cache_manager is None:
+            try:
+                from core.services.cache_manager import CacheManager
+                self._cache_manager = CacheManager()
+            except Exception as e:
+                logger.debug(f"⚠️ Price cache unavailable: {e}")
+        return self._cache_manager
+
+    @staticmethod
+    def _unique(token_ids: Iterable[str]) -> List[str]:
+        return list(dict.fromkeys(str(t).strip() for t in token_ids if t is not None and str(t).strip()))
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'requests': self.requests,
+            'tokens_requested': self.tokens_requested,
+            'cache_hits': self.cache_hits,
+            'errors': self.errors,
+        }
+
+
+_price_fetcher: Optional[PriceFetcher] = None
+
+
+def get_price_fetcher() -> PriceFetcher:
+    """Get or create PriceFetcher instance"""
+    global _price_fetcher
+    if _price_fetcher is None:
+        _price_fetcher = PriceFetcher()
+    return _price_fetcher
@@ -136,6 +136,9 @@ async def create_allocation(
                 db.add(allocation)
                 await db.commit()
                 await db.refresh(allocation)
+
+                from core.services.copy_trading.follower_graph import publish_follower_graph_changed
+                await publish_follower_graph_changed(leader_address_id=allocation.leader_address_id)
                 return allocation.__dict__
         except Exception as e:
             logger.error(f"Error creating allocation: {e}")
@@ -177,7 +180,11 @@ async def update_allocation(
                 await db.commit()
 
                 # Return updated allocation
-                return await get_allocation_by_id(allocation_id)
+                updated = await get_allocation_by_id(allocation_id)
+                if updated and updated.get('leader_address_id') is not None:
+                    from core.services.copy_trading.follower_graph import publish_follower_graph_changed
+                    await publish_follower_graph_changed(leader_address_id=updated['leader_address_id'])
+                return updated
         except Exception as e:
             logger.error(f"Error updating allocation: {e}")
             return None
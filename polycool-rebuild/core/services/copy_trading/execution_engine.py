@@ -0,0 +1,284 @@
+"""
+Copy Trade Execution Engine - One leader trade, all followers at once
+Phases instead of one sequential build/sign/post per follower:
+1. resolve - market / token / outcome once per leader trade
+2. size    - every follower's amount concurrently (balance, budget, allocation mode)
+3. sign    - orders signed concurrently, EIP-712 signing in the CLOB signing thread pool
+4. post    - orders grouped by credentials: POST /orders per group of several, POST /order otherwise
+5. settle  - positions, fees and WebSocket subscriptions per executed order
+Each run returns per-follower results and a latency breakdown of the phases.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from infrastructure.config.settings import settings
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CopyTradeContext:
+    """Leader trade resolved once for every follower"""
+    trade_data: Dict[str, Any]
+    tx_type: str
+    market: Dict[str, Any]  # Resolved market (outcomes, title...)
+    market_data: Dict[str, Any]  # Tradable market (TradeService)
+    token_id: Optional[str]
+    outcome: str
+    market_id_for_position: str  # Market id format of leader positions
+    market_id_for_api: str  # Resolved short market id
+    leader_amount_usdc: Optional[float] = None
+
+
+@dataclass
+class FollowerOrder:
+    """One follower's copy order through the phases"""
+    allocation: Any
+    user: Any
+    side: str
+    amount_usd: float
+    order_amount: float  # USD for BUY, shares for SELL
+    client: Any = None
+    signed_order: Any = None
+    response: Any = None
+    result: Optional[Dict[str, Any]] = None  # execute_market_order format
+
+    @property
+    def executed(self) -> bool:
+        return bool(self.result and self.result.get('status') == 'executed')
+
+    def fail(self, error: str) -> None:
+        self.result = {'status': 'failed', 'error': error}
+
+
+@dataclass
+class CopyTradeBatchResult:
+    """Per-follower orders (only sized ones) + phase latencies in ms"""
+    context: Optional[CopyTradeContext] = None
+    orders: List[FollowerOrder] = field(default_factory=list)
+    skipped: int = 0  # Followers sized to nothing (no balance, no position, amount 0...)
+    timings: Dict[str, float] = field(default_factory=dict)
+    requests: int = 0  # Post requests issued
+
+    @property
+    def executed(self) -> int:
+        return sum(1 for order in self.orders if order.executed)
+
+    def format_timings(self) -> str:
+        return ", ".join(f"{phase}={ms:.0f}ms" for phase, ms in self.timings.items())
+
+
+class CopyTradeExecutionEngine:
+    """
+    Executes a leader trade for all its followers
+    The caller supplies resolve() and size() (listener-specific rules); the engine
+    runs them and signs, posts and settles the resulting orders.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None):
+        """
+        Args:
+            concurrency: Followers sized / signed / posted / settled in parallel
+        """
+        self.concurrency = concurrency or settings.trading.copy_trade_concurrency
+        self._clob_service = None
+        self._trade_service = None
+
+        # Stats
+        self.runs = 0
+        self.orders = 0
+        self.executed = 0
+        self.fallbacks = 0
+        self.post_requests = 0
+        self.last_timings: Dict[str, float] = {}
+
+    @property
+    def clob_service(self):
+        if self._clob_service is None:
+            from core.services.clob.clob_service import get_clob_service
+            self._clob_service = get_clob_service()
+        return self._clob_service
+
+    @property
+    def trade_service(self):
+        if self._trade_service is None:
+            from core.services.trading.trade_service import trade_service
+            self._trade_service = trade_service
+        return self._trade_service
+
+    async def execute(
+        self,
+        trade_data: Dict[str, Any],
+        allocations: List[Any],
+        resolve: Callable[[Dict[str, Any]], Awaitable[Optional[CopyTradeContext]]],
+        size: Callable[[Any, CopyTradeContext], Awaitable[Optional[FollowerOrder]]]
+    ) -> CopyTradeBatchResult:
+        """
+        Run all phases for one leader trade
+
+        Args:
+            trade_data: Leader trade message
+            allocations: Active allocations following the leader
+            resolve: Leader trade -> context (None aborts)
+            size: (allocation, context) -> follower order (None skips the follower)
+        """
+        self.runs += 1
+        batch = CopyTradeBatchResult()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _bounded(coro):
+            async with semaphore:
+                return await coro
+
+        started = time.perf_counter()
+        batch.context = await resolve(trade_data)
+        batch.timings['resolve'] = (time.perf_counter() - started) * 1000
+        if not batch.context:
+            return batch
+        context = batch.context
+
+        started = time.perf_counter()
+        sized = await asyncio.gather(
+            *(_bounded(size(allocation, context)) for allocation in allocations),
+            return_exceptions=True
+        )
+        for allocation, order in zip(allocations, sized):
+            if isinstance(order, Exception):
+                logger.error(f"❌ [COPY_TRADE] Sizing failed for allocation {allocation.id}: {order}")
+            if isinstance(order, FollowerOrder):
+                batch.orders.append(order)
+            else:
+                batch.skipped += 1
+        batch.timings['size'] = (time.perf_counter() - started) * 1000
+        self.orders += len(batch.orders)
+
+        # Sign / settle failures stay per order: one follower must not skip the others' settle step
+        started = time.perf_counter()
+        await asyncio.gather(*(_bounded(self._sign(order, context)) for order in batch.orders), return_exceptions=True)
+        batch.timings['sign'] = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        batch.requests = await self._post(batch.orders, _bounded)
+        batch.timings['post'] = (time.perf_counter() - started) * 1000
+        self.post_requests += batch.requests
+
+        started = time.perf_counter()
+        settled = await asyncio.gather(
+            *(_bounded(self._settle(order, context)) for order in batch.orders),
+            return_exceptions=True
+        )
+        for order, error in zip(batch.orders, settled):
+            if isinstance(error, Exception):
+                logger.error(f"❌ [COPY_TRADE] Settling order failed for user {order.user.telegram_user_id}: {error}")
+                order.fail(f'Execution failed: {str(error)}')
+        batch.timings['settle'] = (time.perf_counter() - started) * 1000
+
+        self.executed += batch.executed
+        self.last_timings = dict(batch.timings)
+        return batch
+
+    async def _sign(self, order: FollowerOrder, context: CopyTradeContext) -> None:
+        if order.result is not None:
+            return  # Rejected while sizing
+        if self.trade_service._is_test_mode() or not context.token_id:
+            return  # Dry run / token from market data: execute_market_order path
+        try:
+            order.client = await self.clob_service.create_user_client(order.user.telegram_user_id)
+            if not order.client:
+                order.fail('Wallet not ready: Private key not available. Please complete wallet setup via /wallet')
+                return
+            order.signed_order = await self.clob_service.sign_market_order(
+                order.client, context.token_id, order.side, order.order_amount
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ [COPY_TRADE] Signing failed for user {order.user.telegram_user_id}: {e}")
+            order.fail(f'Execution failed: {str(e)}')
+
+    async def _post(self, orders: List[FollowerOrder], bounded: Callable) -> int:
+        """
+        Post signed orders grouped by API key (POST /orders batches need one set of credentials)
+        Clients are cached per user, so a group holds the orders of one user's allocations.
+        """
+        groups: Dict[Any, List[FollowerOrder]] = {}
+        for order in orders:
+            if order.signed_order is not None:
+                creds = getattr(order.client, 'creds', None)
+                groups.setdefault(getattr(creds, 'api_key', None) or id(order.client), []).append(order)
+
+        async def _post_group(group: List[FollowerOrder]) -> None:
+            try:
+                responses = await self.clob_service.post_signed_orders(
+                    group[0].client, [order.signed_order for order in group], order_type='FAK'
+                )
+            except Exception as e:
+                logger.error(f"❌ [COPY_TRADE] Posting {len(group)} orders failed: {e}")
+                responses = [{'success': False, 'error': str(e)}] * len(group)
+            for order, response in zip(group, responses):
+                order.response = response
+
+        await asyncio.gather(*(bounded(_post_group(group)) for group in groups.values()), return_exceptions=True)
+        return len(groups)
+
+    async def _settle(self, order: FollowerOrder, context: CopyTradeContext) -> None:
+        if order.result is not None:
+            return  # Failed before posting
+        try:
+            if order.signed_order is None:
+                # Mock client / dry run: the regular per-order path
+                self.fallbacks += 1
+                order.result = await self.trade_service.execute_market_order(
+                    user_id=order.user.telegram_user_id,
+                    market_id=context.market_id_for_api,
+                    outcome=context.outcome,
+                    amount_usd=order.amount_usd,
+                    order_type='IOC',
+                    is_copy_trade=True,
+                    token_id=context.token_id,
+                    side=order.side,
+                    tokens_to_sell=order.order_amount if order.side == 'SELL' else None
+                )
+                return
+
+            order_result = await self.clob_service.parse_market_order_response(
+                order.response, order.side, context.market_data['id'], context.outcome
+            )
+            if not order_result.get('success'):
+                order.fail(order_result.get('error', 'Order placement failed'))
+                return
+            order.result = await self.trade_service.complete_order(
+                user=order.user,
+                market_data=context.market_data,
+                outcome=context.outcome,
+                amount_usd=order.amount_usd,
+                token_id=context.token_id,
+                side=order.side,
+                order_result=order_result,
+                is_copy_trade=True
+            )
+        except Exception as e:
+            logger.error(f"❌ [COPY_TRADE] Settling order failed for user {order.user.telegram_user_id}: {e}")
+            order.fail(f'Execution failed: {str(e)}')
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'runs': self.runs,
+            'orders': self.orders,
+            'executed': self.executed,
+            'fallbacks': self.fallbacks,
+            'post_requests': self.post_requests,
+            'last_timings_ms': self.last_timings,
+        }
+
+
+_execution_engine: Optional[CopyTradeExecutionEngine] = None
+
+
+def get_copy_trade_execution_engine() -> CopyTradeExecutionEngine:
+    """Get or create CopyTradeExecutionEngine instance"""
+    global _execution_engine
+    if _execution_engine is None:
+        _execution_engine = CopyTradeExecutionEngine()
+    return _execution_engine
@@ -0,0 +1,270 @@
+"""
+Follower Graph - In-process view of watched addresses and copy-trading allocations
+address -> watched entry (type, id) and leader -> active allocations, so the
+copy-trade hot path classifies a trade and fans it out without any I/O.
+Kept fresh by change notifications published on every allocation / watched
+address write; the 5min watched-addresses sync only reconciles.
+"""
+import asyncio
+import json
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from core.database.connection import get_db
+from core.database.models import CopyTradingAllocation, WatchedAddress
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Redis channel prefix used to propagate allocation / watched address edits to the listener process
+FOLLOWER_GRAPH_CHANGED_CHANNEL = "follower_graph:changed"
+
+
+async def publish_follower_graph_changed(
+    leader_address_id: Optional[int] = None,
+    address: Optional[str] = None
+) -> None:
+    """Notify the follower graph that a leader's allocations or a watched address changed (best effort)"""
+    if leader_address_id is None and not address:
+        return
+    try:
+        from core.services.redis_pubsub import get_redis_pubsub_service
+        await get_redis_pubsub_service().publish(
+            f"{FOLLOWER_GRAPH_CHANGED_CHANNEL}:{leader_address_id if leader_address_id is not None else address.lower()}",
+            {'leader_address_id': leader_address_id, 'address': address.lower() if address else None}
+        )
+    except Exception as e:
+        # Periodic reconciliation picks the change up anyway
+        logger.debug(f"⚠️ Could not publish follower graph change: {e}")
+
+
+@dataclass(frozen=True)
+class WatchedEntry:
+    """Active watched address"""
+    id: int
+    address: str
+    address_type: str
+
+
+@dataclass(frozen=True)
+class AllocationSnapshot:
+    """Immutable copy of an active CopyTradingAllocation row"""
+    id: int
+    user_id: int
+    leader_address_id: int
+    allocation_type: str
+    allocation_value: float
+    allocation_percentage: Any
+    total_wallet_balance: Any
+    allocated_budget: Any
+    budget_remaining: Any
+    mode: str
+    sell_mode: str
+    fixed_amount: Any
+    is_active: bool
+    total_copied_trades: int
+    total_invested: float
+
+    @classmethod
+    def from_model(cls, allocation: CopyTradingAllocation) -> "AllocationSnapshot":
+        return cls(**{f.name: getattr(allocation, f.name) for f in fields(cls)})
+
+    def to_model(self) -> CopyTradingAllocation:
+        """
+        Transient CopyTradingAllocation for one copy trade
+        Never added to a session: its values may be stale, so budget and stats
+        writes go through targeted UPDATEs / DB-side increments on the id.
+        """
+        return CopyTradingAllocation(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+
+class FollowerGraph:
+    """
+    Versioned in-process follower graph
+    - classify(): O(1) address -> WatchedEntry
+    - get_followers(): leader watched_address_id -> active allocations
+    Updates build new tuples and swap them in, so readers never see a half-applied change.
+    """
+
+    def __init__(self):
+        self._addresses: Dict[str, WatchedEntry] = {}
+        self._followers: Dict[int, Tuple[AllocationSnapshot, ...]] = {}
+        self._allocation_leaders: Dict[int, int] = {}  # allocation_id -> leader_address_id
+        self._lock = asyncio.Lock()
+        self._listening = False
+
+        self.version = 0
+        self.loaded = False
+        self.loaded_at: Optional[datetime] = None
+
+        # Stats
+        self.lookup_count = 0
+        self.change_count = 0
+        self.reload_count = 0
+
+    async def start(self) -> None:
+        """Load the graph and subscribe to change notifications"""
+        await self.ensure_loaded()
+        if self._listening:
+            return
+        try:
+            from core.services.redis_pubsub import get_redis_pubsub_service
+            await get_redis_pubsub_service().subscribe(f"{FOLLOWER_GRAPH_CHANGED_CHANNEL}:*", self._on_changed)
+            self._listening = True
+        except Exception as e:
+            logger.warning(f"⚠️ Follower graph change subscription failed (reconciled by periodic sync only): {e}")
+
+    async def ensure_loaded(self) -> None:
+        if not self.loaded:
+            await self.reload()
+
+    def classify(self, address: str) -> Optional[WatchedEntry]:
+        """Watched entry of an address (None if not watched)"""
+        self.lookup_count += 1
+        return self._addresses.get(address.lower()) if address else None
+
+    def get_followers(self, leader_address_id: int) -> Tuple[AllocationSnapshot, ...]:
+        """Active allocations following a leader"""
+        return self._followers.get(leader_address_id, ())
+
+    def addresses_by_type(self) -> Dict[str, List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for entry in self._addresses.values():
+            grouped.setdefault(entry.address_type, []).append(entry.address)
+        return grouped
+
+    async def reload(self) -> None:
+        """Full rebuild from the database (startup + periodic reconciliation)"""
+        async with self._lock:
+            try:
+                async with get_db() as db:
+                    result = await db.execute(
+                        select(WatchedAddress.id, WatchedAddress.address, WatchedAddress.address_type)
+                        .where(WatchedAddress.is_active == True)
+                    )
+                    addresses = {
+                        row.address.lower(): WatchedEntry(row.id, row.address.lower(), row.address_type)
+                        for row in result.all()
+                    }
+
+                    result = await db.execute(
+                        select(CopyTradingAllocation).where(CopyTradingAllocation.is_active == True)
+                    )
+                    allocations = [AllocationSnapshot.from_model(a) for a in result.scalars().all()]
+
+                followers: Dict[int, List[AllocationSnapshot]] = {}
+                for allocation in allocations:
+                    followers.setdefault(allocation.leader_address_id, []).append(allocation)
+
+                self._addresses = addresses
+                self._followers = {leader_id: tuple(items) for leader_id, items in followers.items()}
+                self._allocation_leaders = {a.id: a.leader_address_id for a in allocations}
+                self.version += 1
+                self.reload_count += 1
+                self.loaded = True
+                self.loaded_at = datetime.now(timezone.utc)
+
+                logger.debug(
+                    f"✅ Follower graph v{self.version}: {len(addresses)} addresses, "
+                    f"{len(allocations)} allocations"
+                )
+
+            except Exception as e:
+                logger.error(f"❌ Error loading follower graph: {e}")
+
+    async def refresh_address(self, address: str) -> None:
+        """Reload one watched address"""
+        address = address.lower()
+        async with self._lock:
+            async with get_db() as db:
+                result = await db.execute(
+                    select(WatchedAddress.id, WatchedAddress.address_type, WatchedAddress.is_active)
+                    .where(WatchedAddress.address == address)
+                )
+                row = result.first()
+
+            addresses = dict(self._addresses)
+            if row and row.is_active:
+                addresses[address] = WatchedEntry(row.id, address, row.address_type)
+            else:
+                addresses.pop(address, None)
+            self._addresses = addresses
+            self.version += 1
+
+    async def refresh_leader(self, leader_address_id: int) -> None:
+        """Reload the active allocations of one leader"""
+        async with self._lock:
+            async with get_db() as db:
+                result = await db.execute(
+                    select(CopyTradingAllocation).where(
+                        CopyTradingAllocation.leader_address_id == leader_address_id,
+                        CopyTradingAllocation.is_active == True
+                    )
+                )
+                allocations = tuple(AllocationSnapshot.from_model(a) for a in result.scalars().all())
+
+            followers = dict(self._followers)
+            allocation_leaders = dict(self._allocation_leaders)
+
+            # Drop allocations this leader no longer has
+            for stale in followers.get(leader_address_id, ()):
+                allocation_leaders.pop(stale.id, None)
+
+            # Allocations that moved here from another leader
+            for allocation in allocations:
+                previous_leader = allocation_leaders.get(allocation.id)
+                if previous_leader is not None and previous_leader != leader_address_id:
+                    remaining = tuple(a for a in followers.get(previous_leader, ()) if a.id != allocation.id)
+                    if remaining:
+                        followers[previous_leader] = remaining
+                    else:
+                        followers.pop(previous_leader, None)
+                allocation_leaders[allocation.id] = leader_address_id
+
+            if allocations:
+                followers[leader_address_id] = allocations
+            else:
+                followers.pop(leader_address_id, None)
+
+            self._followers = followers
+            self._allocation_leaders = allocation_leaders
+            self.version += 1
+
+    async def _on_changed(self, channel: str, data: str) -> None:
+        """Apply a change notification published by the API"""
+        try:
+            payload = json.loads(data)
+            if payload.get('address'):
+                await self.refresh_address(payload['address'])
+            if payload.get('leader_address_id') is not None:
+                await self.refresh_leader(int(payload['leader_address_id']))
+            self.change_count += 1
+        except Exception as e:
+            logger.error(f"❌ Error applying follower graph change from {channel}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'loaded': self.loaded,
+            'loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+            'addresses': len(self._addresses),
+            'leaders_with_followers': len(self._followers),
+            'allocations': len(self._allocation_leaders),
+            'lookup_count': self.lookup_count,
+            'change_count': self.change_count,
+            'reload_count': self.reload_count,
+        }
+
+
+_follower_graph: Optional[FollowerGraph] = None
+
+
+def get_follower_graph() -> FollowerGraph:
+    """Get or create FollowerGraph instance"""
+    global _follower_graph
+    if _follower_graph is None:
+        _follower_graph = FollowerGraph()
+    return _follower_graph
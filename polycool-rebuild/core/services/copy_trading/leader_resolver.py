@@ -20,6 +20,7 @@ from core.database.connection import get_db
 from core.database.models import User, WatchedAddress
 from core.services.user.user_service import user_service
 from core.services.api_client.api_client import get_api_client
+from core.services.copy_trading.follower_graph import publish_follower_graph_changed
 from data_ingestion.indexer.watched_addresses.manager import get_watched_addresses_manager
 from infrastructure.logging.logger import get_logger
 
@@ -250,6 +251,7 @@ class LeaderResolver:
                     existing.updated_at = datetime.now(timezone.utc)
                     await db.commit()
                     await db.refresh(existing)
+                    await publish_follower_graph_changed(address=address)
                     logger.debug(f"✅ Updated watched address {address[:10]}... ({address_type})")
                     return existing
                 else:
@@ -269,6 +271,7 @@ class LeaderResolver:
                     db.add(watched_addr)
                     await db.commit()
                     await db.refresh(watched_addr)
+                    await publish_follower_graph_changed(address=address)
                     logger.debug(f"✅ Created watched address {address[:10]}... ({address_type})")
                     return watched_addr
 
@@ -14,6 +14,7 @@ from core.database.connection import get_db
 from core.database.models import CopyTradingAllocation, WatchedAddress, User, CopyTradingHistory
 from core.services.copy_trading.leader_resolver import LeaderResolver, LeaderInfo, get_leader_resolver
 from core.services.copy_trading.budget_calculator import get_budget_calculator
+from core.services.copy_trading.follower_graph import publish_follower_graph_changed
 from core.services.user.user_service import user_service
 from core.services.user.user_helper import get_user_data
 from core.services.clob.clob_service import get_clob_service
@@ -107,6 +108,7 @@ class CopyTradingService:
 
                     await db.commit()
                     await db.refresh(existing)
+                    await publish_follower_graph_changed(leader_address_id=existing.leader_address_id)
 
                     logger.info(
                         f"✅ Updated subscription: follower {follower_user_id} → leader {leader_address[:10]}..."
@@ -133,6 +135,7 @@ class CopyTradingService:
                     db.add(allocation)
                     await db.commit()
                     await db.refresh(allocation)
+                    await publish_follower_graph_changed(leader_address_id=allocation.leader_address_id)
 
                     logger.info(
                         f"✅ Created subscription: follower {follower_user_id} → leader {leader_address[:10]}... "
@@ -200,6 +203,7 @@ class CopyTradingService:
                 allocation.is_active = False
                 allocation.updated_at = datetime.now(timezone.utc)
                 await db.commit()
+                await publish_follower_graph_changed(leader_address_id=allocation.leader_address_id)
 
                 logger.info(f"✅ Unsubscribed follower {follower_user_id}")
                 return True
@@ -615,6 +619,7 @@ class CopyTradingService:
 
                     allocation.updated_at = datetime.now(timezone.utc)
                     await db.commit()
+                    await publish_follower_graph_changed(leader_address_id=allocation.leader_address_id)
 
                     logger.info(f"✅ Updated allocation settings for follower {follower_user_id}")
                     return True
@@ -0,0 +1,130 @@
+"""
+Event Deduplicator - Bounded O(1) "seen before?" checks for trade events
+- In-process: insertion-ordered map (fixed TTL, so the oldest entry always
+  expires first) trimmed from the front - O(1) amortized, hard memory cap
+- Shared: optional Redis SET NX EX claim so several listener replicas (or a
+  restarted one) never process the same event twice
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from infrastructure.config.settings import settings
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EventDeduplicator:
+    """
+    Deduplicates events by key within a TTL window
+    Local memory answers repeats without I/O; the Redis claim decides between processes.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: int = 300,
+        max_entries: Optional[int] = None,
+        use_redis: Optional[bool] = None
+    ):
+        """
+        Args:
+            namespace: Key namespace (one per consumer - webhook, listener, ...)
+            ttl: Seconds an event key is remembered
+            max_entries: Local memory cap (oldest keys dropped first)
+            use_redis: Claim keys in Redis (default: DEDUP_REDIS_ENABLED)
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries or settings.redis.dedup_max_entries
+        self.use_redis = settings.redis.dedup_redis_enabled if use_redis is None else use_redis
+        self._seen: "OrderedDict[str, float]" = OrderedDict()  # key -> expiry (ascending)
+
+        # Stats
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.claims = 0
+        self.redis_errors = 0
+        self.evictions = 0
+
+    def is_duplicate(self, key: str) -> bool:
+        """Local check only (no I/O)"""
+        self._expire(time.monotonic())
+        return key in self._seen
+
+    def mark(self, key: str) -> None:
+        """Remember a key locally"""
+        self._seen.pop(key, None)
+        self._seen[key] = time.monotonic() + self.ttl
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+            self.evictions += 1
+
+    async def claim(self, key: str) -> bool:
+        """
+        Claim an event for processing
+
+        Returns:
+            True if the caller is the first to see this key (process it),
+            False if it is a duplicate
+        """
+        if not key:
+            return True
+
+        if self.is_duplicate(key):
+            self.local_hits += 1
+            return False
+
+        if self.use_redis:
+            try:
+                from core.services.cache_manager import _get_shared_redis
+                claimed = await _get_shared_redis().set(
+                    f"dedup:{self.namespace}:{key}", 1, nx=True, ex=self.ttl
+                )
+                if not claimed:
+                    self.redis_hits += 1
+                    self.mark(key)
+                    return False
+            except Exception as e:
+                # Redis down: local memory still dedups within this process
+                self.redis_errors += 1
+                logger.debug(f"⚠️ Dedup claim failed for {self.namespace}, using local memory only: {e}")
+
+        self.mark(key)
+        self.claims += 1
+        return True
+
+    def _expire(self, now: float) -> None:
+        while self._seen:
+            key, expires_at = next(iter(self._seen.items()))
+            if expires_at > now:
+                break
+            self._seen.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'namespace': self.namespace,
+            'ttl': self.ttl,
+            'entries': len(self._seen),
+            'max_entries': self.max_entries,
+            'redis': self.use_redis,
+            'claims': self.claims,
+            'local_hits': self.local_hits,
+            'redis_hits': self.redis_hits,
+            'redis_errors': self.redis_errors,
+            'evictions': self.evictions,
+        }
+
+
+_deduplicators: Dict[str, EventDeduplicator] = {}
+
+
+def get_deduplicator(namespace: str, ttl: int = 300) -> EventDeduplicator:
+    """Get or create the EventDeduplicator of a namespace"""
+    if namespace not in _deduplicators:
+        _deduplicators[namespace] = EventDeduplicator(namespace, ttl=ttl)
+    return _deduplicators[namespace]
@@ -1,7 +1,8 @@
 """
 Market Resolution Detector Service
 Detects resolved markets by checking closed_positions from Polymarket API
-Runs periodically (every 20 minutes) to update markets that are resolved
+Low-frequency fallback (RESOLUTION_DETECTOR_INTERVAL): pollers flag resolutions as they
+are written and publish resolution events, this sweep catches what they miss
 """
 import os
 import asyncio
@@ -9,6 +10,7 @@ from typing import List, Dict, Optional, Set
 from datetime import datetime, timedelta, timezone
 from infrastructure.logging.logger import get_logger
 from core.services.cache_manager import CacheManager
+from infrastructure.config.settings import settings
 
 logger = get_logger(__name__)
 
@@ -303,6 +305,12 @@ class MarketResolutionDetector:
                         updated_count += 1
                         logger.info(f"✅ Updated market {market_id} as resolved in DB")
 
+                    from core.services.market_service.market_listings import get_market_listings
+                    await get_market_listings().refresh_markets([market_id])
+
+                    from core.services.redeem.resolution_events import publish_market_resolved
+                    await publish_market_resolved([market_id], source="resolution_detector")
+
             except Exception as e:
                 logger.error(f"❌ Error updating market for condition_id {condition_id[:20]}...: {e}")
                 continue
@@ -376,5 +384,5 @@ def get_resolution_detector() -> MarketResolutionDetector:
     """Get singleton instance"""
     global _detector
     if _detector is None:
-        _detector = MarketResolutionDetector()
+        _detector = MarketResolutionDetector(check_interval=settings.trading.resolution_detector_interval)
     return _detector
@@ -2,6 +2,14 @@
 Market Service Module
 """
 from .market_service import MarketService, get_market_service, _normalize_category
+from .market_listings import MarketListings, get_market_listings
+from .market_search import MarketSearch, get_market_search
+from .token_resolver import TokenInfo, TokenResolver, get_token_resolver
 
-__all__ = ['MarketService', 'get_market_service', '_normalize_category']
+__all__ = [
+    'MarketService', 'get_market_service', '_normalize_category',
+    'MarketListings', 'get_market_listings',
+    'MarketSearch', 'get_market_search',
+    'TokenInfo', 'TokenResolver', 'get_token_resolver',
+]
 
@@ -0,0 +1,295 @@
+"""
+Market Listings - Precomputed display items with keyset pagination
+market_display_items holds one row per event group (2+ open markets sharing an
+event title) or standalone open market, with aggregated volume / liquidity and
+the sort key of every listing (see migrations/create_market_display_items_table.sql).
+- Maintained incrementally: poller upserts refresh the items of the markets they wrote,
+  a sweep refreshes items whose earliest market has ended, a periodic rebuild reconciles
+  changes made outside the pollers
+- Read with keyset cursors: page N is one index range scan, like page 1
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.connection import get_db
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# filter_type -> (display item column, markets column, direction)
+LISTING_SORTS = {
+    'volume': ('total_volume', 'volume', 'desc'),
+    'liquidity': ('total_liquidity', 'liquidity', 'desc'),
+    'newest': ('newest_at', 'created_at', 'desc'),
+    'endingsoon': ('ends_at', 'end_date', 'asc'),
+}
+DEFAULT_SORT = 'volume'
+
+# Displayable markets (same rules as _is_market_valid); end_date is naive UTC
+_OPEN_MARKET_SQL = """
+    m.is_active = true
+    AND m.is_resolved = false
+    AND m.end_date > (now() AT TIME ZONE 'utc')
+    AND (coalesce(m.liquidity, 0) = 0 OR m.liquidity >= 100)
+"""
+
+# Markets sharing an event title form one item, others are their own item
+_ITEM_KEY_SQL = "coalesce('event:' || nullif(m.event_title, ''), 'market:' || m.id)"
+
+# Recompute the items in scope from markets: upsert changed ones, delete emptied ones
+_REFRESH_ITEMS_SQL = f"""
+WITH fresh AS (
+    SELECT
+        {_ITEM_KEY_SQL} AS item_key,
+        CASE WHEN count(*) > 1 THEN 'event_group' ELSE 'individual' END AS item_type,
+        (array_agg(m.category ORDER BY coalesce(m.volume, 0) DESC, m.id))[1] AS category,
+        (array_agg(nullif(m.event_title, '')))[1] AS event_title,
+        (array_agg(m.event_id ORDER BY coalesce(m.volume, 0) DESC, m.id))[1] AS event_id,
+        (array_agg(m.event_slug ORDER BY coalesce(m.volume, 0) DESC, m.id))[1] AS event_slug,
+        jsonb_agg(m.id ORDER BY coalesce(m.volume, 0) DESC, m.id) AS market_ids,
+        count(*) AS market_count,
+        sum(coalesce(m.volume, 0)) AS total_volume,
+        sum(coalesce(m.liquidity, 0)) AS total_liquidity,
+        coalesce(max(m.created_at), max(m.updated_at), now() AT TIME ZONE 'utc') AS newest_at,
+        min(m.end_date) AS ends_at
+    FROM markets m
+    WHERE {_OPEN_MARKET_SQL}
+      AND {{market_scope}}
+    GROUP BY 1
+),
+removed AS (
+    DELETE FROM market_display_items d
+    WHERE {{item_scope}}
+      AND NOT EXISTS (SELECT 1 FROM fresh f WHERE f.item_key = d.item_key)
+    RETURNING d.item_key
+),
+written AS (
+    INSERT INTO market_display_items (
+        item_key, item_type, category, event_title, event_id, event_slug,
+        market_ids, market_count, total_volume, total_liquidity, newest_at, ends_at, updated_at
+    )
+    SELECT
+        item_key, item_type, category, event_title, event_id, event_slug,
+        market_ids, market_count, total_volume, total_liquidity, newest_at, ends_at, now()
+    FROM fresh
+    ON CONFLICT (item_key) DO UPDATE SET
+        item_type = EXCLUDED.item_type,
+        category = EXCLUDED.category,
+        event_title = EXCLUDED.event_title,
+        event_id = EXCLUDED.event_id,
+        event_slug = EXCLUDED.event_slug,
+        market_ids = EXCLUDED.market_ids,
+        market_count = EXCLUDED.market_count,
+        total_volume = EXCLUDED.total_volume,
+        total_liquidity = EXCLUDED.total_liquidity,
+        newest_at = EXCLUDED.newest_at,
+        ends_at = EXCLUDED.ends_at,
+        updated_at = now()
+    WHERE (
+        market_display_items.item_type, market_display_items.category, market_display_items.event_id,
+        market_display_items.event_slug, market_display_items.market_ids, market_display_items.total_volume,
+        market_display_items.total_liquidity, market_display_items.newest_at, market_display_items.ends_at
+    ) IS DISTINCT FROM (
+        EXCLUDED.item_type, EXCLUDED.category, EXCLUDED.event_id,
+        EXCLUDED.event_slug, EXCLUDED.market_ids, EXCLUDED.total_volume,
+        EXCLUDED.total_liquidity, EXCLUDED.newest_at, EXCLUDED.ends_at
+    )
+    RETURNING item_key
+)
+SELECT (SELECT count(*) FROM written) AS written, (SELECT count(*) FROM removed) AS removed
+"""
+
+_REBUILD_SQL = text(_REFRESH_ITEMS_SQL.format(market_scope="true", item_scope="true"))
+
+# Items of the given keys only (event titles / market ids derived from the keys)
+_REFRESH_KEYS_SQL = text(_REFRESH_ITEMS_SQL.format(
+    market_scope=(
+        "(m.event_title = ANY(CAST(:event_titles AS text[])) OR m.id = ANY(CAST(:market_ids AS text[])))"
+        f" AND {_ITEM_KEY_SQL} = ANY(CAST(:item_keys AS text[]))"
+    ),
+    item_scope="d.item_key = ANY(CAST(:item_keys AS text[]))",
+))
+
+# Current items of written markets + items that held them (event title changed)
+_ITEM_KEYS_FOR_MARKETS_SQL = text(f"""
+    SELECT {_ITEM_KEY_SQL} AS item_key FROM markets m WHERE m.id = ANY(CAST(:ids AS text[]))
+    UNION
+    SELECT d.item_key FROM market_display_items d WHERE d.market_ids ?| CAST(:ids AS text[])
+""")
+
+_EXPIRED_ITEM_KEYS_SQL = text("""
+    SELECT item_key FROM market_display_items WHERE ends_at <= (now() AT TIME ZONE 'utc')
+""")
+
+
+def encode_cursor(sort_value: Any, key: str) -> str:
+    """Opaque keyset cursor for the row after (sort_value, key)"""
+    if isinstance(sort_value, datetime):
+        payload = {'v': sort_value.isoformat(), 'k': key, 't': 'dt'}
+    else:
+        payload = {'v': float(sort_value) if sort_value is not None else 0.0, 'k': key}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[Any, str]]:
+    """(sort_value, key) of a cursor, None if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = datetime.fromisoformat(payload['v']) if payload.get('t') == 'dt' else float(payload['v'])
+        return value, str(payload['k'])
+    except Exception:
+        return None
+
+
+def resolve_sort(filter_type: Optional[str]) -> str:
+    """Listing sort for a filter_type (unknown / None -> volume)"""
+    return filter_type if filter_type in LISTING_SORTS else DEFAULT_SORT
+
+
+class MarketListings:
+    """
+    Display items projection: maintenance (refresh / sweep / rebuild) and keyset reads
+    """
+
+    def __init__(self):
+        # Stats
+        self.refreshes = 0
+        self.items_written = 0
+        self.items_removed = 0
+        self.rebuilds = 0
+        self.last_rebuild_at: Optional[datetime] = None
+
+    async def refresh_markets(self, market_ids: Iterable[str]) -> Tuple[int, int]:
+        """
+        Refresh the items of markets that were just written
+
+        Returns:
+            (items written, items removed)
+        """
+        ids = list(dict.fromkeys(str(m) for m in market_ids if m))
+        if not ids:
+            return 0, 0
+
+        async with get_db() as db:
+            result = await db.execute(_ITEM_KEYS_FOR_MARKETS_SQL, {'ids': ids})
+            return await self._refresh_keys(db, [row.item_key for row in result.all()])
+
+    async def refresh_expired(self) -> Tuple[int, int]:
+        """Refresh items whose earliest market has ended (no upsert tells us)"""
+        async with get_db() as db:
+            result = await db.execute(_EXPIRED_ITEM_KEYS_SQL)
+            return await self._refresh_keys(db, [row.item_key for row in result.all()])
+
+    async def rebuild(self) -> Tuple[int, int]:
+        """Reconcile the whole projection with markets (only differing items are written)"""
+        async with get_db() as db:
+            row = (await db.execute(_REBUILD_SQL)).one()
+        self.rebuilds += 1
+        self.last_rebuild_at = datetime.utcnow()
+        self._count(row.written, row.removed)
+        logger.info(f"✅ Market listings rebuilt: {row.written} items written, {row.removed} removed")
+        return row.written, row.removed
+
+    async def _refresh_keys(self, db: AsyncSession, item_keys: List[str]) -> Tuple[int, int]:
+        if not item_keys:
+            return 0, 0
+        event_titles = [k[len('event:'):] for k in item_keys if k.startswith('event:')]
+        market_ids = [k[len('market:'):] for k in item_keys if k.startswith('market:')]
+        row = (await db.execute(_REFRESH_KEYS_SQL, {
+            'item_keys': item_keys,
+            'event_titles': event_titles,
+            'market_ids': market_ids,
+        })).one()
+        self.refreshes += 1
+        self._count(row.written, row.removed)
+        logger.debug(f"📋 Market listings: {len(item_keys)} items refreshed ({row.written} written, {row.removed} removed)")
+        return row.written, row.removed
+
+    def _count(self, written: int, removed: int) -> None:
+        self.items_written += written
+        self.items_removed += removed
+
+    async def list_items(
+        self,
+        db: AsyncSession,
+        sort: str,
+        limit: int,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        offset: int = 0
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        One page of display items
+
+        Args:
+            sort: Key of LISTING_SORTS
+            limit: Items per page
+            category: Only items of this category
+            cursor: Keyset cursor from the previous page (takes precedence over offset)
+            offset: Rows to skip when no cursor is known
+
+        Returns:
+            (rows, next_cursor) - next_cursor is None on the last page
+        """
+        column, _, direction = LISTING_SORTS[sort]
+        conditions = []
+        params: Dict[str, Any] = {'limit': limit}
+        if category:
+            conditions.append("category = :category")
+            params['category'] = category
+
+        after = decode_cursor(cursor) if cursor else None
+        if after:
+            conditions.append(f"({column}, item_key) {'<' if direction == 'desc' else '>'} (:after_value, :after_key)")
+            params['after_value'], params['after_key'] = after
+        elif offset:
+            params['offset'] = offset
+
+        sql = f"""
+            SELECT item_key, item_type, event_title, event_id, event_slug, market_ids,
+                   market_count, total_volume, total_liquidity, {column} AS sort_value
+            FROM market_display_items
+            {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+            ORDER BY {column} {direction}, item_key {direction}
+            LIMIT :limit{' OFFSET :offset' if 'offset' in params else ''}
+        """
+        rows = (await db.execute(text(sql), params)).all()
+        next_cursor = encode_cursor(rows[-1].sort_value, rows[-1].item_key) if len(rows) == limit else None
+        return rows, next_cursor
+
+    async def count_items(self, db: AsyncSession, category: Optional[str] = None) -> int:
+        """Number of display items (of a category)"""
+        if category:
+            result = await db.execute(
+                text("SELECT count(*) FROM market_display_items WHERE category = :category"),
+                {'category': category}
+            )
+        else:
+            result = await db.execute(text("SELECT count(*) FROM market_display_items"))
+        return result.scalar() or 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'refreshes': self.refreshes,
+            'items_written': self.items_written,
+            'items_removed': self.items_removed,
+            'rebuilds': self.rebuilds,
+            'last_rebuild_at': self.last_rebuild_at.isoformat() if self.last_rebuild_at else None,
+        }
+
+
+_market_listings: Optional[MarketListings] = None
+
+
+def get_market_listings() -> MarketListings:
+    """Get or create MarketListings instance"""
+    global _market_listings
+    if _market_listings is None:
+        _market_listings = MarketListings()
+    return _market_listings
@@ -0,0 +1,149 @@
+"""
+Market Search - Full-text + trigram search over open markets
+Matching, ranking, grouping and paging all happen in Postgres
+(see migrations/add_market_search_index.sql):
+- Prefix matches: every term must prefix a word of the title / event title ("bitc 1" -> "Bitcoin ... 1PM")
+- Typo matches: word similarity of the whole query with the title ("bitcon" -> "Bitcoin")
+- Ranking: text relevance, boosted by log(volume)
+"""
+import re
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Word characters only: safe to embed in to_tsquery()
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+MAX_TERMS = 8
+
+# Relevance multiplier per unit of ln(1 + volume): $1M volume ~ x2.4
+VOLUME_WEIGHT = 0.1
+
+# Open, displayable markets matching the query, with their score
+# (same rules as _is_market_valid, so SQL paging matches what is displayed)
+_MATCHES_CTE = """
+WITH q AS (SELECT to_tsquery('simple', :tsquery) AS tsq),
+matches AS (
+    SELECT
+        m.id,
+        coalesce(nullif(m.event_title, ''), 'market:' || m.id) AS group_key,
+        coalesce(m.volume, 0) AS volume,
+        (ts_rank_cd(m.search_vector, q.tsq) + word_similarity(:query, lower(m.title)))
+            * (1 + :volume_weight * ln(1 + greatest(coalesce(m.volume, 0), 0))) AS score
+    FROM markets m, q
+    WHERE m.is_active = true
+      AND m.is_resolved = false
+      AND m.end_date > :now
+      AND (coalesce(m.liquidity, 0) = 0 OR m.liquidity >= 100)
+      AND (m.search_vector @@ q.tsq OR :query <% lower(m.title))
+)
+"""
+
+_SEARCH_MARKETS_SQL = text(_MATCHES_CTE + """
+SELECT id, count(*) OVER () AS total
+FROM matches
+ORDER BY score DESC, volume DESC, id
+LIMIT :limit OFFSET :offset
+""")
+
+_SEARCH_GROUPS_SQL = text(_MATCHES_CTE + """,
+groups AS (
+    SELECT
+        group_key,
+        array_agg(id ORDER BY volume DESC, id) AS market_ids,
+        max(score) AS score,
+        sum(volume) AS total_volume
+    FROM matches
+    GROUP BY group_key
+)
+SELECT market_ids, count(*) OVER () AS total
+FROM groups
+ORDER BY score DESC, total_volume DESC, group_key
+LIMIT :limit OFFSET :offset
+""")
+
+
+def parse_search_terms(query_text: str) -> List[str]:
+    """Lowercased unique word terms of a query (punctuation dropped)"""
+    terms = TERM_PATTERN.findall((query_text or "").lower())
+    return list(dict.fromkeys(terms))[:MAX_TERMS]
+
+
+def build_tsquery(terms: List[str]) -> str:
+    """AND of prefix terms: ['bitcoin', '1'] -> 'bitcoin:* & 1:*'"""
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+class MarketSearch:
+    """
+    Indexed market search
+    Returns market ids only: MarketService loads and formats the page.
+    """
+
+    def _params(self, query_text: str, limit: int, offset: int) -> dict:
+        terms = parse_search_terms(query_text)
+        return {
+            'tsquery': build_tsquery(terms),
+            'query': " ".join(terms),
+            'volume_weight': VOLUME_WEIGHT,
+            'now': datetime.now(timezone.utc).replace(tzinfo=None),  # end_date is naive UTC
+            'limit': limit,
+            'offset': offset,
+        }
+
+    async def search_markets(
+        self,
+        db: AsyncSession,
+        query_text: str,
+        limit: int,
+        offset: int = 0
+    ) -> Tuple[List[str], int]:
+        """
+        One page of matching markets, best first
+
+        Returns:
+            (market_ids, total_matches)
+        """
+        if not parse_search_terms(query_text):
+            return [], 0
+
+        result = await db.execute(_SEARCH_MARKETS_SQL, self._params(query_text, limit, offset))
+        rows = result.all()
+        return [row.id for row in rows], (rows[0].total if rows else 0)
+
+    async def search_groups(
+        self,
+        db: AsyncSession,
+        query_text: str,
+        limit: int,
+        offset: int = 0
+    ) -> Tuple[List[List[str]], int]:
+        """
+        One page of matching event groups, best first
+        Markets group by event title; a market without one is its own group.
+
+        Returns:
+            (market_ids per group - by volume, total_groups)
+        """
+        if not parse_search_terms(query_text):
+            return [], 0
+
+        result = await db.execute(_SEARCH_GROUPS_SQL, self._params(query_text, limit, offset))
+        rows = result.all()
+        return [list(row.market_ids) for row in rows], (rows[0].total if rows else 0)
+
+
+_market_search: Optional[MarketSearch] = None
+
+
+def get_market_search() -> MarketSearch:
+    """Get or create MarketSearch instance"""
+    global _market_search
+    if _market_search is None:
+        _market_search = MarketSearch()
+    return _market_search
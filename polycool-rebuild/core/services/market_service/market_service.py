@@ -5,11 +5,13 @@ Unified service for fetching markets from Supabase with caching
 import os
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import select, func, or_, and_, desc, asc
+from sqlalchemy import select, func, or_, and_, desc, asc, literal, tuple_
+from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database.models import Market
 from core.database.connection import get_db
+from core.database.schema_features import SchemaFeature, is_missing_schema_error
 from core.services.cache_manager import CacheManager
 from infrastructure.logging.logger import get_logger
 
@@ -140,6 +142,8 @@ class MarketService:
     def __init__(self, cache_manager: Optional[CacheManager] = None):
         """Initialize MarketService"""
         self.cache_manager = cache_manager
+        self._search_index = SchemaFeature("Market search index")
+        self._listings = SchemaFeature("Market listings projection")
         logger.info("MarketService initialized")
 
     async def get_market_by_id(self, market_id: str) -> Optional[Dict]:
@@ -258,26 +262,21 @@ class MarketService:
             logger.error(f"MarketService cannot access DB when SKIP_DB=true! Service API should have SKIP_DB=false")
             return None
 
+        from .token_resolver import get_token_resolver
+        token_info = await get_token_resolver().resolve(token_id)
+        if not token_info:
+            logger.debug(f"Market not found by token_id: {token_id[:30]}...")
+            return None
+
         async with get_db() as db:
             result = await db.execute(
-                select(Market).where(
-                    Market.clob_token_ids.contains([token_id])
-                )
+                select(Market).where(Market.id == token_info.market_id)
             )
             market = result.scalar_one_or_none()
 
             if not market:
-                logger.debug(f"Market not found by token_id, trying with string token_id...")
-                result = await db.execute(
-                    select(Market).where(
-                        Market.clob_token_ids.contains([str(token_id)])
-                    )
-                )
-                market = result.scalar_one_or_none()
-
-                if not market:
-                    logger.debug(f"Market not found by token_id: {token_id[:30]}...")
-                    return None
+                logger.debug(f"Market not found by token_id: {token_id[:30]}...")
+                return None
 
             market_dict = _market_to_dict(market)
 
@@ -291,6 +290,242 @@ class MarketService:
             return market_dict
 
     async def get_trending_markets(
+        self,
+        page: int = 0,
+        page_size: int = 10,
+        group_by_events: bool = True,
+        filter_type: str = 'volume',
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        Get trending markets with pagination
+
+        Args:
+            page: Page number (0-indexed)
+            page_size: Markets per page
+            group_by_events: If True, groups markets by events
+            filter_type: Sort order ('volume', 'liquidity', 'newest', 'endingsoon')
+            cursor: Keyset cursor of the page (from get_market_listing), instead of page
+
+        Returns:
+            (markets_list, total_count) tuple
+        """
+        items, total_count, _ = await self.get_market_listing(
+            page=page, page_size=page_size, group_by_events=group_by_events,
+            filter_type=filter_type, cursor=cursor
+        )
+        return items, total_count
+
+    async def get_category_markets(
+        self,
+        category: str,
+        page: int = 0,
+        page_size: int = 10,
+        group_by_events: bool = True,
+        filter_type: str = 'volume',
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        Get markets by category with pagination
+
+        Args:
+            category: Category name (Geopolitics, Sports, Finance, Crypto, Other)
+            page: Page number (0-indexed)
+            page_size: Markets per page
+            group_by_events: If True, groups markets by events
+            filter_type: Sort order ('volume', 'liquidity', 'newest', 'endingsoon')
+            cursor: Keyset cursor of the page (from get_market_listing), instead of page
+
+        Returns:
+            (markets_list, total_count) tuple
+        """
+        items, total_count, _ = await self.get_market_listing(
+            category=category, page=page, page_size=page_size,
+            group_by_events=group_by_events, filter_type=filter_type, cursor=cursor
+        )
+        return items, total_count
+
+    async def get_market_listing(
+        self,
+        category: Optional[str] = None,
+        page: int = 0,
+        page_size: int = 10,
+        group_by_events: bool = True,
+        filter_type: Optional[str] = 'volume',
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], int, Optional[str]]:
+        """
+        One page of a market listing, keyset-paginated
+        Grouped listings read the precomputed display items, ungrouped ones open markets.
+        Page-based callers get keyset paging too: the cursor reached at the end of
+        page N is cached as the start of page N+1 (OFFSET only when it has expired).
+
+        Args:
+            category: Category name, None for all markets (trending)
+            page: Page number (0-indexed), used when no cursor is given
+            page_size: Items per page
+            group_by_events: Event groups + standalone markets, or individual markets
+            filter_type: Sort order ('volume', 'liquidity', 'newest', 'endingsoon')
+            cursor: Keyset cursor returned with the previous page
+
+        Returns:
+            (items, total_count, next_cursor) - next_cursor is None on the last page
+        """
+        from .market_listings import get_market_listings, resolve_sort
+
+        if not self._listings.available:
+            return await self._get_listing_legacy(category, page, page_size, group_by_events, filter_type)
+
+        sort = resolve_sort(filter_type)
+        listing_key = f"{(category or 'all').lower()}:{sort}:{'grouped' if group_by_events else 'markets'}:{page_size}"
+        page_cursor_key = f"listing_cursor:{listing_key}:{page + 1}"
+
+        start_cursor = cursor
+        if start_cursor is None and page > 0 and self.cache_manager:
+            start_cursor = await self.cache_manager.get(f"listing_cursor:{listing_key}:{page}", 'metadata')
+
+        cache_key = f"listing:{listing_key}:{start_cursor or page}"
+        if self.cache_manager:
+            cached = await self.cache_manager.get(cache_key, 'markets_list')
+            if cached:
+                logger.debug(f"Cache hit: listing {listing_key} page {page}")
+                if cursor is None and cached.get('next_cursor'):
+                    await self.cache_manager.set(page_cursor_key, cached['next_cursor'], 'metadata', ttl=300)
+                return cached['items'], cached['total_count'], cached.get('next_cursor')
+
+        offset = 0 if start_cursor else page * page_size
+        listings = get_market_listings()
+        try:
+            async with get_db() as db:
+                if group_by_events:
+                    items, next_cursor = await self._list_display_items(
+                        db, listings, sort, page_size, category, start_cursor, offset
+                    )
+                    total_count = await listings.count_items(db, category)
+                else:
+                    items, next_cursor = await self._list_open_markets(
+                        db, sort, page_size, category, start_cursor, offset
+                    )
+                    total_count = -1  # Unknown for individual markets
+        except ProgrammingError as e:
+            if not is_missing_schema_error(e):
+                raise
+            # Listings migration not applied yet: in-memory grouping until the next probe
+            self._listings.mark_missing(e)
+            return await self._get_listing_legacy(category, page, page_size, group_by_events, filter_type)
+
+        if self.cache_manager:
+            await self.cache_manager.set(
+                cache_key,
+                {'items': items, 'total_count': total_count, 'next_cursor': next_cursor},
+                'markets_list'
+            )
+            if cursor is None and next_cursor:
+                await self.cache_manager.set(page_cursor_key, next_cursor, 'metadata', ttl=300)
+
+        return items, total_count, next_cursor
+
+    async def _list_display_items(
+        self,
+        db: AsyncSession,
+        listings,
+        sort: str,
+        limit: int,
+        category: Optional[str],
+        cursor: Optional[str],
+        offset: int
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Page of display items, with their markets loaded (fresh prices)"""
+        rows, next_cursor = await listings.list_items(
+            db, sort, limit, category=category, cursor=cursor, offset=offset
+        )
+
+        market_ids = [market_id for row in rows for market_id in row.market_ids]
+        markets_by_id = {}
+        if market_ids:
+            result = await db.execute(select(Market).where(Market.id.in_(market_ids)))
+            markets_by_id = {m.id: m for m in result.scalars().all()}
+
+        items = []
+        for row in rows:
+            # Re-check validity: the projection may lag a market that ended since
+            markets = [
+                _market_to_dict(markets_by_id[market_id])
+                for market_id in row.market_ids
+                if market_id in markets_by_id and _is_market_valid(markets_by_id[market_id])
+            ]
+            if markets:
+                items.append(self._to_display_item(markets))
+        return items, next_cursor
+
+    async def _list_open_markets(
+        self,
+        db: AsyncSession,
+        sort: str,
+        limit: int,
+        category: Optional[str],
+        cursor: Optional[str],
+        offset: int
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Page of individual open markets (keyset on the sort column + id)"""
+        from .market_listings import LISTING_SORTS, decode_cursor, encode_cursor
+
+        _, column_name, direction = LISTING_SORTS[sort]
+        column = getattr(Market, column_name)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        query = select(Market).where(
+            and_(
+                Market.is_active == True,
+                Market.is_resolved == False,
+                Market.end_date > now,
+                or_(func.coalesce(Market.liquidity, 0) == 0, Market.liquidity >= 100),
+                column.isnot(None)
+            )
+        )
+        if category:
+            query = query.where(Market.category == category)
+
+        after = decode_cursor(cursor) if cursor else None
+        if after:
+            keyset = tuple_(column, Market.id)
+            after_keyset = tuple_(literal(after[0]), literal(after[1]))
+            query = query.where(keyset < after_keyset if direction == 'desc' else keyset > after_keyset)
+        elif offset:
+            query = query.offset(offset)
+
+        if direction == 'desc':
+            query = query.order_by(desc(column), desc(Market.id))
+        else:
+            query = query.order_by(asc(column), asc(Market.id))
+
+        result = await db.execute(query.limit(limit))
+        markets = result.scalars().all()
+
+        next_cursor = None
+        if len(markets) == limit:
+            next_cursor = encode_cursor(getattr(markets[-1], column_name), markets[-1].id)
+        return [_market_to_dict(m) for m in markets], next_cursor
+
+    async def _get_listing_legacy(
+        self,
+        category: Optional[str],
+        page: int,
+        page_size: int,
+        group_by_events: bool,
+        filter_type: Optional[str]
+    ) -> Tuple[List[Dict], int, Optional[str]]:
+        if category:
+            items, total_count = await self._get_category_markets_legacy(
+                category, page, page_size, group_by_events, filter_type
+            )
+        else:
+            items, total_count = await self._get_trending_markets_legacy(
+                page, page_size, group_by_events, filter_type
+            )
+        return items, total_count, None
+
+    async def _get_trending_markets_legacy(
         self,
         page: int = 0,
         page_size: int = 10,
@@ -298,7 +533,7 @@ class MarketService:
         filter_type: str = 'volume'
     ) -> Tuple[List[Dict], int]:
         """
-        Get trending markets (high volume) with pagination
+        Get trending markets by grouping up to 2000 markets per cache miss (fallback without the listings projection)
 
         Args:
             page: Page number (0-indexed)
@@ -406,7 +641,7 @@ class MarketService:
             total_count = total_groups if group_by_events else -1
             return display_items, total_count
 
-    async def get_category_markets(
+    async def _get_category_markets_legacy(
         self,
         category: str,
         page: int = 0,
@@ -415,7 +650,7 @@ class MarketService:
         filter_type: str = 'volume'
     ) -> Tuple[List[Dict], int]:
         """
-        Get markets by category with pagination
+        Get markets by category with in-memory pagination (fallback without the listings projection)
 
         Args:
             category: Category name (Geopolitics, Sports, Finance, Crypto, Other)
@@ -500,30 +735,88 @@ class MarketService:
         group_by_events: bool = True
     ) -> Tuple[List[Dict], int]:
         """
-        Search markets by title (all terms must be in title)
+        Search markets by title / event title (all terms must match, prefix or close typo)
+        Full-text + trigram indexes, ranked by relevance and volume, paged in the database.
 
         Args:
-            query_text: Search query (supports multiple words with AND logic - all terms must be in title)
+            query_text: Search query (multiple words with AND logic - "bitc 1" matches "Bitcoin ... 1PM")
             page: Page number (0-indexed)
-            page_size: Markets per page
+            page_size: Markets (or event groups) per page
             group_by_events: If True, groups markets by events
 
         Returns:
             (markets_list, total_count) tuple
         """
         cache_key = f"search:{query_text.lower()}:{page}:{group_by_events}"
+        total_count_key = f"search_total:{query_text.lower()}:{group_by_events}"
 
         # Try cache first
         if self.cache_manager:
             cached = await self.cache_manager.get(cache_key, 'markets_list')
             if cached:
                 logger.debug(f"Cache hit: search '{query_text}' page {page}")
-                # Try to get total_count from separate cache key
-                total_count_key = f"search_total:{query_text.lower()}:{group_by_events}"
                 total_count_cached = await self.cache_manager.get(total_count_key, 'metadata')
                 total_count = total_count_cached if total_count_cached is not None else -1
                 return cached, total_count
 
+        if not self._search_index.available:
+            return await self._search_markets_ilike(query_text, page, page_size, group_by_events)
+
+        from .market_search import get_market_search
+        search = get_market_search()
+        try:
+            async with get_db() as db:
+                if group_by_events:
+                    id_groups, total_count = await search.search_groups(
+                        db, query_text, limit=page_size, offset=page * page_size
+                    )
+                else:
+                    market_ids, total_count = await search.search_markets(
+                        db, query_text, limit=page_size, offset=page * page_size
+                    )
+                    id_groups = [[market_id] for market_id in market_ids]
+
+                all_ids = [market_id for group in id_groups for market_id in group]
+                markets_by_id = {}
+                if all_ids:
+                    result = await db.execute(select(Market).where(Market.id.in_(all_ids)))
+                    markets_by_id = {m.id: _market_to_dict(m) for m in result.scalars().all()}
+        except ProgrammingError as e:
+            if not is_missing_schema_error(e):
+                raise
+            # Search index migration not applied yet: ILIKE scan until the next probe
+            self._search_index.mark_missing(e)
+            return await self._search_markets_ilike(query_text, page, page_size, group_by_events)
+
+        if group_by_events:
+            display_items = []
+            for group in id_groups:
+                group_markets = [markets_by_id[m] for m in group if m in markets_by_id]
+                if group_markets:
+                    display_items.append(self._to_display_item(group_markets))
+        else:
+            display_items = [markets_by_id[group[0]] for group in id_groups if group[0] in markets_by_id]
+
+        # Cache result (longer TTL for search to reduce DB load)
+        if self.cache_manager:
+            await self.cache_manager.set(cache_key, display_items, 'markets_list', ttl=300)
+            await self.cache_manager.set(total_count_key, total_count, 'metadata', ttl=300)
+
+        return display_items, total_count
+
+    async def _search_markets_ilike(
+        self,
+        query_text: str,
+        page: int = 0,
+        page_size: int = 10,
+        group_by_events: bool = True
+    ) -> Tuple[List[Dict], int]:
+        """
+        Search markets by title with one ILIKE per term (fallback without the search index)
+        Fetches up to 2000 matches, then groups and paginates them in memory.
+        """
+        cache_key = f"search:{query_text.lower()}:{page}:{group_by_events}"
+
         # Fetch from database
         async with get_db() as db:
             # Note: end_date is stored as timestamp without time zone in UTC
@@ -684,27 +977,8 @@ class MarketService:
         # Convert event_groups to display items
         display_items = []
 
-        for event_title, group in event_groups.items():
-            if len(group['markets']) > 1:
-                # Multi-market event - show as group
-                display_items.append({
-                    'type': 'event_group',
-                    'event_title': event_title,
-                    'event_id': group['event_id'],
-                    'event_slug': group['event_slug'],
-                    'markets': group['markets'],
-                    'market_count': len(group['markets']),
-                    # Aggregate stats
-                    'total_volume': sum(m.get('volume', 0) for m in group['markets']),
-                    'total_liquidity': sum(m.get('liquidity', 0) for m in group['markets']),
-                })
-            else:
-                # Single market event - show as individual market
-                market = group['markets'][0]
-                display_items.append({
-                    'type': 'individual',
-                    **market
-                })
+        for group in event_groups.values():
+            display_items.append(self._to_display_item(group['markets']))
 
         # Add markets without event_title as individual
         display_items.extend(individual_markets)
@@ -717,6 +991,37 @@ class MarketService:
 
         return display_items
 
+    def _to_display_item(self, markets: List[Dict]) -> Dict:
+        """
+        Display item for the markets of one event
+
+        Args:
+            markets: Market dictionaries sharing an event_title (at least one)
+
+        Returns:
+            Event group for a multi-market event, the market itself otherwise
+        """
+        if len(markets) > 1:
+            # Multi-market event - show as group
+            first = markets[0]
+            return {
+                'type': 'event_group',
+                'event_title': first.get('event_title'),
+                'event_id': first.get('event_id'),  # May be null, that's ok
+                'event_slug': first.get('event_slug'),  # May be null, that's ok
+                'markets': markets,
+                'market_count': len(markets),
+                # Aggregate stats
+                'total_volume': sum(m.get('volume', 0) for m in markets),
+                'total_liquidity': sum(m.get('liquidity', 0) for m in markets),
+            }
+
+        # Single market event - show as individual market
+        return {
+            'type': 'individual',
+            **markets[0]
+        }
+
 
 # Global instance
 _market_service: Optional[MarketService] = None
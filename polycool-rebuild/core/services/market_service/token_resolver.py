@@ -0,0 +1,195 @@
+"""
+Token Resolver - CLOB token id -> market resolution
+Backed by the market_tokens projection (token_id primary key, refreshed by the
+market bulk upsert), so resolving a leader trade or a WebSocket token is a
+primary-key lookup instead of a JSONB-contains scan over markets.
+"""
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.database.connection import get_db
+from core.database.models import Market, MarketToken
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+SKIP_DB = os.getenv("SKIP_DB", "false").lower() == "true"
+
+
+@dataclass(frozen=True)
+class TokenInfo:
+    """Where a CLOB token lives"""
+    token_id: str
+    market_id: str
+    outcome_index: int
+    condition_id: Optional[str] = None
+
+
+class TokenResolver:
+    """
+    Batch token resolution
+    - In-process LRU first (token -> market never changes for a live market)
+    - One market_tokens query for all misses
+    - Tokens still missing (market written outside the bulk upsert) are looked up
+      in markets.clob_token_ids once and written back to the projection
+    """
+
+    def __init__(self, cache_size: int = 50000):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, TokenInfo]" = OrderedDict()
+
+        # Stats
+        self.cache_hits = 0
+        self.table_hits = 0
+        self.fallback_hits = 0
+        self.misses = 0
+
+    async def resolve(self, token_id: str) -> Optional[TokenInfo]:
+        """Resolve a single token id"""
+        if not token_id:
+            return None
+        resolved = await self.resolve_many([token_id])
+        return resolved.get(str(token_id).strip())
+
+    async def resolve_many(self, token_ids: Iterable[str]) -> Dict[str, TokenInfo]:
+        """
+        Resolve several token ids with at most two queries
+
+        Args:
+            token_ids: CLOB token ids (str or int)
+
+        Returns:
+            token_id -> TokenInfo for every token that belongs to a known market
+        """
+        wanted = {str(t).strip() for t in token_ids if t is not None and str(t).strip()}
+        resolved: Dict[str, TokenInfo] = {}
+
+        for token_id in wanted:
+            info = self._cache.get(token_id)
+            if info:
+                self._cache.move_to_end(token_id)
+                resolved[token_id] = info
+        self.cache_hits += len(resolved)
+
+        missing = wanted - resolved.keys()
+        if not missing or SKIP_DB:
+            return resolved
+
+        try:
+            async with get_db() as db:
+                result = await db.execute(
+                    select(MarketToken).where(MarketToken.token_id.in_(missing))
+                )
+                for row in result.scalars().all():
+                    resolved[row.token_id] = self._remember(TokenInfo(
+                        token_id=row.token_id,
+                        market_id=row.market_id,
+                        outcome_index=row.outcome_index,
+                        condition_id=row.condition_id,
+                    ))
+                    self.table_hits += 1
+
+            missing -= resolved.keys()
+            if missing:
+                for token_id, info in (await self._resolve_from_markets(missing)).items():
+                    resolved[token_id] = info
+                    self.fallback_hits += 1
+                self.misses += len(missing - resolved.keys())
+
+        except Exception as e:
+            logger.error(f"❌ Error resolving {len(missing)} token ids: {e}")
+
+        return resolved
+
+    async def index_markets(self, markets: List[Dict]) -> int:
+        """
+        Write the market_tokens rows of markets written outside the bulk upsert
+
+        Args:
+            markets: Dicts with id, clob_token_ids and optional condition_id
+
+        Returns:
+            Number of token rows written
+        """
+        rows = {}
+        for market in markets:
+            token_ids = market.get('clob_token_ids')
+            if not market.get('id') or not isinstance(token_ids, list):
+                continue
+            for index, token_id in enumerate(token_ids):
+                if token_id:
+                    rows[str(token_id)] = {
+                        'token_id': str(token_id),
+                        'market_id': str(market['id']),
+                        'outcome_index': index,
+                        'condition_id': market.get('condition_id'),
+                    }
+
+        if not rows or SKIP_DB:
+            return 0
+
+        async with get_db() as db:
+            stmt = pg_insert(MarketToken).values(list(rows.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[MarketToken.token_id],
+                set_={
+                    'market_id': stmt.excluded.market_id,
+                    'outcome_index': stmt.excluded.outcome_index,
+                    'condition_id': stmt.excluded.condition_id,
+                }
+            )
+            await db.execute(stmt)
+
+        for row in rows.values():
+            self._remember(TokenInfo(**row))
+        return len(rows)
+
+    def get_stats(self) -> Dict:
+        return {
+            'cached': len(self._cache),
+            'cache_hits': self.cache_hits,
+            'table_hits': self.table_hits,
+            'fallback_hits': self.fallback_hits,
+            'misses': self.misses,
+        }
+
+    async def _resolve_from_markets(self, token_ids: set) -> Dict[str, TokenInfo]:
+        """Fallback scan on markets.clob_token_ids (GIN index) + write-back to the projection"""
+        async with get_db() as db:
+            result = await db.execute(
+                select(Market.id, Market.clob_token_ids, Market.condition_id)
+                .where(Market.clob_token_ids.has_any(list(token_ids)))
+            )
+            markets = [
+                {'id': row[0], 'clob_token_ids': row[1], 'condition_id': row[2]}
+                for row in result.all()
+            ]
+
+        if not markets:
+            return {}
+
+        await self.index_markets(markets)
+        return {token_id: self._cache[token_id] for token_id in token_ids if token_id in self._cache}
+
+    def _remember(self, info: TokenInfo) -> TokenInfo:
+        self._cache[info.token_id] = info
+        self._cache.move_to_end(info.token_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return info
+
+
+_token_resolver: Optional[TokenResolver] = None
+
+
+def get_token_resolver() -> TokenResolver:
+    """Get or create TokenResolver instance"""
+    global _token_resolver
+    if _token_resolver is None:
+        _token_resolver = TokenResolver()
+    return _token_resolver
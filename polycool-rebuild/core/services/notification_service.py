@@ -1,10 +1,15 @@
 """
 Centralized Notification Service
 Handles queuing and processing of all notifications asynchronously
+- One Redis list per priority, drained with a blocking BLPOP (critical first)
+- Concurrent sender pool, paced by token buckets (Telegram global + per-chat limits)
+- Queue wait / send latency metrics per notification type
 """
 import asyncio
 import json
+import time
 import uuid
+from collections import OrderedDict
 from decimal import Decimal
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
@@ -12,7 +17,9 @@ from datetime import datetime, timezone
 from core.models.notification_models import Notification, NotificationType, NotificationPriority, NotificationResult
 from core.services.notification_templates import NotificationTemplates
 from core.services.cache_manager import CacheManager
+from infrastructure.config.settings import settings
 from infrastructure.logging.logger import get_logger
+from infrastructure.utils.rate_metrics import LatencyStats, TokenBucket
 
 logger = get_logger(__name__)
 
@@ -40,14 +47,32 @@ def convert_decimals_to_floats(obj: Any) -> Any:
 class RedisNotificationQueue:
     """
     Redis-based queue for notifications
-    Uses Redis lists for FIFO queue with priority support
+    One Redis list per priority; BLPOP checks the keys in order, so higher
+    priorities are always drained first (FIFO within a priority)
     """
 
+    PRIORITY_ORDER = [
+        NotificationPriority.CRITICAL,
+        NotificationPriority.HIGH,
+        NotificationPriority.NORMAL,
+        NotificationPriority.LOW,
+    ]
+
     def __init__(self, cache_manager: CacheManager):
         self.cache_manager = cache_manager
-        self.queue_key = "notifications:queue"
+        self.queue_key = "notifications:queue"  # Legacy single queue (drained as normal priority)
         self.processing_key = "notifications:processing"
         self.dead_letter_key = "notifications:dead_letter"
+        self.priority_keys = {
+            priority: f"{self.queue_key}:{priority.value}" for priority in self.PRIORITY_ORDER
+        }
+        self._pop_keys = [
+            self.priority_keys[NotificationPriority.CRITICAL],
+            self.priority_keys[NotificationPriority.HIGH],
+            self.priority_keys[NotificationPriority.NORMAL],
+            self.queue_key,
+            self.priority_keys[NotificationPriority.LOW],
+        ]
 
     async def push(self, notification_dict: Dict[str, Any], priority: NotificationPriority = NotificationPriority.NORMAL) -> None:
         """Push notification to queue with priority"""
@@ -55,6 +80,7 @@ class RedisNotificationQueue:
             # Add metadata
             notification_dict['id'] = notification_dict.get('id', str(uuid.uuid4()))
             notification_dict['priority'] = priority.value
+            notification_dict['queued_at'] = time.time()
 
             # Convert all Decimal values to float for JSON serialization
             notification_dict = convert_decimals_to_floats(notification_dict)
@@ -62,37 +88,62 @@ class RedisNotificationQueue:
             # Serialize
             data = json.dumps(notification_dict)
 
-            # Push to Redis list (right push for FIFO) - redis operations are synchronous
-            self.cache_manager.redis.rpush(self.queue_key, data)
+            # Push to the priority list (right push for FIFO)
+            await self.cache_manager.redis.rpush(self.priority_keys[priority], data)
 
-            logger.debug(f"📨 Queued notification {notification_dict['id']} (type: {notification_dict.get('type')})")
+            logger.debug(f"📨 Queued notification {notification_dict['id']} (type: {notification_dict.get('type')}, priority: {priority.value})")
 
         except Exception as e:
             logger.error(f"❌ Failed to queue notification: {e}")
 
-    async def pop(self) -> Optional[Dict[str, Any]]:
-        """Pop notification from queue"""
+    async def requeue(self, notification_dict: Dict[str, Any]) -> None:
+        """Put a popped, unprocessed notification back at the head of its priority list"""
         try:
-            # Pop from left (FIFO) - redis operations are synchronous
-            data = self.cache_manager.redis.lpop(self.queue_key)
-            if data:
+            priority = NotificationPriority(notification_dict.get('priority', NotificationPriority.NORMAL.value))
+            await self.cache_manager.redis.lpush(self.priority_keys[priority], json.dumps(notification_dict))
+        except Exception as e:
+            logger.error(f"❌ Failed to requeue notification {notification_dict.get('id')}: {e}")
+
+    async def pop(self, timeout: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Pop the next notification, highest priority first
+
+        Args:
+            timeout: Seconds to block while every queue is empty
+        """
+        try:
+            item = await self.cache_manager.redis.blpop(self._pop_keys, timeout=timeout)
+            if item:
+                _, data = item
                 return json.loads(data)
         except Exception as e:
             logger.error(f"❌ Failed to pop notification from queue: {e}")
         return None
 
-    def size(self) -> int:
-        """Get queue size"""
+    async def size(self) -> int:
+        """Get queue size (all priorities)"""
+        return sum((await self.sizes()).values())
+
+    async def sizes(self) -> Dict[str, int]:
+        """Get queue size per priority"""
         try:
-            return self.cache_manager.redis.llen(self.queue_key)
+            pipe = self.cache_manager.redis.pipeline(transaction=False)
+            for key in self._pop_keys:
+                pipe.llen(key)
+            lengths = await pipe.execute()
+            sizes = {priority.value: 0 for priority in self.PRIORITY_ORDER}
+            for key, length in zip(self._pop_keys, lengths):
+                priority = key.rsplit(':', 1)[-1] if key != self.queue_key else NotificationPriority.NORMAL.value
+                sizes[priority] += int(length or 0)
+            return sizes
         except Exception:
-            return 0
+            return {}
 
     async def move_to_dead_letter(self, notification_dict: Dict[str, Any]) -> None:
         """Move failed notification to dead letter queue"""
         try:
             data = json.dumps(notification_dict)
-            self.cache_manager.redis.rpush(self.dead_letter_key, data)
+            await self.cache_manager.redis.rpush(self.dead_letter_key, data)
             logger.warning(f"💀 Moved notification {notification_dict.get('id')} to dead letter queue")
         except Exception as e:
             logger.error(f"❌ Failed to move to dead letter queue: {e}")
@@ -113,6 +164,23 @@ class NotificationService:
         # Processing state
         self.is_processing = False
         self.processing_task: Optional[asyncio.Task] = None
+        self.sender_count = settings.telegram.notification_senders
+        self._sender_tasks: List[asyncio.Task] = []
+        self._dispatch_queue: Optional[asyncio.Queue] = None
+        self._http_client = None
+
+        # Telegram send pacing
+        self.global_bucket = TokenBucket(settings.telegram.send_rate_global)
+        self.per_chat_rate = settings.telegram.send_rate_per_chat
+        self._chat_buckets: "OrderedDict[int, TokenBucket]" = OrderedDict()
+        self._max_chat_buckets = 10000
+
+        # Metrics (per notification type)
+        self.queue_wait: Dict[str, LatencyStats] = {}
+        self.send_latency: Dict[str, LatencyStats] = {}
+        self.sent_count = 0
+        self.failed_count = 0
+        self.throttled_count = 0
 
     async def queue_notification(self, notification: Notification) -> NotificationResult:
         """
@@ -162,9 +230,21 @@ class NotificationService:
             logger.warning("⚠️ Notification processing already running")
             return
 
+        import httpx
+
         self.is_processing = True
+        self._http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=self.sender_count, max_keepalive_connections=self.sender_count)
+        )
+        # Bounded hand-off: the dispatcher stops popping while every sender is busy
+        self._dispatch_queue = asyncio.Queue(maxsize=self.sender_count)
+        self._sender_tasks = [
+            asyncio.create_task(self._sender_loop(i), name=f"notification_sender_{i}")
+            for i in range(self.sender_count)
+        ]
         self.processing_task = asyncio.create_task(self._process_notifications_loop())
-        logger.info("🚀 Started notification processing")
+        logger.info(f"🚀 Started notification processing ({self.sender_count} senders)")
 
     async def stop_processing(self) -> None:
         """Stop background notification processing"""
@@ -179,25 +259,46 @@ class NotificationService:
             except asyncio.CancelledError:
                 pass
 
+        # Let senders finish what was already popped, then stop them
+        if self._dispatch_queue is not None:
+            try:
+                await asyncio.wait_for(self._dispatch_queue.join(), timeout=10)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ {self._dispatch_queue.qsize()} notifications still pending at shutdown")
+        for task in self._sender_tasks:
+            task.cancel()
+        await asyncio.gather(*self._sender_tasks, return_exceptions=True)
+        self._sender_tasks = []
+        # Popped but never sent: back to Redis for the next worker
+        if self._dispatch_queue is not None:
+            while not self._dispatch_queue.empty():
+                await self.queue.requeue(self._dispatch_queue.get_nowait())
+                self._dispatch_queue.task_done()
+
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
         logger.info("🛑 Stopped notification processing")
 
     async def _process_notifications_loop(self) -> None:
-        """Main processing loop for notifications"""
+        """Dispatcher: blocking pop (highest priority first) -> sender pool"""
         logger.info("🔄 Notification processing loop started")
 
         while self.is_processing:
+            notification_dict = None
             try:
-                # Get next notification from queue
-                notification_dict = await self.queue.pop()
+                # Blocks up to 1s while every queue is empty (no sleep-polling)
+                notification_dict = await self.queue.pop(timeout=1)
                 if notification_dict:
-                    # Process notification
-                    await self._process_notification(notification_dict)
-                else:
-                    # Queue is empty, wait a bit
-                    await asyncio.sleep(1.0)
+                    await self._dispatch_queue.put(notification_dict)
+                    notification_dict = None  # Handed to the senders
 
             except asyncio.CancelledError:
                 logger.info("🛑 Notification processing loop cancelled")
+                if notification_dict:
+                    # Popped while every sender was busy: don't lose it
+                    await self.queue.requeue(notification_dict)
                 break
             except Exception as e:
                 logger.error(f"❌ Error in notification processing loop: {e}")
@@ -205,10 +306,37 @@ class NotificationService:
 
         logger.info("🔄 Notification processing loop ended")
 
+    async def _sender_loop(self, sender_id: int) -> None:
+        """Sender pool worker"""
+        while True:
+            notification_dict = await self._dispatch_queue.get()
+            try:
+                await self._process_notification(notification_dict)
+            except Exception as e:
+                logger.error(f"❌ Sender {sender_id} failed on notification {notification_dict.get('id')}: {e}")
+            finally:
+                self._dispatch_queue.task_done()
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.per_chat_rate, capacity=1)
+            self._chat_buckets[chat_id] = bucket
+            if len(self._chat_buckets) > self._max_chat_buckets:
+                self._chat_buckets.popitem(last=False)
+        else:
+            self._chat_buckets.move_to_end(chat_id)
+        return bucket
+
     async def _process_notification(self, notification_dict: Dict[str, Any]) -> None:
         """Process a single notification"""
         try:
+            queued_at = notification_dict.pop('queued_at', None)
             notification = Notification.from_dict(notification_dict)
+            notification_type = notification.type.value
+
+            if queued_at:
+                self.queue_wait.setdefault(notification_type, LatencyStats()).record(max(time.time() - queued_at, 0.0))
 
             # Get formatted message
             message = self.templates.get_template(notification.type, notification.data)
@@ -217,14 +345,24 @@ class NotificationService:
                 await self._handle_failed_notification(notification)
                 return
 
+            # Respect Telegram limits (per chat first, then global)
+            waited = await self._chat_bucket(notification.user_id).acquire()
+            waited += await self.global_bucket.acquire()
+            if waited > 0:
+                self.throttled_count += 1
+
             # Send via Telegram
+            start = time.monotonic()
             result = await self._send_telegram_notification(notification.user_id, message)
+            self.send_latency.setdefault(notification_type, LatencyStats()).record(time.monotonic() - start)
 
             if result.success:
+                self.sent_count += 1
                 notification.mark_sent()
                 logger.info(f"✅ Sent notification {notification.id} to user {notification.user_id}")
             else:
                 # Handle failure
+                self.failed_count += 1
                 await self._handle_failed_notification(notification, result.error_message)
 
         except Exception as e:
@@ -253,42 +391,55 @@ class NotificationService:
                     error_message="Bot token not configured"
                 )
 
-            # Send message via Telegram API
+            # Send message via Telegram API (pooled client while processing runs)
             telegram_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    telegram_url,
-                    json={
-                        "chat_id": user_id,
-                        "text": message,
-                        "parse_mode": "Markdown",
-                        "disable_web_page_preview": True
-                    }
-                )
-
-                if response.status_code == 200:
-                    result_data = response.json()
-                    if result_data.get("ok"):
-                        message_id = result_data.get("result", {}).get("message_id")
-                        logger.info(f"✅ Sent notification to user {user_id} (message_id: {message_id})")
-                        return NotificationResult(
-                            success=True,
-                            telegram_message_id=message_id
-                        )
-                    else:
-                        error_description = result_data.get("description", "Unknown error")
-                        logger.error(f"❌ Telegram API error: {error_description}")
-                        return NotificationResult(
-                            success=False,
-                            error_message=f"Telegram API: {error_description}"
-                        )
+            payload = {
+                "chat_id": user_id,
+                "text": message,
+                "parse_mode": "Markdown",
+                "disable_web_page_preview": True
+            }
+
+            if self._http_client is not None:
+                response = await self._http_client.post(telegram_url, json=payload)
+            else:
+                async with httpx.AsyncClient(timeout=10.0) as client:
+                    response = await client.post(telegram_url, json=payload)
+
+            if response.status_code == 200:
+                result_data = response.json()
+                if result_data.get("ok"):
+                    message_id = result_data.get("result", {}).get("message_id")
+                    logger.info(f"✅ Sent notification to user {user_id} (message_id: {message_id})")
+                    return NotificationResult(
+                        success=True,
+                        telegram_message_id=message_id
+                    )
                 else:
-                    logger.error(f"❌ HTTP {response.status_code} from Telegram API")
+                    error_description = result_data.get("description", "Unknown error")
+                    logger.error(f"❌ Telegram API error: {error_description}")
                     return NotificationResult(
                         success=False,
-                        error_message=f"HTTP {response.status_code}"
+                        error_message=f"Telegram API: {error_description}"
                     )
+            elif response.status_code == 429:
+                # Flood control: hold every sender for retry_after
+                try:
+                    retry_after = float(response.json().get("parameters", {}).get("retry_after", 1))
+                except Exception:
+                    retry_after = 1.0
+                self.global_bucket.pause(retry_after)
+                logger.warning(f"⚠️ Telegram flood control, pausing sends for {retry_after:.0f}s")
+                return NotificationResult(
+                    success=False,
+                    error_message=f"HTTP 429 (retry after {retry_after:.0f}s)"
+                )
+            else:
+                logger.error(f"❌ HTTP {response.status_code} from Telegram API")
+                return NotificationResult(
+                    success=False,
+                    error_message=f"HTTP {response.status_code}"
+                )
 
         except Exception as e:
             logger.error(f"❌ Failed to send Telegram notification: {e}")
@@ -300,9 +451,9 @@ class NotificationService:
     async def _handle_failed_notification(self, notification: Notification, error: Optional[str] = None) -> None:
         """Handle failed notification processing"""
         if notification.increment_retry():
-            # Can retry - put back in queue with lower priority
+            # Can retry - put back in queue with its original priority (429s must not demote it)
             logger.warning(f"🔄 Retrying notification {notification.id} (attempt {notification.retry_count}/{notification.max_retries})")
-            await self.queue.push(notification.to_dict(), NotificationPriority.LOW)
+            await self.queue.push(notification.to_dict(), notification.priority)
         else:
             # Max retries exceeded - move to dead letter queue
             logger.error(f"💀 Max retries exceeded for notification {notification.id}")
@@ -310,9 +461,18 @@ class NotificationService:
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get notification service statistics"""
+        queue_sizes = await self.queue.sizes()
         return {
-            'queue_size': self.queue.size(),
+            'queue_size': sum(queue_sizes.values()),
+            'queue_sizes': queue_sizes,
             'is_processing': self.is_processing,
+            'senders': len(self._sender_tasks),
+            'in_flight': self._dispatch_queue.qsize() if self._dispatch_queue else 0,
+            'sent': self.sent_count,
+            'failed': self.failed_count,
+            'throttled': self.throttled_count,
+            'queue_wait': {t: stats.to_dict() for t, stats in self.queue_wait.items()},
+            'send_latency': {t: stats.to_dict() for t, stats in self.send_latency.items()},
             'rate_limiter_stats': self.rate_limiter.get_stats()
         }
 
@@ -320,7 +480,8 @@ class NotificationService:
 class NotificationRateLimiter:
     """
     Rate limiter for notifications
-    Prevents spam and respects Telegram API limits
+    Prevents per-user spam at queue time; Telegram API limits are enforced
+    by the sender pool token buckets (bursts are delayed, not dropped)
     """
 
     def __init__(self, cache_manager: CacheManager):
@@ -333,11 +494,6 @@ class NotificationRateLimiter:
             'per_day': 200
         }
 
-        # Global rate limits (across all users)
-        self.global_limits = {
-            'per_second': 5  # Max 5 notifications per second globally
-        }
-
     async def can_send(
         self,
         user_id: int,
@@ -360,10 +516,6 @@ class NotificationRateLimiter:
             if priority == NotificationPriority.CRITICAL:
                 return True
 
-            # Check global rate limit
-            if not await self._check_global_rate_limit():
-                return False
-
             # Check user-specific rate limits
             return await self._check_user_rate_limits(user_id)
 
@@ -372,49 +524,33 @@ class NotificationRateLimiter:
             # Allow notification on rate limit check failure (fail open)
             return True
 
-    async def _check_global_rate_limit(self) -> bool:
-        """Check global rate limit (across all users)"""
-        try:
-            key = "notifications:global:per_second"
-            # Use direct Redis operations since CacheManager methods are async but we need sync Redis
-            count = int(self.cache_manager.redis.get(key) or 0)
-
-            if count >= self.global_limits['per_second']:
-                return False
-
-            # Increment counter with 1-second expiry
-            self.cache_manager.redis.setex(key, 1, count + 1)
-            return True
-
-        except Exception as e:
-            logger.error(f"❌ Error checking global rate limit: {e}")
-            return True  # Fail open
-
     async def _check_user_rate_limits(self, user_id: int) -> bool:
         """Check user-specific rate limits"""
         try:
-            # Check per-minute limit
             minute_key = f"notifications:user:{user_id}:per_minute"
-            minute_count = int(self.cache_manager.redis.get(minute_key) or 0)
+            hour_key = f"notifications:user:{user_id}:per_hour"
+            day_key = f"notifications:user:{user_id}:per_day"
+
+            # Read the three counters in one round-trip
+            minute_count, hour_count, day_count = (
+                int(count or 0)
+                for count in await self.cache_manager.redis.mget(minute_key, hour_key, day_key)
+            )
+
+            # Check per-minute / per-hour / per-day limits
             if minute_count >= self.limits['per_minute']:
                 return False
-
-            # Check per-hour limit
-            hour_key = f"notifications:user:{user_id}:per_hour"
-            hour_count = int(self.cache_manager.redis.get(hour_key) or 0)
             if hour_count >= self.limits['per_hour']:
                 return False
-
-            # Check per-day limit
-            day_key = f"notifications:user:{user_id}:per_day"
-            day_count = int(self.cache_manager.redis.get(day_key) or 0)
             if day_count >= self.limits['per_day']:
                 return False
 
             # Increment counters
-            self.cache_manager.redis.setex(minute_key, 60, minute_count + 1)   # 1 minute
-            self.cache_manager.redis.setex(hour_key, 3600, hour_count + 1)     # 1 hour
-            self.cache_manager.redis.setex(day_key, 86400, day_count + 1)      # 24 hours
+            pipe = self.cache_manager.redis.pipeline(transaction=False)
+            pipe.setex(minute_key, 60, minute_count + 1)   # 1 minute
+            pipe.setex(hour_key, 3600, hour_count + 1)     # 1 hour
+            pipe.setex(day_key, 86400, day_count + 1)      # 24 hours
+            await pipe.execute()
 
             return True
 
@@ -426,7 +562,8 @@ class NotificationRateLimiter:
         """Get rate limiter statistics"""
         return {
             'limits': self.limits,
-            'global_limits': self.global_limits
+            'send_rate_global': settings.telegram.send_rate_global,
+            'send_rate_per_chat': settings.telegram.send_rate_per_chat
         }
 
 
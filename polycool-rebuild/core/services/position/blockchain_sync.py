@@ -1,7 +1,7 @@
 """
 Blockchain Synchronization - Sync positions from Polymarket API
+HTTP fetching, fingerprinting and batch mode live in sync_service; this module diffs into the DB
 """
-import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
 from sqlalchemy import select
@@ -9,6 +9,7 @@ from sqlalchemy import select
 from core.database.connection import get_db
 from core.database.models import Position, Market
 from infrastructure.logging.logger import get_logger
+from .sync_service import get_position_sync_service
 from .crud import (
     get_active_positions,
     close_position
@@ -57,7 +58,7 @@ def validate_position_data(bp: Dict, field_name: str) -> float:
 async def get_positions_from_blockchain(wallet_address: str) -> List[Dict]:
     """
     Get current positions from blockchain via Polymarket API
-    Uses official endpoint: /api/core/positions/current
+    Shared pooled session, last working endpoint tried first (see sync_service)
 
     Args:
         wallet_address: User's Polygon wallet address
@@ -69,54 +70,9 @@ async def get_positions_from_blockchain(wallet_address: str) -> List[Dict]:
         Exception: If API call fails completely
     """
     try:
-        import aiohttp
-
-        # Try official Polymarket API endpoint first
-        base_urls = [
-            "https://data-api.polymarket.com",
-            "https://api.polymarket.com"
-        ]
-
-        for base_url in base_urls:
-            try:
-                # Try new official endpoint format
-                url = f"{base_url}/api/core/positions/current?address={wallet_address}"
-
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            # Handle both formats: {"positions": [...]} or [...]
-                            if isinstance(data, dict) and 'positions' in data:
-                                positions_list = data.get('positions', [])
-                                logger.info(f"✅ Fetched {len(positions_list)} current positions from {base_url}")
-                                return positions_list if isinstance(positions_list, list) else []
-                            elif isinstance(data, list):
-                                logger.info(f"✅ Fetched {len(data)} current positions from {base_url}")
-                                return data
-                        elif response.status == 404:
-                            # Endpoint doesn't exist, try next base URL
-                            logger.debug(f"⚠️ Endpoint not found at {base_url}, trying next...")
-                            continue
-                        else:
-                            logger.warning(f"⚠️ API Error {response.status} from {base_url}, trying next...")
-                            continue
-            except Exception as e:
-                logger.debug(f"⚠️ Error with {base_url}: {e}, trying next...")
-                continue
-
-        # Fallback to legacy endpoint if official endpoints don't work
-        logger.warning(f"⚠️ Official endpoints failed, falling back to legacy endpoint")
-        url = f"https://data-api.polymarket.com/positions?user={wallet_address}"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status != 200:
-                    raise Exception(f"Legacy API Error: {response.status} for wallet {wallet_address[:10]}...")
-
-                positions_data = await response.json()
-                return positions_data if isinstance(positions_data, list) else []
-
+        positions = await get_position_sync_service().fetch_current(wallet_address)
+        logger.info(f"✅ Fetched {len(positions)} current positions for {wallet_address[:10]}...")
+        return positions
     except Exception as e:
         logger.error(f"❌ Error fetching positions from blockchain for {wallet_address[:10]}...: {e}")
         raise
@@ -125,124 +81,20 @@ async def get_positions_from_blockchain(wallet_address: str) -> List[Dict]:
 async def get_closed_positions_from_blockchain(wallet_address: str) -> List[Dict]:
     """
     Get closed positions from blockchain via Polymarket API
-    Uses optimized endpoint: /closed-positions (more complete than /api/core/positions/closed)
-
-    The /closed-positions endpoint provides:
-    - realizedPnl (key field for redeemable detection)
-    - conditionId, outcome, outcomeIndex
-    - avgPrice, totalBought, curPrice
-    - title, slug, icon, eventSlug
-    - endDate
+    Uses /closed-positions first (more complete than /api/core/positions/closed):
+    realizedPnl (key field for redeemable detection), conditionId, outcome,
+    outcomeIndex, avgPrice, totalBought, curPrice, title, slug, eventSlug, endDate
 
     Args:
         wallet_address: User's Polygon wallet address
 
     Returns:
-        List of closed position dictionaries from API
+        List of closed position dictionaries from API (empty on failure)
     """
     try:
-        import aiohttp
-
-        # ✅ OPTIMIZATION: Use /closed-positions endpoint (more complete data)
-        # This endpoint provides realizedPnl which is critical for redeemable detection
-        base_url = "https://data-api.polymarket.com"
-
-        # Use optimized parameters: limit=100, sortBy=REALIZEDPNL DESC (most profitable first)
-        url = f"{base_url}/closed-positions"
-        params = {
-            "user": wallet_address,
-            "limit": 100,  # Max 100 positions per request
-            "sortBy": "REALIZEDPNL",
-            "sortDirection": "DESC"
-        }
-
-        try:
-            logger.debug(f"🔍 [CLOSED POSITIONS] Calling {url} with params: {params}")
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    logger.debug(f"📡 [CLOSED POSITIONS] Response status: {response.status}")
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.debug(f"📦 [CLOSED POSITIONS] Response type: {type(data)}, length: {len(data) if isinstance(data, (list, dict)) else 'N/A'}")
-
-                        # Handle both formats: array or object with 'positions' key
-                        if isinstance(data, list):
-                            logger.info(f"✅ Fetched {len(data)} closed positions from {base_url}")
-                            # Log first position for debugging
-                            if len(data) > 0:
-                                first_pos = data[0]
-                                logger.debug(
-                                    f"📋 [CLOSED POSITIONS] Sample position: "
-                                    f"conditionId={first_pos.get('conditionId', 'N/A')[:20]}..., "
-                                    f"realizedPnl=${first_pos.get('realizedPnl', 0):.2f}, "
-                                    f"title={first_pos.get('title', 'N/A')[:50]}..."
-                                )
-                            return data
-                        elif isinstance(data, dict) and 'positions' in data:
-                            positions_list = data.get('positions', [])
-                            logger.info(f"✅ Fetched {len(positions_list)} closed positions from {base_url}")
-                            return positions_list if isinstance(positions_list, list) else []
-                        else:
-                            logger.warning(f"⚠️ Unexpected response format from /closed-positions: {type(data)}")
-                            logger.debug(f"📦 [CLOSED POSITIONS] Response content: {str(data)[:200]}")
-                            return []
-                    elif response.status == 404:
-                        logger.debug(f"⚠️ Closed positions endpoint not found at {base_url}")
-                        return []
-                    elif response.status == 429:
-                        logger.warning(f"⚠️ Rate limited (429) for closed positions, returning empty list")
-                        return []
-                    else:
-                        logger.debug(f"⚠️ API Error {response.status} from {base_url} for closed positions")
-                        return []
-        except asyncio.TimeoutError:
-            logger.warning(f"⏱️ Timeout fetching closed positions for {wallet_address[:10]}...")
-            return []
-        except Exception as e:
-            logger.debug(f"⚠️ Error fetching closed positions from {base_url}: {e}")
-            return []
-
-        # Fallback: try /api/core/positions/closed if /closed-positions fails
-        logger.debug(f"⚠️ /closed-positions failed, trying fallback endpoint")
-        base_urls = [
-            "https://data-api.polymarket.com",
-            "https://api.polymarket.com"
-        ]
-
-        for base_url in base_urls:
-            try:
-                url = f"{base_url}/api/core/positions/closed?address={wallet_address}"
-
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            # Handle both formats: {"positions": [...]} or [...]
-                            if isinstance(data, dict) and 'positions' in data:
-                                positions_list = data.get('positions', [])
-                                logger.info(f"✅ Fetched {len(positions_list)} closed positions from fallback {base_url}")
-                                return positions_list if isinstance(positions_list, list) else []
-                            elif isinstance(data, list):
-                                logger.info(f"✅ Fetched {len(data)} closed positions from fallback {base_url}")
-                                return data
-                        elif response.status == 404:
-                            logger.debug(f"⚠️ Fallback endpoint not found at {base_url}")
-                            continue
-                        else:
-                            logger.debug(f"⚠️ API Error {response.status} from fallback {base_url}")
-                            continue
-            except Exception as e:
-                logger.debug(f"⚠️ Error with fallback {base_url}: {e}")
-                continue
-
-        # If no endpoint works, return empty list (closed positions are optional)
-        logger.debug(f"⚠️ Could not fetch closed positions for {wallet_address[:10]}..., returning empty list")
-        return []
-
+        positions = await get_position_sync_service().fetch_closed(wallet_address)
+        logger.info(f"✅ Fetched {len(positions)} closed positions for {wallet_address[:10]}...")
+        return positions
     except Exception as e:
         logger.warning(f"⚠️ Error fetching closed positions for {wallet_address[:10]}...: {e}")
         return []
@@ -259,13 +111,9 @@ async def get_market_id_from_token_id(token_id: str) -> Optional[str]:
         Market ID or None
     """
     try:
-        async with get_db() as db:
-            result = await db.execute(
-                select(Market.id)
-                .where(Market.clob_token_ids.contains([token_id]))
-            )
-            market = result.scalar_one_or_none()
-            return market
+        from core.services.market_service.token_resolver import get_token_resolver
+        info = await get_token_resolver().resolve(token_id)
+        return info.market_id if info else None
 
     except Exception as e:
         logger.error(f"Error getting market_id for token_id {token_id}: {e}")
@@ -280,6 +128,7 @@ async def sync_positions_from_blockchain(
     Sync positions from blockchain to database
     Creates/updates positions based on blockchain data
     Also checks closed positions to fix corrupted positions
+    Always runs the DB diff (the periodic batch sync skips unchanged wallets)
 
     Uses ONLY 'size' field from Polymarket API (not 'amount' or 'currentValue')
     NO hardcoded fallbacks - raises ValueError if required data is missing
@@ -296,17 +145,36 @@ async def sync_positions_from_blockchain(
     """
     try:
         logger.info(f"🔄 Starting sync for user {user_id}, wallet {wallet_address[:10]}...")
+        result = await get_position_sync_service().sync_wallet(user_id, wallet_address, force=True)
+        return result.synced
+
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error syncing positions from blockchain: {e}")
+        raise
+
+
+async def apply_blockchain_positions(
+    user_id: int,
+    blockchain_positions: List[Dict],
+    closed_positions: List[Dict]
+) -> int:
+    """
+    Diff fetched blockchain positions against the user's positions in the database
 
-        # Get current positions from blockchain
-        logger.debug(f"📡 Fetching current positions from blockchain...")
-        blockchain_positions = await get_positions_from_blockchain(wallet_address)
-        logger.info(f"✅ Fetched {len(blockchain_positions)} current positions from blockchain")
+    Args:
+        user_id: User ID
+        blockchain_positions: Current positions from the Polymarket API
+        closed_positions: Closed positions from the Polymarket API
 
-        # Get closed positions from blockchain (to detect corrupted positions)
-        logger.debug(f"📡 Fetching closed positions from blockchain...")
-        closed_positions = await get_closed_positions_from_blockchain(wallet_address)
-        logger.info(f"✅ Fetched {len(closed_positions)} closed positions from blockchain")
+    Returns:
+        Number of positions synced
 
+    Raises:
+        ValueError: If required fields are missing from API response
+    """
+    try:
         # Create set of closed position identifiers for quick lookup
         closed_positions_set = set()
         from core.services.position.pnl_calculator import normalize_outcome
@@ -221,6 +221,36 @@ async def get_positions_by_market(market_id: str) -> List[Position]:
         return []
 
 
+async def get_positions_by_markets(market_ids: List[str]) -> List[Position]:
+    """
+    Get all active positions for several markets in one query
+    Used for batched position price updates
+
+    Args:
+        market_ids: Market IDs
+
+    Returns:
+        List of active Position objects for these markets
+    """
+    if not market_ids:
+        return []
+    try:
+        async with get_db() as db:
+            result = await db.execute(
+                select(Position)
+                .where(
+                    and_(
+                        Position.market_id.in_(market_ids),
+                        Position.status == "active"
+                    )
+                )
+            )
+            return list(result.scalars().all())
+    except Exception as e:
+        logger.error(f"❌ Error getting positions for {len(market_ids)} markets: {e}")
+        return []
+
+
 async def get_position_by_market_and_outcome(
     user_id: int,
     market_id: str,
@@ -326,6 +356,10 @@ async def update_position(
             await db.commit()
             await db.refresh(position)
 
+            if status is not None and (position.take_profit_price is not None or position.stop_loss_price is not None):
+                from core.services.trading.tpsl_index import publish_tpsl_changed
+                await publish_tpsl_changed(position_id)
+
             logger.info(f"✅ Updated position {position_id}")
             return position
 
@@ -429,6 +463,10 @@ async def update_position_tpsl(
             await db.commit()
             await db.refresh(position)
 
+            # Keep the TP/SL trigger index of the monitor process in sync
+            from core.services.trading.tpsl_index import publish_tpsl_changed
+            await publish_tpsl_changed(position_id)
+
             if is_clear:
                 logger.info(f"✅ Cleared {tpsl_type} for position {position_id}")
             else:
@@ -502,6 +540,10 @@ async def close_position(
             await db.commit()
             await db.refresh(position)
 
+            if position.take_profit_price is not None or position.stop_loss_price is not None:
+                from core.services.trading.tpsl_index import publish_tpsl_changed
+                await publish_tpsl_changed(position_id)
+
             # ✅ CRITICAL: Invalidate cache BEFORE checking positions for unsubscription
             # This ensures we get fresh data when checking if market should be unsubscribed
             try:
@@ -60,6 +60,10 @@ class PositionService:
         """Get all active positions for a specific market"""
         return await crud.get_positions_by_market(market_id)
 
+    async def get_positions_by_markets(self, market_ids: List[str]) -> List[Position]:
+        """Get all active positions for several markets (single query)"""
+        return await crud.get_positions_by_markets(market_ids)
+
     async def update_position(
         self,
         position_id: int,
@@ -1,9 +1,10 @@
 """
 Price Updater - Update position prices from various sources
 """
+import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
-from sqlalchemy import select
+from sqlalchemy import select, text
 
 from core.database.connection import get_db
 from core.database.models import Position, Market
@@ -245,8 +246,8 @@ async def batch_update_positions_prices(
     position_updates: List[Dict[str, Any]]
 ) -> int:
     """
-    Batch update position prices in a single transaction (optimized)
-    More efficient than individual updates - uses single DB transaction
+    Batch update position prices (optimized)
+    One SELECT for entry data + one multi-row UPDATE, whatever the batch size
 
     Args:
         position_updates: List of dicts with 'position_id', 'current_price', and optionally 'outcome'
@@ -258,66 +259,69 @@ async def batch_update_positions_prices(
         return 0
 
     try:
-        async with get_db() as db:
-            # First, fetch all positions in a single query
-            position_ids = [
-                update_data.get('position_id')
-                for update_data in position_updates
-                if update_data.get('position_id') and update_data.get('current_price') is not None
-            ]
-
-            if not position_ids:
-                return 0
+        # Create update mapping for efficient lookup
+        updates_map = {
+            update_data.get('position_id'): update_data
+            for update_data in position_updates
+            if update_data.get('position_id') and update_data.get('current_price') is not None
+        }
+
+        if not updates_map:
+            return 0
 
-            # Fetch all positions at once
+        async with get_db() as db:
+            # Fetch entry data of all positions in a single query
             result = await db.execute(
-                select(Position).where(Position.id.in_(position_ids))
+                select(Position.id, Position.entry_price, Position.amount, Position.outcome)
+                .where(Position.id.in_(list(updates_map)))
             )
-            positions = {pos.id: pos for pos in result.scalars().all()}
-
-            # Create update mapping for efficient lookup
-            updates_map = {
-                update_data.get('position_id'): update_data
-                for update_data in position_updates
-                if update_data.get('position_id') and update_data.get('current_price') is not None
-            }
-
-            updated_count = 0
-            now = datetime.now(timezone.utc)
-
-            # Update all positions in memory
-            for position_id, position in positions.items():
-                update_data = updates_map.get(position_id)
-                if not update_data:
-                    continue
 
+            rows = []
+            for position_id, entry_price, amount, position_outcome in result.all():
+                update_data = updates_map[position_id]
                 current_price = update_data.get('current_price')
-                outcome = update_data.get('outcome')
 
                 # Validate price range
                 if not (0 <= current_price <= 1):
                     logger.warning(f"Invalid price {current_price} for position {position_id}, skipping")
                     continue
 
-                # Update price
-                position.current_price = current_price
-
                 # Recalculate P&L
                 pnl_amount, pnl_percentage = calculate_pnl(
-                    position.entry_price,
+                    entry_price,
                     current_price,
-                    position.amount,
-                    outcome or position.outcome
+                    amount,
+                    update_data.get('outcome') or position_outcome
                 )
+                rows.append({
+                    'id': position_id,
+                    'current_price': current_price,
+                    'pnl_amount': pnl_amount,
+                    'pnl_percentage': pnl_percentage,
+                })
 
-                position.pnl_amount = pnl_amount
-                position.pnl_percentage = pnl_percentage
-                position.updated_at = now
-                updated_count += 1
+            if not rows:
+                return 0
 
-            # Commit all updates in a single transaction
+            # Apply all updates in a single statement
+            result = await db.execute(
+                text("""
+                    UPDATE positions AS p SET
+                        current_price = v.current_price,
+                        pnl_amount = v.pnl_amount,
+                        pnl_percentage = v.pnl_percentage,
+                        updated_at = now()
+                    FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS v(
+                        id integer, current_price double precision,
+                        pnl_amount double precision, pnl_percentage double precision
+                    )
+                    WHERE p.id = v.id
+                """),
+                {'rows': json.dumps(rows)}
+            )
             await db.commit()
-            logger.debug(f"✅ Batch updated {updated_count} positions in single transaction")
+            updated_count = result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(rows)
+            logger.debug(f"✅ Batch updated {updated_count} positions in single statement")
             return updated_count
 
     except Exception as e:
@@ -345,26 +349,23 @@ async def update_all_positions_prices_with_priority(user_id: int) -> int:
         if not positions:
             return 0
 
-        # Get markets for positions
-        market_ids = [p.market_id for p in positions]
-
         # Get current prices - prioritize WebSocket prices
         from core.services.clob.clob_service import get_clob_service
 
-        clob_service = get_clob_service()
-
         updated_count = 0
 
         async with get_db() as db:
+            # Get markets for positions (one query)
+            market_ids = list({p.market_id for p in positions})
+            market_result = await db.execute(select(Market).where(Market.id.in_(market_ids)))
+            markets = {market.id: market for market in market_result.scalars().all()}
+
+            # Priority 1: WebSocket / poll outcome_prices
+            current_prices: Dict[int, Optional[float]] = {}
+            fallback_tokens: Dict[int, str] = {}  # position_id -> token needing the CLOB API
             for position in positions:
-                # Get market
-                market_result = await db.execute(
-                    select(Market).where(Market.id == position.market_id)
-                )
-                market = market_result.scalar_one_or_none()
-
+                market = markets.get(position.market_id)
                 if not market:
-                    logger.warning(f"Market {position.market_id} not found for position {position.id}")
                     continue
 
                 # CRITICAL: When source='ws', use ONLY outcome_prices (no CLOB API fallback)
@@ -402,24 +403,38 @@ async def update_all_positions_prices_with_priority(user_id: int) -> int:
                         except (ValueError, IndexError, TypeError) as e:
                             logger.debug(f"⚠️ Error extracting poll price: {e}")
 
-                # Priority 2: Fallback to CLOB API if WebSocket/poll price not available (only for source='poll')
-                # CRITICAL: When source='ws', NEVER use CLOB API or last_mid_price fallback
-                if current_price is None and market.source != 'ws':
-                    clob_token_ids = market.clob_token_ids or []
-                    try:
-                        outcome_index = find_outcome_index(position.outcome, outcomes)
-                        token_id = clob_token_ids[outcome_index] if outcome_index is not None and outcome_index < len(clob_token_ids) else None
-                    except (IndexError, ValueError):
-                        token_id = None
-
-                    if token_id:
+                    if current_price is None:
+                        clob_token_ids = market.clob_token_ids or []
                         try:
-                            prices = await clob_service.get_market_prices([token_id])
-                            current_price = prices.get(token_id)
-                            if current_price is not None:
-                                logger.debug(f"✅ Using CLOB API price for position {position.id}: {current_price}")
-                        except Exception as e:
-                            logger.debug(f"⚠️ CLOB API error for position {position.id}: {e}")
+                            outcome_index = find_outcome_index(position.outcome, outcomes)
+                            token_id = clob_token_ids[outcome_index] if outcome_index is not None and outcome_index < len(clob_token_ids) else None
+                        except (IndexError, ValueError):
+                            token_id = None
+                        if token_id:
+                            fallback_tokens[position.id] = token_id
+
+                current_prices[position.id] = current_price
+
+            # Priority 2: CLOB API for every poll position still without a price (batched)
+            # CRITICAL: When source='ws', NEVER use CLOB API or last_mid_price fallback
+            clob_prices: Dict[str, float] = {}
+            if fallback_tokens:
+                try:
+                    clob_prices = await get_clob_service().get_market_prices(list(fallback_tokens.values()))
+                except Exception as e:
+                    logger.debug(f"⚠️ CLOB API error for {len(fallback_tokens)} tokens: {e}")
+
+            for position in positions:
+                market = markets.get(position.market_id)
+                if not market:
+                    logger.warning(f"Market {position.market_id} not found for position {position.id}")
+                    continue
+
+                current_price = current_prices.get(position.id)
+                if current_price is None and position.id in fallback_tokens:
+                    current_price = clob_prices.get(fallback_tokens[position.id])
+                    if current_price is not None:
+                        logger.debug(f"✅ Using CLOB API price for position {position.id}: {current_price}")
 
                 # Priority 3: Fallback to market.last_mid_price (only for source='poll', NOT for source='ws')
                 # CRITICAL: When source='ws', NEVER use last_mid_price fallback - must use outcome_prices only
@@ -0,0 +1,276 @@
+"""
+Position Revaluation Engine - Bulk mark-to-market of active positions
+Prices for many markets are applied to every affected position at once:
+one SELECT, NumPy arrays for current_price / pnl_amount / pnl_percentage,
+one set-based UPDATE (unnest of arrays), whatever the number of positions.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import and_, select, text
+
+from core.database.connection import get_db
+from core.database.models import Market, Position
+from infrastructure.logging.logger import get_logger
+from .outcome_helper import find_outcome_index
+
+logger = get_logger(__name__)
+
+BULK_UPDATE_SQL = text("""
+    UPDATE positions AS p SET
+        current_price = v.current_price,
+        pnl_amount = v.pnl_amount,
+        pnl_percentage = v.pnl_percentage,
+        updated_at = now()
+    FROM unnest(
+        CAST(:ids AS integer[]),
+        CAST(:current_prices AS double precision[]),
+        CAST(:pnl_amounts AS double precision[]),
+        CAST(:pnl_percentages AS double precision[])
+    ) AS v(id, current_price, pnl_amount, pnl_percentage)
+    WHERE p.id = v.id
+""")
+
+
+@dataclass
+class RevaluationResult:
+    """Outcome of a bulk revaluation"""
+    updated: int = 0
+    position_ids_by_market: Dict[str, List[int]] = field(default_factory=dict)  # every active position seen
+    user_ids: Set[int] = field(default_factory=set)  # owners of updated positions
+    prices: Dict[int, float] = field(default_factory=dict)  # updated position_id -> new price
+
+
+def compute_pnl(
+    entry_prices: np.ndarray,
+    amounts: np.ndarray,
+    current_prices: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    P&L of outcome-token positions (element-wise)
+
+    Returns:
+        (pnl_amount, pnl_percentage) - percentage is 0 where entry price is 0
+    """
+    diff = current_prices - entry_prices
+    pnl_amount = diff * amounts
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pnl_percentage = np.where(entry_prices > 0, diff / entry_prices * 100.0, 0.0)
+    return pnl_amount, pnl_percentage
+
+
+def changed_mask(old_prices: np.ndarray, new_prices: np.ndarray, min_change_pct: float) -> np.ndarray:
+    """Positions to write: valid new price and no price yet, or a move of at least min_change_pct"""
+    valid = ~np.isnan(new_prices) & (new_prices >= 0) & (new_prices <= 1)
+    unset = np.isnan(old_prices) | (old_prices <= 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moved = np.abs(new_prices - old_prices) / old_prices * 100.0 >= min_change_pct
+    return valid & (unset | moved)
+
+
+class PositionRevaluationEngine:
+    """
+    Bulk revaluation entry points
+    - revalue_markets(): market price vectors (streamer / API market updates)
+    - revalue_positions(): prices already resolved per position (TP/SL sweep)
+    """
+
+    def __init__(self, min_change_pct: float = 0.1):
+        """
+        Args:
+            min_change_pct: Skip positions whose price moved less than this (%)
+        """
+        self.min_change_pct = min_change_pct
+        self._outcome_indexes: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+
+        # Stats
+        self.runs = 0
+        self.positions_seen = 0
+        self.positions_updated = 0
+
+    async def revalue_markets(self, prices_by_market: Dict[str, List[float]]) -> RevaluationResult:
+        """
+        Revalue every active position of the given markets
+
+        Args:
+            prices_by_market: market_id -> prices in outcome order
+        """
+        result = RevaluationResult()
+        if not prices_by_market:
+            return result
+
+        async with get_db() as db:
+            rows = (await db.execute(
+                select(
+                    Position.id, Position.user_id, Position.market_id, Position.outcome,
+                    Position.entry_price, Position.amount, Position.current_price, Market.outcomes
+                )
+                .join(Market, Market.id == Position.market_id)
+                .where(
+                    and_(
+                        Position.market_id.in_(list(prices_by_market)),
+                        Position.status == "active"
+                    )
+                )
+            )).all()
+
+        if not rows:
+            return result
+
+        for row in rows:
+            result.position_ids_by_market.setdefault(row[2], []).append(row[0])
+
+        await self._apply(rows, self.price_vector(rows, prices_by_market), result)
+        return result
+
+    def price_vector(self, rows: list, prices_by_market: Dict[str, List[float]]) -> np.ndarray:
+        """
+        New price of each row (NaN when the outcome can't be matched)
+
+        Args:
+            rows: (id, user_id, market_id, outcome, entry_price, amount, current_price, market outcomes)
+            prices_by_market: market_id -> prices in outcome order
+        """
+        # Price matrix: one row per market, NaN where an outcome has no price
+        market_rows = {market_id: i for i, market_id in enumerate(prices_by_market)}
+        width = max(len(prices) for prices in prices_by_market.values())
+        price_matrix = np.full((len(market_rows), width), np.nan)
+        for market_id, prices in prices_by_market.items():
+            price_matrix[market_rows[market_id], :len(prices)] = [
+                np.nan if price is None else float(price) for price in prices
+            ]
+
+        count = len(rows)
+        market_index = np.empty(count, dtype=np.int64)
+        outcome_index = np.empty(count, dtype=np.int64)
+        for i, (_, _, market_id, outcome, _, _, _, outcomes) in enumerate(rows):
+            market_index[i] = market_rows[market_id]
+            outcomes = outcomes or ['YES', 'NO']
+            index = self._outcome_index(outcome, outcomes)
+            # Price vector must match the market's outcomes, otherwise the index is meaningless
+            if len(prices_by_market[market_id]) != len(outcomes) or index is None or index >= width:
+                index = -1
+            outcome_index[i] = index
+
+        resolved = outcome_index >= 0
+        new_prices = np.full(count, np.nan)
+        new_prices[resolved] = price_matrix[market_index[resolved], outcome_index[resolved]]
+        return new_prices
+
+    async def revalue_positions(self, prices_by_position: Dict[int, float]) -> RevaluationResult:
+        """
+        Revalue positions whose current price is already known
+
+        Args:
+            prices_by_position: position_id -> current price of the held outcome
+        """
+        result = RevaluationResult()
+        if not prices_by_position:
+            return result
+
+        async with get_db() as db:
+            rows = (await db.execute(
+                select(
+                    Position.id, Position.user_id, Position.market_id, Position.outcome,
+                    Position.entry_price, Position.amount, Position.current_price
+                )
+                .where(
+                    and_(
+                        Position.id.in_(list(prices_by_position)),
+                        Position.status == "active"
+                    )
+                )
+            )).all()
+
+        if not rows:
+            return result
+
+        for row in rows:
+            result.position_ids_by_market.setdefault(row[2], []).append(row[0])
+        new_prices = np.array([prices_by_position[row[0]] for row in rows], dtype=np.float64)
+
+        await self._apply(rows, new_prices, result)
+        return result
+
+    def plan(self, rows: list, new_prices: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Vectorized P&L of the rows whose price changed enough
+
+        Returns:
+            (changed row mask, ids, new prices, pnl_amount, pnl_percentage) - all but the mask restricted to it
+        """
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        entry_prices = np.fromiter((row[4] or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+        amounts = np.fromiter((row[5] or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+        old_prices = np.fromiter(
+            (np.nan if row[6] is None else row[6] for row in rows), dtype=np.float64, count=len(rows)
+        )
+
+        mask = changed_mask(old_prices, new_prices, self.min_change_pct)
+        pnl_amount, pnl_percentage = compute_pnl(entry_prices[mask], amounts[mask], new_prices[mask])
+        return mask, ids[mask], new_prices[mask], pnl_amount, pnl_percentage
+
+    async def _apply(self, rows: list, new_prices: np.ndarray, result: RevaluationResult) -> None:
+        """Plan the rows, then one UPDATE for the changed ones"""
+        self.runs += 1
+        self.positions_seen += len(rows)
+
+        mask, changed_ids, changed_prices, pnl_amount, pnl_percentage = self.plan(rows, new_prices)
+        if not mask.any():
+            return
+
+        changed_ids = changed_ids.tolist()
+        changed_prices = changed_prices.tolist()
+
+        result.updated = await self._write(changed_ids, changed_prices, pnl_amount.tolist(), pnl_percentage.tolist())
+        result.prices = dict(zip(changed_ids, changed_prices))
+        result.user_ids = {row[1] for row, changed in zip(rows, mask) if changed}
+        self.positions_updated += result.updated
+
+    async def _write(
+        self,
+        ids: List[int],
+        current_prices: List[float],
+        pnl_amounts: List[float],
+        pnl_percentages: List[float]
+    ) -> int:
+        async with get_db() as db:
+            update = await db.execute(
+                BULK_UPDATE_SQL,
+                {
+                    'ids': ids,
+                    'current_prices': current_prices,
+                    'pnl_amounts': pnl_amounts,
+                    'pnl_percentages': pnl_percentages,
+                }
+            )
+            await db.commit()
+        return update.rowcount if update.rowcount is not None and update.rowcount >= 0 else len(ids)
+
+    def _outcome_index(self, outcome: str, outcomes: List[str]) -> Optional[int]:
+        """find_outcome_index, memoized per (outcome, market outcomes) - only a handful of distinct pairs"""
+        key = (outcome, tuple(outcomes))
+        if key not in self._outcome_indexes:
+            index = find_outcome_index(outcome, outcomes)
+            self._outcome_indexes[key] = -1 if index is None else index
+        index = self._outcome_indexes[key]
+        return None if index < 0 else index
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'runs': self.runs,
+            'positions_seen': self.positions_seen,
+            'positions_updated': self.positions_updated,
+        }
+
+
+_revaluation_engine: Optional[PositionRevaluationEngine] = None
+
+
+def get_revaluation_engine() -> PositionRevaluationEngine:
+    """Get or create PositionRevaluationEngine instance"""
+    global _revaluation_engine
+    if _revaluation_engine is None:
+        _revaluation_engine = PositionRevaluationEngine()
+    return _revaluation_engine
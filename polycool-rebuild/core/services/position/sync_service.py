@@ -0,0 +1,403 @@
+"""
+Position Sync Service - Shared, concurrent blockchain position sync
+- One pooled aiohttp session for every Polymarket data-api call
+- Current and closed positions fetched in parallel, working endpoint memoized
+- Conditional requests (ETag / Last-Modified) + per-wallet response fingerprints:
+  a wallet whose holdings did not change skips the DB diff entirely
+- sync_wallets(): N wallets with bounded concurrency (periodic worker sync)
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from infrastructure.config.settings import settings
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+DATA_API_URL = "https://data-api.polymarket.com"
+LEGACY_API_URL = "https://api.polymarket.com"
+
+# (url, wallet query param, extra params) - memoized endpoint first, then in this order
+CURRENT_ENDPOINTS: Tuple[Tuple[str, str, Dict[str, Any]], ...] = (
+    (f"{DATA_API_URL}/api/core/positions/current", "address", {}),
+    (f"{LEGACY_API_URL}/api/core/positions/current", "address", {}),
+    (f"{DATA_API_URL}/positions", "user", {}),
+)
+CLOSED_ENDPOINTS: Tuple[Tuple[str, str, Dict[str, Any]], ...] = (
+    # Most complete (realizedPnl for redeemable detection), most profitable first
+    (f"{DATA_API_URL}/closed-positions", "user", {"limit": 100, "sortBy": "REALIZEDPNL", "sortDirection": "DESC"}),
+    (f"{DATA_API_URL}/api/core/positions/closed", "address", {}),
+    (f"{LEGACY_API_URL}/api/core/positions/closed", "address", {}),
+)
+
+# Holdings only: curPrice moves every tick and is kept fresh by the price pipeline,
+# so it must not make a wallet look "changed"
+CURRENT_FINGERPRINT_FIELDS = ('conditionId', 'marketId', 'asset', 'outcome', 'outcomeIndex', 'size', 'avgPrice')
+CLOSED_FINGERPRINT_FIELDS = ('conditionId', 'marketId', 'outcome')
+
+
+def _positions_from_payload(data: Any) -> Optional[List[Dict]]:
+    """Handle both formats: [...] or {"positions": [...]} (None if neither)"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and 'positions' in data:
+        positions = data.get('positions')
+        return positions if isinstance(positions, list) else []
+    return None
+
+
+def fingerprint_positions(current: List[Dict], closed: List[Dict]) -> str:
+    """Order-independent digest of the fields the DB diff acts on"""
+    def _canonical(positions: List[Dict], fields: Tuple[str, ...]) -> List[str]:
+        rows = []
+        for position in positions:
+            row = {}
+            for name in fields:
+                value = position.get(name)
+                if isinstance(value, float):
+                    value = round(value, 6)
+                row[name] = value
+            rows.append(json.dumps(row, sort_keys=True, default=str))
+        return sorted(rows)
+
+    payload = json.dumps([
+        _canonical(current, CURRENT_FINGERPRINT_FIELDS),
+        _canonical(closed, CLOSED_FINGERPRINT_FIELDS),
+    ])
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+@dataclass
+class WalletSnapshot:
+    """Current + closed positions of a wallet as returned by the data-api"""
+    wallet_address: str
+    current: List[Dict]
+    closed: List[Dict]
+    fingerprint: str
+
+
+@dataclass
+class WalletSyncResult:
+    """Outcome of one wallet sync"""
+    user_id: int
+    wallet_address: str
+    diffed: bool  # False when the fingerprint matched and the DB diff was skipped
+    synced: int = 0
+
+
+@dataclass
+class BatchSyncResult:
+    """Outcome of a batch sync"""
+    wallets: int = 0
+    diffed: int = 0
+    unchanged: int = 0
+    errors: int = 0
+    synced: int = 0
+    duration_ms: float = 0.0
+    diffed_user_ids: Set[int] = field(default_factory=set)
+
+
+class PositionSyncService:
+    """
+    Blockchain -> DB position sync
+    - fetch_current() / fetch_closed() / fetch_wallet(): pooled, conditional HTTP
+    - sync_wallet(): fetch + DB diff (skipped for unchanged wallets unless forced)
+    - sync_wallets() / sync_active_users(): batch mode with bounded concurrency
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        full_diff_interval: Optional[int] = None,
+        max_wallets: int = 20000
+    ):
+        """
+        Args:
+            concurrency: Wallets synced in parallel in batch mode
+            full_diff_interval: Seconds after which an unchanged wallet is diffed anyway
+            max_wallets: Cap of remembered fingerprints / conditional-request validators
+        """
+        self.concurrency = concurrency or settings.trading.position_sync_concurrency
+        self.full_diff_interval = full_diff_interval or settings.trading.position_sync_full_diff_interval
+        self.max_wallets = max_wallets
+
+        self._session = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._endpoint_index: Dict[str, int] = {'current': 0, 'closed': 0}  # memoized working endpoint
+        # (url, wallet) -> (etag, last_modified, positions)
+        self._validators: "OrderedDict[Tuple[str, str], Tuple[Optional[str], Optional[str], List[Dict]]]" = OrderedDict()
+        # wallet -> (fingerprint, monotonic time of last DB diff, synced count)
+        self._fingerprints: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+
+        # Stats
+        self.requests = 0
+        self.not_modified = 0
+        self.request_errors = 0
+        self.diffs = 0
+        self.skipped_diffs = 0
+        self.batches = 0
+
+    async def _get_session(self):
+        """Shared aiohttp session (re-created if closed or bound to another event loop)"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            import aiohttp
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=self.concurrency * 2, ttl_dns_cache=300),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def fetch_current(self, wallet_address: str) -> List[Dict]:
+        """
+        Current positions of a wallet
+
+        Raises:
+            Exception: If every endpoint failed
+        """
+        positions = await self._fetch('current', CURRENT_ENDPOINTS, wallet_address)
+        if positions is None:
+            raise Exception(f"All position endpoints failed for wallet {wallet_address[:10]}...")
+        return positions
+
+    async def fetch_closed(self, wallet_address: str) -> List[Dict]:
+        """Closed positions of a wallet (empty list on failure - closed positions are optional)"""
+        positions = await self._fetch('closed', CLOSED_ENDPOINTS, wallet_address)
+        return positions if positions is not None else []
+
+    async def fetch_wallet(self, wallet_address: str) -> WalletSnapshot:
+        """Current and closed positions in parallel"""
+        current, closed = await asyncio.gather(
+            self.fetch_current(wallet_address),
+            self.fetch_closed(wallet_address)
+        )
+        return WalletSnapshot(
+            wallet_address=wallet_address,
+            current=current,
+            closed=closed,
+            fingerprint=fingerprint_positions(current, closed),
+        )
+
+    async def sync_wallet(self, user_id: int, wallet_address: str, force: bool = True) -> WalletSyncResult:
+        """
+        Sync one wallet to the database
+
+        Args:
+            user_id: User ID
+            wallet_address: User's Polygon wallet address
+            force: Always run the DB diff (user-triggered syncs); otherwise skip it
+                when the wallet's positions are unchanged since the last diff
+        """
+        snapshot = await self.fetch_wallet(wallet_address)
+        key = wallet_address.lower()
+
+        previous = self._fingerprints.get(key)
+        if (
+            not force
+            and previous
+            and previous[0] == snapshot.fingerprint
+            and time.monotonic() - previous[1] < self.full_diff_interval
+        ):
+            self.skipped_diffs += 1
+            return WalletSyncResult(user_id, wallet_address, diffed=False, synced=previous[2])
+
+        from .blockchain_sync import apply_blockchain_positions
+        synced = await apply_blockchain_positions(user_id, snapshot.current, snapshot.closed)
+        self.diffs += 1
+
+        self._fingerprints[key] = (snapshot.fingerprint, time.monotonic(), synced)
+        self._fingerprints.move_to_end(key)
+        while len(self._fingerprints) > self.max_wallets:
+            self._fingerprints.popitem(last=False)
+
+        return WalletSyncResult(user_id, wallet_address, diffed=True, synced=synced)
+
+    async def sync_wallets(
+        self,
+        wallets: Iterable[Tuple[int, str]],
+        concurrency: Optional[int] = None,
+        force: bool = False
+    ) -> BatchSyncResult:
+        """
+        Sync many wallets with bounded concurrency
+
+        Args:
+            wallets: (user_id, wallet_address) pairs
+            concurrency: Parallel wallets (default: POSITION_SYNC_CONCURRENCY)
+            force: Diff every wallet even if unchanged
+        """
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+        wallets = [(user_id, address) for user_id, address in wallets if address]
+
+        async def _sync_one(user_id: int, wallet_address: str) -> Optional[WalletSyncResult]:
+            async with semaphore:
+                try:
+                    return await self.sync_wallet(user_id, wallet_address, force=force)
+                except Exception as e:
+                    logger.warning(f"⚠️ Position sync failed for user {user_id} ({wallet_address[:10]}...): {e}")
+                    return None
+
+        results = await asyncio.gather(*(_sync_one(user_id, address) for user_id, address in wallets))
+
+        batch = BatchSyncResult(wallets=len(wallets))
+        for result in results:
+            if result is None:
+                batch.errors += 1
+            elif result.diffed:
+                batch.diffed += 1
+                batch.synced += result.synced
+                batch.diffed_user_ids.add(result.user_id)
+            else:
+                batch.unchanged += 1
+        batch.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.batches += 1
+        return batch
+
+    async def sync_active_users(self, active_days: int = 7) -> BatchSyncResult:
+        """
+        Batch sync of every active user (active position, or a position touched recently)
+        Positions cache of users whose wallet was diffed is invalidated afterwards.
+        """
+        from sqlalchemy import or_, select
+        from core.database.connection import get_db
+        from core.database.models import Position, User
+
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=active_days)  # naive UTC column
+        async with get_db() as db:
+            result = await db.execute(
+                select(User.id, User.polygon_address)
+                .where(
+                    User.polygon_address.isnot(None),
+                    User.id.in_(
+                        select(Position.user_id)
+                        .where(or_(Position.status == "active", Position.updated_at >= cutoff))
+                        .distinct()
+                    )
+                )
+            )
+            wallets = [(row[0], row[1]) for row in result.all()]
+
+        batch = await self.sync_wallets(wallets)
+
+        if batch.diffed_user_ids:
+            try:
+                from core.services.cache_manager import CacheManager
+                cache_manager = CacheManager()
+                for user_id in batch.diffed_user_ids:
+                    await cache_manager.invalidate_pattern(f"api:positions:{user_id}")
+            except Exception as e:
+                logger.warning(f"⚠️ Cache invalidation after position sync failed (non-fatal): {e}")
+
+        return batch
+
+    async def _fetch(
+        self,
+        kind: str,
+        endpoints: Tuple[Tuple[str, str, Dict[str, Any]], ...],
+        wallet_address: str
+    ) -> Optional[List[Dict]]:
+        """Try the memoized endpoint first, then the others; None if none answered"""
+        session = await self._get_session()
+        first = self._endpoint_index[kind]
+        order = [first] + [i for i in range(len(endpoints)) if i != first]
+
+        for index in order:
+            url, wallet_param, extra_params = endpoints[index]
+            try:
+                positions = await self._get_positions(session, url, {wallet_param: wallet_address, **extra_params})
+            except Exception as e:
+                self.request_errors += 1
+                logger.debug(f"⚠️ Error with {url} ({kind} positions): {e}, trying next...")
+                continue
+
+            if positions is not None:
+                if index != first:
+                    logger.info(f"✅ Using {url} for {kind} positions")
+                    self._endpoint_index[kind] = index
+                return positions
+
+        logger.debug(f"⚠️ Could not fetch {kind} positions for {wallet_address[:10]}...")
+        return None
+
+    async def _get_positions(self, session, url: str, params: Dict[str, Any]) -> Optional[List[Dict]]:
+        """One conditional GET - a 304 reuses the positions of the previous response"""
+        wallet_address = next(iter(params.values()))
+        key = (url, wallet_address.lower())
+        cached = self._validators.get(key)
+
+        headers = {}
+        if cached:
+            if cached[0]:
+                headers['If-None-Match'] = cached[0]
+            if cached[1]:
+                headers['If-Modified-Since'] = cached[1]
+
+        self.requests += 1
+        async with session.get(url, params=params, headers=headers) as response:
+            if response.status == 304 and cached:
+                self.not_modified += 1
+                self._validators.move_to_end(key)
+                return cached[2]
+
+            if response.status != 200:
+                if response.status == 429:
+                    logger.warning(f"⚠️ Rate limited (429) by {url}")
+                else:
+                    logger.debug(f"⚠️ API Error {response.status} from {url}")
+                return None
+
+            positions = _positions_from_payload(await response.json(content_type=None))
+            if positions is None:
+                logger.warning(f"⚠️ Unexpected response format from {url}")
+                return None
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._validators[key] = (etag, last_modified, positions)
+                self._validators.move_to_end(key)
+                while len(self._validators) > self.max_wallets * 2:
+                    self._validators.popitem(last=False)
+            else:
+                self._validators.pop(key, None)
+
+            return positions
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'endpoints': {
+                'current': CURRENT_ENDPOINTS[self._endpoint_index['current']][0],
+                'closed': CLOSED_ENDPOINTS[self._endpoint_index['closed']][0],
+            },
+            'requests': self.requests,
+            'not_modified': self.not_modified,
+            'request_errors': self.request_errors,
+            'diffs': self.diffs,
+            'skipped_diffs': self.skipped_diffs,
+            'batches': self.batches,
+            'fingerprints': len(self._fingerprints),
+        }
+
+
+_position_sync_service: Optional[PositionSyncService] = None
+
+
+def get_position_sync_service() -> PositionSyncService:
+    """Get or create PositionSyncService instance"""
+    global _position_sync_service
+    if _position_sync_service is None:
+        _position_sync_service = PositionSyncService()
+    return _position_sync_service
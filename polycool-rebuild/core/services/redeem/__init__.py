@@ -3,10 +3,20 @@ Redeem services - Detection and execution of position redemptions
 """
 from .redeemable_detector import get_redeemable_detector, RedeemablePositionDetector
 from .redemption_service import get_redemption_service, RedemptionService
+from .resolution_events import (
+    get_resolution_event_consumer,
+    publish_market_resolved,
+    ResolutionEventConsumer,
+    MARKET_RESOLVED_CHANNEL,
+)
 
 __all__ = [
     'get_redeemable_detector',
     'RedeemablePositionDetector',
     'get_redemption_service',
     'RedemptionService',
+    'get_resolution_event_consumer',
+    'publish_market_resolved',
+    'ResolutionEventConsumer',
+    'MARKET_RESOLVED_CHANNEL',
 ]
@@ -15,6 +15,42 @@ from infrastructure.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
+REDEMPTION_FEE_RATE = Decimal('0.01')  # 1% fee on winning redemptions
+
+
+def compute_redemption_values(tokens_held: float, avg_price: float, is_winner: bool) -> Dict[str, Decimal]:
+    """
+    Cost / value / P&L of a resolved position
+
+    Returns:
+        total_cost, gross_value, fee_amount, net_value, pnl, pnl_percentage
+    """
+    total_cost = Decimal(str(tokens_held * avg_price))
+
+    if is_winner:
+        # Winner: tokens worth 1 USDC each
+        gross_value = Decimal(str(tokens_held * 1.0))
+        fee_amount = gross_value * REDEMPTION_FEE_RATE
+        net_value = gross_value - fee_amount
+        pnl = net_value - total_cost
+        pnl_percentage = (pnl / total_cost * Decimal('100')) if total_cost > 0 else Decimal('0')
+    else:
+        # Loser: tokens worth 0
+        gross_value = Decimal('0')
+        fee_amount = Decimal('0')
+        net_value = Decimal('0')
+        pnl = -total_cost  # Loss = negative of investment
+        pnl_percentage = Decimal('-100.00')  # -100% loss
+
+    return {
+        'total_cost': total_cost,
+        'gross_value': gross_value,
+        'fee_amount': fee_amount,
+        'net_value': net_value,
+        'pnl': pnl,
+        'pnl_percentage': pnl_percentage,
+    }
+
 
 class RedeemablePositionDetector:
     """Detects and creates redeemable position records"""
@@ -218,39 +254,19 @@ class RedeemablePositionDetector:
         user_id: int
     ) -> Dict[str, Dict]:
         """
-        Batch query resolved markets with Redis caching
+        Batch query resolved markets (one indexed condition_id lookup per status)
 
         Args:
             condition_ids: List of condition_ids to check
-            user_id: User ID for cache key
+            user_id: User ID (logging)
 
         Returns:
             Dict mapping condition_id -> market dict
         """
         resolved_markets = {}
-        uncached_ids = []
-
-        # Check Redis cache first
-        for condition_id in condition_ids:
-            cache_key = f"redeemable_check:{user_id}:{condition_id}"
-            cached_result = await self.cache_manager.get(cache_key)
-
-            if cached_result:
-                # Cache hit - check if it's resolved
-                if cached_result == "RESOLVED":
-                    # Still need to fetch market data from DB
-                    uncached_ids.append(condition_id)
-                # If cached as "NOT_RESOLVED", skip DB query
-                logger.debug(f"✅ [REDEEM CACHE] Hit for {condition_id[:10]}...")
-            else:
-                uncached_ids.append(condition_id)
-
-        if not uncached_ids:
-            # All cached, but we still need market data for resolved ones
-            # Re-query DB for resolved markets (but fewer now)
-            uncached_ids = condition_ids
+        uncached_ids = list(dict.fromkeys(condition_ids))
 
-        # Batch query DB for uncached markets
+        # Batch query DB
         try:
             async with get_db() as db:
                 from sqlalchemy import select
@@ -311,10 +327,6 @@ class RedeemablePositionDetector:
                             'clob_token_ids': clob_token_ids
                         }
 
-                        # Cache result in Redis (5min TTL)
-                        cache_key = f"redeemable_check:{user_id}:{condition_id}"
-                        await self.cache_manager.set(cache_key, "RESOLVED", ttl=self.cache_ttl)
-
                 # Process PROPOSED markets with extreme prices
                 for market in proposed_markets_list:
                     # Check if prices are extreme (>= 0.999 and <= 0.001)
@@ -363,10 +375,6 @@ class RedeemablePositionDetector:
                                     'clob_token_ids': clob_token_ids
                                 }
 
-                                # Cache result in Redis (5min TTL)
-                                cache_key = f"redeemable_check:{user_id}:{condition_id}"
-                                await self.cache_manager.set(cache_key, "RESOLVED", ttl=self.cache_ttl)
-
                                 logger.debug(
                                     f"🔍 [REDEEM] Found PROPOSED market with extreme prices: "
                                     f"{market.id[:10]}... YES={yes_price:.4f}, NO={no_price:.4f}, "
@@ -750,22 +758,8 @@ class RedeemablePositionDetector:
 
                 # Calculate values based on winner/loser
                 winning_outcome_str = 'YES' if winning_outcome_num == 1 else 'NO'
-                total_cost = Decimal(str(tokens_held * avg_price))
-
-                if is_winner:
-                    # Winner: tokens worth 1 USDC each
-                    gross_value = Decimal(str(tokens_held * 1.0))
-                    fee_amount = gross_value * Decimal('0.01')  # 1% fee
-                    net_value = gross_value - fee_amount
-                    pnl = net_value - total_cost
-                    pnl_percentage = (pnl / total_cost * Decimal('100')) if total_cost > 0 else Decimal('0')
-                else:
-                    # Loser: tokens worth 0
-                    gross_value = Decimal('0')
-                    fee_amount = Decimal('0')
-                    net_value = Decimal('0')
-                    pnl = -total_cost  # Loss = negative of investment
-                    pnl_percentage = Decimal('-100.00')  # -100% loss
+                values = compute_redemption_values(tokens_held, avg_price, is_winner)
+                net_value = values['net_value']
 
                 # Create new record
                 resolved_pos = ResolvedPosition(
@@ -776,18 +770,13 @@ class RedeemablePositionDetector:
                     outcome=position_outcome,
                     position_id=position_id,  # Changed from token_id to position_id
                     tokens_held=Decimal(str(tokens_held)),
-                    total_cost=total_cost,
                     avg_buy_price=Decimal(str(avg_price)),
                     winning_outcome=winning_outcome_str,
                     is_winner=is_winner,
                     resolved_at=resolution_date,
-                    gross_value=gross_value,
-                    fee_amount=fee_amount,
-                    net_value=net_value,
-                    pnl=pnl,
-                    pnl_percentage=pnl_percentage,
                     status='PENDING',
-                    notified=False
+                    notified=False,
+                    **values
                 )
 
                 db.add(resolved_pos)
@@ -0,0 +1,297 @@
+"""
+Resolution Events - Event-driven redeemable position detection
+When a market gets resolved (poller upsert, resolution detector, API update) a
+resolution event is published; the consumer joins the resolved markets against
+all active positions in one query and creates the ResolvedPosition rows in bulk.
+A low-frequency reconcile catches events that were missed (Redis down, worker restart).
+"""
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import and_, exists, select, text
+
+from core.database.connection import get_db
+from core.database.models import Market, Position, ResolvedPosition
+from core.services.position.outcome_helper import find_outcome_index
+from core.services.redeem.redeemable_detector import compute_redemption_values
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Redis channel carrying the ids of markets that just got resolved
+MARKET_RESOLVED_CHANNEL = "market:resolved"
+
+# Insert computed rows unless the (user, condition) pair was recorded meanwhile
+# (the per-user redeem detector writes the same table)
+_INSERT_RESOLVED_POSITIONS_SQL = text("""
+    INSERT INTO resolved_positions (
+        user_id, market_id, condition_id, position_id, outcome,
+        tokens_held, total_cost, avg_buy_price,
+        market_title, winning_outcome, is_winner, resolved_at,
+        gross_value, fee_amount, net_value, pnl, pnl_percentage,
+        status, notified
+    )
+    SELECT
+        r.user_id, r.market_id, r.condition_id, r.position_id, r.outcome,
+        r.tokens_held, r.total_cost, r.avg_buy_price,
+        r.market_title, r.winning_outcome, r.is_winner, r.resolved_at,
+        r.gross_value, r.fee_amount, r.net_value, r.pnl, r.pnl_percentage,
+        'PENDING', false
+    FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(
+        user_id integer, market_id text, condition_id text, position_id text, outcome text,
+        tokens_held numeric, total_cost numeric, avg_buy_price numeric,
+        market_title text, winning_outcome text, is_winner boolean, resolved_at timestamp,
+        gross_value numeric, fee_amount numeric, net_value numeric, pnl numeric, pnl_percentage numeric
+    )
+    WHERE NOT EXISTS (
+        SELECT 1 FROM resolved_positions rp
+        WHERE rp.user_id = r.user_id AND rp.condition_id = r.condition_id
+    )
+    RETURNING id
+""")
+
+
+async def publish_market_resolved(market_ids: Iterable[str], source: str = "unknown") -> None:
+    """Notify the resolution consumer that markets just got resolved (best effort)"""
+    ids = list(dict.fromkeys(str(m) for m in market_ids if m))
+    if not ids:
+        return
+    try:
+        from core.services.redis_pubsub import get_redis_pubsub_service
+        await get_redis_pubsub_service().publish(MARKET_RESOLVED_CHANNEL, {'market_ids': ids, 'source': source})
+        logger.info(f"📣 Published resolution of {len(ids)} markets ({source})")
+    except Exception as e:
+        # Periodic reconciliation picks the markets up anyway
+        logger.debug(f"⚠️ Could not publish market resolution: {e}")
+
+
+def _as_list(value: Any) -> List[Any]:
+    """JSONB list column that may hold a JSON string"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+class ResolutionEventConsumer:
+    """
+    Creates ResolvedPosition rows for resolved markets
+    - Events are batched for a short window so a poller cycle resolving many markets costs one query
+    - reconcile(): same join over every resolved market, run every reconcile_interval
+    """
+
+    def __init__(self, reconcile_interval: int = 1800, batch_window: float = 1.0):
+        self.reconcile_interval = reconcile_interval
+        self.batch_window = batch_window
+        self.running = False
+        self._listening = False
+        self._pending: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+        # Stats
+        self.events_received = 0
+        self.markets_processed = 0
+        self.positions_created = 0
+        self.reconcile_count = 0
+        self.last_reconcile_at: Optional[datetime] = None
+
+    async def start(self) -> None:
+        """Subscribe to resolution events and start the reconcile loop"""
+        if self.running:
+            return
+        self.running = True
+        try:
+            from core.services.redis_pubsub import get_redis_pubsub_service
+            await get_redis_pubsub_service().subscribe(MARKET_RESOLVED_CHANNEL, self._on_resolved)
+            self._listening = True
+        except Exception as e:
+            logger.warning(f"⚠️ Resolution event subscription failed (reconciled periodically only): {e}")
+        self._reconcile_task = asyncio.create_task(self._reconcile_loop(), name="resolution_reconcile")
+        logger.info(f"🚀 Resolution event consumer started (reconcile interval: {self.reconcile_interval}s)")
+
+    async def stop(self) -> None:
+        """Unsubscribe and stop background tasks"""
+        self.running = False
+        if self._listening:
+            try:
+                from core.services.redis_pubsub import get_redis_pubsub_service
+                await get_redis_pubsub_service().unsubscribe(MARKET_RESOLVED_CHANNEL)
+            except Exception:
+                pass
+            self._listening = False
+        for task in (self._flush_task, self._reconcile_task):
+            if task and not task.done():
+                task.cancel()
+        logger.info("🛑 Resolution event consumer stopped")
+
+    async def _on_resolved(self, channel: str, data: str) -> None:
+        """Queue the markets of a resolution event"""
+        try:
+            payload = json.loads(data)
+            self._pending.update(str(m) for m in payload.get('market_ids') or [])
+            self.events_received += 1
+            if not self._flush_task or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush())
+        except Exception as e:
+            logger.error(f"❌ Error reading resolution event from {channel}: {e}")
+
+    async def _flush(self) -> None:
+        # Events received while a batch is processed form the next batch
+        while self._pending:
+            await asyncio.sleep(self.batch_window)
+            market_ids, self._pending = list(self._pending), set()
+            try:
+                await self.process_markets(market_ids)
+            except Exception as e:
+                logger.error(f"❌ Error processing {len(market_ids)} resolved markets: {e}", exc_info=True)
+
+    async def _reconcile_loop(self) -> None:
+        while self.running:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"❌ Resolution reconcile failed: {e}", exc_info=True)
+            await asyncio.sleep(self.reconcile_interval)
+
+    async def process_markets(self, market_ids: List[str]) -> int:
+        """
+        Create resolved positions for active positions in the given resolved markets
+
+        Returns:
+            Number of ResolvedPosition rows created
+        """
+        if not market_ids:
+            return 0
+        return await self._process(Position.market_id.in_(market_ids), len(market_ids))
+
+    async def reconcile(self) -> int:
+        """Create resolved positions missed by events (every resolved market)"""
+        created = await self._process(None, None)
+        self.reconcile_count += 1
+        self.last_reconcile_at = datetime.utcnow()
+        if created:
+            logger.info(f"✅ Resolution reconcile: {created} resolved positions created")
+        return created
+
+    async def _process(self, scope, market_count: Optional[int]) -> int:
+        # Active positions in resolved markets not yet recorded for (user, condition)
+        conditions = [
+            Position.status == 'active',
+            Position.amount > 0,
+            Market.is_resolved.is_(True),
+            Market.resolved_outcome.isnot(None),
+            Market.condition_id.isnot(None),
+            ~exists().where(and_(
+                ResolvedPosition.user_id == Position.user_id,
+                ResolvedPosition.condition_id == Market.condition_id,
+            )),
+        ]
+        if scope is not None:
+            conditions.append(scope)
+
+        query = (
+            select(
+                Position.user_id, Position.market_id, Position.outcome, Position.amount,
+                Position.entry_price, Position.position_id,
+                Market.title, Market.condition_id, Market.outcomes, Market.clob_token_ids,
+                Market.resolved_outcome, Market.resolved_at,
+            )
+            .join(Market, Market.id == Position.market_id)
+            .where(*conditions)
+        )
+
+        # Lock: an event flush and a reconcile must not compute the same pairs concurrently
+        async with self._lock:
+            async with get_db() as db:
+                rows = (await db.execute(query)).all()
+                records = self._build_records(rows)
+                created = 0
+                if records:
+                    result = await db.execute(
+                        _INSERT_RESOLVED_POSITIONS_SQL,
+                        {'rows': json.dumps(records, default=str)}
+                    )
+                    created = len(result.all())
+
+        if market_count:
+            self.markets_processed += market_count
+        self.positions_created += created
+        if created:
+            logger.info(
+                f"💰 Created {created} resolved positions "
+                f"({len(rows)} active positions in {len({r.market_id for r in rows})} resolved markets)"
+            )
+        return created
+
+    def _build_records(self, rows) -> List[Dict[str, Any]]:
+        """One resolved position per (user, condition), winner first"""
+        records: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            outcomes = _as_list(row.outcomes)
+            winner_index = find_outcome_index(row.resolved_outcome, outcomes)
+            if winner_index is None:
+                logger.debug(f"⚠️ Unknown winning outcome '{row.resolved_outcome}' for market {row.market_id}")
+                continue
+
+            token_ids = [str(t) for t in _as_list(row.clob_token_ids)]
+            if row.position_id and str(row.position_id) in token_ids:
+                position_index = token_ids.index(str(row.position_id))
+            else:
+                position_index = find_outcome_index(row.outcome, outcomes)
+            if position_index is None:
+                logger.debug(f"⚠️ Unknown position outcome '{row.outcome}' for market {row.market_id}")
+                continue
+
+            key = (row.user_id, row.condition_id)
+            is_winner = position_index == winner_index
+            if key in records and (records[key]['is_winner'] or not is_winner):
+                continue
+
+            tokens_held = float(row.amount)
+            avg_price = float(row.entry_price or 0)
+            values = compute_redemption_values(tokens_held, avg_price, is_winner)
+            records[key] = {
+                'user_id': row.user_id,
+                'market_id': row.market_id,
+                'condition_id': row.condition_id,
+                'position_id': row.position_id,
+                'outcome': 'YES' if position_index == 0 else 'NO',
+                'tokens_held': tokens_held,
+                'avg_buy_price': avg_price,
+                'market_title': row.title,
+                'winning_outcome': 'YES' if winner_index == 0 else 'NO',
+                'is_winner': is_winner,
+                'resolved_at': (row.resolved_at or datetime.utcnow()).isoformat(),
+                **{name: str(value) for name, value in values.items()},
+            }
+        return list(records.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': self.running,
+            'listening': self._listening,
+            'pending_markets': len(self._pending),
+            'events_received': self.events_received,
+            'markets_processed': self.markets_processed,
+            'positions_created': self.positions_created,
+            'reconcile_count': self.reconcile_count,
+            'last_reconcile_at': self.last_reconcile_at.isoformat() if self.last_reconcile_at else None,
+        }
+
+
+_consumer: Optional[ResolutionEventConsumer] = None
+
+
+def get_resolution_event_consumer() -> ResolutionEventConsumer:
+    """Get or create ResolutionEventConsumer instance"""
+    global _consumer
+    if _consumer is None:
+        from infrastructure.config.settings import settings
+        _consumer = ResolutionEventConsumer(reconcile_interval=settings.trading.resolution_reconcile_interval)
+    return _consumer
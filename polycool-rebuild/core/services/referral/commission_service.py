@@ -391,7 +391,7 @@ class CommissionService:
                 signed_tx = treasury_account.sign_transaction(tx)
 
                 # Send transaction
-                tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+                tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
                 tx_hash_hex = tx_hash.hex()
 
                 logger.info(f"💸 CLAIM: Payout transaction sent: {tx_hash_hex}")
@@ -0,0 +1,157 @@
+"""
+TP/SL Trigger Index - Sorted per-token thresholds for instant TP/SL detection
+Each price update finds crossed triggers by bisection (O(log n + k))
+instead of scanning every position with TP/SL.
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Redis channel prefix used to propagate TP/SL edits (set/edit/clear/close) to the monitor process
+TPSL_CHANGED_CHANNEL = "tpsl:changed"
+
+
+async def publish_tpsl_changed(position_id: int) -> None:
+    """Notify the TP/SL monitor that a position's TP/SL changed (best effort)"""
+    try:
+        from core.services.redis_pubsub import get_redis_pubsub_service
+        await get_redis_pubsub_service().publish(
+            f"{TPSL_CHANGED_CHANNEL}:{position_id}",
+            {'position_id': position_id}
+        )
+    except Exception as e:
+        # Safety-net sweep resyncs the index anyway
+        logger.debug(f"⚠️ Could not publish TP/SL change for position {position_id}: {e}")
+
+
+class TPSLTriggerIndex:
+    """
+    Per-token sorted threshold lists
+    - take profit: triggered when price >= threshold (prefix of the ascending list)
+    - stop loss: triggered when price <= threshold (suffix of the ascending list)
+    Markets map to their tokens so a market price update (prices in outcome order)
+    can be checked token by token.
+    """
+
+    def __init__(self):
+        self._take_profit: Dict[str, List[Tuple[float, int]]] = {}
+        self._stop_loss: Dict[str, List[Tuple[float, int]]] = {}
+        self._entries: Dict[int, Tuple[str, Optional[float], Optional[float]]] = {}  # position_id -> (token, tp, sl)
+        self._market_tokens: Dict[str, List[str]] = {}
+
+        # Stats
+        self.lookup_count = 0
+        self.trigger_count = 0
+
+    def set_market_tokens(self, market_id: str, token_ids: List[str]) -> None:
+        """Register token ids of a market (outcome order)"""
+        if token_ids:
+            self._market_tokens[str(market_id)] = [str(t) for t in token_ids]
+
+    def upsert(
+        self,
+        position_id: int,
+        token_id: str,
+        take_profit_price: Optional[float],
+        stop_loss_price: Optional[float]
+    ) -> None:
+        """Add or replace the TP/SL thresholds of a position (both None = remove)"""
+        self.remove(position_id)
+        if take_profit_price is None and stop_loss_price is None:
+            return
+
+        token_id = str(token_id)
+        if take_profit_price is not None:
+            insort(self._take_profit.setdefault(token_id, []), (float(take_profit_price), position_id))
+        if stop_loss_price is not None:
+            insort(self._stop_loss.setdefault(token_id, []), (float(stop_loss_price), position_id))
+        self._entries[position_id] = (
+            token_id,
+            float(take_profit_price) if take_profit_price is not None else None,
+            float(stop_loss_price) if stop_loss_price is not None else None,
+        )
+
+    def remove(self, position_id: int) -> None:
+        entry = self._entries.pop(position_id, None)
+        if not entry:
+            return
+        token_id, take_profit_price, stop_loss_price = entry
+        if take_profit_price is not None:
+            self._discard(self._take_profit, token_id, (take_profit_price, position_id))
+        if stop_loss_price is not None:
+            self._discard(self._stop_loss, token_id, (stop_loss_price, position_id))
+
+    def clear(self) -> None:
+        self._take_profit.clear()
+        self._stop_loss.clear()
+        self._entries.clear()
+
+    def find_triggered(self, token_id: str, price: float) -> List[Tuple[int, str]]:
+        """
+        Positions whose TP or SL is crossed at this price
+
+        Returns:
+            [(position_id, 'take_profit' | 'stop_loss')] - take profit wins if both are crossed
+        """
+        self.lookup_count += 1
+        token_id = str(token_id)
+        triggered: Dict[int, str] = {}
+
+        take_profits = self._take_profit.get(token_id)
+        if take_profits:
+            end = bisect_right(take_profits, (price, float('inf')))
+            for _, position_id in take_profits[:end]:
+                triggered[position_id] = 'take_profit'
+
+        stop_losses = self._stop_loss.get(token_id)
+        if stop_losses:
+            start = bisect_left(stop_losses, (price, float('-inf')))
+            for _, position_id in stop_losses[start:]:
+                triggered.setdefault(position_id, 'stop_loss')
+
+        self.trigger_count += len(triggered)
+        return list(triggered.items())
+
+    def find_triggered_for_market(self, market_id: str, prices: List[float]) -> List[Tuple[int, str, float]]:
+        """
+        Check a market price update (prices in outcome order)
+
+        Returns:
+            [(position_id, trigger_type, outcome_price)]
+        """
+        tokens = self._market_tokens.get(str(market_id))
+        if not tokens:
+            return []
+
+        results = []
+        for token_id, price in zip(tokens, prices):
+            if price is None:
+                continue
+            for position_id, trigger_type in self.find_triggered(token_id, float(price)):
+                results.append((position_id, trigger_type, float(price)))
+        return results
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        return {
+            'positions': len(self._entries),
+            'tokens': len(set(self._take_profit) | set(self._stop_loss)),
+            'lookup_count': self.lookup_count,
+            'trigger_count': self.trigger_count,
+        }
+
+    @staticmethod
+    def _discard(book: Dict[str, List[Tuple[float, int]]], token_id: str, item: Tuple[float, int]) -> None:
+        thresholds = book.get(token_id)
+        if not thresholds:
+            return
+        i = bisect_left(thresholds, item)
+        if i < len(thresholds) and thresholds[i] == item:
+            thresholds.pop(i)
+        if not thresholds:
+            book.pop(token_id, None)
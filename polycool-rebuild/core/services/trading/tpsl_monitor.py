@@ -3,15 +3,17 @@ TP/SL Monitor - Background task for monitoring Take Profit / Stop Loss orders
 Continuously monitors positions with TP/SL and triggers automatic sells when targets are hit
 """
 import asyncio
+import json
 import os
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from sqlalchemy import select, and_, or_
 
 from core.database.connection import get_db
 from core.database.models import Position, Market
 from core.services.position.position_service import position_service
 from core.services.position.price_updater import extract_position_price
+from core.services.position.revaluation import get_revaluation_engine
 from core.services.position.outcome_helper import find_outcome_index
 from core.services.clob.clob_service import get_clob_service
 from core.services.market_service import get_market_service
@@ -19,6 +21,7 @@ from core.services.user.user_service import user_service
 from core.services.cache_manager import CacheManager
 from core.services.notification_service import get_notification_service
 from core.models.notification_models import Notification, NotificationType, NotificationPriority
+from core.services.trading.tpsl_index import TPSLTriggerIndex, TPSL_CHANGED_CHANNEL
 from infrastructure.logging.logger import get_logger
 
 logger = get_logger(__name__)
@@ -50,9 +53,10 @@ class PositionFromAPI:
 class TPSLMonitor:
     """
     Background task that continuously monitors TP/SL orders
-    - HYBRID APPROACH: WebSocket triggers (< 100ms) + Polling fallback (10s)
-    - Checks every 10 seconds (polling mode)
-    - WebSocket-triggered checks for instant TP/SL execution
+    - EVENT-DRIVEN: price updates (WebSocket + poller) are checked against a
+      per-token trigger index (bisection, see TPSLTriggerIndex)
+    - Index kept in sync via Redis (tpsl:changed:<position_id>) and rebuilt every sweep
+    - Timer sweep is only a safety net (polling mode)
     - Batch checks all positions with TP/SL
     - Rate limited: max 100 positions per cycle
     - Batch updates positions
@@ -71,6 +75,11 @@ class TPSLMonitor:
         self.monitor_task: Optional[asyncio.Task] = None
         self.max_positions_per_cycle = 100  # Rate limit: max 100 positions per cycle
 
+        # Event-driven trigger index (DB mode only - SKIP_DB keeps the sweep)
+        self.trigger_index = TPSLTriggerIndex()
+        self._in_flight: Set[int] = set()  # Positions with a sell in progress
+        self.index_triggered_count = 0
+
     async def start(self) -> None:
         """Start the monitoring background task"""
         if self.running:
@@ -78,6 +87,14 @@ class TPSLMonitor:
             return
 
         self.running = True
+
+        if not SKIP_DB:
+            try:
+                from core.services.redis_pubsub import get_redis_pubsub_service
+                await get_redis_pubsub_service().subscribe(f"{TPSL_CHANGED_CHANNEL}:*", self._on_tpsl_changed)
+            except Exception as e:
+                logger.warning(f"⚠️ TP/SL change subscription failed (index resynced by sweep only): {e}")
+
         self.monitor_task = asyncio.create_task(self._monitor_loop())
         logger.info(f"🚀 TP/SL Monitor started (check interval: {self.check_interval}s)")
 
@@ -102,6 +119,8 @@ class TPSLMonitor:
 
         while self.running:
             try:
+                if not SKIP_DB:
+                    await self._rebuild_index()
                 await self._check_all_active_orders()
                 await asyncio.sleep(self.check_interval)
 
@@ -170,6 +189,7 @@ class TPSLMonitor:
 
             # Check each position
             triggered_positions = []
+            checked_prices: Dict[int, float] = {}
             for position in positions:
                 try:
                     market = markets_map.get(position.market_id)
@@ -182,6 +202,7 @@ class TPSLMonitor:
                     if current_price is None:
                         logger.debug(f"⚠️ Could not get price for position {position.id}")
                         continue
+                    checked_prices[position.id] = current_price
 
                     # Check TP/SL conditions
                     triggered = await self._check_tpsl_conditions(position, current_price)
@@ -192,6 +213,13 @@ class TPSLMonitor:
                     logger.error(f"❌ Error checking position {position.id}: {e}")
                     continue
 
+            # Revalue the checked positions in one statement (P&L shown in TP/SL alerts stays fresh)
+            if checked_prices and not SKIP_DB:
+                try:
+                    await get_revaluation_engine().revalue_positions(checked_prices)
+                except Exception as e:
+                    logger.warning(f"⚠️ TP/SL Monitor: bulk revaluation failed: {e}")
+
             # Execute sells for triggered positions (batch)
             if triggered_positions:
                 await self._execute_triggered_sells(triggered_positions)
@@ -201,6 +229,133 @@ class TPSLMonitor:
         except Exception as e:
             logger.error(f"❌ Error checking TP/SL orders: {e}")
 
+    def on_market_prices(self, market_id: str, prices: List[float]) -> None:
+        """
+        Check a price update against the trigger index (called by streamer and poller)
+        Never blocks the caller - triggered sells run in a background task
+
+        Args:
+            market_id: Market ID
+            prices: Prices in outcome order
+        """
+        if not self.running or not prices:
+            return
+
+        triggers = [
+            trigger for trigger in self.trigger_index.find_triggered_for_market(market_id, prices)
+            if trigger[0] not in self._in_flight
+        ]
+        if not triggers:
+            return
+
+        # Remove from the index until the sell is done (re-added by the sweep if it failed)
+        for position_id, _, _ in triggers:
+            self.trigger_index.remove(position_id)
+        self.index_triggered_count += len(triggers)
+        asyncio.create_task(self._execute_index_triggers(triggers))
+
+    async def _execute_index_triggers(self, triggers: List[Tuple[int, str, float]]) -> None:
+        """Load triggered positions, re-check conditions on fresh rows, then sell"""
+        try:
+            prices = {position_id: price for position_id, _, price in triggers}
+            async with get_db() as db:
+                result = await db.execute(
+                    select(Position).where(Position.id.in_(list(prices)))
+                )
+                positions = list(result.scalars().all())
+
+            triggered_positions = []
+            for position in positions:
+                current_price = prices[position.id]
+                triggered = await self._check_tpsl_conditions(position, current_price)
+                if triggered:
+                    logger.info(
+                        f"🎯 INDEX TRIGGER: {triggered} for position {position.id} @ ${current_price:.4f}"
+                    )
+                    triggered_positions.append((position, triggered, current_price))
+
+            if triggered_positions:
+                await self._execute_triggered_sells(triggered_positions)
+
+        except Exception as e:
+            logger.error(f"❌ Error executing index-triggered TP/SL: {e}")
+
+    async def _load_index_rows(self, position_ids: Optional[List[int]] = None) -> List[tuple]:
+        """Active positions with TP/SL + their market's outcomes/tokens"""
+        query = (
+            select(
+                Position.id, Position.market_id, Position.outcome,
+                Position.take_profit_price, Position.stop_loss_price,
+                Market.outcomes, Market.clob_token_ids
+            )
+            .join(Market, Market.id == Position.market_id)
+            .where(
+                and_(
+                    Position.status == "active",
+                    or_(
+                        Position.take_profit_price.isnot(None),
+                        Position.stop_loss_price.isnot(None)
+                    )
+                )
+            )
+        )
+        if position_ids is not None:
+            query = query.where(Position.id.in_(position_ids))
+
+        async with get_db() as db:
+            result = await db.execute(query)
+            return list(result.all())
+
+    def _index_row(self, row: tuple) -> None:
+        position_id, market_id, outcome, take_profit_price, stop_loss_price, outcomes, clob_token_ids = row
+        if isinstance(clob_token_ids, str):
+            try:
+                clob_token_ids = json.loads(clob_token_ids)
+            except (json.JSONDecodeError, TypeError):
+                clob_token_ids = None
+        if not clob_token_ids:
+            return  # Sweep still covers it
+
+        outcome_index = find_outcome_index(outcome, outcomes or ['YES', 'NO'])
+        if outcome_index is None or outcome_index >= len(clob_token_ids):
+            return
+
+        self.trigger_index.set_market_tokens(market_id, clob_token_ids)
+        self.trigger_index.upsert(
+            position_id,
+            clob_token_ids[outcome_index],
+            take_profit_price,
+            stop_loss_price
+        )
+
+    async def _rebuild_index(self) -> None:
+        """Full resync of the trigger index from DB (startup + every sweep)"""
+        try:
+            rows = await self._load_index_rows()
+            self.trigger_index.clear()
+            for row in rows:
+                if row[0] not in self._in_flight:
+                    self._index_row(row)
+            logger.debug(f"🗂️ TP/SL index rebuilt: {len(self.trigger_index)} positions")
+        except Exception as e:
+            logger.error(f"❌ Error rebuilding TP/SL index: {e}")
+
+    async def reload_position(self, position_id: int) -> None:
+        """Re-index one position after its TP/SL was set, edited, cleared or closed"""
+        rows = await self._load_index_rows([position_id])
+        self.trigger_index.remove(position_id)
+        for row in rows:
+            self._index_row(row)
+
+    async def _on_tpsl_changed(self, channel: str, data: str) -> None:
+        """Redis callback for tpsl:changed:<position_id>"""
+        try:
+            position_id = int(json.loads(data)['position_id'])
+            await self.reload_position(position_id)
+            logger.debug(f"🗂️ TP/SL index updated for position {position_id}")
+        except Exception as e:
+            logger.error(f"❌ Error handling TP/SL change on {channel}: {e}")
+
     def _api_position_to_position_obj(self, pos_data: Dict) -> PositionFromAPI:
         """Convert API position data to PositionFromAPI object for TP/SL monitoring"""
         return PositionFromAPI(pos_data)
@@ -371,6 +526,25 @@ class TPSLMonitor:
     async def _execute_triggered_sells(
         self,
         triggered_positions: List[tuple]
+    ) -> None:
+        """
+        Execute sells for triggered positions
+        Positions already being sold (index trigger, WebSocket hybrid, sweep) are skipped
+        """
+        triggered_positions = [t for t in triggered_positions if t[0].id not in self._in_flight]
+        if not triggered_positions:
+            return
+
+        position_ids = {t[0].id for t in triggered_positions}
+        self._in_flight |= position_ids
+        try:
+            await self._execute_sells(triggered_positions)
+        finally:
+            self._in_flight -= position_ids
+
+    async def _execute_sells(
+        self,
+        triggered_positions: List[tuple]
     ) -> None:
         """
         Execute sells for triggered positions
@@ -818,6 +992,9 @@ class TPSLMonitor:
         return {
             'running': self.running,
             'check_interval': self.check_interval,
+            'index': self.trigger_index.get_stats(),
+            'index_triggered_count': self.index_triggered_count,
+            'in_flight': len(self._in_flight),
         }
 
 
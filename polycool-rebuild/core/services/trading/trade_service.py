@@ -179,61 +179,7 @@ class TradeService:
             )
 
             if trade_result['success']:
-                # Calculate and record trade fee + commissions (for referral system)
-                try:
-                    internal_user_id = user_data.get('id')
-                    if internal_user_id:
-                        from core.services.referral.commission_service import get_commission_service
-                        commission_service = get_commission_service()
-
-                        # Get trade amount (USD spent for BUY, or USD received for SELL)
-                        trade_amount = trade_result.get('usd_spent') or trade_result.get('usd_received') or amount_usd
-                        trade_type = 'BUY'  # Default to BUY (we can detect SELL later if needed)
-
-                        # Calculate fee and commissions
-                        trade_fee = await commission_service.calculate_and_record_fee(
-                            user_id=internal_user_id,
-                            trade_amount=trade_amount,
-                            trade_type=trade_type,
-                            market_id=market_id,
-                            trade_id=None  # We don't have a trade_id yet (could add later)
-                        )
-
-                        if trade_fee:
-                            logger.info(f"💰 Fee calculated: ${trade_fee.final_fee_after_discount:.2f} for user {internal_user_id}")
-                        else:
-                            logger.debug(f"No fee calculated (fees disabled or error) for user {internal_user_id}")
-                except Exception as e:
-                    logger.error(f"❌ Error calculating fee/commission: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                    # Don't fail the trade if fee calculation fails
-
-                # Subscribe to WebSocket for real-time updates after trade
-                try:
-                    logger.info(f"🔌 Attempting to subscribe to WebSocket for market {market_id} after trade")
-                    if SKIP_DB:
-                        # Use API endpoint for subscription
-                        from core.services.api_client import get_api_client
-                        api_client = get_api_client()
-                        result_data = await api_client.subscribe_websocket(user_id, market_id)
-                        if result_data and result_data.get('success'):
-                            logger.info(f"✅ WebSocket subscription via API for market {market_id}: success")
-                        else:
-                            logger.warning(f"⚠️ WebSocket subscription via API failed: {result_data}")
-                    else:
-                        # Direct call to websocket_manager when DB access available
-                        from core.services.websocket_manager import websocket_manager
-                        logger.debug(f"WebSocket manager imported successfully")
-                        result = await websocket_manager.on_trade_executed(user_id, market_id)
-                        logger.info(f"✅ WebSocket subscription result for market {market_id}: {result}")
-                except Exception as e:
-                    logger.error(f"❌ Failed to subscribe to WebSocket after trade: {e}")
-                    import traceback
-                    logger.debug(f"Traceback: {traceback.format_exc()}")
-
-                # TODO: Update positions cache - commented out to avoid cache error
-                # await self._update_positions_cache(user_id)
+                await self._after_trade(user_id, user_data, market_id, amount_usd, trade_result)
 
                 logger.info(
                     f"✅ [TRADE] Trade executed successfully for user {user_id}: "
@@ -265,6 +211,120 @@ class TradeService:
                 'error': f'Execution error: {str(e)}'
             }
 
+    async def get_tradable_market(self, market_id: str) -> Optional[Dict[str, Any]]:
+        """Market data for trading (None if not found or inactive)"""
+        return await self._get_market_data(market_id)
+
+    async def complete_order(
+        self,
+        user,
+        market_data: Dict[str, Any],
+        outcome: str,
+        amount_usd: float,
+        token_id: str,
+        side: str,
+        order_result: Dict[str, Any],
+        is_copy_trade: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Record an order posted outside execute_market_order (e.g. batched copy trades)
+
+        Args:
+            user: User row
+            market_data: Market traded
+            order_result: Parsed CLOB response (see CLOBService.parse_market_order_response)
+
+        Returns:
+            Same format as execute_market_order
+        """
+        trade_result = await self._record_order_result(
+            user=user,
+            market_data=market_data,
+            outcome=outcome,
+            amount_usd=amount_usd,
+            is_copy_trade=is_copy_trade,
+            token_id=token_id,
+            side=side,
+            order_result=order_result
+        )
+        if not trade_result['success']:
+            return {
+                'status': 'failed',
+                'error': trade_result.get('error', 'Unknown error')
+            }
+
+        await self._after_trade(user.telegram_user_id, {'id': user.id}, market_data['id'], amount_usd, trade_result)
+        return {
+            'status': 'executed',
+            'trade': trade_result,
+            'market_title': market_data.get('title', 'Unknown Market')
+        }
+
+    async def _after_trade(
+        self,
+        user_id: int,
+        user_data: Dict[str, Any],
+        market_id: str,
+        amount_usd: float,
+        trade_result: Dict[str, Any]
+    ) -> None:
+        """Fees/commissions + WebSocket subscription after an executed trade (never fails the trade)"""
+        # Calculate and record trade fee + commissions (for referral system)
+        try:
+            internal_user_id = user_data.get('id')
+            if internal_user_id:
+                from core.services.referral.commission_service import get_commission_service
+                commission_service = get_commission_service()
+
+                # Get trade amount (USD spent for BUY, or USD received for SELL)
+                trade_amount = trade_result.get('usd_spent') or trade_result.get('usd_received') or amount_usd
+                trade_type = 'BUY'  # Default to BUY (we can detect SELL later if needed)
+
+                # Calculate fee and commissions
+                trade_fee = await commission_service.calculate_and_record_fee(
+                    user_id=internal_user_id,
+                    trade_amount=trade_amount,
+                    trade_type=trade_type,
+                    market_id=market_id,
+                    trade_id=None  # We don't have a trade_id yet (could add later)
+                )
+
+                if trade_fee:
+                    logger.info(f"💰 Fee calculated: ${trade_fee.final_fee_after_discount:.2f} for user {internal_user_id}")
+                else:
+                    logger.debug(f"No fee calculated (fees disabled or error) for user {internal_user_id}")
+        except Exception as e:
+            logger.error(f"❌ Error calculating fee/commission: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            # Don't fail the trade if fee calculation fails
+
+        # Subscribe to WebSocket for real-time updates after trade
+        try:
+            logger.info(f"🔌 Attempting to subscribe to WebSocket for market {market_id} after trade")
+            if SKIP_DB:
+                # Use API endpoint for subscription
+                from core.services.api_client import get_api_client
+                api_client = get_api_client()
+                result_data = await api_client.subscribe_websocket(user_id, market_id)
+                if result_data and result_data.get('success'):
+                    logger.info(f"✅ WebSocket subscription via API for market {market_id}: success")
+                else:
+                    logger.warning(f"⚠️ WebSocket subscription via API failed: {result_data}")
+            else:
+                # Direct call to websocket_manager when DB access available
+                from core.services.websocket_manager import websocket_manager
+                logger.debug(f"WebSocket manager imported successfully")
+                result = await websocket_manager.on_trade_executed(user_id, market_id)
+                logger.info(f"✅ WebSocket subscription result for market {market_id}: {result}")
+        except Exception as e:
+            logger.error(f"❌ Failed to subscribe to WebSocket after trade: {e}")
+            import traceback
+            logger.debug(f"Traceback: {traceback.format_exc()}")
+
+        # TODO: Update positions cache - commented out to avoid cache error
+        # await self._update_positions_cache(user_id)
+
     async def _check_wallet_ready(self, user) -> tuple[bool, str]:
         """Check if user's wallet is ready for trading"""
         try:
@@ -429,6 +489,37 @@ class TradeService:
                 outcome=outcome
             )
 
+            return await self._record_order_result(
+                user=user,
+                market_data=market_data,
+                outcome=outcome,
+                amount_usd=amount_usd,
+                is_copy_trade=is_copy_trade,
+                token_id=token_id,
+                side=side,
+                order_result=order_result
+            )
+
+        except Exception as e:
+            logger.error(f"Trade execution error: {e}")
+            return {
+                'success': False,
+                'error': f'Execution failed: {str(e)}'
+            }
+
+    async def _record_order_result(
+        self,
+        user,
+        market_data: Dict[str, Any],
+        outcome: str,
+        amount_usd: float,
+        is_copy_trade: bool,
+        token_id: str,
+        side: str,
+        order_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Create (BUY) or update/close (SELL) the position of an executed order"""
+        try:
             if order_result.get('success'):
                 if side.upper() == 'SELL':
                     # For SELL: Find and update/close existing position
@@ -540,7 +631,7 @@ class TradeService:
                 }
 
         except Exception as e:
-            logger.error(f"Trade execution error: {e}")
+            logger.error(f"Trade recording error: {e}")
             return {
                 'success': False,
                 'error': f'Execution failed: {str(e)}'
@@ -13,6 +13,9 @@ from infrastructure.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
+# User fields the cached trading clients are built from (see clob.client_cache)
+CLIENT_CREDENTIAL_FIELDS = {'polygon_private_key', 'polygon_address', 'api_key', 'api_secret', 'api_passphrase'}
+
 
 class UserService:
     """
@@ -183,8 +186,13 @@ class UserService:
                 await db.commit()
                 await db.refresh(user)
 
-                logger.info(f"✅ Updated user {telegram_user_id}")
-                return user
+            # Cached trading clients are derived from the keys / API credentials
+            if CLIENT_CREDENTIAL_FIELDS.intersection(kwargs):
+                from core.services.clob.client_cache import get_client_cache
+                await get_client_cache().invalidate(telegram_user_id)
+
+            logger.info(f"✅ Updated user {telegram_user_id}")
+            return user
 
         except Exception as e:
             logger.error(f"❌ Error updating user {telegram_user_id}: {e}")
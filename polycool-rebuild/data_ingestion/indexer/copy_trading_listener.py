@@ -7,10 +7,10 @@ import json
 import time
 import decimal
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database.connection import get_db
@@ -21,7 +21,14 @@ from core.services.market_service import get_market_service
 from core.services.trading.trade_service import trade_service
 from core.services.copy_trading.leader_position_tracker import get_leader_position_tracker
 from core.services.copy_trading.leader_balance_updater import get_leader_balance_updater
+from core.services.copy_trading.follower_graph import get_follower_graph
+from core.services.copy_trading.execution_engine import (
+    CopyTradeContext,
+    FollowerOrder,
+    get_copy_trade_execution_engine,
+)
 from core.services.notification_service import get_notification_service
+from core.services.deduplicator import get_deduplicator
 from core.models.notification_models import Notification, NotificationType, NotificationPriority
 from data_ingestion.indexer.watched_addresses.manager import get_watched_addresses_manager
 from infrastructure.logging.logger import get_logger
@@ -43,10 +50,11 @@ class CopyTradingListener:
         """Initialize Copy Trading Listener"""
         self.pubsub_service = get_redis_pubsub_service()
         self.watched_manager = get_watched_addresses_manager()
+        self.follower_graph = get_follower_graph()
         self.clob_service = get_clob_service()
+        self.execution_engine = get_copy_trade_execution_engine()
         self.running = False
-        self._processed_trades: Dict[str, float] = {}  # tx_id -> timestamp
-        self._deduplication_ttl = 300  # 5 minutes
+        self.deduplicator = get_deduplicator('copy_trade_listener', ttl=300)  # 5 minutes, shared across replicas
 
         # Market resolution cache (5min TTL)
         self._position_resolution_cache: Dict[str, Dict[str, Any]] = {}  # position_id -> resolution
@@ -118,6 +126,9 @@ class CopyTradingListener:
                 logger.error(f"❌ [COPY_TRADE] Failed to subscribe to pattern: {sub_error}", exc_info=True)
                 return
 
+            # In-process follower graph (address types + leader -> allocations)
+            await self.follower_graph.start()
+
             self.running = True
             logger.info("✅ [COPY_TRADE] Copy Trading Listener started and listening for messages")
 
@@ -153,14 +164,11 @@ class CopyTradingListener:
                 logger.warning(f"⚠️ Invalid trade message: missing tx_id or user_address")
                 return
 
-            # Deduplication check
-            if self._is_duplicate(tx_id):
+            # Deduplication check (claims the trade for this replica)
+            if not await self.deduplicator.claim(tx_id):
                 logger.debug(f"⏭️ Skipped duplicate trade: {tx_id[:20]}...")
                 return
 
-            # Mark as processed
-            self._mark_processed(tx_id)
-
             # Track metrics
             self._metrics['total_trades_processed'] += 1
 
@@ -170,90 +178,56 @@ class CopyTradingListener:
                 f"market_id: {trade_data.get('market_id', 'N/A')[:20]}...)"
             )
 
-            # Get leader address info
-            address_info = await self.watched_manager.is_watched_address(user_address)
-            logger.info(
-                f"🔍 [COPY_TRADE] Address info for {user_address[:10]}...: "
-                f"is_watched={address_info.get('is_watched')}, "
-                f"address_type={address_info.get('address_type')}"
-            )
+            # Classify leader address (in-process follower graph, no I/O)
+            await self.follower_graph.ensure_loaded()
+            watched_address = self.follower_graph.classify(user_address)
 
-            if not address_info['is_watched']:
+            if not watched_address:
                 logger.info(f"⏭️ [COPY_TRADE] Address {user_address[:10]}... not watched, skipping")
                 return
 
             # CRITICAL: Only process copy_leader addresses, skip smart_trader addresses
-            if address_info['address_type'] != 'copy_leader':
+            if watched_address.address_type != 'copy_leader':
                 logger.info(
                     f"⏭️ [COPY_TRADE] Skipped non-leader address: {user_address[:10]}... "
-                    f"(type: {address_info['address_type']}, tx_id: {tx_id[:20]}...)"
+                    f"(type: {watched_address.address_type}, tx_id: {tx_id[:20]}...)"
                 )
                 return
 
-            # Get watched address record
-            async with get_db() as db:
-                result = await db.execute(
-                    select(WatchedAddress)
-                    .where(WatchedAddress.address == user_address.lower())
-                    .where(WatchedAddress.is_active == True)
-                    .where(WatchedAddress.address_type == 'copy_leader')  # Additional safety check
-                )
-                watched_address = result.scalar_one_or_none()
+            # Active copy trading allocations for this leader
+            followers = self.follower_graph.get_followers(watched_address.id)
 
-            if not watched_address:
-                logger.warning(
-                    f"⚠️ [COPY_TRADE] Watched address not found in DB: {user_address[:10]}... "
-                    f"(tx_id: {tx_id[:20]}...)"
-                )
+            if not followers:
+                logger.info(f"⏭️ No active followers for leader {user_address[:10]}... (watched_address_id={watched_address.id})")
                 return
 
             logger.info(
-                f"✅ [COPY_TRADE] Found watched address: id={watched_address.id}, "
-                f"address_type={watched_address.address_type}, is_active={watched_address.is_active}"
+                f"🔄 [COPY_TRADE] Found {len(followers)} active followers for leader {user_address[:10]}... "
+                f"(watched_address_id={watched_address.id}, graph v{self.follower_graph.version}, tx_id={tx_id[:20]}...)"
             )
 
-            # Get all active copy trading allocations for this leader
-            async with get_db() as db:
-                result = await db.execute(
-                    select(CopyTradingAllocation)
-                    .where(
-                        and_(
-                            CopyTradingAllocation.leader_address_id == watched_address.id,
-                            CopyTradingAllocation.is_active == True
-                        )
-                    )
-                )
-                allocations = list(result.scalars().all())
+            # Each copy trade gets its own detached allocation (budget is refreshed and saved per trade)
+            allocations = [follower.to_model() for follower in followers]
 
-            if not allocations:
-                logger.info(f"⏭️ No active followers for leader {user_address[:10]}... (watched_address_id={watched_address.id})")
-                return
+            # Build the followers' trading clients while each copy trade resolves market/balance
+            asyncio.create_task(self._warm_follower_clients([allocation.user_id for allocation in allocations]))
 
-            logger.info(
-                f"🔄 [COPY_TRADE] Found {len(allocations)} active followers for leader {user_address[:10]}... "
-                f"(watched_address_id={watched_address.id}, tx_id={tx_id[:20]}...)"
+            # Resolve once, size all followers, then sign / post / settle their orders together
+            batch = await self.execution_engine.execute(
+                trade_data, allocations, self._resolve_copy_trade, self._size_copy_trade
             )
 
-            # Execute copy trades for each follower (parallel)
-            tasks = []
-            for allocation in allocations:
-                logger.info(
-                    f"📋 [COPY_TRADE] Creating task for follower user_id={allocation.user_id} "
-                    f"(allocation_id={allocation.id}, mode={allocation.mode})"
-                )
-                task = asyncio.create_task(
-                    self._execute_copy_trade(allocation, trade_data)
-                )
-                tasks.append(task)
-
-            # Wait for all copy trades (but don't fail if some fail)
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await asyncio.gather(
+                *(self._finalize_copy_trade(order, batch.context) for order in batch.orders),
+                return_exceptions=True
+            )
 
             success_count = sum(1 for r in results if r is True)
             failed_count = len(allocations) - success_count
             logger.info(
                 f"✅ [COPY_TRADE] Completed: {success_count}/{len(allocations)} successful, "
-                f"{failed_count} failed (tx_id={tx_id[:20]}...)"
+                f"{failed_count} failed ({batch.skipped} skipped, {batch.requests} post requests; "
+                f"{batch.format_timings()}) (tx_id={tx_id[:20]}...)"
             )
 
         except json.JSONDecodeError as e:
@@ -261,227 +235,302 @@ class CopyTradingListener:
         except Exception as e:
             logger.error(f"❌ Error handling trade message: {e}", exc_info=True)
 
-    async def _execute_copy_trade(
-        self,
-        allocation: CopyTradingAllocation,
-        trade_data: Dict[str, Any]
-    ) -> bool:
+    async def _warm_follower_clients(self, user_ids: List[int]) -> None:
+        """Pre-build followers' ClobClients so the orders of a burst skip client setup"""
+        try:
+            async with get_db() as db:
+                result = await db.execute(
+                    select(User.telegram_user_id)
+                    .where(and_(User.id.in_(user_ids), User.stage == "ready"))
+                )
+                telegram_user_ids = [row[0] for row in result.all()]
+
+            ready = await self.clob_service.warm_clients(telegram_user_ids)
+            logger.debug(f"🔥 [COPY_TRADE] {ready}/{len(telegram_user_ids)} follower clients ready")
+        except Exception as e:
+            logger.debug(f"⚠️ [COPY_TRADE] Follower client warm-up failed: {e}")
+
+    async def _resolve_copy_trade(self, trade_data: Dict[str, Any]) -> Optional[CopyTradeContext]:
         """
-        Execute copy trade for a follower
+        Resolve market, token and outcome of a leader trade (once for all followers)
 
         Args:
-            allocation: CopyTradingAllocation object
             trade_data: Trade data from Redis
 
         Returns:
-            True if successful, False otherwise
+            CopyTradeContext or None if the trade can't be copied
         """
-        try:
-            logger.info(
-                f"🔄 [COPY_TRADE] Starting copy trade execution for user {allocation.user_id} "
-                f"(allocation_id={allocation.id}, tx_type={trade_data.get('tx_type', 'BUY')}, "
-                f"tx_id={trade_data.get('tx_id', 'unknown')[:20]}...)"
-            )
-
-            # Get user
-            async with get_db() as db:
-                result = await db.execute(
-                    select(User)
-                    .where(User.id == allocation.user_id)
-                )
-                user = result.scalar_one_or_none()
-
-            if not user or user.stage != "ready":
-                logger.debug(f"⏭️ User {allocation.user_id} not ready for copy trading")
-                return False
+        # Resolve market and token ID (priority: position_id > market_id+outcome)
+        resolution = await self._resolve_market_and_token(trade_data)
+        if not resolution:
+            logger.warning(f"⚠️ Could not resolve market/token for trade {trade_data.get('tx_id', 'unknown')}")
+            return None
 
-            # Resolve market and token ID (priority: position_id > market_id+outcome)
-            resolution = await self._resolve_market_and_token(trade_data)
-            if not resolution:
-                logger.warning(f"⚠️ Could not resolve market/token for trade {trade_data.get('tx_id', 'unknown')}")
-                return False
+        market = resolution['market']
 
-            market = resolution['market']
+        # CRITICAL: Use resolved outcome as primary source of truth
+        # The resolution from _resolve_market_by_position_id uses position_id to find
+        # the exact outcome from the market's outcomes array
+        resolved_outcome = resolution.get('outcome')
+        if resolved_outcome and resolved_outcome != 'UNKNOWN':
+            outcome = resolved_outcome
+        else:
+            # Fallback: Use outcome index from trade_data to get outcome from market's outcomes array
+            trade_outcome_index = trade_data.get('outcome')
+            outcomes = market.get('outcomes', [])
 
-            # CRITICAL: Use resolved outcome as primary source of truth
-            # The resolution from _resolve_market_by_position_id uses position_id to find
-            # the exact outcome from the market's outcomes array
-            resolved_outcome = resolution.get('outcome')
-            if resolved_outcome and resolved_outcome != 'UNKNOWN':
-                outcome = resolved_outcome
-            else:
-                # Fallback: Use outcome index from trade_data to get outcome from market's outcomes array
-                trade_outcome_index = trade_data.get('outcome')
-                outcomes = market.get('outcomes', [])
-
-                if outcomes and isinstance(outcomes, list) and isinstance(trade_outcome_index, (int, str)):
-                    try:
-                        outcome_idx = int(trade_outcome_index)
-                        if 0 <= outcome_idx < len(outcomes):
-                            outcome = outcomes[outcome_idx]
-                        else:
-                            logger.warning(f"⚠️ Outcome index {outcome_idx} out of range for market {market.get('id')}")
-                            outcome = "UNKNOWN"
-                    except (ValueError, TypeError):
-                        logger.warning(f"⚠️ Invalid outcome index {trade_outcome_index}")
+            if outcomes and isinstance(outcomes, list) and isinstance(trade_outcome_index, (int, str)):
+                try:
+                    outcome_idx = int(trade_outcome_index)
+                    if 0 <= outcome_idx < len(outcomes):
+                        outcome = outcomes[outcome_idx]
+                    else:
+                        logger.warning(f"⚠️ Outcome index {outcome_idx} out of range for market {market.get('id')}")
                         outcome = "UNKNOWN"
-                else:
-                    logger.warning(f"⚠️ Cannot resolve outcome: no outcomes array or invalid index")
+                except (ValueError, TypeError):
+                    logger.warning(f"⚠️ Invalid outcome index {trade_outcome_index}")
                     outcome = "UNKNOWN"
+            else:
+                logger.warning(f"⚠️ Cannot resolve outcome: no outcomes array or invalid index")
+                outcome = "UNKNOWN"
+
+        trade_outcome_index = trade_data.get('outcome')
+        logger.info(
+            f"🔍 [COPY_TRADE] Outcome mapping: trade_outcome_index={trade_outcome_index}, "
+            f"resolved_outcome={resolved_outcome}, final_outcome={outcome}, "
+            f"market_outcomes={market.get('outcomes', [])}"
+        )
+
+        # CRITICAL: Use original market_id from webhook if available (for consistency with leader position tracking)
+        # The webhook stores leader positions using event.market_id (which is often a condition_id)
+        # But resolution returns market.id (which is a short numeric ID)
+        # We need to use the same market_id format that was used during BUY
+        original_market_id = trade_data.get('market_id')
+        resolved_market_id = market.get('id')
+
+        # Prefer original market_id from webhook for leader position lookup
+        # This ensures we use the same market_id format as stored in leader_positions
+        market_id_for_position = original_market_id if original_market_id else resolved_market_id
+        # Use resolved market_id for market data retrieval (API calls)
+        market_id_for_api = resolved_market_id
+
+        logger.info(
+            f"🔍 [COPY_TRADE] Resolved market: resolved_id={resolved_market_id}, "
+            f"original_id={original_market_id}, using_for_position={market_id_for_position}, "
+            f"outcome={outcome}, title={market.get('title', 'N/A')[:50]}..."
+        )
+
+        if not market_id_for_position:
+            logger.warning(f"⚠️ [COPY_TRADE] Missing market_id for position lookup")
+            return None
 
-            trade_outcome_index = trade_data.get('outcome')
-            logger.info(
-                f"🔍 [COPY_TRADE] Outcome mapping: trade_outcome_index={trade_outcome_index}, "
-                f"resolved_outcome={resolved_outcome}, final_outcome={outcome}, "
-                f"market_outcomes={market.get('outcomes', [])}"
-            )
-
-            # CRITICAL: Use original market_id from webhook if available (for consistency with leader position tracking)
-            # The webhook stores leader positions using event.market_id (which is often a condition_id)
-            # But resolution returns market.id (which is a short numeric ID)
-            # We need to use the same market_id format that was used during BUY
-            original_market_id = trade_data.get('market_id')
-            resolved_market_id = market.get('id')
-
-            # Prefer original market_id from webhook for leader position lookup
-            # This ensures we use the same market_id format as stored in leader_positions
-            market_id_for_position = original_market_id if original_market_id else resolved_market_id
-            # Use resolved market_id for market data retrieval (API calls)
-            market_id_for_api = resolved_market_id
-
-            logger.info(
-                f"🔍 [COPY_TRADE] Resolved market: resolved_id={resolved_market_id}, "
-                f"original_id={original_market_id}, using_for_position={market_id_for_position}, "
-                f"outcome={outcome}, title={market.get('title', 'N/A')[:50]}..."
-            )
+        if not market_id_for_api:
+            logger.warning(f"⚠️ [COPY_TRADE] Missing market_id for API calls")
+            return None
 
-            if not market_id_for_position:
-                logger.warning(f"⚠️ [COPY_TRADE] Missing market_id for position lookup")
-                return False
+        market_data = await trade_service.get_tradable_market(market_id_for_api)
+        if not market_data:
+            logger.warning(f"⚠️ [COPY_TRADE] Market {market_id_for_api} not found or inactive")
+            return None
 
-            if not market_id_for_api:
-                logger.warning(f"⚠️ [COPY_TRADE] Missing market_id for API calls")
-                return False
+        # Parse taking_amount (total USDC amount, already in real value, not units)
+        leader_amount_usdc = None
+        taking_amount_str = trade_data.get('taking_amount')
+        if taking_amount_str:
+            try:
+                leader_amount_usdc = float(taking_amount_str)
+            except (ValueError, TypeError):
+                logger.warning(f"⚠️ Invalid taking_amount: {taking_amount_str}")
+
+        return CopyTradeContext(
+            trade_data=trade_data,
+            tx_type=trade_data.get('tx_type', 'BUY').upper(),
+            market=market,
+            market_data=market_data,
+            token_id=resolution.get('token_id'),  # Exact position_id when available
+            outcome=outcome,
+            market_id_for_position=market_id_for_position,
+            market_id_for_api=market_id_for_api,
+            leader_amount_usdc=leader_amount_usdc,
+        )
+
+    async def _size_copy_trade(
+        self,
+        allocation: CopyTradingAllocation,
+        context: CopyTradeContext
+    ) -> Optional[FollowerOrder]:
+        """
+        Size the copy order of one follower
 
-            # Calculate copy trade amount (use taking_amount directly if available)
-            tx_type = trade_data.get('tx_type', 'BUY')
-            taking_amount_str = trade_data.get('taking_amount')  # Total USDC amount (string)
+        Args:
+            allocation: CopyTradingAllocation object
+            context: Resolved leader trade
 
-            # Parse taking_amount (already in USDC real value, not units)
-            leader_amount_usdc = None
-            if taking_amount_str:
-                try:
-                    leader_amount_usdc = float(taking_amount_str)
-                except (ValueError, TypeError):
-                    logger.warning(f"⚠️ Invalid taking_amount: {taking_amount_str}")
+        Returns:
+            FollowerOrder, or None if the follower doesn't copy this trade
+        """
+        trade_data = context.trade_data
+        logger.info(
+            f"🔄 [COPY_TRADE] Sizing copy trade for user {allocation.user_id} "
+            f"(allocation_id={allocation.id}, tx_type={context.tx_type}, "
+            f"tx_id={trade_data.get('tx_id', 'unknown')[:20]}...)"
+        )
+
+        # Get user
+        async with get_db() as db:
+            result = await db.execute(
+                select(User)
+                .where(User.id == allocation.user_id)
+            )
+            user = result.scalar_one_or_none()
 
-            # Get follower balance
-            balance_info = await self.clob_service.get_balance(user.telegram_user_id)
-            balance = balance_info.get('balance', 0.0) if balance_info else 0.0
+        if not user or user.stage != "ready":
+            logger.debug(f"⏭️ User {allocation.user_id} not ready for copy trading")
+            return None
 
-            if balance <= 0:
-                logger.debug(f"⏭️ User {user.telegram_user_id} has no balance")
-                return False
+        if not user.polygon_address:
+            logger.warning(f"❌ No polygon address for user {user.telegram_user_id}")
+            return None
 
-            # Refresh allocation budget with current balance (dynamic update)
-            allocation.update_budget_from_wallet(balance)
+        # Get follower balance
+        balance_info = await self.clob_service.get_balance(user.telegram_user_id)
+        balance = balance_info.get('balance', 0.0) if balance_info else 0.0
 
-            # Save updated budget to DB
-            async with get_db() as db:
-                db.add(allocation)
-                await db.commit()
-
-            # Calculate copy amount based on allocation settings and trade type
-            tx_type = trade_data.get('tx_type', 'BUY').upper()
-
-            if tx_type == 'BUY':
-                # BUY: Use calculation with leader balance for proportional mode
-                copy_amount = await self._calculate_buy_copy_amount(
-                    allocation=allocation,
-                    leader_amount_usdc=leader_amount_usdc,
-                    trade_data=trade_data,
-                    follower_balance=balance,
-                    mode=allocation.mode
-                )
-                logger.info(
-                    f"📊 [COPY_TRADE_BUY] BUY calculation result: {copy_amount} USD "
-                    f"for user {user.telegram_user_id}"
-                )
-            elif tx_type == 'SELL':
-                # SELL: Use position-based calculation
-                # Use market_id_for_position (original from webhook) for leader position lookup
-                logger.info(
-                    f"💰 [COPY_TRADE_SELL] Calculating SELL amount for user {user.telegram_user_id} "
-                    f"(leader_amount_usdc={leader_amount_usdc}, market_id={market_id_for_position}, outcome={outcome})"
-                )
-                sell_result = await self._calculate_sell_copy_amount(
-                    allocation=allocation,
-                    leader_amount_usdc=leader_amount_usdc,
-                    trade_data=trade_data,
-                    market_id=market_id_for_position,  # Use original market_id for leader position lookup
-                    outcome=outcome,
-                    user=user,
-                    resolved_market_id=market_id_for_api  # Pass resolved_id for follower position lookup
-                )
-                # sell_result is now a dict with 'tokens' and 'usd' keys
-                if isinstance(sell_result, dict):
-                    copy_amount = sell_result.get('usd', 0)
-                    trade_data['_tokens_to_sell'] = sell_result.get('tokens')  # Store for later use
-                else:
-                    copy_amount = sell_result if sell_result else 0
-                logger.info(
-                    f"📊 [COPY_TRADE_SELL] SELL calculation result: {copy_amount} USD "
-                    f"for user {user.telegram_user_id}"
-                )
+        if balance <= 0:
+            logger.debug(f"⏭️ User {user.telegram_user_id} has no balance")
+            return None
 
-            if copy_amount <= 0:
-                logger.warning(
-                    f"⏭️ [COPY_TRADE] Copy amount is 0 for user {user.telegram_user_id} "
-                    f"(allocation_id={allocation.id}, leader_amount_usdc={leader_amount_usdc})"
+        # Refresh allocation budget with current balance (dynamic update)
+        allocation.update_budget_from_wallet(balance)
+
+        # Save updated budget to DB (targeted UPDATE: the allocation is a cached snapshot copy)
+        async with get_db() as db:
+            await db.execute(
+                update(CopyTradingAllocation)
+                .where(CopyTradingAllocation.id == allocation.id)
+                .values(
+                    total_wallet_balance=allocation.total_wallet_balance,
+                    allocated_budget=allocation.allocated_budget,
+                    budget_remaining=allocation.budget_remaining,
+                    last_wallet_sync=allocation.last_wallet_sync,
+                    updated_at=allocation.updated_at,
                 )
-                return False
-
-            # Execute trade using the existing TradeService
-            # Pass is_copy_trade=True to mark position as copy trade
-            # Use market_id_for_api (resolved short ID) for API calls
+            )
+            await db.commit()
+
+        # Calculate copy amount based on allocation settings and trade type
+        tokens_to_sell = None
+        copy_amount = 0
+        if context.tx_type == 'BUY':
+            # BUY: Use calculation with leader balance for proportional mode
+            copy_amount = await self._calculate_buy_copy_amount(
+                allocation=allocation,
+                leader_amount_usdc=context.leader_amount_usdc,
+                trade_data=trade_data,
+                follower_balance=balance,
+                mode=allocation.mode
+            )
             logger.info(
-                f"💰 [COPY_TRADE] Executing {tx_type} trade for user {user.telegram_user_id}: "
-                f"${copy_amount:.2f} on market {market_id_for_api} ({outcome}) "
-                f"(allocation_id={allocation.id}, tx_id={trade_data.get('tx_id', 'unknown')[:20]}...)"
+                f"📊 [COPY_TRADE_BUY] BUY calculation result: {copy_amount} USD "
+                f"for user {user.telegram_user_id}"
+            )
+        elif context.tx_type == 'SELL':
+            # SELL: Use position-based calculation
+            # Use market_id_for_position (original from webhook) for leader position lookup
+            logger.info(
+                f"💰 [COPY_TRADE_SELL] Calculating SELL amount for user {user.telegram_user_id} "
+                f"(leader_amount_usdc={context.leader_amount_usdc}, market_id={context.market_id_for_position}, "
+                f"outcome={context.outcome})"
+            )
+            sell_result = await self._calculate_sell_copy_amount(
+                allocation=allocation,
+                leader_amount_usdc=context.leader_amount_usdc,
+                trade_data=trade_data,
+                market_id=context.market_id_for_position,  # Use original market_id for leader position lookup
+                outcome=context.outcome,
+                user=user,
+                resolved_market_id=context.market_id_for_api  # Pass resolved_id for follower position lookup
+            )
+            # sell_result is a dict with 'tokens' and 'usd' keys
+            if isinstance(sell_result, dict):
+                copy_amount = sell_result.get('usd', 0)
+                tokens_to_sell = sell_result.get('tokens')
+            else:
+                copy_amount = sell_result if sell_result else 0
+            logger.info(
+                f"📊 [COPY_TRADE_SELL] SELL calculation result: {copy_amount} USD "
+                f"for user {user.telegram_user_id}"
             )
 
-            # Get token_id from resolution (if available) to ensure we use the exact position_id
-            token_id = resolution.get('token_id') if resolution else None
-
-            # For SELL, get tokens directly from the calculation we already did
-            tokens_to_sell = trade_data.get('_tokens_to_sell') if tx_type == 'SELL' else None
-
-            result = await trade_service.execute_market_order(
-                user_id=user.telegram_user_id,
-                market_id=market_id_for_api,  # Use resolved market_id for API calls
-                outcome=outcome,
-                amount_usd=copy_amount,
-                order_type='IOC',  # Immediate or Cancel
-                is_copy_trade=True,  # Mark as copy trade
-                token_id=token_id,  # Pass token_id from resolution (position_id) for precise position creation
-                side=tx_type,  # Pass tx_type ('BUY' or 'SELL') to execute correct order type
-                tokens_to_sell=tokens_to_sell  # For SELL: pass tokens directly to avoid conversion errors
+        if copy_amount <= 0:
+            logger.warning(
+                f"⏭️ [COPY_TRADE] Copy amount is 0 for user {user.telegram_user_id} "
+                f"(allocation_id={allocation.id}, leader_amount_usdc={context.leader_amount_usdc})"
             )
+            return None
+
+        if context.tx_type == 'SELL':
+            order_amount = tokens_to_sell
+            if not order_amount or order_amount <= 0:
+                # Convert USD amount to tokens using current price
+                current_price = context.market_data.get('last_mid_price') or context.market_data.get('last_trade_price') or 0.5
+                order_amount = copy_amount / current_price if current_price > 0 else 0
+        else:
+            order_amount = copy_amount
+
+        logger.info(
+            f"💰 [COPY_TRADE] {context.tx_type} order for user {user.telegram_user_id}: "
+            f"${copy_amount:.2f} on market {context.market_id_for_api} ({context.outcome}) "
+            f"(allocation_id={allocation.id}, tx_id={trade_data.get('tx_id', 'unknown')[:20]}...)"
+        )
+
+        order = FollowerOrder(
+            allocation=allocation,
+            user=user,
+            side=context.tx_type,
+            amount_usd=copy_amount,
+            order_amount=order_amount
+        )
+        if context.tx_type == 'BUY' and copy_amount > balance:
+            order.fail(f'Insufficient balance: Required: ${copy_amount:.2f}, Available: ${balance:.2f}')
+        elif order_amount <= 0:
+            order.fail('Invalid price for SELL order')
+        return order
+
+    async def _finalize_copy_trade(self, order: FollowerOrder, context: CopyTradeContext) -> bool:
+        """
+        Allocation stats + notification of one follower's copy order
 
+        Returns:
+            True if the order executed
+        """
+        user, allocation, result = order.user, order.allocation, order.result
+        try:
             logger.info(
                 f"📊 [COPY_TRADE] Trade execution result for user {user.telegram_user_id}: "
                 f"status={result.get('status') if result else 'None'}, "
                 f"error={result.get('error') if result else 'None'}"
             )
 
-            if result and result.get('status') == 'executed':
-                # Update allocation stats
+            if order.executed:
+                # Update allocation stats (DB-side increment: concurrent trades of the
+                # same allocation all start from the same cached snapshot)
                 async with get_db() as db:
-                    allocation.total_copied_trades += 1
-                    # Fix: Convert copy_amount (float) to float for DB storage (total_invested is Float column)
-                    allocation.total_invested += float(copy_amount)
-                    allocation.updated_at = datetime.now(timezone.utc)
+                    stats = await db.execute(
+                        update(CopyTradingAllocation)
+                        .where(CopyTradingAllocation.id == allocation.id)
+                        .values(
+                            total_copied_trades=CopyTradingAllocation.total_copied_trades + 1,
+                            # Convert copy_amount to float for DB storage (total_invested is Float column)
+                            total_invested=CopyTradingAllocation.total_invested + float(order.amount_usd),
+                            updated_at=datetime.now(timezone.utc),
+                        )
+                        .returning(CopyTradingAllocation.total_copied_trades, CopyTradingAllocation.total_invested)
+                    )
+                    row = stats.one_or_none()
                     await db.commit()
+                if row:
+                    allocation.total_copied_trades, allocation.total_invested = row
 
                 # Send copy trade notification (async, non-blocking, fire-and-forget)
                 try:
@@ -489,9 +538,9 @@ class CopyTradingListener:
                         self._send_copy_trade_notification(
                             user.telegram_user_id,
                             allocation,
-                            market,
-                            tx_type,
-                            copy_amount
+                            context.market,
+                            context.tx_type,
+                            order.amount_usd
                         )
                     )
                     logger.debug(f"📨 [COPY_TRADE] Notification task created for user {user.telegram_user_id}")
@@ -501,7 +550,7 @@ class CopyTradingListener:
 
                 self._metrics['successful_copies'] += 1
                 logger.info(
-                    f"✅ Copied {tx_type} trade: ${copy_amount:.2f} for user {user.telegram_user_id}"
+                    f"✅ Copied {context.tx_type} trade: ${order.amount_usd:.2f} for user {user.telegram_user_id}"
                 )
                 return True
             else:
@@ -513,7 +562,7 @@ class CopyTradingListener:
                 return False
 
         except Exception as e:
-            logger.error(f"❌ Error executing copy trade: {e}", exc_info=True)
+            logger.error(f"❌ Error finalizing copy trade: {e}", exc_info=True)
             return False
 
     async def _resolve_market_and_token(self, trade_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -585,24 +634,21 @@ class CopyTradingListener:
         try:
             logger.info(f"🔍 [RESOLUTION] Resolving position_id: ...{position_id[-20:]}")
 
-            # Query markets table for market containing this position_id in clob_token_ids
-            async with get_db() as db:
-                import json
-                from sqlalchemy import or_, func
+            # position_id -> market via the market_tokens projection (primary-key lookup)
+            from core.services.market_service.token_resolver import get_token_resolver
+            token_info = await get_token_resolver().resolve(position_id)
 
-                # Search for market with this position_id in clob_token_ids (JSONB)
-                # Use PostgreSQL JSONB contains operator
-                result = await db.execute(
-                    select(Market)
-                    .where(
-                        or_(
-                            Market.clob_token_ids.contains([position_id]),  # JSONB array contains
-                            Market.clob_token_ids.contains([str(position_id)]),  # Try as string too
-                        ),
-                        Market.is_active == True
+            async with get_db() as db:
+                matching_market = None
+                if token_info:
+                    result = await db.execute(
+                        select(Market)
+                        .where(
+                            Market.id == token_info.market_id,
+                            Market.is_active == True
+                        )
                     )
-                )
-                matching_market = result.scalar_one_or_none()
+                    matching_market = result.scalar_one_or_none()
 
                 if not matching_market:
                     logger.warning(f"⚠️ [RESOLUTION] No market found in DB for position_id ...{position_id[-20:]}")
@@ -616,19 +662,8 @@ class CopyTradingListener:
                     logger.info(f"🔄 [RESOLUTION] Market not in DB, will try fallback resolution methods")
                     return None
 
-                # Parse clob_token_ids to find index (now always a list after storage fix)
                 clob_token_ids = matching_market.clob_token_ids or []
-
-                # Find index of position_id
-                token_index = -1
-                for i, token_id in enumerate(clob_token_ids):
-                    if str(token_id) == str(position_id):
-                        token_index = i
-                        break
-
-                if token_index < 0:
-                    logger.error(f"❌ position_id not found in clob_token_ids array")
-                    return None
+                token_index = token_info.outcome_index
 
                 # Get outcome from outcomes array
                 outcomes = matching_market.outcomes or []
@@ -1227,22 +1262,6 @@ class CopyTradingListener:
             logger.error(f"❌ Error calculating copy amount: {e}")
             return 0.0
 
-    def _is_duplicate(self, tx_id: str) -> bool:
-        """Check if trade was already processed"""
-        # Clean old entries
-        current_time = time.time()
-        self._processed_trades = {
-            k: v for k, v in self._processed_trades.items()
-            if current_time - v < self._deduplication_ttl
-        }
-
-        # Check if exists
-        return tx_id in self._processed_trades
-
-    def _mark_processed(self, tx_id: str) -> None:
-        """Mark trade as processed"""
-        self._processed_trades[tx_id] = time.time()
-
     async def _send_copy_trade_notification(
         self,
         user_id: int,
@@ -1334,11 +1353,13 @@ class CopyTradingListener:
         """Get listener statistics"""
         return {
             "running": self.running,
-            "processed_trades_count": len(self._processed_trades),
-            "deduplication_ttl": self._deduplication_ttl,
+            "processed_trades_count": len(self.deduplicator),
+            "deduplication": self.deduplicator.get_stats(),
             "metrics": self._metrics.copy(),
             "cache_size": len(self._position_resolution_cache),
             "api_fetch_failures_cache_size": len(self._api_fetch_failures),
+            "follower_graph": self.follower_graph.get_stats(),
+            "execution_engine": self.execution_engine.get_stats(),
         }
 
 
@@ -23,6 +23,7 @@ class WatchedAddressesManager:
     - Syncs addresses to Redis cache (5min TTL)
     - Used by indexer-ts for filtering (optional)
     - Used by webhook receiver for fast validation
+    - Reconciles the in-process follower graph when it is loaded (copy-trade listener)
     """
 
     def __init__(self):
@@ -76,10 +77,16 @@ class WatchedAddressesManager:
             await self.cache_manager.set(
                 self.cache_key,
                 cache_data,
-                data_type='user_profile',  # Use longer TTL
+                data_type='watched_addresses',  # Near-cached (hot on the copy-trade path)
                 ttl=self.cache_ttl
             )
 
+            # Reconcile the follower graph (kept fresh by change notifications in between)
+            from core.services.copy_trading.follower_graph import get_follower_graph
+            follower_graph = get_follower_graph()
+            if follower_graph.loaded:
+                await follower_graph.reload()
+
             logger.info(
                 f"✅ Refreshed watched addresses cache: "
                 f"{len(smart_wallets)} smart wallets, "
@@ -110,7 +117,7 @@ class WatchedAddressesManager:
             Cache data dictionary or empty dict if not found
         """
         try:
-            cached = await self.cache_manager.get(self.cache_key, data_type='user_profile')
+            cached = await self.cache_manager.get(self.cache_key, data_type='watched_addresses')
             if cached:
                 return cached
 
@@ -141,6 +148,16 @@ class WatchedAddressesManager:
             Dict with 'is_watched' (bool) and 'address_type' (str or None)
         """
         try:
+            # Follower graph loaded in this process: O(1) lookup, no I/O
+            from core.services.copy_trading.follower_graph import get_follower_graph
+            follower_graph = get_follower_graph()
+            if follower_graph.loaded:
+                entry = follower_graph.classify(address)
+                return {
+                    'is_watched': entry is not None,
+                    'address_type': entry.address_type if entry else None
+                }
+
             address_lower = address.lower()
             cached = await self.get_cached_addresses()
 
@@ -224,6 +241,7 @@ class WatchedAddressesManager:
                     existing.updated_at = datetime.now(timezone.utc)
                     await db.commit()
                     await db.refresh(existing)
+                    await self._publish_changed(address=normalized_addr)
                     logger.debug(f"✅ Updated watched address: {normalized_addr[:10]}... ({address_type})")
                     return existing
                 else:
@@ -243,6 +261,7 @@ class WatchedAddressesManager:
                     db.add(watched_addr)
                     await db.commit()
                     await db.refresh(watched_addr)
+                    await self._publish_changed(address=normalized_addr)
                     logger.debug(f"✅ Created watched address: {normalized_addr[:10]}... ({address_type})")
                     return watched_addr
 
@@ -304,6 +323,7 @@ class WatchedAddressesManager:
                     watched_addr.is_active = False
                     watched_addr.updated_at = datetime.now(timezone.utc)
                     await db.commit()
+                    await self._publish_changed(address=address)
 
                     # Refresh cache
                     await self.refresh_cache()
@@ -335,6 +355,13 @@ class WatchedAddressesManager:
             logger.error(f"❌ Error getting all active addresses: {e}")
             return []
 
+    @staticmethod
+    async def _publish_changed(address: str) -> None:
+        """Propagate a watched address change to the follower graph"""
+        # Lazy import: core.services.copy_trading imports this module
+        from core.services.copy_trading.follower_graph import publish_follower_graph_changed
+        await publish_follower_graph_changed(address=address)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get manager statistics"""
         # Note: This is synchronous, so we can't await get_cached_addresses
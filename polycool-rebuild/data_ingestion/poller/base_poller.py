@@ -10,7 +10,9 @@ from typing import List, Dict, Optional
 from dateutil import parser as date_parser
 from infrastructure.config.settings import settings
 from infrastructure.logging.logger import get_logger
-from sqlalchemy import text
+from data_ingestion.poller.market_upserter import MarketBulkUpserter, UpsertFailure
+from data_ingestion.poller.market_fingerprint import compute_fingerprint, get_market_fingerprint_cache
+from data_ingestion.poller.gamma_scheduler import get_gamma_scheduler
 
 logger = get_logger(__name__)
 
@@ -43,6 +45,16 @@ def safe_json_parse(value):
         logger.warning(f"Failed to parse JSON: {value}")
         return None
 
+
+def _isoformat_naive(dt: Optional[datetime]) -> Optional[str]:
+    """Serialize a datetime as naive UTC ISO string (markets columns are timestamp without tz)"""
+    if dt is None:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat()
+
+
 def extract_category(market: Dict) -> Optional[str]:
     """
     Extract category from market data
@@ -89,6 +101,9 @@ class BaseGammaAPIPoller:
         self.running = False
         self.client: Optional[httpx.AsyncClient] = None
         self.max_retries = 3
+        self.scheduler = get_gamma_scheduler()  # Shared across pollers
+        self.upserter = MarketBulkUpserter()
+        self.fingerprints = get_market_fingerprint_cache()  # Shared across pollers
 
         # Stats
         self.poll_count = 0
@@ -97,6 +112,20 @@ class BaseGammaAPIPoller:
         self.last_poll_time = None
         self.consecutive_errors = 0
 
+        # Change detection stats (fetched -> changed -> written)
+        self.fetched_count = 0
+        self.changed_count = 0
+        self.written_count = 0
+        self.last_upsert_counts = {'fetched': 0, 'changed': 0, 'written': 0}
+
+        # Upsert stats
+        self.upsert_rows_total = 0
+        self.upsert_seconds_total = 0.0
+        self.upsert_statements_total = 0
+        self.upsert_failed_count = 0
+        self.last_upsert_rows_per_sec = 0.0
+        self.last_upsert_failures: List[UpsertFailure] = []
+
     async def start_polling(self) -> None:
         """Main polling loop"""
         self.running = True
@@ -125,7 +154,21 @@ class BaseGammaAPIPoller:
             'market_count': self.market_count,
             'upsert_count': self.upsert_count,
             'last_poll_time': self.last_poll_time.isoformat() if self.last_poll_time else None,
-            'consecutive_errors': self.consecutive_errors
+            'consecutive_errors': self.consecutive_errors,
+            'gamma_scheduler': self.scheduler.get_stats(),
+            'fetched_count': self.fetched_count,
+            'changed_count': self.changed_count,
+            'written_count': self.written_count,
+            'last_upsert_counts': self.last_upsert_counts,
+            'upsert_statements': self.upsert_statements_total,
+            'upsert_failed_count': self.upsert_failed_count,
+            'upsert_rows_per_sec': (
+                self.upsert_rows_total / self.upsert_seconds_total if self.upsert_seconds_total > 0 else 0.0
+            ),
+            'last_upsert_rows_per_sec': self.last_upsert_rows_per_sec,
+            'last_upsert_failures': [
+                {'market_id': f.market_id, 'error': f.error} for f in self.last_upsert_failures
+            ]
         }
 
     async def _poll_cycle(self) -> None:
@@ -135,6 +178,7 @@ class BaseGammaAPIPoller:
     async def _fetch_api(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
         """
         Generic API fetch with retry logic
+        - All requests go through the shared GammaRequestScheduler (rate limit, coalescing)
         - 404 errors are not retried (market doesn't exist) - returns None immediately
         - Other HTTP errors are retried with exponential backoff
         - Network errors/timeouts are retried
@@ -144,9 +188,10 @@ class BaseGammaAPIPoller:
 
         for attempt in range(self.max_retries):
             try:
-                response = await self.client.get(
+                response = await self.scheduler.get(
+                    self.client,
                     f"{self.api_url}{endpoint}",
-                    params=params or {}
+                    params=params
                 )
                 response.raise_for_status()
                 return response.json()
@@ -157,6 +202,9 @@ class BaseGammaAPIPoller:
                     market_id = endpoint.split('/')[-1] if '/' in endpoint else endpoint
                     logger.debug(f"Market {market_id} not found (404) - skipping")
                     return None
+                # 429 - scheduler already paused and slowed down every poller, retry directly
+                if e.response.status_code == 429 and attempt < self.max_retries - 1:
+                    continue
                 # Other HTTP errors (500, 503, etc.) - retry
                 if attempt < self.max_retries - 1:
                     logger.debug(f"API fetch attempt {attempt + 1}/{self.max_retries} failed: {e.response.status_code}")
@@ -183,147 +231,172 @@ class BaseGammaAPIPoller:
 
         return None
 
-    async def _upsert_markets(self, markets: List[Dict], allow_resolved: bool = False) -> int:
+    async def _fetch_markets_by_ids(self, market_ids: List[str], chunk_size: int = 50) -> List[Dict]:
+        """
+        Fetch fresh market data for given IDs
+        - Chunks go out in parallel as /markets?id=..&id=.. (paced by the shared scheduler)
+        - IDs missing from a chunk response fall back to /markets/{id}
+        """
+        chunks = [market_ids[i:i + chunk_size] for i in range(0, len(market_ids), chunk_size)]
+        results = await asyncio.gather(*(self._fetch_market_chunk(chunk) for chunk in chunks))
+
+        updated_markets = []
+        for chunk_markets in results:
+            for market in chunk_markets:
+                # Mark as regular market (not event parent)
+                market['is_event_parent'] = False
+                updated_markets.append(market)
+
+        logger.debug(f"Fetched {len(updated_markets)}/{len(market_ids)} markets by ID in {len(chunks)} chunks")
+        return updated_markets
+
+    async def _fetch_market_chunk(self, market_ids: List[str]) -> List[Dict]:
+        """Fetch one chunk of markets by ID (bulk request + individual fallback)"""
+        found: Dict[str, Dict] = {}
+        wanted = {str(market_id) for market_id in market_ids}
+
+        batch = await self._fetch_api("/markets", params={'id': list(market_ids), 'limit': len(market_ids)})
+        if batch and isinstance(batch, list):
+            for market in batch:
+                market_id = str(market.get('id'))
+                if market_id in wanted:
+                    found[market_id] = market
+
+        missing = [str(market_id) for market_id in market_ids if str(market_id) not in found]
+        if missing:
+            singles = await asyncio.gather(
+                *(self._fetch_api(f"/markets/{market_id}") for market_id in missing),
+                return_exceptions=True
+            )
+            for market_id, market in zip(missing, singles):
+                if isinstance(market, Exception):
+                    logger.debug(f"Failed to fetch market {market_id}: {market}")
+                elif market:
+                    found[market_id] = market
+
+        return list(found.values())
+
+    async def _upsert_markets(self, markets: List[Dict], allow_resolved: bool = False,
+                              skip_unchanged: bool = True) -> int:
         """
         Upsert markets to unified table
-        Shared upsert logic for all poller types
+        Shared upsert logic for all poller types - set-based (one statement per chunk)
 
         Args:
             markets: List of market dicts
             allow_resolved: If True, allow upserting resolved markets (for resolutions poller)
                            If False, filter out resolved markets (default behavior)
+            skip_unchanged: If True, only write markets whose content fingerprint changed
+
+        Returns:
+            Number of markets written. Per-row failures are kept in self.last_upsert_failures
         """
-        upserted_count = 0
-        from core.database.connection import get_db
+        rows = [self._build_market_row(market) for market in markets]
 
         # Filter out resolved markets - we stop polling them once resolved
         # UNLESS allow_resolved=True (for resolutions poller to update resolved status)
-        if allow_resolved:
-            active_markets = markets
+        if not allow_resolved:
+            active_rows = [row for row in rows if not row['is_resolved']]
+            if len(active_rows) < len(rows):
+                logger.debug(f"Filtered out {len(rows) - len(active_rows)} resolved markets")
+            rows = active_rows
+
+        # Change detection - only emit rows whose fingerprint differs
+        await self.fingerprints.warm()
+        for row in rows:
+            row['content_hash'] = compute_fingerprint(row)
+        if skip_unchanged:
+            changed_rows = [row for row in rows if self.fingerprints.has_changed(row['id'], row['content_hash'])]
+            # Periodic refresh of unchanged rows: overwrite edits made outside the pollers
+            for row in changed_rows:
+                if self.fingerprints.is_refresh_due(row['id'], row['content_hash']):
+                    row['force_write'] = True
         else:
-            active_markets = [m for m in markets if not self._is_market_really_resolved(m)]
-            if len(active_markets) < len(markets):
-                logger.debug(f"Filtered out {len(markets) - len(active_markets)} resolved markets")
+            changed_rows = rows
 
-        for market in active_markets:
-            try:
-                async with get_db() as db_tx:
-                    await db_tx.execute(text("""
-                        INSERT INTO markets (
-                            id, source, title, description, category,
-                            outcomes, outcome_prices, events,
-                            is_event_market, parent_event_id,
-                            volume, liquidity, last_trade_price,
-                            clob_token_ids, condition_id,
-                            is_resolved, resolved_outcome, resolved_at,
-                            start_date, end_date, is_active,
-                            event_id, event_slug, event_title, polymarket_url,
-                            updated_at
-                        ) VALUES (
-                            :id, 'poll', :title, :description, :category,
-                            :outcomes, :outcome_prices, :events,
-                            :is_event_market, :parent_event_id,
-                            :volume, :liquidity, :last_trade_price,
-                            :clob_token_ids, :condition_id,
-                            :is_resolved, :resolved_outcome, :resolved_at,
-                            :start_date, :end_date, true,
-                            :event_id, :event_slug, :event_title, :polymarket_url,
-                            now()
-                        )
-                        ON CONFLICT (id) DO UPDATE SET
-                            title = EXCLUDED.title,
-                            description = EXCLUDED.description,
-                            category = EXCLUDED.category,
-                            outcomes = EXCLUDED.outcomes,
-                            -- CRITICAL: Preserve WebSocket prices if source is 'ws' (WebSocket has priority)
-                            outcome_prices = CASE
-                                WHEN markets.source = 'ws' THEN markets.outcome_prices
-                                ELSE EXCLUDED.outcome_prices
-                            END,
-                            events = EXCLUDED.events,
-                            is_event_market = EXCLUDED.is_event_market,
-                            parent_event_id = EXCLUDED.parent_event_id,
-                            volume = EXCLUDED.volume,
-                            liquidity = EXCLUDED.liquidity,
-                            -- CRITICAL: Preserve WebSocket last_trade_price if source is 'ws'
-                            last_trade_price = CASE
-                                WHEN markets.source = 'ws' AND markets.last_trade_price IS NOT NULL
-                                THEN markets.last_trade_price
-                                ELSE EXCLUDED.last_trade_price
-                            END,
-                            -- CRITICAL: Only update clob_token_ids if new value is not null (preserve existing)
-                            clob_token_ids = CASE
-                                WHEN EXCLUDED.clob_token_ids IS NOT NULL
-                                    AND EXCLUDED.clob_token_ids != '[]'::jsonb
-                                    AND EXCLUDED.clob_token_ids != 'null'::jsonb
-                                THEN EXCLUDED.clob_token_ids
-                                ELSE markets.clob_token_ids
-                            END,
-                            -- CRITICAL: Only update condition_id if new value is not null (preserve existing)
-                            condition_id = CASE
-                                WHEN EXCLUDED.condition_id IS NOT NULL AND EXCLUDED.condition_id != ''
-                                THEN EXCLUDED.condition_id
-                                ELSE markets.condition_id
-                            END,
-                            is_resolved = EXCLUDED.is_resolved,
-                            resolved_outcome = EXCLUDED.resolved_outcome,
-                            resolved_at = EXCLUDED.resolved_at,
-                            -- CRITICAL: Update dates (especially end_date for resolution detection)
-                            start_date = EXCLUDED.start_date,
-                            end_date = EXCLUDED.end_date,
-                            is_active = EXCLUDED.is_active,
-                            -- CRITICAL: Preserve WebSocket source (ws > poll priority)
-                            source = CASE
-                                WHEN markets.source = 'ws' THEN 'ws'
-                                ELSE 'poll'
-                            END,
-                            -- CRITICAL: Preserve event_id if new value is NULL (prevents overwriting with NULL)
-                            event_id = CASE
-                                WHEN EXCLUDED.event_id IS NOT NULL AND EXCLUDED.event_id != ''
-                                THEN EXCLUDED.event_id
-                                ELSE markets.event_id
-                            END,
-                            event_slug = EXCLUDED.event_slug,
-                            -- CRITICAL: Preserve event_title if new value is NULL or empty
-                            event_title = CASE
-                                WHEN EXCLUDED.event_title IS NOT NULL AND EXCLUDED.event_title != ''
-                                THEN EXCLUDED.event_title
-                                ELSE markets.event_title
-                            END,
-                            polymarket_url = EXCLUDED.polymarket_url,
-                            updated_at = now()
-                    """), {
-                        'id': market.get('id'),
-                        'title': market.get('question'),
-                        'description': market.get('description'),
-                        'category': extract_category(market),
-                        'outcomes': json_dumps_safe(safe_json_parse(market.get('outcomes')) or []),
-                        'outcome_prices': json_dumps_safe(safe_json_parse(market.get('outcomePrices')) or []),
-                        'events': json_dumps_safe(safe_json_parse(market.get('events'))),
-                        'is_event_market': market.get('is_event_parent', False),
-                        'parent_event_id': market.get('event_id') if market.get('event_id') and not market.get('is_event_parent', False) else None,
-                        'volume': safe_float(market.get('volume', 0)),
-                        'liquidity': safe_float(market.get('liquidity', 0)),
-                        'last_trade_price': safe_float(market.get('lastTradePrice')),
-                        'clob_token_ids': json_dumps_safe(safe_json_parse(market.get('clobTokenIds')) if market.get('clobTokenIds') else None),
-                        'condition_id': market.get('conditionId'),
-                        'is_resolved': self._is_market_really_resolved(market),
-                        'resolved_outcome': self._calculate_winner(market) if self._is_market_really_resolved(market) else None,
-                        'resolved_at': self._parse_resolution_time(market) if self._is_market_really_resolved(market) else None,
-                        'start_date': self._parse_date(market.get('startDate')),
-                        'end_date': self._parse_date(market.get('endDate')),
-                        'event_id': market.get('event_id'),
-                        'event_slug': market.get('event_slug'),
-                        'event_title': market.get('event_title'),
-                        'polymarket_url': self._build_polymarket_url(market)
-                    })
-                    upserted_count += 1
+        result = await self.upserter.upsert(changed_rows)
 
+        hashes = {str(row['id']): row['content_hash'] for row in changed_rows}
+        for market_id in result.accepted_ids:
+            self.fingerprints.update(market_id, hashes[market_id])
+
+        # Keep the streamer's resident market index in sync (same process in workers)
+        from data_ingestion.streamer.market_index import get_market_index
+        market_index = get_market_index()
+        if market_index.warmed:
+            accepted = set(result.accepted_ids)
+            market_index.add_markets([row for row in changed_rows if str(row['id']) in accepted])
+
+        # Refresh the listing items (event groups / standalone markets) of written markets
+        if result.written_ids:
+            try:
+                from core.services.market_service.market_listings import get_market_listings
+                await get_market_listings().refresh_markets(result.written_ids)
             except Exception as e:
-                logger.error(f"Failed upsert for market {market.get('id')}: {e}")
+                # Caught up by the periodic rebuild
+                logger.warning(f"⚠️ Market listings refresh failed for {len(result.written_ids)} markets: {e}")
 
-        logger.info(f"✅ UPSERT: {upserted_count} markets inserted/updated")
-        return upserted_count
+        # Resolution transitions: resolved positions are created by the resolution event consumer
+        if result.resolved_ids:
+            try:
+                from core.services.redeem.resolution_events import publish_market_resolved
+                await publish_market_resolved(result.resolved_ids, source=self.__class__.__name__)
+            except Exception as e:
+                # Caught up by the periodic resolution reconcile
+                logger.warning(f"⚠️ Resolution event failed for {len(result.resolved_ids)} markets: {e}")
+
+        # Update stats
+        self.fetched_count += len(markets)
+        self.changed_count += len(changed_rows)
+        self.written_count += result.written
+        self.last_upsert_counts = {
+            'fetched': len(markets),
+            'changed': len(changed_rows),
+            'written': result.written,
+        }
+        self.upsert_rows_total += len(result.accepted_ids)
+        self.upsert_seconds_total += result.duration
+        self.upsert_statements_total += result.statements
+        self.upsert_failed_count += len(result.failures)
+        self.last_upsert_rows_per_sec = result.rows_per_sec
+        self.last_upsert_failures = result.failures
+
+        if result.failures:
+            logger.warning(f"⚠️ UPSERT: {len(result.failures)} markets failed ({', '.join(str(f.market_id) for f in result.failures[:10])})")
+        logger.info(f"✅ UPSERT: {len(markets)} fetched, {len(changed_rows)} changed, {result.written} written in {result.statements} statements ({result.rows_per_sec:.0f} rows/s)")
+        return result.written
+
+    def _build_market_row(self, market: Dict) -> Dict:
+        """
+        Normalize a Gamma API market into a markets row (JSON-serializable)
+        Resolution is evaluated once per market
+        """
+        is_resolved = self._is_market_really_resolved(market)
+        return {
+            'id': str(market.get('id')) if market.get('id') is not None else None,
+            'title': market.get('question'),
+            'description': market.get('description'),
+            'category': extract_category(market),
+            'outcomes': safe_json_parse(market.get('outcomes')) or [],
+            'outcome_prices': safe_json_parse(market.get('outcomePrices')) or [],
+            'events': safe_json_parse(market.get('events')),
+            'is_event_market': market.get('is_event_parent', False),
+            'parent_event_id': market.get('event_id') if market.get('event_id') and not market.get('is_event_parent', False) else None,
+            'volume': safe_float(market.get('volume', 0)),
+            'liquidity': safe_float(market.get('liquidity', 0)),
+            'last_trade_price': safe_float(market.get('lastTradePrice')),
+            'clob_token_ids': safe_json_parse(market.get('clobTokenIds')) if market.get('clobTokenIds') else None,
+            'condition_id': market.get('conditionId'),
+            'is_resolved': is_resolved,
+            'resolved_outcome': self._calculate_winner(market) if is_resolved else None,
+            'resolved_at': _isoformat_naive(self._parse_resolution_time(market)) if is_resolved else None,
+            'start_date': _isoformat_naive(self._parse_date(market.get('startDate'))),
+            'end_date': _isoformat_naive(self._parse_date(market.get('endDate'))),
+            'event_id': market.get('event_id'),
+            'event_slug': market.get('event_slug'),
+            'event_title': market.get('event_title'),
+            'polymarket_url': self._build_polymarket_url(market)
+        }
 
     def _is_market_really_resolved(self, market: Dict) -> bool:
         """
@@ -0,0 +1,138 @@
+"""
+Gamma Request Scheduler - Shared rate limiting for all Gamma API pollers
+- Global token bucket (requests/second + burst)
+- Bounded number of in-flight requests
+- Coalescing of identical in-flight requests (same URL + params)
+- Adaptive backoff on 429: halve the rate and pause, then recover gradually
+"""
+import asyncio
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from infrastructure.config.settings import settings
+from infrastructure.logging.logger import get_logger
+from infrastructure.utils.rate_metrics import TokenBucket
+
+logger = get_logger(__name__)
+
+
+class GammaRequestScheduler:
+    """
+    Process-wide scheduler shared by every BaseGammaAPIPoller
+    All pollers of a worker process draw from the same budget, so running
+    them concurrently can't exceed the Gamma API rate limit.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, max_concurrency: int = 8,
+                 min_rate: float = 1.0, recovery_step: float = 0.1):
+        self.max_rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.recovery_step = recovery_step
+
+        self._bucket = TokenBucket(rate, capacity=burst)
+        self._consecutive_throttles = 0
+        self.max_concurrency = max_concurrency
+        # Created lazily inside the running loop (pollers may be built before the loop starts)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+
+        # Stats
+        self.request_count = 0
+        self.coalesced_count = 0
+        self.throttled_count = 0
+
+    async def get(self, client: httpx.AsyncClient, url: str, params: Optional[Dict] = None) -> httpx.Response:
+        """
+        Scheduled GET - identical concurrent requests share one HTTP call
+
+        Returns:
+            httpx.Response (status is not checked here)
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        key = self._request_key(url, params)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced_count += 1
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(self._send(client, url, params))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    @property
+    def rate(self) -> float:
+        """Current (adaptive) request rate"""
+        return self._bucket.rate
+
+    def get_stats(self) -> Dict:
+        return {
+            'rate': round(self.rate, 2),
+            'max_rate': self.max_rate,
+            'inflight': len(self._inflight),
+            'request_count': self.request_count,
+            'coalesced_count': self.coalesced_count,
+            'throttled_count': self.throttled_count,
+        }
+
+    async def _send(self, client: httpx.AsyncClient, url: str, params: Optional[Dict]) -> httpx.Response:
+        async with self._semaphore:
+            await self._bucket.acquire()
+            self.request_count += 1
+            response = await client.get(url, params=params or {})
+
+        if response.status_code == 429:
+            self._on_throttled(response)
+        else:
+            self._on_success()
+        return response
+
+    def _on_throttled(self, response: httpx.Response) -> None:
+        """429 - halve the rate and pause everyone (Retry-After if provided)"""
+        self.throttled_count += 1
+        self._consecutive_throttles += 1
+        self._bucket.set_rate(max(self.min_rate, self.rate / 2))
+        self._bucket.drain()
+
+        retry_after = response.headers.get('Retry-After')
+        try:
+            pause = float(retry_after) if retry_after else 0.0
+        except ValueError:
+            pause = 0.0
+        pause = max(pause, min(30.0, 0.5 * 2 ** self._consecutive_throttles))
+        self._bucket.pause(pause)
+        logger.warning(f"⏳ Gamma API throttled (429) - rate reduced to {self.rate:.1f} req/s, pausing {pause:.1f}s")
+
+    def _on_success(self) -> None:
+        self._consecutive_throttles = 0
+        if self.rate < self.max_rate:
+            self._bucket.set_rate(min(self.max_rate, self.rate + self.recovery_step))
+
+    @staticmethod
+    def _request_key(url: str, params: Optional[Dict]) -> Tuple:
+        items = []
+        for key, value in (params or {}).items():
+            if isinstance(value, (list, tuple)):
+                value = tuple(str(v) for v in value)
+            items.append((key, value if isinstance(value, tuple) else str(value)))
+        return (url, tuple(sorted(items)))
+
+
+# Global instance
+_gamma_scheduler: Optional[GammaRequestScheduler] = None
+
+
+def get_gamma_scheduler() -> GammaRequestScheduler:
+    """Get global GammaRequestScheduler instance"""
+    global _gamma_scheduler
+    if _gamma_scheduler is None:
+        _gamma_scheduler = GammaRequestScheduler(
+            rate=settings.data_ingestion.gamma_rate_limit,
+            burst=settings.data_ingestion.gamma_rate_burst,
+            max_concurrency=settings.data_ingestion.gamma_max_concurrency,
+        )
+    return _gamma_scheduler
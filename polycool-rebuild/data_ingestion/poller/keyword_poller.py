@@ -38,12 +38,12 @@ class KeywordPoller(BaseGammaAPIPoller):
     - Exhaustive pagination through ALL events (both volume and createdAt ordering)
     - Exhaustive pagination through ALL standalone markets
     - Ensures 100% coverage - upserts ALL keyword markets found (not just new ones)
-    - Batch processing (100 markets/batch) to avoid DB overload
+    - Set-based bulk upsert (a few statements per cycle)
     - Rate limiting (400-500ms between pages) to respect API limits
 
     OPTIMIZATIONS:
     - Rate limiting between API calls (400-500ms)
-    - Batch processing for DB upserts (100 markets/batch)
+    - Set-based bulk upserts (one statement per 500 markets)
     - Safety limits to avoid infinite loops (200 pages events, 300 pages standalone)
     - Deduplication during search to avoid processing same market twice
     - Search in: title, description, AND event_title
@@ -161,20 +161,8 @@ class KeywordPoller(BaseGammaAPIPoller):
 
         logger.info(f"📋 Found {len(all_keyword_markets)} total keyword markets to ensure coverage")
 
-        # 2. Upsert in batches to avoid DB overload
-        batch_size = 100  # Process 100 markets at a time
-        total_upserted = 0
-
-        for i in range(0, len(all_keyword_markets), batch_size):
-            batch = all_keyword_markets[i:i + batch_size]
-            upserted = await self._upsert_markets(batch, allow_resolved=False)
-            total_upserted += upserted
-
-            logger.info(f"📦 Batch {i//batch_size + 1}/{(len(all_keyword_markets) + batch_size - 1)//batch_size}: {upserted} markets upserted (total: {total_upserted})")
-
-            # Rate limiting between batches to avoid DB overload
-            if i + batch_size < len(all_keyword_markets):
-                await asyncio.sleep(0.5)  # 500ms delay between batches
+        # 2. Upsert all keyword markets (bulk upserter chunks internally)
+        total_upserted = await self._upsert_markets(all_keyword_markets, allow_resolved=False)
 
         # 3. Update stats
         self.market_count = len(all_keyword_markets)
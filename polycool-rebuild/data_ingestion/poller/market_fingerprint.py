@@ -0,0 +1,96 @@
+"""
+Market Fingerprint Cache - Change detection for Gamma pollers
+Keeps a content hash per market (in memory + markets.content_hash) so pollers
+only write markets whose normalized fields actually changed.
+"""
+import hashlib
+import json
+from time import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from core.database.connection import get_db
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def compute_fingerprint(row: Dict) -> str:
+    """SHA-1 of a normalized market row (see BaseGammaAPIPoller._build_market_row)"""
+    payload = {k: v for k, v in row.items() if k not in ('content_hash', 'force_write')}
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+class MarketFingerprintCache:
+    """
+    In-memory market_id -> fingerprint map shared by all pollers of a process
+    - Warmed once from markets.content_hash
+    - Entries older than refresh_after are reported as changed so rows
+      modified outside the pollers eventually get rewritten (the row is sent
+      with force_write, the unchanged content_hash alone would be skipped by the upsert)
+    """
+
+    def __init__(self, refresh_after: int = 3600):
+        self.refresh_after = refresh_after
+        self._fingerprints: Dict[str, Tuple[str, float]] = {}
+        self._warmed = False
+
+    async def warm(self) -> None:
+        """Load persisted fingerprints from DB (once per process)"""
+        if self._warmed:
+            return
+        self._warmed = True
+        try:
+            async with get_db() as db:
+                result = await db.execute(text(
+                    "SELECT id, content_hash FROM markets WHERE content_hash IS NOT NULL"
+                ))
+                now = time()
+                for market_id, content_hash in result.fetchall():
+                    self._fingerprints[str(market_id)] = (content_hash, now)
+            logger.info(f"🔑 Fingerprint cache warmed with {len(self._fingerprints)} markets")
+        except Exception as e:
+            # Column might not exist yet (migration not applied) - start cold
+            logger.warning(f"Could not warm fingerprint cache: {e}")
+
+    def has_changed(self, market_id: str, fingerprint: str) -> bool:
+        """True if the market must be written"""
+        entry = self._fingerprints.get(str(market_id))
+        if entry is None:
+            return True
+        known_fingerprint, stored_at = entry
+        if known_fingerprint != fingerprint:
+            return True
+        return time() - stored_at > self.refresh_after
+
+    def is_refresh_due(self, market_id: str, fingerprint: str) -> bool:
+        """True if the fingerprint is unchanged but older than refresh_after (row must be force-written)"""
+        entry = self._fingerprints.get(str(market_id))
+        if entry is None:
+            return False
+        known_fingerprint, stored_at = entry
+        return known_fingerprint == fingerprint and time() - stored_at > self.refresh_after
+
+    def update(self, market_id: str, fingerprint: str) -> None:
+        """Record a fingerprint after a successful write"""
+        self._fingerprints[str(market_id)] = (fingerprint, time())
+
+    def forget(self, market_id: str) -> None:
+        self._fingerprints.pop(str(market_id), None)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+
+# Global instance
+_fingerprint_cache: Optional[MarketFingerprintCache] = None
+
+
+def get_market_fingerprint_cache() -> MarketFingerprintCache:
+    """Get global MarketFingerprintCache instance"""
+    global _fingerprint_cache
+    if _fingerprint_cache is None:
+        _fingerprint_cache = MarketFingerprintCache()
+    return _fingerprint_cache
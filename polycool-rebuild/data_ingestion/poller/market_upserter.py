@@ -0,0 +1,301 @@
+"""
+Market Bulk Upserter - Set-based writes to the unified markets table
+Sends a whole poll cycle as a single JSONB recordset per chunk and applies
+it with one INSERT ... ON CONFLICT, instead of one session per market.
+"""
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import time
+from typing import List, Dict, Optional
+
+from sqlalchemy import text
+
+from core.database.connection import get_db
+from core.database.schema_features import SchemaFeature, is_missing_schema_error
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Column types of the recordset sent by the poller (one JSON object per market)
+MARKET_RECORD_COLUMNS = """
+    id text, title text, description text, category text,
+    outcomes jsonb, outcome_prices jsonb, events jsonb,
+    is_event_market boolean, parent_event_id text,
+    volume double precision, liquidity double precision, last_trade_price double precision,
+    clob_token_ids jsonb, condition_id text,
+    is_resolved boolean, resolved_outcome text, resolved_at timestamp,
+    start_date timestamp, end_date timestamp,
+    event_id text, event_slug text, event_title text, polymarket_url text,
+    content_hash text
+"""
+
+# Same ws-over-poll precedence rules as the historical per-row upsert.
+# Rows whose content_hash is unchanged are left untouched (no WAL, updated_at kept),
+# unless listed in :force_ids (periodic refresh of rows edited outside the pollers).
+# prev (statement snapshot, before the write) flags existing markets that just became
+# settled (resolved with a known outcome): redeemable positions are created from those.
+# {hash_*} placeholders: content_hash write + guard (empty while the column is missing)
+_UPSERT_CTES = """
+    WITH prev AS (
+        SELECT m.id, (m.is_resolved AND m.resolved_outcome IS NOT NULL) AS settled
+        FROM markets m
+        WHERE m.id IN (SELECT r.id FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(id text))
+    ),
+    upserted AS (
+    INSERT INTO markets (
+        id, source, title, description, category,
+        outcomes, outcome_prices, events,
+        is_event_market, parent_event_id,
+        volume, liquidity, last_trade_price,
+        clob_token_ids, condition_id,
+        is_resolved, resolved_outcome, resolved_at,
+        start_date, end_date, is_active,
+        event_id, event_slug, event_title, polymarket_url,
+        {hash_column}updated_at
+    )
+    SELECT
+        r.id, 'poll', r.title, r.description, r.category,
+        r.outcomes, r.outcome_prices, r.events,
+        r.is_event_market, r.parent_event_id,
+        r.volume, r.liquidity, r.last_trade_price,
+        r.clob_token_ids, r.condition_id,
+        r.is_resolved, r.resolved_outcome, r.resolved_at,
+        r.start_date, r.end_date, true,
+        r.event_id, r.event_slug, r.event_title, r.polymarket_url,
+        {hash_value}now()
+    FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r({columns})
+    ON CONFLICT (id) DO UPDATE SET
+        title = EXCLUDED.title,
+        description = EXCLUDED.description,
+        category = EXCLUDED.category,
+        outcomes = EXCLUDED.outcomes,
+        -- CRITICAL: Preserve WebSocket prices if source is 'ws' (WebSocket has priority)
+        outcome_prices = CASE
+            WHEN markets.source = 'ws' THEN markets.outcome_prices
+            ELSE EXCLUDED.outcome_prices
+        END,
+        events = EXCLUDED.events,
+        is_event_market = EXCLUDED.is_event_market,
+        parent_event_id = EXCLUDED.parent_event_id,
+        volume = EXCLUDED.volume,
+        liquidity = EXCLUDED.liquidity,
+        -- CRITICAL: Preserve WebSocket last_trade_price if source is 'ws'
+        last_trade_price = CASE
+            WHEN markets.source = 'ws' AND markets.last_trade_price IS NOT NULL
+            THEN markets.last_trade_price
+            ELSE EXCLUDED.last_trade_price
+        END,
+        -- CRITICAL: Only update clob_token_ids if new value is not null (preserve existing)
+        clob_token_ids = CASE
+            WHEN EXCLUDED.clob_token_ids IS NOT NULL
+                AND EXCLUDED.clob_token_ids != '[]'::jsonb
+                AND EXCLUDED.clob_token_ids != 'null'::jsonb
+            THEN EXCLUDED.clob_token_ids
+            ELSE markets.clob_token_ids
+        END,
+        -- CRITICAL: Only update condition_id if new value is not null (preserve existing)
+        condition_id = CASE
+            WHEN EXCLUDED.condition_id IS NOT NULL AND EXCLUDED.condition_id != ''
+            THEN EXCLUDED.condition_id
+            ELSE markets.condition_id
+        END,
+        is_resolved = EXCLUDED.is_resolved,
+        resolved_outcome = EXCLUDED.resolved_outcome,
+        resolved_at = EXCLUDED.resolved_at,
+        -- CRITICAL: Update dates (especially end_date for resolution detection)
+        start_date = EXCLUDED.start_date,
+        end_date = EXCLUDED.end_date,
+        is_active = EXCLUDED.is_active,
+        -- CRITICAL: Preserve WebSocket source (ws > poll priority)
+        source = CASE
+            WHEN markets.source = 'ws' THEN 'ws'
+            ELSE 'poll'
+        END,
+        -- CRITICAL: Preserve event_id if new value is NULL (prevents overwriting with NULL)
+        event_id = CASE
+            WHEN EXCLUDED.event_id IS NOT NULL AND EXCLUDED.event_id != ''
+            THEN EXCLUDED.event_id
+            ELSE markets.event_id
+        END,
+        event_slug = EXCLUDED.event_slug,
+        -- CRITICAL: Preserve event_title if new value is NULL or empty
+        event_title = CASE
+            WHEN EXCLUDED.event_title IS NOT NULL AND EXCLUDED.event_title != ''
+            THEN EXCLUDED.event_title
+            ELSE markets.event_title
+        END,
+        polymarket_url = EXCLUDED.polymarket_url,
+        {hash_set}updated_at = now()
+    {hash_guard}RETURNING id, clob_token_ids, condition_id,
+        (is_resolved AND resolved_outcome IS NOT NULL) AS settled
+    )
+"""
+
+# Written rows also refresh their market_tokens projection (token_id -> market) in the
+# same statement, from the final (post-merge) clob_token_ids.
+_TOKENS_CTE = """,
+    tokens AS (
+        INSERT INTO market_tokens (token_id, market_id, outcome_index, condition_id, updated_at)
+        -- DISTINCT ON: a token listed twice in one batch must not hit ON CONFLICT twice
+        SELECT DISTINCT ON (t.token_id)
+            t.token_id, u.id, (t.ordinality - 1)::int, u.condition_id, now()
+        FROM upserted u
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(u.clob_token_ids) = 'array' THEN u.clob_token_ids ELSE '[]'::jsonb END
+        ) WITH ORDINALITY AS t(token_id, ordinality)
+        WHERE t.token_id <> ''
+        ORDER BY t.token_id
+        ON CONFLICT (token_id) DO UPDATE SET
+            market_id = EXCLUDED.market_id,
+            outcome_index = EXCLUDED.outcome_index,
+            condition_id = EXCLUDED.condition_id,
+            updated_at = now()
+        WHERE (market_tokens.market_id, market_tokens.outcome_index, market_tokens.condition_id)
+            IS DISTINCT FROM (EXCLUDED.market_id, EXCLUDED.outcome_index, EXCLUDED.condition_id)
+    )
+"""
+
+_UPSERT_RESULT = """
+    SELECT u.id, (u.settled IS TRUE AND p.id IS NOT NULL AND p.settled IS NOT TRUE) AS resolved_now
+    FROM upserted u
+    LEFT JOIN prev p ON p.id = u.id
+"""
+
+_HASH_GUARD = """WHERE markets.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        OR EXCLUDED.content_hash IS NULL
+        OR markets.id = ANY(CAST(:force_ids AS text[]))
+    """
+
+
+@lru_cache(maxsize=None)
+def build_upsert_sql(market_tokens: bool = True, content_hash: bool = True) -> str:
+    """
+    Bulk upsert statement for the schema at hand
+    - market_tokens=False: markets only (token lookups fall back to markets.clob_token_ids)
+    - content_hash=False: no fingerprint column, every row is written
+    """
+    ctes = _UPSERT_CTES.format(
+        columns=MARKET_RECORD_COLUMNS,
+        hash_column='content_hash, ' if content_hash else '',
+        hash_value='r.content_hash, ' if content_hash else '',
+        hash_set='content_hash = EXCLUDED.content_hash,\n        ' if content_hash else '',
+        hash_guard=_HASH_GUARD if content_hash else '',
+    )
+    return ctes + (_TOKENS_CTE if market_tokens else '') + _UPSERT_RESULT
+
+
+BULK_UPSERT_SQL = build_upsert_sql()
+
+
+@dataclass
+class UpsertFailure:
+    """A single market row rejected by the database"""
+    market_id: Optional[str]
+    error: str
+
+
+@dataclass
+class BulkUpsertResult:
+    """Outcome of a bulk upsert call"""
+    written: int = 0  # Rows actually inserted/updated
+    statements: int = 0
+    duration: float = 0.0
+    accepted_ids: List[str] = field(default_factory=list)  # Rows in committed chunks (written or unchanged)
+    written_ids: List[str] = field(default_factory=list)  # Rows actually inserted/updated
+    resolved_ids: List[str] = field(default_factory=list)  # Existing markets that just got resolved (with an outcome)
+    failures: List[UpsertFailure] = field(default_factory=list)
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Rows processed per second (written or skipped as unchanged by the DB)"""
+        return len(self.accepted_ids) / self.duration if self.duration > 0 else 0.0
+
+
+class MarketBulkUpserter:
+    """
+    Set-based upsert engine for the markets table
+    - Rows are deduplicated by id (last one wins) so ON CONFLICT never touches a row twice
+    - Each chunk is one statement in one transaction
+    - A failing chunk is bisected until the offending rows are isolated,
+      so one bad market never drops the rest of the cycle
+    - Missing-schema errors are not bisected (every row would fail): without the
+      market_tokens table / markets.content_hash column the upsert skips the
+      projection / fingerprint guard until the next probe
+    """
+
+    def __init__(self, chunk_size: int = 500):
+        self.chunk_size = chunk_size
+        self.market_tokens = SchemaFeature("market_tokens projection")
+        self.content_hash = SchemaFeature("markets.content_hash fingerprint")
+
+    async def upsert(self, rows: List[Dict]) -> BulkUpsertResult:
+        """
+        Upsert prepared market rows (see BaseGammaAPIPoller._build_market_row)
+
+        Args:
+            rows: JSON-serializable dicts keyed by MARKET_RECORD_COLUMNS names
+                  (optional force_write: write even if content_hash is unchanged)
+
+        Returns:
+            BulkUpsertResult with written count, statement count and per-row failures
+        """
+        result = BulkUpsertResult()
+        start_time = time()
+
+        unique_rows: Dict[str, Dict] = {}
+        for row in rows:
+            market_id = row.get('id')
+            if not market_id:
+                result.failures.append(UpsertFailure(market_id=None, error="missing market id"))
+                continue
+            unique_rows[str(market_id)] = row
+
+        deduped = list(unique_rows.values())
+        for i in range(0, len(deduped), self.chunk_size):
+            await self._write_chunk(deduped[i:i + self.chunk_size], result)
+
+        result.duration = time() - start_time
+        return result
+
+    async def _write_chunk(self, rows: List[Dict], result: BulkUpsertResult) -> None:
+        """Write one chunk; bisect on failure to isolate bad rows"""
+        if not rows:
+            return
+
+        result.statements += 1
+        try:
+            async with get_db() as db:
+                sql = build_upsert_sql(self.market_tokens.available, self.content_hash.available)
+                db_result = await db.execute(text(sql), {
+                    'rows': json.dumps(rows, default=str),
+                    'force_ids': [str(row['id']) for row in rows if row.get('force_write')],
+                })
+                written = db_result.fetchall()
+            result.written += len(written)
+            result.written_ids.extend(str(row.id) for row in written)
+            result.resolved_ids.extend(str(row.id) for row in written if row.resolved_now)
+            result.accepted_ids.extend(str(row['id']) for row in rows)
+        except Exception as e:
+            if is_missing_schema_error(e):
+                for feature, name in ((self.market_tokens, 'market_tokens'), (self.content_hash, 'content_hash')):
+                    if name in str(e) and feature.available:
+                        feature.mark_missing(e)
+                        await self._write_chunk(rows, result)
+                        return
+                # Not row-specific: bisecting would only repeat the error
+                logger.error(f"Bulk upsert of {len(rows)} markets failed, schema out of date: {e}")
+                result.failures.extend(UpsertFailure(market_id=row.get('id'), error=str(e)) for row in rows)
+                return
+
+            if len(rows) == 1:
+                market_id = rows[0].get('id')
+                logger.error(f"Failed upsert for market {market_id}: {e}")
+                result.failures.append(UpsertFailure(market_id=market_id, error=str(e)))
+                return
+
+            logger.warning(f"Bulk upsert of {len(rows)} markets failed, bisecting: {e}")
+            mid = len(rows) // 2
+            await self._write_chunk(rows[:mid], result)
+            await self._write_chunk(rows[mid:], result)
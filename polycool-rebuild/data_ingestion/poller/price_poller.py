@@ -1,13 +1,21 @@
 """
-Price Poller - Maintains fresh prices for popular markets
-Uses layered strategy: featured events, top volume, trending, user positions, copy trading
+Price Poller - Maintains fresh prices, prioritized by money at risk
+Each market has its own refresh deadline driven by its tier:
+TP/SL armed > open positions / copied leaders > trending > long tail
 """
 import asyncio
-from time import time
+from time import time, monotonic
 from datetime import datetime, timezone
 from typing import List, Dict, Set
 from infrastructure.logging.logger import get_logger
-from data_ingestion.poller.base_poller import BaseGammaAPIPoller
+from data_ingestion.poller.base_poller import BaseGammaAPIPoller, safe_json_parse
+from data_ingestion.poller.priority_scheduler import (
+    MarketPriorityScheduler,
+    TIER_CRITICAL,
+    TIER_HOT,
+    TIER_WARM,
+    TIER_COLD,
+)
 from core.database.connection import get_db
 from sqlalchemy import text
 
@@ -16,61 +24,58 @@ logger = get_logger(__name__)
 
 class PricePoller(BaseGammaAPIPoller):
     """
-    Poller to maintain fresh prices for popular markets
-    Layered strategy:
-    1. Featured events (featured=true) - priority maximum
-    2. Top 200 by volume (very active markets)
-    3. Top 300 by volume24hr (trending)
-    4. Markets with active user positions (200)
-    5. Markets with copy trading active (300)
-    Total: ~1000 markets max
-    Frequency: 30s
+    Poller to maintain fresh prices, prioritized by exposure
+    Tiers (recomputed every tier_refresh_interval):
+    1. critical (3s): markets with TP/SL orders armed
+    2. hot (10s): markets with open user positions or held by copied leaders
+    3. warm (30s): featured events, top 200 by volume, top 300 trending
+    4. cold (10min): long tail of active markets by volume
+    Markets whose price moved >= 2 cents are promoted one tier for 5 minutes.
+
+    Ticks every `interval` seconds and fetches only the markets that are due,
+    capped at fetch_budget_per_minute (same total as the former 1000 markets / 30s).
     """
 
-    def __init__(self, interval: int = 30):
+    def __init__(self, interval: int = 5, tier_refresh_interval: int = 60,
+                 fetch_budget_per_minute: int = 2000, long_tail_limit: int = 2000):
         super().__init__(poll_interval=interval)
+        self.tier_refresh_interval = tier_refresh_interval
+        self.fetch_budget_per_minute = fetch_budget_per_minute
+        self.long_tail_limit = long_tail_limit
+        self.priority = MarketPriorityScheduler()
+        self.last_tier_refresh = None
+
+    def get_stats(self) -> Dict:
+        """Get current stats (with priority scheduler state)"""
+        stats = super().get_stats()
+        stats['priority'] = self.priority.get_stats()
+        return stats
 
     async def _poll_cycle(self) -> None:
-        """Single poll cycle - update prices for popular markets"""
+        """Single tick - refresh tiers if stale, then fetch markets whose deadline passed"""
         start_time = time()
 
         try:
-            all_market_ids: Set[str] = set()
+            if self.last_tier_refresh is None or monotonic() - self.last_tier_refresh >= self.tier_refresh_interval:
+                await self._refresh_tiers()
+                self.last_tier_refresh = monotonic()
 
-            # Layer 1: Featured events (priority maximum)
-            featured_markets = await self._fetch_featured_markets()
-            for market in featured_markets:
-                all_market_ids.add(str(market.get('id')))
+            budget = max(1, int(self.fetch_budget_per_minute * self.poll_interval / 60))
+            due_market_ids = self.priority.pop_due(budget)
 
-            # Layer 2: Top volume markets
-            top_volume_markets = await self._fetch_top_volume_markets(200)
-            for market in top_volume_markets:
-                all_market_ids.add(str(market.get('id')))
-
-            # Layer 3: Trending markets (volume24hr)
-            trending_markets = await self._fetch_trending_markets(300)
-            for market in trending_markets:
-                all_market_ids.add(str(market.get('id')))
-
-            # Layer 4: User positions (from DB)
-            user_position_markets = await self._get_markets_with_user_positions(200)
-            all_market_ids.update(user_position_markets)
-
-            # Layer 5: Copy trading (from DB)
-            copy_trading_markets = await self._get_copy_trading_markets(300)
-            all_market_ids.update(copy_trading_markets)
-
-            # Limit to 1000 markets max
-            market_ids_list = list(all_market_ids)[:1000]
-            logger.info(f"📊 Price poller: {len(market_ids_list)} unique markets to update")
+            if not due_market_ids:
+                logger.debug("No markets due for price refresh")
+                return
 
-            # Fetch fresh data for all markets
-            updated_markets = await self._fetch_markets_by_ids(market_ids_list)
+            # Fetch fresh data for due markets (parallel chunks)
+            updated_markets = await self._fetch_markets_by_ids(due_market_ids)
 
             if not updated_markets:
                 logger.debug("No markets updated")
                 return
 
+            self._record_prices(updated_markets)
+
             # Upsert updated markets
             upserted = await self._upsert_markets(updated_markets)
 
@@ -82,12 +87,72 @@ class PricePoller(BaseGammaAPIPoller):
             self.consecutive_errors = 0
 
             duration = time() - start_time
-            logger.info(f"✅ Price poll cycle completed in {duration:.2f}s - {len(updated_markets)} markets updated, {upserted} upserted")
+            logger.info(f"✅ Price poll tick completed in {duration:.2f}s - {len(due_market_ids)} due, {len(updated_markets)} fetched, {upserted} upserted")
 
         except Exception as e:
             logger.error(f"Price poll cycle error: {e}")
             raise
 
+    async def _refresh_tiers(self) -> None:
+        """
+        Recompute tier membership from API layers and DB exposure
+        Layer markets come back with full data, so they are upserted right away
+        and their deadlines pushed back.
+        """
+        (
+            featured_markets,
+            top_volume_markets,
+            trending_markets,
+            tpsl_markets,
+            user_position_markets,
+            copy_trading_markets,
+            long_tail_markets,
+        ) = await asyncio.gather(
+            self._fetch_featured_markets(),
+            self._fetch_top_volume_markets(200),
+            self._fetch_trending_markets(300),
+            self._get_markets_with_tpsl(),
+            self._get_markets_with_user_positions(),
+            self._get_copy_trading_markets(),
+            self._get_long_tail_markets(self.long_tail_limit),
+        )
+
+        # Event parents are synthetic rows (not fetchable via /markets/{id})
+        layer_markets = [
+            m for m in featured_markets + top_volume_markets + trending_markets
+            if not m.get('is_event_parent')
+        ]
+        trending_ids = {str(m.get('id')) for m in layer_markets}
+
+        self.priority.set_tiers({
+            TIER_CRITICAL: tpsl_markets,
+            TIER_HOT: user_position_markets | copy_trading_markets,
+            TIER_WARM: trending_ids,
+            TIER_COLD: long_tail_markets,
+        })
+
+        if featured_markets or layer_markets:
+            self._record_prices(layer_markets)
+            await self._upsert_markets(featured_markets + top_volume_markets + trending_markets)
+            self.priority.mark_refreshed(list(trending_ids))
+
+        logger.info(f"📊 Price poller tiers: {self.priority.tier_counts()}")
+
+    def _record_prices(self, markets: List[Dict]) -> None:
+        """Feed fetched prices to the volatility tracker and the TP/SL trigger index"""
+        from core.services.trading.tpsl_monitor import get_tpsl_monitor
+        tpsl_monitor = get_tpsl_monitor()
+
+        for market in markets:
+            prices = safe_json_parse(market.get('outcomePrices')) or []
+            try:
+                prices = [float(p) for p in prices]
+            except (ValueError, TypeError):
+                continue
+            self.priority.record_prices(str(market.get('id')), prices)
+            if tpsl_monitor:
+                tpsl_monitor.on_market_prices(str(market.get('id')), prices)
+
     async def _fetch_featured_markets(self) -> List[Dict]:
         """Fetch markets from featured events AND create event parent markets"""
         try:
@@ -192,7 +257,24 @@ class PricePoller(BaseGammaAPIPoller):
             logger.error(f"Error fetching trending markets: {e}")
             return []
 
-    async def _get_markets_with_user_positions(self, limit: int) -> Set[str]:
+    async def _get_markets_with_tpsl(self) -> Set[str]:
+        """Get market IDs with active positions that have TP/SL armed"""
+        try:
+            async with get_db() as db:
+                result = await db.execute(text("""
+                    SELECT DISTINCT market_id
+                    FROM positions
+                    WHERE status = 'active'
+                    AND (take_profit_price IS NOT NULL OR stop_loss_price IS NOT NULL)
+                """))
+                market_ids = {str(row[0]) for row in result.fetchall()}
+                logger.debug(f"Found {len(market_ids)} markets with TP/SL")
+                return market_ids
+        except Exception as e:
+            logger.debug(f"Error getting markets with TP/SL: {e}")
+            return set()
+
+    async def _get_markets_with_user_positions(self) -> Set[str]:
         """Get market IDs with active user positions from DB"""
         try:
             async with get_db() as db:
@@ -200,55 +282,48 @@ class PricePoller(BaseGammaAPIPoller):
                     SELECT DISTINCT market_id
                     FROM positions
                     WHERE market_id IS NOT NULL
-                    AND (closed_at IS NULL OR closed_at > now())
-                    LIMIT :limit
-                """), {'limit': limit})
-                rows = result.fetchall()
-                market_ids = {str(row[0]) for row in rows}
+                    AND status = 'active'
+                """))
+                market_ids = {str(row[0]) for row in result.fetchall()}
                 logger.debug(f"Found {len(market_ids)} markets with user positions")
                 return market_ids
         except Exception as e:
             logger.debug(f"Error getting markets with user positions (table might not exist): {e}")
             return set()
 
-    async def _get_copy_trading_markets(self, limit: int) -> Set[str]:
-        """Get market IDs with active copy trading from DB"""
+    async def _get_copy_trading_markets(self) -> Set[str]:
+        """Get market IDs currently held by leaders that users actively copy"""
         try:
             async with get_db() as db:
-                # Check if copy_trading table exists, if not return empty set
                 result = await db.execute(text("""
-                    SELECT DISTINCT market_id
-                    FROM copy_trading
-                    WHERE market_id IS NOT NULL
-                    AND active = true
-                    LIMIT :limit
-                """), {'limit': limit})
-                rows = result.fetchall()
-                market_ids = {str(row[0]) for row in rows}
-                logger.debug(f"Found {len(market_ids)} markets with copy trading")
+                    SELECT DISTINCT lp.market_id
+                    FROM leader_positions lp
+                    JOIN copy_trading_allocations cta
+                        ON cta.leader_address_id = lp.watched_address_id
+                    WHERE cta.is_active = true
+                    AND lp.token_quantity > 0
+                """))
+                market_ids = {str(row[0]) for row in result.fetchall()}
+                logger.debug(f"Found {len(market_ids)} markets held by copied leaders")
                 return market_ids
         except Exception as e:
             logger.debug(f"Error getting copy trading markets (table might not exist): {e}")
             return set()
 
-    async def _fetch_markets_by_ids(self, market_ids: List[str]) -> List[Dict]:
-        """Fetch fresh market data for given IDs"""
-        updated_markets = []
-
-        # Fetch markets individually (API doesn't support bulk by ID)
-        for market_id in market_ids:
-            try:
-                market = await self._fetch_api(f"/markets/{market_id}")
-                if market:
-                    # Mark as regular market (not event parent)
-                    market['is_event_parent'] = False
-                    updated_markets.append(market)
-            except Exception as e:
-                logger.debug(f"Failed to fetch market {market_id}: {e}")
-                continue
-
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(0.05)  # 50ms delay
-
-        logger.debug(f"Fetched {len(updated_markets)} markets by ID")
-        return updated_markets
+    async def _get_long_tail_markets(self, limit: int) -> Set[str]:
+        """Get active, non-resolved markets by volume (long tail, refreshed rarely)"""
+        try:
+            async with get_db() as db:
+                result = await db.execute(text("""
+                    SELECT id
+                    FROM markets
+                    WHERE is_active = true
+                    AND (is_resolved = false OR is_resolved IS NULL)
+                    AND (is_event_market = false OR is_event_market IS NULL)
+                    ORDER BY volume DESC NULLS LAST
+                    LIMIT :limit
+                """), {'limit': limit})
+                return {str(row[0]) for row in result.fetchall()}
+        except Exception as e:
+            logger.debug(f"Error getting long tail markets: {e}")
+            return set()
@@ -0,0 +1,172 @@
+"""
+Market Priority Scheduler - Per-market refresh deadlines for the price poller
+Markets are assigned to tiers by money at risk; each tier has its own cadence.
+Recently volatile markets are promoted one tier for a while.
+"""
+import heapq
+from time import monotonic
+from typing import Dict, List, Optional, Set, Tuple
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Tiers (lower rank = refreshed first)
+TIER_CRITICAL = 'critical'  # TP/SL armed
+TIER_HOT = 'hot'            # Open user positions, markets held by copied leaders
+TIER_WARM = 'warm'          # Featured / top volume / trending
+TIER_COLD = 'cold'          # Long tail
+
+TIER_ORDER = [TIER_CRITICAL, TIER_HOT, TIER_WARM, TIER_COLD]
+
+DEFAULT_TIER_INTERVALS = {
+    TIER_CRITICAL: 3,
+    TIER_HOT: 10,
+    TIER_WARM: 30,
+    TIER_COLD: 600,
+}
+
+
+class MarketPriorityScheduler:
+    """
+    Deadline scheduler for market refreshes
+    - set_tiers() replaces tier membership (recomputed periodically by the poller)
+    - pop_due() returns due markets, most critical first, capped by a fetch budget
+    - record_prices() tracks price moves and promotes volatile markets
+    """
+
+    def __init__(self, tier_intervals: Optional[Dict[str, float]] = None,
+                 volatility_threshold: float = 0.02, volatility_hold: float = 300):
+        self.tier_intervals = dict(DEFAULT_TIER_INTERVALS)
+        if tier_intervals:
+            self.tier_intervals.update(tier_intervals)
+        self.volatility_threshold = volatility_threshold  # Absolute price move (0.02 = 2 cents)
+        self.volatility_hold = volatility_hold  # Seconds a volatile market stays promoted
+
+        self._tiers: Dict[str, str] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._last_prices: Dict[str, List[float]] = {}
+        self._promoted_until: Dict[str, float] = {}
+
+        # Stats
+        self.dispatched_count = 0
+        self.deferred_count = 0
+        self.max_lag = 0.0
+
+    def set_tiers(self, tiers: Dict[str, Set[str]]) -> None:
+        """
+        Replace tier membership
+
+        Args:
+            tiers: tier name -> market ids. A market in several tiers gets the most critical one.
+                   Markets absent from every tier stop being scheduled.
+        """
+        now = monotonic()
+        new_tiers: Dict[str, str] = {}
+        for tier in reversed(TIER_ORDER):
+            for market_id in tiers.get(tier, set()):
+                new_tiers[str(market_id)] = tier
+
+        for market_id in list(self._tiers):
+            if market_id not in new_tiers:
+                self._forget(market_id)
+
+        for market_id, tier in new_tiers.items():
+            self._tiers[market_id] = tier
+            # New markets are due now; upgraded markets don't wait for their old deadline
+            deadline = min(self._deadlines.get(market_id, now), now + self._interval(market_id))
+            self._schedule(market_id, deadline)
+
+        logger.debug(f"Priority tiers updated: {self.tier_counts()}")
+
+    def pop_due(self, budget: int) -> List[str]:
+        """
+        Pop due markets (most critical tier first, then earliest deadline)
+        and reschedule them one interval later. Markets beyond the budget stay due.
+        """
+        now = monotonic()
+        due: List[Tuple[float, str]] = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, market_id = heapq.heappop(self._heap)
+            if self._deadlines.get(market_id) != deadline:
+                continue  # Stale heap entry
+            due.append((deadline, market_id))
+
+        due.sort(key=lambda item: (self._rank(item[1]), item[0]))
+        selected, deferred = due[:budget], due[budget:]
+
+        for deadline, market_id in deferred:
+            heapq.heappush(self._heap, (deadline, market_id))
+        for deadline, market_id in selected:
+            self.max_lag = max(self.max_lag, now - deadline)
+            self._schedule(market_id, now + self._interval(market_id))
+
+        self.dispatched_count += len(selected)
+        self.deferred_count += len(deferred)
+        return [market_id for _, market_id in selected]
+
+    def mark_refreshed(self, market_ids: List[str]) -> None:
+        """Push back deadlines of markets refreshed by another path (e.g. layer fetches)"""
+        now = monotonic()
+        for market_id in market_ids:
+            market_id = str(market_id)
+            if market_id in self._tiers:
+                self._schedule(market_id, now + self._interval(market_id))
+
+    def record_prices(self, market_id: str, prices: List[float]) -> None:
+        """Track price moves - promote the market one tier if it moved more than the threshold"""
+        market_id = str(market_id)
+        previous = self._last_prices.get(market_id)
+        self._last_prices[market_id] = prices
+        if not previous or len(previous) != len(prices):
+            return
+
+        move = max(abs(a - b) for a, b in zip(prices, previous))
+        if move >= self.volatility_threshold:
+            was_promoted = self._is_promoted(market_id)
+            self._promoted_until[market_id] = monotonic() + self.volatility_hold
+            if not was_promoted and market_id in self._tiers:
+                # Pull the next refresh forward to the promoted cadence
+                deadline = min(self._deadlines[market_id], monotonic() + self._interval(market_id))
+                self._schedule(market_id, deadline)
+
+    def tier_counts(self) -> Dict[str, int]:
+        counts = {tier: 0 for tier in TIER_ORDER}
+        for tier in self._tiers.values():
+            counts[tier] += 1
+        return counts
+
+    def get_stats(self) -> Dict:
+        now = monotonic()
+        return {
+            'tiers': self.tier_counts(),
+            'promoted': sum(1 for until in self._promoted_until.values() if until > now),
+            'overdue': sum(1 for deadline in self._deadlines.values() if deadline <= now),
+            'dispatched_count': self.dispatched_count,
+            'deferred_count': self.deferred_count,
+            'max_lag_seconds': round(self.max_lag, 2),
+        }
+
+    def _schedule(self, market_id: str, deadline: float) -> None:
+        self._deadlines[market_id] = deadline
+        heapq.heappush(self._heap, (deadline, market_id))
+
+    def _forget(self, market_id: str) -> None:
+        self._tiers.pop(market_id, None)
+        self._deadlines.pop(market_id, None)  # Heap entry becomes stale
+        self._last_prices.pop(market_id, None)
+        self._promoted_until.pop(market_id, None)
+
+    def _is_promoted(self, market_id: str) -> bool:
+        return self._promoted_until.get(market_id, 0) > monotonic()
+
+    def _rank(self, market_id: str) -> int:
+        rank = TIER_ORDER.index(self._tiers.get(market_id, TIER_COLD))
+        if self._is_promoted(market_id):
+            rank = max(0, rank - 1)
+        return rank
+
+    def _interval(self, market_id: str) -> float:
+        return self.tier_intervals[TIER_ORDER[self._rank(market_id)]]
@@ -143,24 +143,9 @@ class GammaAPIPollerResolutions(BaseGammaAPIPoller):
     async def _fetch_markets_for_resolution(self, market_ids: List[str]) -> List[Dict]:
         """
         Fetch fresh market data from API for resolution checking
-        Fetches individually (API doesn't support bulk by ID)
+        Uses the shared chunked/parallel fetch (limited to 500 markets per cycle)
         """
-        updated_markets = []
-
-        # Fetch markets individually (limited to 500 markets per cycle)
-        for market_id in market_ids[:500]:
-            try:
-                market = await self._fetch_api(f"/markets/{market_id}")
-                if market:
-                    # Mark as regular market (not event parent)
-                    market['is_event_parent'] = False
-                    updated_markets.append(market)
-            except Exception as e:
-                logger.debug(f"Failed to fetch market {market_id}: {e}")
-                continue
-
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(0.1)
+        updated_markets = await self._fetch_markets_by_ids(market_ids[:500])
 
         # Only log if significant number fetched
         if len(updated_markets) > 0:
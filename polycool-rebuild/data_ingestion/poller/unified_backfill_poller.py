@@ -504,17 +504,8 @@ class UnifiedBackfillPoller(BaseGammaAPIPoller):
         # Enrich with tags
         await self._enrich_markets_with_tags(markets)
 
-        # Upsert in batches
-        total_upserted = 0
-        batch_size = 100  # Increased for better performance
-
-        for i in range(0, len(markets), batch_size):
-            batch = markets[i:i + batch_size]
-            upserted = await self._upsert_markets(batch)
-            total_upserted += upserted
-
-            logger.info(f"📦 Upsert batch {i//batch_size + 1}: {upserted} markets upserted (total: {total_upserted})")
-            await asyncio.sleep(1.0)  # Rate limiting
+        # Bulk upsert (chunked internally, one statement per chunk)
+        total_upserted = await self._upsert_markets(markets)
 
         logger.info(f"✅ Final upsert complete: {total_upserted} markets inserted/updated")
         return total_upserted
@@ -565,18 +556,8 @@ class UnifiedBackfillPoller(BaseGammaAPIPoller):
         """
         logger.info(f"💾 Starting direct batch upsert for {len(markets)} markets (no tags)...")
 
-        # Upsert in larger batches for speed
-        total_upserted = 0
-        batch_size = 200  # Larger batches for speed
-
-        for i in range(0, len(markets), batch_size):
-            batch = markets[i:i + batch_size]
-            upserted = await self._upsert_markets(batch)
-            total_upserted += upserted
-
-            logger.info(f"📦 Upsert batch {i//batch_size + 1}: {upserted} markets upserted (total: {total_upserted})")
-            # Minimal sleep between batches
-            await asyncio.sleep(0.1)
+        # Bulk upsert (chunked internally, one statement per chunk)
+        total_upserted = await self._upsert_markets(markets)
 
         logger.info(f"✅ Direct batch upsert complete: {total_upserted} markets inserted/updated")
         return total_upserted
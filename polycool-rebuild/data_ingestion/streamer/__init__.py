@@ -1,8 +1,8 @@
 """
 WebSocket Streamer for real-time market data
 """
-from .websocket_client import WebSocketClient
+from .websocket_client import WebSocketClient, WebSocketPool
 from .market_updater import MarketUpdater
 from .subscription_manager import SubscriptionManager
 
-__all__ = ["WebSocketClient", "MarketUpdater", "SubscriptionManager"]
+__all__ = ["WebSocketClient", "WebSocketPool", "MarketUpdater", "SubscriptionManager"]
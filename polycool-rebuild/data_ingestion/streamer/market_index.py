@@ -0,0 +1,183 @@
+"""
+Market Index - Resident identifier index for the WebSocket streamer
+- token_id -> (market_id, outcome_index)
+- condition_id -> market_id
+- market_id -> outcomes / clob_token_ids
+Warmed at streamer start, updated by poller upserts and new subscriptions,
+so the per-message path needs no database access.
+"""
+import json
+import os
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Check if bot has DB access
+SKIP_DB = os.getenv("SKIP_DB", "false").lower() == "true"
+
+
+def _parse_list(value: Any) -> List:
+    """Parse a JSONB/JSON-string list column"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return []
+    return value if isinstance(value, list) else []
+
+
+class MarketIndex:
+    """
+    In-memory market identifier index
+    Lookups never touch the DB - callers fall back to their slow path on a miss
+    and feed the result back with add_market().
+    """
+
+    def __init__(self):
+        self._tokens: Dict[str, Tuple[str, int]] = {}
+        self._conditions: Dict[str, str] = {}
+        self._markets: Dict[str, Dict] = {}
+        self.warmed = False
+
+        # Stats (per lookup kind)
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+
+    async def warm(self) -> None:
+        """Load all non-resolved markets with CLOB tokens (DB mode only)"""
+        if self.warmed:
+            return
+        self.warmed = True
+
+        if SKIP_DB:
+            # Bot-side streamer: index is filled on subscription and on misses
+            logger.info("🗂️ Market index: SKIP_DB=true - filling on demand")
+            return
+
+        try:
+            from core.database.connection import get_db
+            from sqlalchemy import text
+
+            async with get_db() as db:
+                result = await db.execute(text("""
+                    SELECT id, outcomes, clob_token_ids, condition_id
+                    FROM markets
+                    WHERE (is_resolved = false OR is_resolved IS NULL)
+                    AND clob_token_ids IS NOT NULL
+                """))
+                for market_id, outcomes, clob_token_ids, condition_id in result.fetchall():
+                    self.add_market({
+                        'id': market_id,
+                        'outcomes': outcomes,
+                        'clob_token_ids': clob_token_ids,
+                        'condition_id': condition_id,
+                    })
+            logger.info(f"🗂️ Market index warmed: {len(self._markets)} markets, {len(self._tokens)} tokens")
+        except Exception as e:
+            logger.error(f"❌ Market index warm-up failed (will fill on demand): {e}")
+
+    def add_market(self, market: Dict) -> None:
+        """
+        Index (or re-index) a market
+
+        Args:
+            market: dict with id, outcomes, clob_token_ids, condition_id (list or JSON string values)
+        """
+        market_id = market.get('id')
+        if not market_id:
+            return
+        market_id = str(market_id)
+
+        existing = self._markets.get(market_id, {})
+        token_ids = [str(t) for t in _parse_list(market.get('clob_token_ids')) if t]
+        outcomes = _parse_list(market.get('outcomes'))
+        condition_id = market.get('condition_id')
+
+        # Same rule as the upsert: never clear known tokens/condition with empty values
+        if not token_ids:
+            token_ids = existing.get('clob_token_ids', [])
+        if not outcomes:
+            outcomes = existing.get('outcomes', [])
+        if not condition_id:
+            condition_id = existing.get('condition_id')
+
+        for old_token in existing.get('clob_token_ids', []):
+            if old_token not in token_ids:
+                self._tokens.pop(old_token, None)
+
+        self._markets[market_id] = {
+            'id': market_id,
+            'outcomes': outcomes,
+            'clob_token_ids': token_ids,
+            'condition_id': condition_id,
+        }
+        for outcome_index, token_id in enumerate(token_ids):
+            self._tokens[token_id] = (market_id, outcome_index)
+        if condition_id:
+            self._conditions[condition_id.lower()] = market_id
+
+    def add_markets(self, markets: List[Dict]) -> None:
+        for market in markets:
+            self.add_market(market)
+
+    def remove_market(self, market_id: str) -> None:
+        entry = self._markets.pop(str(market_id), None)
+        if not entry:
+            return
+        for token_id in entry['clob_token_ids']:
+            self._tokens.pop(token_id, None)
+        if entry.get('condition_id'):
+            self._conditions.pop(entry['condition_id'].lower(), None)
+
+    def lookup_token(self, token_id: str) -> Optional[Tuple[str, int]]:
+        """token_id -> (market_id, outcome_index)"""
+        entry = self._tokens.get(str(token_id))
+        self._count('token', entry is not None)
+        return entry
+
+    def lookup_condition(self, condition_id: str) -> Optional[str]:
+        """condition_id -> market_id"""
+        market_id = self._conditions.get(condition_id.lower())
+        self._count('condition', market_id is not None)
+        return market_id
+
+    def get_market(self, market_id: str) -> Optional[Dict]:
+        """market_id -> {'id', 'outcomes', 'clob_token_ids', 'condition_id'}"""
+        entry = self._markets.get(str(market_id))
+        self._count('market', entry is not None)
+        return entry
+
+    def get_stats(self) -> Dict:
+        stats = {
+            'warmed': self.warmed,
+            'markets': len(self._markets),
+            'tokens': len(self._tokens),
+            'conditions': len(self._conditions),
+        }
+        for kind in ('token', 'condition', 'market'):
+            total = self.hits[kind] + self.misses[kind]
+            stats[f'{kind}_hits'] = self.hits[kind]
+            stats[f'{kind}_misses'] = self.misses[kind]
+            stats[f'{kind}_hit_rate'] = round(self.hits[kind] / total, 4) if total else None
+        return stats
+
+    def _count(self, kind: str, hit: bool) -> None:
+        if hit:
+            self.hits[kind] += 1
+        else:
+            self.misses[kind] += 1
+
+
+# Global instance
+_market_index: Optional[MarketIndex] = None
+
+
+def get_market_index() -> MarketIndex:
+    """Get global MarketIndex instance"""
+    global _market_index
+    if _market_index is None:
+        _market_index = MarketIndex()
+    return _market_index
@@ -1,10 +1,11 @@
 """
 Identifier Resolver - Resolve market identifiers (condition_id, market_id, token_id)
-Uses MarketService for lookups with caching support
+Uses the resident MarketIndex first, MarketService/API only on index misses
 """
 import os
 from typing import Dict, Any, Optional
 from infrastructure.logging.logger import get_logger
+from data_ingestion.streamer.market_index import get_market_index
 
 logger = get_logger(__name__)
 
@@ -36,6 +37,7 @@ class IdentifierResolver:
             from core.services.cache_manager import CacheManager
             cache_manager = CacheManager()
             self.market_service = get_market_service(cache_manager=cache_manager)
+        self.market_index = get_market_index()
 
     async def resolve_market_identifier(self, data: Dict[str, Any]) -> Optional[str]:
         """
@@ -106,7 +108,7 @@ class IdentifierResolver:
 
     async def get_market_id_from_condition_id(self, condition_id: str) -> Optional[str]:
         """
-        Get market_id from condition_id by searching in markets table
+        Get market_id from condition_id (MarketIndex first, then DB/API)
         Uses APIClient with Redis cache to avoid repeated API calls
 
         Args:
@@ -115,6 +117,10 @@ class IdentifierResolver:
         Returns:
             Market ID (numeric) or None if not found
         """
+        market_id = self.market_index.lookup_condition(condition_id)
+        if market_id:
+            return market_id
+
         try:
             # Use API if SKIP_DB=true
             if SKIP_DB:
@@ -124,6 +130,7 @@ class IdentifierResolver:
                     market = await api_client.get_market(condition_id)
 
                     if market:
+                        self.market_index.add_market(market)
                         market_id = market.get('id')
                         return market_id
                     return None
@@ -134,6 +141,7 @@ class IdentifierResolver:
             # Use MarketService (which uses DB)
             market_data = await self.market_service.get_market_by_condition_id(condition_id)
             if market_data:
+                self.market_index.add_market(market_data)
                 market_id = market_data.get('id')
                 if market_id:
                     logger.debug(
@@ -149,7 +157,7 @@ class IdentifierResolver:
 
     async def get_market_id_from_token_id(self, token_id: str) -> Optional[str]:
         """
-        Get market_id from token_id by searching in markets table
+        Get market_id from token_id (MarketIndex first, then DB/API)
         Uses APIClient with Redis cache to avoid repeated API calls
 
         Args:
@@ -158,6 +166,10 @@ class IdentifierResolver:
         Returns:
             Market ID or None if not found
         """
+        indexed = self.market_index.lookup_token(token_id)
+        if indexed:
+            return indexed[0]
+
         try:
             # Use API if SKIP_DB=true
             if SKIP_DB:
@@ -171,6 +183,7 @@ class IdentifierResolver:
                     )
 
                     if market:
+                        self.market_index.add_market(market)
                         market_id = market.get('id')
                         return market_id
                     return None
@@ -183,16 +196,28 @@ class IdentifierResolver:
             from core.database.models import Market
             from sqlalchemy import select
 
+            from core.services.market_service.token_resolver import get_token_resolver
+            token_info = await get_token_resolver().resolve(token_id)
+            if not token_info:
+                return None
+
             async with get_db() as db:
                 result = await db.execute(
-                    select(Market.id).where(
-                        Market.clob_token_ids.contains([token_id])
+                    select(Market.id, Market.outcomes, Market.clob_token_ids, Market.condition_id).where(
+                        Market.id == token_info.market_id
                     )
                 )
-                market = result.scalar_one_or_none()
-                if market:
-                    logger.debug(f"✅ Found market_id {market} for token_id {token_id[:20]}...")
-                return market
+                row = result.first()
+                if not row:
+                    return None
+                self.market_index.add_market({
+                    'id': row[0],
+                    'outcomes': row[1],
+                    'clob_token_ids': row[2],
+                    'condition_id': row[3],
+                })
+                logger.debug(f"✅ Found market_id {row[0]} for token_id {token_id[:20]}...")
+                return row[0]
         except Exception as e:
             logger.error(f"⚠️ Error getting market_id for token_id {token_id[:20]}...: {e}")
             return None
@@ -32,7 +32,7 @@ class PriceExtractor:
         Returns:
             List of prices in outcome order [outcome1_price, outcome2_price, ...] or None
         """
-        logger.info(f"🔍 Extracting prices from message with keys: {list(data.keys())[:20]}")
+        logger.debug(f"🔍 Extracting prices from message with keys: {list(data.keys())[:20]}")
 
         # Try Polymarket format: price_changes array with asset_id mapping
         price_changes = data.get("price_changes")
@@ -2,15 +2,17 @@
 Market Update Handler - Unified market price updates (DB/API)
 Handles both database and API updates transparently based on SKIP_DB
 """
+import json
 import os
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
-from sqlalchemy import select, update
+from sqlalchemy import select, update, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database.connection import get_db
 from core.database.models import Market
 from core.services.cache_manager import CacheManager
+from core.services.market_service.token_resolver import get_token_resolver
 from infrastructure.logging.logger import get_logger
 
 logger = get_logger(__name__)
@@ -24,6 +26,21 @@ if SKIP_DB:
 
 cache_manager = CacheManager()
 
+# One statement for a whole batch of WebSocket prices (source: 'ws' takes precedence)
+BULK_PRICE_UPDATE_SQL = """
+    UPDATE markets AS m SET
+        source = 'ws',
+        outcome_prices = v.outcome_prices,
+        last_mid_price = v.last_mid_price,
+        last_trade_price = COALESCE(v.last_trade_price, m.last_trade_price),
+        updated_at = now()
+    FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS v(
+        id text, outcome_prices jsonb, last_mid_price double precision, last_trade_price double precision
+    )
+    WHERE m.id = v.id
+    RETURNING m.id
+"""
+
 
 class MarketUpdateHandler:
     """
@@ -73,6 +90,53 @@ class MarketUpdateHandler:
             await cache_manager.delete(f"market:{market_id}")
             await cache_manager.delete(f"market_detail:{market_id}")
 
+    async def update_prices_bulk(self, updates: List[Dict[str, Any]]) -> List[str]:
+        """
+        Update prices of many markets at once (unified DB/API)
+        DB: one multi-row UPDATE; SKIP_DB: one batch API call
+
+        Args:
+            updates: dicts with 'market_id', 'prices' and optional 'last_trade_price'
+
+        Returns:
+            IDs of markets that were updated
+        """
+        rows = []
+        for item in updates:
+            if not item.get('market_id') or not item.get('prices'):
+                continue
+            prices_as_numbers = [float(p) for p in item['prices']]
+            rows.append({
+                'id': str(item['market_id']),
+                'outcome_prices': prices_as_numbers,  # Explicitly numbers, not strings
+                'last_mid_price': sum(prices_as_numbers) / len(prices_as_numbers),
+                'last_trade_price': float(item['last_trade_price']) if item.get('last_trade_price') is not None else None,
+            })
+        if not rows:
+            return []
+
+        if SKIP_DB:
+            result = await self.api_client.update_market_prices_batch(rows)
+            updated_ids = result.get('updated_ids', []) if result else []
+        else:
+            try:
+                async with get_db() as db:
+                    db_result = await db.execute(text(BULK_PRICE_UPDATE_SQL), {'rows': json.dumps(rows)})
+                    updated_ids = [row[0] for row in db_result.fetchall()]
+            except Exception as e:
+                logger.error(f"⚠️ Error bulk updating prices for {len(rows)} markets: {e}")
+                return []
+
+        logger.debug(f"✅ Bulk updated prices for {len(updated_ids)}/{len(rows)} markets (source='ws')")
+
+        # Invalidate cache (single round-trip)
+        keys = []
+        for market_id in updated_ids:
+            keys.extend([f"price:{market_id}", f"market:{market_id}", f"market_detail:{market_id}"])
+        await cache_manager.delete_many(keys)
+
+        return updated_ids
+
     async def _update_prices_db(
         self,
         db: AsyncSession,
@@ -87,10 +151,12 @@ class MarketUpdateHandler:
             if market_id:
                 query = select(Market).where(Market.id == market_id)
             elif token_id:
-                # Find market by token_id in clob_token_ids JSONB
-                query = select(Market).where(
-                    Market.clob_token_ids.contains([token_id])
-                )
+                # Find market by token_id (market_tokens projection)
+                token_info = await get_token_resolver().resolve(token_id)
+                if not token_info:
+                    logger.debug(f"⚠️ Market not found for update: {token_id}")
+                    return
+                query = select(Market).where(Market.id == token_info.market_id)
             else:
                 return
 
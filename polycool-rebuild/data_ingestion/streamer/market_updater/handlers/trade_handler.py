@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.database.connection import get_db
 from core.database.models import Market
 from core.services.cache_manager import CacheManager
+from core.services.market_service.token_resolver import get_token_resolver
 from infrastructure.logging.logger import get_logger
 
 logger = get_logger(__name__)
@@ -45,9 +46,10 @@ class TradeHandler:
                 if market_id:
                     query = select(Market).where(Market.id == market_id)
                 elif token_id:
-                    query = select(Market).where(
-                        Market.clob_token_ids.contains([token_id])
-                    )
+                    token_info = await get_token_resolver().resolve(token_id)
+                    if not token_info:
+                        return
+                    query = select(Market).where(Market.id == token_info.market_id)
                 else:
                     return
 
@@ -10,7 +10,7 @@ Refactored to use modular components:
 """
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from infrastructure.logging.logger import get_logger
 
 from .extractors.price_extractor import PriceExtractor
@@ -20,9 +20,11 @@ from .handlers.orderbook_handler import OrderbookHandler
 from .handlers.trade_handler import TradeHandler
 from .position.position_update_handler import PositionUpdateHandler
 from .position.tpsl_trigger import TPSLTrigger
-from .utils.debounce_manager import DebounceManager
+from .utils.write_behind import WriteBehindBuffer
 from .utils.price_validator import validate_prices
 from .utils.price_buffer import PriceBuffer
+from data_ingestion.streamer.market_index import get_market_index
+from data_ingestion.streamer.websocket_client.message_pipeline import RECEIVED_AT_KEY, get_pipeline_metrics
 
 logger = get_logger(__name__)
 
@@ -36,7 +38,8 @@ class MarketUpdater:
     - Source priority: 'ws' > 'poll'
     - Updates prices, orderbook, last trade
     - Invalidates cache
-    - Automatically updates positions when prices change (with debouncing)
+    - Automatically updates positions when prices change
+    - Writes are coalesced per market and flushed in batches (write-behind)
     """
 
     def __init__(self):
@@ -45,6 +48,7 @@ class MarketUpdater:
 
         # Initialize extractors
         self.identifier_resolver = IdentifierResolver()
+        self.market_index = get_market_index()
         self.price_extractor = PriceExtractor()
 
         # Initialize handlers
@@ -56,20 +60,28 @@ class MarketUpdater:
         self.position_handler = PositionUpdateHandler()
         self.tpsl_trigger = TPSLTrigger()
 
-        # Initialize debounce managers - increased delays to prevent API spam
-        self.market_debounce = DebounceManager(delay=5.0, max_updates_per_second=2)  # 5s delay, max 2/sec
-        self.position_debounce = DebounceManager(delay=10.0, max_updates_per_second=5)  # 10s delay, max 5/sec
+        # Write-behind buffers: latest prices per market, one batched write per flush window
+        # (bounded latency: a market waits at most flush_interval before being written)
+        self.market_writes = WriteBehindBuffer("market_prices", self._flush_market_updates, flush_interval=2.0, max_batch=500)
+        self.position_writes = WriteBehindBuffer("position_prices", self._flush_position_updates, flush_interval=5.0, max_batch=500)
 
         # Initialize price buffer for accumulating partial price updates
         self.price_buffer = PriceBuffer(buffer_timeout=2.0, max_buffer_size=1000)
 
+        # Shared with the WebSocket pipeline (end-to-end receipt -> DB write lag)
+        self.pipeline_metrics = get_pipeline_metrics()
+
     async def start(self) -> None:
-        """Start the market updater (starts price buffer)"""
+        """Start the market updater (starts price buffer and write-behind buffers)"""
         await self.price_buffer.start()
+        await self.market_writes.start()
+        await self.position_writes.start()
 
     async def stop(self) -> None:
-        """Stop the market updater (stops price buffer)"""
+        """Stop the market updater (flushes pending writes, stops price buffer)"""
         await self.price_buffer.stop()
+        await self.market_writes.stop()
+        await self.position_writes.stop()
 
     async def handle_price_update(self, data: Dict[str, Any]) -> None:
         """
@@ -79,13 +91,13 @@ class MarketUpdater:
             data: WebSocket message data with price information
         """
         try:
-            logger.info(
+            logger.debug(
                 f"📊 Processing price update: {data.get('type', 'unknown')} - "
                 f"event_type: {data.get('event_type')} - keys: {list(data.keys())[:10]}"
             )
 
             # Step 1: Resolve market_id from WebSocket data
-            logger.info(f"🔍 Resolving market identifier from message: market={data.get('market')}, event_type={data.get('event_type')}")
+            logger.debug(f"🔍 Resolving market identifier from message: market={data.get('market')}, event_type={data.get('event_type')}")
             market_id = await self.identifier_resolver.resolve_market_identifier(data)
             token_id = (
                 data.get("token_id") or
@@ -102,15 +114,16 @@ class MarketUpdater:
                     if isinstance(first_change, dict):
                         token_id = first_change.get("asset_id") or first_change.get("asset")
 
-            logger.info(f"🔍 Resolved identifiers: market_id={market_id}, token_id={token_id[:30] if token_id else None}...")
+            logger.debug(f"🔍 Resolved identifiers: market_id={market_id}, token_id={token_id[:30] if token_id else None}...")
 
             if not market_id and not token_id:
                 logger.warning(f"⚠️ Price update without market_id or token_id: {json.dumps(data)[:300]}")
                 return
 
             # Step 2: Get market data for price mapping (if market_id available)
-            market_data = None
-            if market_id:
+            # Resident index first - DB/API only on a miss (result is indexed for next messages)
+            market_data = self.market_index.get_market(market_id) if market_id else None
+            if market_id and market_data is None:
                 try:
                     if SKIP_DB:
                         from core.services.api_client import get_api_client
@@ -129,16 +142,18 @@ class MarketUpdater:
                             if market:
                                 from core.services.market_service.market_service import _market_to_dict
                                 market_data = _market_to_dict(market)
+                    if market_data:
+                        self.market_index.add_market(market_data)
                 except Exception as e:
                     logger.debug(f"Could not fetch market data for mapping: {e}")
 
             # Step 3: Extract prices with proper outcome mapping
             # Try to extract complete prices first
-            logger.info(f"🔍 Extracting prices from message (has market_data: {market_data is not None})")
+            logger.debug(f"🔍 Extracting prices from message (has market_data: {market_data is not None})")
             if market_data:
-                logger.info(f"   Market outcomes: {market_data.get('outcomes')}, clob_token_ids: {market_data.get('clob_token_ids')[:2] if market_data.get('clob_token_ids') else None}...")
+                logger.debug(f"   Market outcomes: {market_data.get('outcomes')}, clob_token_ids: {market_data.get('clob_token_ids')[:2] if market_data.get('clob_token_ids') else None}...")
             prices = await self.price_extractor.extract_prices(data, market_data)
-            logger.info(f"🔍 Extracted prices: {prices}")
+            logger.debug(f"🔍 Extracted prices: {prices}")
 
             # Get expected outcomes count from market_data
             expected_outcomes = None
@@ -228,27 +243,27 @@ class MarketUpdater:
             logger.debug(f"✅ Extracted prices {prices} for market {market_id or token_id}")
 
             # Step 4: Validate prices before updating
-            logger.info(f"🔍 Validating prices: {prices} for market {market_id}")
+            logger.debug(f"🔍 Validating prices: {prices} for market {market_id}")
             if not validate_prices(prices, market_data):
                 logger.warning(
                     f"⚠️ Invalid prices {prices} for market {market_id} (outcomes: {market_data.get('outcomes') if market_data else 'unknown'}) - skipping update"
                 )
                 return
-            logger.info(f"✅ Prices validated successfully: {prices}")
+            logger.debug(f"✅ Prices validated successfully: {prices}")
 
-            # Step 5: Schedule market update with debouncing
+            # Step 4.5: TP/SL trigger index (instant, before the buffered DB write)
             if market_id:
-                logger.info(f"⏱️ Scheduling market update for {market_id} with debounce (delay={self.market_debounce.delay}s), prices={prices}")
-                await self.market_debounce.schedule_update(
-                    key=market_id,
-                    data={
-                        'market_id': market_id,
-                        'token_id': token_id,
-                        'prices': prices,
-                        'original_data': data
-                    },
-                    callback=self._process_market_update
-                )
+                self.tpsl_trigger.check_prices(market_id, prices)
+
+            # Step 5: Buffer market update (flushed in batch by the write-behind buffer)
+            if market_id:
+                logger.debug(f"⏱️ Buffering market update for {market_id}, prices={prices}")
+                self.market_writes.submit(market_id, {
+                    'market_id': market_id,
+                    'prices': prices,
+                    'last_trade_price': data.get('last_trade_price'),
+                    'received_at': data.get(RECEIVED_AT_KEY),
+                })
             else:
                 # If no market_id, update immediately (shouldn't happen often)
                 await self.market_handler.update_prices(
@@ -258,63 +273,35 @@ class MarketUpdater:
                     data=data
                 )
 
-            # Step 6: Trigger position updates (with debouncing)
+            # Step 6: Buffer position updates
             if market_id and prices:
-                await self.position_debounce.schedule_update(
-                    key=market_id,
-                    data={
-                        'market_id': market_id,
-                        'prices': prices
-                    },
-                    callback=self._process_position_update
-                )
+                self.position_writes.submit(market_id, prices)
 
             self.update_count += 1
 
         except Exception as e:
             logger.error(f"⚠️ Error handling price update: {e}")
 
-    async def _process_market_update(self, key: str, data: Dict[str, Any]) -> None:
+    async def _flush_market_updates(self, pending: Dict[str, Dict[str, Any]]) -> None:
         """
-        Process market update callback (called by debounce manager)
+        Flush buffered market prices (called by the write-behind buffer)
 
         Args:
-            key: Market ID
-            data: Update data with prices and original WebSocket data
+            pending: market_id -> latest update (prices, last_trade_price, received_at)
         """
-        market_id = data.get('market_id')
-        token_id = data.get('token_id')
-        prices = data.get('prices')
-        original_data = data.get('original_data', {})
-
-        logger.info(f"✅ Processing debounced market update for {market_id} with prices={prices}")
-        await self.market_handler.update_prices(
-            market_id=market_id,
-            token_id=token_id,
-            prices=prices,
-            data=original_data
-        )
-
-    async def _process_position_update(self, key: str, data: Dict[str, Any]) -> None:
+        updated_ids = await self.market_handler.update_prices_bulk(list(pending.values()))
+        for market_id in updated_ids:
+            self.pipeline_metrics.record_lag('write', pending[market_id].get('received_at'))
+
+    async def _flush_position_updates(self, pending: Dict[str, List[float]]) -> None:
         """
-        Process position update callback (called by debounce manager)
+        Flush buffered position price updates
+        (TP/SL is checked on receipt via the trigger index, see Step 4.5)
 
         Args:
-            key: Market ID
-            data: Update data with prices
+            pending: market_id -> latest prices
         """
-        market_id = data.get('market_id')
-        prices = data.get('prices')
-
-        # Update positions
-        positions = await self.position_handler.update_positions_for_market(
-            market_id=market_id,
-            prices=prices
-        )
-
-        # Check TP/SL triggers if positions were updated
-        if positions:
-            await self.tpsl_trigger.check_triggers_for_market(market_id, positions)
+        await self.position_handler.update_positions_for_markets(pending)
 
     async def handle_orderbook_update(self, data: Dict[str, Any]) -> None:
         """
@@ -401,7 +388,10 @@ class MarketUpdater:
         """Get updater statistics"""
         return {
             "update_count": self.update_count,
-            "pending_market_updates": self.market_debounce.get_pending_count(),
-            "pending_position_updates": self.position_debounce.get_pending_count(),
+            "pending_market_updates": self.market_writes.get_pending_count(),
+            "pending_position_updates": self.position_writes.get_pending_count(),
+            "market_writes": self.market_writes.get_stats(),
+            "position_writes": self.position_writes.get_stats(),
             "price_buffer": self.price_buffer.get_buffer_stats(),
+            "market_index": self.market_index.get_stats(),
         }
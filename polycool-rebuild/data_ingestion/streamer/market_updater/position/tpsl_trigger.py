@@ -1,6 +1,6 @@
 """
 TPSL Trigger - Check and trigger TP/SL orders when prices change
-Integrates with TPSLMonitor for hybrid approach (WebSocket + polling)
+Integrates with TPSLMonitor (trigger index for WebSocket prices + polling safety net)
 """
 from typing import List, Any, Optional
 from infrastructure.logging.logger import get_logger
@@ -23,6 +23,24 @@ class TPSLTrigger:
         """
         self.tpsl_monitor = tpsl_monitor
 
+    def check_prices(self, market_id: str, prices: List[float]) -> None:
+        """
+        Check a fresh price update against the TP/SL trigger index
+        Called as soon as prices are extracted (before any DB write)
+
+        Args:
+            market_id: Market ID
+            prices: Prices in outcome order
+        """
+        if not self.tpsl_monitor:
+            try:
+                from core.services.trading.tpsl_monitor import get_tpsl_monitor
+                self.tpsl_monitor = get_tpsl_monitor()
+            except ImportError:
+                return
+        if self.tpsl_monitor:
+            self.tpsl_monitor.on_market_prices(market_id, prices)
+
     async def check_triggers_for_market(
         self,
         market_id: str,
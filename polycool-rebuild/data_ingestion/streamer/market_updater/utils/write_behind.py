@@ -0,0 +1,144 @@
+"""
+Write-Behind Buffer - Coalesced, bounded-latency batch writes
+Keeps the latest value per key and hands the whole batch to one flush callback,
+so a burst across many markets costs a few statements instead of one per market.
+"""
+import asyncio
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Latest-wins buffer flushed in batches
+    - A key is flushed at most flush_interval seconds after it was first buffered
+      (plus the duration of the flush in progress)
+    - A batch is flushed early once max_batch keys are pending
+    - Values submitted during a flush go to the next batch
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[Dict[str, Any]], Awaitable[None]],
+        flush_interval: float = 1.0,
+        max_batch: int = 500
+    ):
+        """
+        Initialize WriteBehindBuffer
+
+        Args:
+            name: Name used in logs/stats
+            flush: Async callback receiving {key: latest value}
+            flush_interval: Max seconds a value waits before being flushed
+            max_batch: Pending keys that trigger an immediate flush
+        """
+        self.name = name
+        self.flush = flush
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._pending: Dict[str, Any] = {}
+        self._first_pending_at: Optional[float] = None
+        self._wakeup: Optional[asyncio.Event] = None  # Created lazily inside the running loop
+        self._task: Optional[asyncio.Task] = None
+        self.running = False
+
+        # Stats
+        self.submitted_count = 0
+        self.coalesced_count = 0
+        self.flush_count = 0
+        self.flushed_keys = 0
+        self.failed_flushes = 0
+        self.max_flush_latency = 0.0
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still pending"""
+        self.running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self._flush_pending()
+
+    def submit(self, key: str, value: Any) -> None:
+        """Buffer a value (replaces any pending value for the same key)"""
+        self.submitted_count += 1
+        if key in self._pending:
+            self.coalesced_count += 1
+        elif not self._pending:
+            self._first_pending_at = monotonic()
+        self._pending[key] = value
+
+        if self._wakeup and (len(self._pending) == 1 or len(self._pending) >= self.max_batch):
+            self._wakeup.set()
+
+    def get_pending_count(self) -> int:
+        return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pending': len(self._pending),
+            'submitted_count': self.submitted_count,
+            'coalesced_count': self.coalesced_count,
+            'flush_count': self.flush_count,
+            'avg_batch_size': round(self.flushed_keys / self.flush_count, 1) if self.flush_count else None,
+            'failed_flushes': self.failed_flushes,
+            'max_flush_latency': round(self.max_flush_latency, 3),
+        }
+
+    async def _flush_loop(self) -> None:
+        while self.running:
+            try:
+                if not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                # Wait until the oldest pending value reaches the deadline (or the batch is full)
+                remaining = self._first_pending_at + self.flush_interval - monotonic()
+                if remaining > 0 and len(self._pending) < self.max_batch:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._flush_pending()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"⚠️ Write-behind '{self.name}' loop error: {e}")
+                await asyncio.sleep(self.flush_interval)
+
+    async def _flush_pending(self) -> None:
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        first_pending_at, self._first_pending_at = self._first_pending_at, None
+
+        try:
+            await self.flush(batch)
+            self.flush_count += 1
+            self.flushed_keys += len(batch)
+            if first_pending_at is not None:
+                self.max_flush_latency = max(self.max_flush_latency, monotonic() - first_pending_at)
+            logger.debug(f"💾 Write-behind '{self.name}' flushed {len(batch)} keys")
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.error(f"⚠️ Write-behind '{self.name}' flush of {len(batch)} keys failed: {e}")
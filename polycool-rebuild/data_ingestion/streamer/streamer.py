@@ -7,9 +7,11 @@ from typing import Optional
 
 from infrastructure.config.settings import settings
 from infrastructure.logging.logger import get_logger
-from .websocket_client import WebSocketClient
+from core.services.clob.order_book import get_order_book_mirror
+from .websocket_client import WebSocketPool
 from .market_updater import MarketUpdater
 from .subscription_manager import SubscriptionManager
+from .market_index import get_market_index
 
 logger = get_logger(__name__)
 
@@ -23,7 +25,7 @@ class StreamerService:
     def __init__(self):
         self.enabled = settings.data_ingestion.streamer_enabled
         logger.info(f"🔍 StreamerService.__init__() - enabled={self.enabled}, settings.streamer_enabled={settings.data_ingestion.streamer_enabled}")
-        self.websocket_client = WebSocketClient()
+        self.websocket_client = WebSocketPool()  # Sharded connections, same interface as WebSocketClient
         self.market_updater = MarketUpdater()
         self.subscription_manager = SubscriptionManager(self.websocket_client, self.market_updater)
         self.running = False
@@ -45,9 +47,15 @@ class StreamerService:
         self.websocket_client.register_handler("trade", self.market_updater.handle_trade_update)
         self.websocket_client.register_handler("market", self.market_updater.handle_price_update)
 
+        # Warm resident market index (token/condition -> market) before any message arrives
+        await get_market_index().warm()
+
         # Start market updater (starts price buffer)
         await self.market_updater.start()
 
+        # Share mirrored order books with the API process + verify them against REST
+        await get_order_book_mirror().start()
+
         # Start subscription manager
         await self.subscription_manager.start()
 
@@ -73,6 +81,7 @@ class StreamerService:
         await self.subscription_manager.stop()
         await self.websocket_client.stop()
         await self.market_updater.stop()
+        await get_order_book_mirror().stop()
 
         logger.info("✅ Streamer Service stopped")
 
@@ -168,4 +177,5 @@ class StreamerService:
             "websocket": self.websocket_client.get_stats(),
             "subscription_manager": self.subscription_manager.get_stats(),
             "market_updater": self.market_updater.get_stats(),
+            "order_book": get_order_book_mirror().get_stats(),
         }
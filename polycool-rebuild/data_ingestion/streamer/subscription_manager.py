@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.database.connection import get_db
 from core.database.models import Market, Position
 from infrastructure.logging.logger import get_logger
+from data_ingestion.streamer.market_index import get_market_index
 
 logger = get_logger(__name__)
 
@@ -39,7 +40,7 @@ class SubscriptionManager:
         Initialize subscription manager
 
         Args:
-            websocket_client: WebSocketClient instance
+            websocket_client: WebSocketPool (or single WebSocketClient) instance
             market_updater: Optional MarketUpdater instance (for cleaning price buffer on unsubscribe)
         """
         self.websocket_client = websocket_client
@@ -47,6 +48,7 @@ class SubscriptionManager:
         self.running = False
         self.cleanup_task: Optional[asyncio.Task] = None
         self.cleanup_interval = 300  # 5 minutes
+        self.market_index = get_market_index()
 
     async def start(self) -> None:
         """Start the subscription manager"""
@@ -396,7 +398,7 @@ class SubscriptionManager:
 
     async def _get_market_token_ids(self, market_id: str) -> Set[str]:
         """
-        Get CLOB token IDs for a market
+        Get CLOB token IDs for a market (MarketIndex first, indexed on miss)
 
         Args:
             market_id: Market ID
@@ -404,6 +406,10 @@ class SubscriptionManager:
         Returns:
             Set of token IDs
         """
+        indexed = self.market_index.get_market(market_id)
+        if indexed and indexed['clob_token_ids']:
+            return set(indexed['clob_token_ids'])
+
         try:
             # Use API if SKIP_DB=true
             if SKIP_DB:
@@ -413,6 +419,7 @@ class SubscriptionManager:
                     if not market_data:
                         logger.warning(f"⚠️ Market {market_id} not found via API")
                         return set()
+                    self.market_index.add_market(market_data)
 
                     clob_token_ids = market_data.get('clob_token_ids')
                     if not clob_token_ids:
@@ -442,10 +449,19 @@ class SubscriptionManager:
             # Use DB if SKIP_DB=false
             async with get_db() as db:
                 result = await db.execute(
-                    select(Market.clob_token_ids)
+                    select(Market.clob_token_ids, Market.outcomes, Market.condition_id)
                     .where(Market.id == market_id)
                 )
-                row = result.scalar_one_or_none()
+                market_row = result.first()
+
+            row = market_row[0] if market_row else None
+            if row:
+                self.market_index.add_market({
+                    'id': market_id,
+                    'clob_token_ids': row,
+                    'outcomes': market_row[1],
+                    'condition_id': market_row[2],
+                })
 
             if not row:
                 logger.warning(f"⚠️ No clob_token_ids found for market {market_id}")
@@ -551,4 +567,5 @@ class SubscriptionManager:
             "running": self.running,
             "cleanup_interval": self.cleanup_interval,
             "subscribed_markets": len(self.websocket_client.subscribed_token_ids) if self.websocket_client else 0,
+            "market_index": self.market_index.get_stats(),
         }
@@ -2,5 +2,6 @@
 WebSocket client for Polymarket CLOB real-time data
 """
 from .websocket_client import WebSocketClient
+from .websocket_pool import WebSocketPool
 
-__all__ = ["WebSocketClient"]
+__all__ = ["WebSocketClient", "WebSocketPool"]
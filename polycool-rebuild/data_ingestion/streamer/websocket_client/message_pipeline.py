@@ -0,0 +1,259 @@
+"""
+Message Pipeline - Staged processing of WebSocket frames
+- Reader only parses and enqueues (never waits on DB/API work)
+- Bounded per-shard queues: pending price/book updates for the same token are
+  coalesced (latest wins); when a shard is full the oldest pending entry is dropped
+- Workers drain micro-batches and process them grouped per market
+  (markets are pinned to one shard, so updates of a market stay ordered)
+"""
+import asyncio
+from collections import OrderedDict, deque
+from itertools import count
+from time import monotonic
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Key under which the receipt time (monotonic) travels with the message
+RECEIVED_AT_KEY = "_received_at"
+
+# Event types where only the latest pending snapshot per token matters
+COALESCED_EVENT_TYPES = {"price_change", "price", "book", "market"}
+
+
+class PipelineMetrics:
+    """
+    Streamer pipeline metrics (process-wide, shared by client and updater)
+    - queue depth, coalesced/dropped counts
+    - messages/sec over a sliding window
+    - queue lag (receipt -> processing) and write lag (receipt -> DB write)
+    """
+
+    def __init__(self, rate_window: int = 60):
+        self.rate_window = rate_window
+        self.received_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.processed_count = 0
+        self.failed_count = 0
+        self.batch_count = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+        self._processed_buckets: Deque[List[int]] = deque()  # [second, count]
+        self._lags: Dict[str, Dict[str, float]] = {
+            'queue': {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0},
+            'write': {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0},
+        }
+
+    def record_processed(self, n: int = 1) -> None:
+        self.processed_count += n
+        second = int(monotonic())
+        if self._processed_buckets and self._processed_buckets[-1][0] == second:
+            self._processed_buckets[-1][1] += n
+        else:
+            self._processed_buckets.append([second, n])
+        while self._processed_buckets and self._processed_buckets[0][0] <= second - self.rate_window:
+            self._processed_buckets.popleft()
+
+    def record_lag(self, kind: str, received_at: Optional[float]) -> None:
+        """Record lag since receipt (received_at is a monotonic timestamp)"""
+        if received_at is None:
+            return
+        lag = max(0.0, monotonic() - received_at)
+        stats = self._lags[kind]
+        stats['count'] += 1
+        stats['total'] += lag
+        stats['max'] = max(stats['max'], lag)
+        stats['last'] = lag
+
+    def messages_per_sec(self) -> float:
+        now = int(monotonic())
+        recent = sum(n for second, n in self._processed_buckets if second > now - self.rate_window)
+        return recent / self.rate_window
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'received_count': self.received_count,
+            'coalesced_count': self.coalesced_count,
+            'dropped_count': self.dropped_count,
+            'processed_count': self.processed_count,
+            'failed_count': self.failed_count,
+            'batch_count': self.batch_count,
+            'messages_per_sec': round(self.messages_per_sec(), 2),
+        }
+        for kind, lag in self._lags.items():
+            stats[f'{kind}_lag_avg'] = round(lag['total'] / lag['count'], 3) if lag['count'] else None
+            stats[f'{kind}_lag_max'] = round(lag['max'], 3)
+            stats[f'{kind}_lag_last'] = round(lag['last'], 3)
+        return stats
+
+
+class _Shard:
+    """One bounded queue + its worker"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.pending: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class MessagePipeline:
+    """
+    Bounded, coalescing queue between the WebSocket reader and message handlers
+
+    Args:
+        handler: async callable processing one parsed message
+        workers: number of shards/workers (a market always maps to the same one)
+        max_queue_size: total pending messages across shards
+        batch_size: max messages drained per micro-batch
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Dict[str, Any]], Awaitable[None]],
+        workers: int = 2,
+        max_queue_size: int = 5000,
+        batch_size: int = 200,
+    ):
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.metrics = get_pipeline_metrics()
+        self._shards: List[_Shard] = []
+        self._sequence = count()
+        self.running = False
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        per_shard = max(1, self.max_queue_size // self.workers)
+        self._shards = [_Shard(per_shard) for _ in range(self.workers)]
+        for shard in self._shards:
+            shard.task = asyncio.create_task(self._worker(shard))
+        logger.info(f"🧵 Message pipeline started ({self.workers} workers, queue {self.max_queue_size}, batch {self.batch_size})")
+
+    async def stop(self) -> None:
+        self.running = False
+        for shard in self._shards:
+            if shard.task and not shard.task.done():
+                shard.task.cancel()
+                try:
+                    await shard.task
+                except asyncio.CancelledError:
+                    pass
+        self._shards = []
+        self.metrics.queue_depth = 0
+
+    def submit(self, data: Dict[str, Any]) -> None:
+        """Enqueue a parsed message (non-blocking, called from the reader)"""
+        if not self._shards:
+            return
+
+        data.setdefault(RECEIVED_AT_KEY, monotonic())
+        self.metrics.received_count += 1
+
+        market_key = self._market_key(data)
+        shard = self._shards[hash(market_key) % len(self._shards)]
+        coalesce_key = self._coalesce_key(data, market_key)
+
+        if coalesce_key in shard.pending:
+            # Latest snapshot wins - keep the original receipt time so lag stays honest
+            data[RECEIVED_AT_KEY] = shard.pending[coalesce_key][RECEIVED_AT_KEY]
+            shard.pending[coalesce_key] = data
+            self.metrics.coalesced_count += 1
+        else:
+            if len(shard.pending) >= shard.max_size:
+                shard.pending.popitem(last=False)
+                self.metrics.dropped_count += 1
+                self.metrics.queue_depth -= 1
+            shard.pending[coalesce_key] = data
+            self.metrics.queue_depth += 1
+            self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+
+        shard.ready.set()
+
+    async def _worker(self, shard: _Shard) -> None:
+        while self.running:
+            try:
+                await shard.ready.wait()
+                shard.ready.clear()
+
+                while shard.pending:
+                    batch: List[Dict[str, Any]] = []
+                    while shard.pending and len(batch) < self.batch_size:
+                        batch.append(shard.pending.popitem(last=False)[1])
+                    self.metrics.queue_depth -= len(batch)
+                    await self._process_batch(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"⚠️ Message pipeline worker error: {e}")
+
+    async def _process_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Process a micro-batch: markets concurrently, messages of a market in order"""
+        groups: Dict[Hashable, List[Dict[str, Any]]] = {}
+        for data in batch:
+            groups.setdefault(self._market_key(data), []).append(data)
+
+        self.metrics.batch_count += 1
+        await asyncio.gather(*(self._process_group(messages) for messages in groups.values()))
+
+    async def _process_group(self, messages: List[Dict[str, Any]]) -> None:
+        for data in messages:
+            self.metrics.record_lag('queue', data.get(RECEIVED_AT_KEY))
+            try:
+                await self.handler(data)
+                self.metrics.record_processed()
+            except Exception as e:
+                self.metrics.failed_count += 1
+                logger.error(f"⚠️ Error handling message: {e}")
+
+    @staticmethod
+    def _token_ids(data: Dict[str, Any]) -> Tuple[str, ...]:
+        price_changes = data.get("price_changes")
+        if isinstance(price_changes, list):
+            tokens = {
+                str(change.get("asset_id") or change.get("asset"))
+                for change in price_changes
+                if isinstance(change, dict) and (change.get("asset_id") or change.get("asset"))
+            }
+            if tokens:
+                return tuple(sorted(tokens))
+        token_id = data.get("asset_id") or data.get("token_id") or data.get("assetId") or data.get("asset")
+        return (str(token_id),) if token_id else ()
+
+    @classmethod
+    def _market_key(cls, data: Dict[str, Any]) -> Hashable:
+        market = data.get("market") or data.get("market_id") or data.get("condition_id")
+        if market:
+            return str(market)
+        tokens = cls._token_ids(data)
+        return tokens[0] if tokens else None
+
+    def _coalesce_key(self, data: Dict[str, Any], market_key: Hashable) -> Hashable:
+        kind = data.get("event_type") or data.get("type")
+        tokens = self._token_ids(data)
+        if kind in COALESCED_EVENT_TYPES and (tokens or market_key):
+            return (kind, market_key, tokens)
+        # Trades, tick size changes, unknown messages: never coalesced
+        return ("seq", next(self._sequence))
+
+
+# Global instance
+_pipeline_metrics: Optional[PipelineMetrics] = None
+
+
+def get_pipeline_metrics() -> PipelineMetrics:
+    """Get global PipelineMetrics instance"""
+    global _pipeline_metrics
+    if _pipeline_metrics is None:
+        _pipeline_metrics = PipelineMetrics()
+    return _pipeline_metrics
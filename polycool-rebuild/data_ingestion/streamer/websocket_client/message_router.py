@@ -0,0 +1,123 @@
+"""
+Message Router - Routes parsed Polymarket market-channel messages to handlers
+Shared by every WebSocket connection of the streamer.
+"""
+from typing import Any, Callable, Dict
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MessageRouter:
+    """Dispatch messages by Polymarket event_type / legacy type to registered handlers"""
+
+    def __init__(self):
+        self.message_handlers: Dict[str, Callable] = {}
+
+    def register_handler(self, message_type: str, handler: Callable):
+        """Register a message handler for a specific message type"""
+        self.message_handlers[message_type] = handler
+
+    async def handle_message(self, data: Dict[str, Any]) -> None:
+        """Handle incoming WebSocket message (data is already parsed JSON)
+
+        Note: PONG messages are handled by the reader before JSON parsing
+        """
+
+        # Skip list/array messages (some Polymarket messages are arrays)
+        if isinstance(data, list):
+            logger.debug(f"⚠️ Skipping list message (not supported): {len(data)} items")
+            return
+
+        # Ensure data is a dictionary
+        if not isinstance(data, dict):
+            logger.debug(f"⚠️ Skipping non-dict message: {type(data)}")
+            return
+
+        logger.debug(f"🔍 Message structure - type: {data.get('type')}, event_type: {data.get('event_type')}, keys: {list(data.keys())[:15]}")
+
+        # Handle Polymarket event types
+        event_type = data.get("event_type")
+        if event_type:
+            await self._handle_polymarket_event(event_type, data)
+            return
+
+        # Handle Polymarket "market" type messages (standard format)
+        message_type = data.get("type")
+        if message_type == "market":
+            # Polymarket market update - route to price_update handler
+            handler = self.message_handlers.get("price_update")
+            if handler:
+                try:
+                    logger.debug(f"📊 Routing 'market' type message to price_update handler")
+                    await handler(data)
+                except Exception as e:
+                    logger.error(f"⚠️ Handler error for market type: {e}")
+            else:
+                logger.warning("⚠️ No price_update handler registered for market type")
+            return
+
+        # Fallback to legacy message type handling
+        message_type = message_type or data.get("action")
+
+        if not message_type:
+            logger.debug(f"⚠️ Message without type: {data}")
+            return
+
+        # Route to registered handler
+        handler = self.message_handlers.get(message_type)
+        if handler:
+            try:
+                await handler(data)
+            except Exception as e:
+                logger.error(f"⚠️ Handler error for {message_type}: {e}")
+        else:
+            logger.debug(f"⚠️ No handler for message type: {message_type}")
+
+    async def _handle_polymarket_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Handle Polymarket-specific event types"""
+        try:
+            logger.debug(f"🎯 Handling Polymarket event: {event_type}")
+
+            if event_type == "book":
+                # Orderbook update
+                handler = self.message_handlers.get("orderbook")
+                if handler:
+                    await handler(data)
+                else:
+                    logger.debug("⚠️ No orderbook handler registered")
+
+            elif event_type == "price_change" or event_type == "price":
+                # Price change event
+                handler = self.message_handlers.get("price_update")
+                if handler:
+                    logger.debug(f"📊 Routing price_change event to price_update handler")
+                    await handler(data)
+                else:
+                    logger.warning("⚠️ No price_update handler registered")
+
+            elif event_type == "trade":
+                # Trade event
+                handler = self.message_handlers.get("trade")
+                if handler:
+                    await handler(data)
+                else:
+                    logger.debug("⚠️ No trade handler registered")
+
+            elif event_type == "tick_size_change":
+                # Tick size change
+                logger.info(f"📏 Tick size changed: {data}")
+                # Handle tick size changes if needed
+
+            else:
+                logger.debug(f"⚠️ Unknown Polymarket event type: {event_type}, routing to price_update anyway")
+                # Fallback: try price_update handler for unknown event types that might be price-related
+                handler = self.message_handlers.get("price_update")
+                if handler:
+                    await handler(data)
+
+        except Exception as e:
+            logger.error(f"⚠️ Error handling Polymarket event {event_type}: {e}")
+            import traceback
+            logger.debug(f"Traceback: {traceback.format_exc()}")
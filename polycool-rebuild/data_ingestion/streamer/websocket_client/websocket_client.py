@@ -13,6 +13,8 @@ from websockets.exceptions import ConnectionClosed, WebSocketException
 
 from infrastructure.config.settings import settings
 from infrastructure.logging.logger import get_logger
+from .message_pipeline import MessagePipeline
+from .message_router import MessageRouter
 
 logger = get_logger(__name__)
 
@@ -22,10 +24,17 @@ class WebSocketClient:
     WebSocket client for Polymarket CLOB Market Channel
     - Selective subscriptions (only markets with active positions)
     - Auto-reconnect with exponential backoff
-    - Message handling and routing
+    - Message handling and routing (reader -> bounded queue -> workers, see MessagePipeline)
+    Used standalone or as one shard of a WebSocketPool (shared router/pipeline).
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        shard_id: int = 0,
+        router: Optional[MessageRouter] = None,
+        pipeline: Optional[MessagePipeline] = None
+    ):
+        self.shard_id = shard_id
         self.ws_url = settings.polymarket.clob_wss_url
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.running = False
@@ -47,16 +56,26 @@ class WebSocketClient:
         self.last_message_time: Optional[datetime] = None
 
         # Message handlers
-        self.message_handlers: Dict[str, Callable] = {}
+        self.router = router or MessageRouter()
+
+        # Reader only parses/enqueues; workers run the handlers
+        self._owns_pipeline = pipeline is None
+        self.pipeline = pipeline or MessagePipeline(self._handle_message, workers=2, max_queue_size=5000, batch_size=200)
+
+        # Book deltas must be applied in order, before the pipeline coalesces them
+        from core.services.clob.order_book import get_order_book_mirror
+        self.order_book = get_order_book_mirror()
 
     def register_handler(self, message_type: str, handler: Callable):
         """Register a message handler for a specific message type"""
-        self.message_handlers[message_type] = handler
+        self.router.register_handler(message_type, handler)
 
     async def start(self) -> None:
         """Start the WebSocket client"""
         self.running = True
-        logger.info("🌐 WebSocket Client starting...")
+        logger.info(f"🌐 WebSocket Client starting (shard {self.shard_id})...")
+        if self._owns_pipeline:
+            await self.pipeline.start()
 
         # Check if we have subscriptions before starting the connection loop
         if not self.subscribed_token_ids:
@@ -132,6 +151,10 @@ class WebSocketClient:
         # Clear websocket reference (connection will be closed by context manager)
         self.websocket = None
 
+        # Deltas were missed while disconnected - books are rebuilt from the resubscribe snapshots
+        # (only tokens still owned: tokens handed to another shard keep their books)
+        self.order_book.invalidate(self.subscribed_token_ids)
+
     async def stop(self) -> None:
         """Stop the WebSocket client"""
         self.running = False
@@ -144,6 +167,9 @@ class WebSocketClient:
             except asyncio.CancelledError:
                 pass
 
+        if self._owns_pipeline:
+            await self.pipeline.stop()
+
         # Close WebSocket connection
         if self.websocket:
             try:
@@ -174,12 +200,12 @@ class WebSocketClient:
                     logger.warning(f"⚠️ Force close also failed: {force_close_error}")
                     pass
 
-        logger.info("✅ WebSocket Client stopped")
+        logger.info(f"✅ WebSocket Client stopped (shard {self.shard_id})")
 
     async def _connect_and_stream(self) -> None:
         """Connect to WebSocket and stream messages"""
         try:
-            logger.info(f"🔌 Connecting to Polymarket CLOB WebSocket: {self.ws_url}")
+            logger.info(f"🔌 Connecting to Polymarket CLOB WebSocket (shard {self.shard_id}): {self.ws_url}")
 
             async with websockets.connect(
                 self.ws_url,
@@ -188,7 +214,7 @@ class WebSocketClient:
                 max_size=10 * 1024 * 1024  # 10MB max message
             ) as websocket:
                 self.websocket = websocket
-                logger.info("✅ WebSocket connected")
+                logger.info(f"✅ WebSocket connected (shard {self.shard_id}, {len(self.subscribed_token_ids)} tokens)")
 
                 # Reset error count on successful connection
                 self.consecutive_errors = 0
@@ -280,6 +306,7 @@ class WebSocketClient:
                     if message.strip() == "PONG":
                         logger.debug("🏓 Received PONG (heartbeat response)")
                         self.last_message_time = datetime.now(timezone.utc)
+                        self.order_book.touch()
                         continue
 
                     # Try to parse as JSON
@@ -290,20 +317,18 @@ class WebSocketClient:
                         logger.warning(f"⚠️ Message is not JSON and not PONG: {str(message)[:200]}")
                         continue
 
-                    # Handle empty arrays (Polymarket sometimes sends empty arrays)
-                    if isinstance(data, list):
-                        if len(data) == 0:
-                            logger.debug("⚠️ Received empty array message, skipping")
-                            continue
-                        else:
-                            logger.warning(f"⚠️ Received non-empty array message (not supported): {data[:3]}")
-                            continue
+                    logger.debug(f"📨 Received WebSocket message: {message[:500]}")
 
-                    # Log at INFO level to see messages in production logs
-                    logger.info(f"📨 Received WebSocket message: {json.dumps(data)[:500]}")  # Log first 500 chars
-                    await self._handle_message(data)
-                    self.message_count += 1
-                    self.last_message_time = datetime.now(timezone.utc)
+                    # Initial `book` snapshots arrive as an array of events (empty arrays are keepalives)
+                    events = data if isinstance(data, list) else [data]
+                    for event in events:
+                        if not isinstance(event, dict):
+                            logger.debug(f"⚠️ Skipping non-dict message: {type(event)}")
+                            continue
+                        self.order_book.apply(event)
+                        self.pipeline.submit(event)
+                        self.message_count += 1
+                        self.last_message_time = datetime.now(timezone.utc)
                 except Exception as e:
                     logger.error(f"⚠️ Error handling message: {e}, raw: {str(message)[:200]}")
                     import traceback
@@ -322,113 +347,13 @@ class WebSocketClient:
             raise
 
     async def _handle_message(self, data: Dict[str, Any]) -> None:
-        """Handle incoming WebSocket message (data is already parsed JSON)
-
-        Note: PONG messages are handled in _stream_messages before JSON parsing
-        """
-
-        # Skip list/array messages (some Polymarket messages are arrays)
-        if isinstance(data, list):
-            logger.debug(f"⚠️ Skipping list message (not supported): {len(data)} items")
-            return
-
-        # Ensure data is a dictionary
-        if not isinstance(data, dict):
-            logger.debug(f"⚠️ Skipping non-dict message: {type(data)}")
-            return
-
-        # Log message structure at INFO level to diagnose issues
-        logger.info(f"🔍 Message structure - type: {data.get('type')}, event_type: {data.get('event_type')}, keys: {list(data.keys())[:15]}")
-
-        # Handle Polymarket event types
-        event_type = data.get("event_type")
-        if event_type:
-            await self._handle_polymarket_event(event_type, data)
-            return
-
-        # Handle Polymarket "market" type messages (standard format)
-        message_type = data.get("type")
-        if message_type == "market":
-            # Polymarket market update - route to price_update handler
-            handler = self.message_handlers.get("price_update")
-            if handler:
-                try:
-                    logger.info(f"📊 Routing 'market' type message to price_update handler")
-                    await handler(data)
-                except Exception as e:
-                    logger.error(f"⚠️ Handler error for market type: {e}")
-            else:
-                logger.warning("⚠️ No price_update handler registered for market type")
-            return
-
-        # Fallback to legacy message type handling
-        message_type = message_type or data.get("action")
-
-        if not message_type:
-            logger.debug(f"⚠️ Message without type: {data}")
-            return
-
-        # Route to registered handler
-        handler = self.message_handlers.get(message_type)
-        if handler:
-            try:
-                await handler(data)
-            except Exception as e:
-                logger.error(f"⚠️ Handler error for {message_type}: {e}")
-        else:
-            logger.debug(f"⚠️ No handler for message type: {message_type}")
-
-    async def _handle_polymarket_event(self, event_type: str, data: Dict[str, Any]) -> None:
-        """Handle Polymarket-specific event types"""
-        try:
-            logger.debug(f"🎯 Handling Polymarket event: {event_type}")
-
-            if event_type == "book":
-                # Orderbook update
-                handler = self.message_handlers.get("orderbook")
-                if handler:
-                    await handler(data)
-                else:
-                    logger.debug("⚠️ No orderbook handler registered")
-
-            elif event_type == "price_change" or event_type == "price":
-                # Price change event
-                handler = self.message_handlers.get("price_update")
-                if handler:
-                    logger.info(f"📊 Routing price_change event to price_update handler")
-                    await handler(data)
-                else:
-                    logger.warning("⚠️ No price_update handler registered")
-
-            elif event_type == "trade":
-                # Trade event
-                handler = self.message_handlers.get("trade")
-                if handler:
-                    await handler(data)
-                else:
-                    logger.debug("⚠️ No trade handler registered")
-
-            elif event_type == "tick_size_change":
-                # Tick size change
-                logger.info(f"📏 Tick size changed: {data}")
-                # Handle tick size changes if needed
-
-            else:
-                logger.debug(f"⚠️ Unknown Polymarket event type: {event_type}, routing to price_update anyway")
-                # Fallback: try price_update handler for unknown event types that might be price-related
-                handler = self.message_handlers.get("price_update")
-                if handler:
-                    await handler(data)
-
-        except Exception as e:
-            logger.error(f"⚠️ Error handling Polymarket event {event_type}: {e}")
-            import traceback
-            logger.debug(f"Traceback: {traceback.format_exc()}")
+        """Handle incoming WebSocket message (data is already parsed JSON)"""
+        await self.router.handle_message(data)
 
     async def _sync_subscriptions_after_reconnect(self) -> None:
         """Sync subscriptions after reconnection"""
-        logger.info("🔄 Syncing subscriptions after reconnection...")
-        logger.info(f"📊 Current subscribed token_ids: {list(self.subscribed_token_ids) if self.subscribed_token_ids else 'None'}")
+        logger.info(f"🔄 Syncing subscriptions after reconnection (shard {self.shard_id})...")
+        logger.debug(f"📊 Current subscribed token_ids: {list(self.subscribed_token_ids) if self.subscribed_token_ids else 'None'}")
 
         # Resend all stored subscriptions after reconnection
         if self.subscribed_token_ids and self.websocket:
@@ -438,8 +363,7 @@ class WebSocketClient:
                     "type": "market"
                 }
                 subscription_json = json.dumps(subscription_message)
-                logger.info(f"📡 Resending subscriptions after reconnect: {subscription_message}")
-                logger.info(f"📡 Subscription JSON: {subscription_json}")
+                logger.debug(f"📡 Resending subscriptions after reconnect: {subscription_json}")
                 await self.websocket.send(subscription_json)
                 logger.info(f"✅ Resent {len(self.subscribed_token_ids)} subscriptions")
             except Exception as e:
@@ -476,7 +400,7 @@ class WebSocketClient:
             # If WebSocket is not connected, just store the subscriptions
             # They will be sent when the connection is established
             self.subscribed_token_ids.update(valid_token_ids)
-            logger.info(f"✅ Added {len(valid_token_ids)} subscriptions: {valid_token_ids}")
+            logger.info(f"✅ Added {len(valid_token_ids)} subscriptions (shard {self.shard_id})")
 
             # If WebSocket is connected, send the subscription immediately
             if self.websocket:
@@ -487,14 +411,10 @@ class WebSocketClient:
                     "type": "market"
                 }
 
-                logger.info(f"📡 Sending subscription message: {subscription_message}")
                 subscription_json = json.dumps(subscription_message)
-                logger.info(f"📡 Subscription JSON: {subscription_json}")
+                logger.debug(f"📡 Sending subscription message: {subscription_json}")
                 await self.websocket.send(subscription_json)
-                logger.info(f"✅ Subscription message sent for {len(valid_token_ids)} tokens")
-
-                # Wait a bit to see if subscription is accepted or if we get any response
-                await asyncio.sleep(0.5)  # Short wait to see if we get immediate response
+                logger.info(f"✅ Subscription message sent for {len(valid_token_ids)} tokens (shard {self.shard_id})")
             else:
                 logger.info("📝 WebSocket not connected - subscriptions stored for later")
 
@@ -510,7 +430,13 @@ class WebSocketClient:
         Args:
             token_ids: Set of CLOB token IDs to unsubscribe from
         """
-        if not self.websocket or not token_ids:
+        if not token_ids:
+            return
+
+        # Always forget the tokens - a disconnected shard must not resubscribe them on reconnect
+        self.subscribed_token_ids -= token_ids
+        self.order_book.drop(token_ids)
+        if not self.websocket:
             return
 
         try:
@@ -522,12 +448,19 @@ class WebSocketClient:
             }
 
             await self.websocket.send(json.dumps(unsubscribe_message))
-            self.subscribed_token_ids -= token_ids
             logger.info(f"🚪 Unsubscribed from {len(token_ids)} markets (Polymarket format)")
 
         except Exception as e:
             logger.error(f"⚠️ Unsubscription error: {e}")
 
+    def release_markets(self, token_ids: Set[str]) -> None:
+        """
+        Hand tokens over to another shard (pool rebalancing)
+        They are forgotten without unsubscribing or dropping their books,
+        which the new owner keeps updating.
+        """
+        self.subscribed_token_ids -= token_ids
+
     def get_stats(self) -> Dict[str, Any]:
         """Get WebSocket client statistics"""
         connected = False
@@ -542,7 +475,8 @@ class WebSocketClient:
         except Exception:
             connected = False
 
-        return {
+        stats = {
+            "shard_id": self.shard_id,
             "running": self.running,
             "connected": connected,
             "subscribed_markets": len(self.subscribed_token_ids),
@@ -551,3 +485,6 @@ class WebSocketClient:
             "last_message_time": self.last_message_time.isoformat() if self.last_message_time else None,
             "consecutive_errors": self.consecutive_errors,
         }
+        if self._owns_pipeline:
+            stats["pipeline"] = self.pipeline.metrics.get_stats()
+        return stats
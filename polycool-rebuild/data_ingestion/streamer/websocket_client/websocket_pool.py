@@ -0,0 +1,257 @@
+"""
+WebSocket Pool - Sharded Polymarket market-channel connections
+Token subscriptions are spread across several WebSocketClient shards
+(capped per connection); every shard feeds the same router and pipeline.
+Shards reconnect independently, so one dropped socket only affects its tokens.
+"""
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from infrastructure.config.settings import settings
+from infrastructure.logging.logger import get_logger
+from .message_pipeline import MessagePipeline
+from .message_router import MessageRouter
+from .websocket_client import WebSocketClient
+
+logger = get_logger(__name__)
+
+
+class WebSocketPool:
+    """
+    Connection pool with the WebSocketClient interface used by the streamer
+    - subscribe_markets() places new tokens on the least loaded shard below the cap,
+      opening a new connection when all shards are full
+    - unsubscribe_markets() removes tokens and consolidates shards that became
+      unnecessary (empty shards are closed)
+    - A supervisor restarts shards that gave up while still owning tokens
+    """
+
+    def __init__(
+        self,
+        tokens_per_connection: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        max_subscriptions: Optional[int] = None
+    ):
+        self.tokens_per_connection = tokens_per_connection or settings.data_ingestion.ws_tokens_per_connection
+        self.max_connections = max_connections or settings.data_ingestion.ws_max_connections
+        self.max_subscriptions = max_subscriptions or settings.data_ingestion.max_websocket_subscriptions
+
+        self.router = MessageRouter()
+        self.pipeline = MessagePipeline(self.router.handle_message, workers=2, max_queue_size=5000, batch_size=200)
+
+        self.shards: Dict[int, WebSocketClient] = {}
+        self.token_to_shard: Dict[str, int] = {}
+        self._shard_tasks: Dict[int, asyncio.Task] = {}
+        self._next_shard_id = 0
+        self._lock: Optional[asyncio.Lock] = None  # Created lazily inside the running loop
+
+        self.running = False
+        self.supervise_interval = 5
+        self.rebalance_count = 0
+        self.shard_restart_count = 0
+
+    @property
+    def subscribed_token_ids(self) -> Set[str]:
+        return set(self.token_to_shard)
+
+    def register_handler(self, message_type: str, handler: Callable):
+        """Register a message handler for a specific message type"""
+        self.router.register_handler(message_type, handler)
+
+    async def start(self) -> None:
+        """Start the pool (blocks until stop(), like WebSocketClient.start)"""
+        if self.running:
+            return
+        self.running = True
+        logger.info(
+            f"🌐 WebSocket Pool starting ({self.tokens_per_connection} tokens/connection, "
+            f"max {self.max_connections} connections)"
+        )
+        await self.pipeline.start()
+
+        for shard in self.shards.values():
+            self._start_shard(shard)
+
+        while self.running:
+            await asyncio.sleep(self.supervise_interval)
+            self._supervise()
+
+    async def stop(self) -> None:
+        """Stop all shards and the pipeline"""
+        self.running = False
+        for shard_id in list(self.shards):
+            await self._stop_shard(shard_id)
+        await self.pipeline.stop()
+        logger.info("✅ WebSocket Pool stopped")
+
+    async def subscribe_markets(self, token_ids: Set[str]) -> None:
+        """
+        Subscribe to CLOB token IDs, sharded across connections
+
+        Args:
+            token_ids: Set of CLOB token IDs to subscribe to
+        """
+        new_tokens = sorted({
+            tid.strip() for tid in token_ids or ()
+            if isinstance(tid, str) and tid.strip() and tid.strip() not in self.token_to_shard
+        })
+        if not new_tokens:
+            return
+
+        async with self._get_lock():
+            available = self.max_subscriptions - len(self.token_to_shard)
+            if len(new_tokens) > available:
+                logger.warning(
+                    f"⚠️ WS subscription limit reached ({self.max_subscriptions}) - "
+                    f"dropping {len(new_tokens) - max(available, 0)} tokens"
+                )
+                new_tokens = new_tokens[:max(available, 0)]
+
+            assignments = self._assign(new_tokens)
+            for shard_id, tokens in assignments.items():
+                await self._subscribe_on_shard(shard_id, tokens)
+
+    async def unsubscribe_markets(self, token_ids: Set[str]) -> None:
+        """
+        Unsubscribe CLOB token IDs and consolidate shards
+
+        Args:
+            token_ids: Set of CLOB token IDs to unsubscribe from
+        """
+        if not token_ids:
+            return
+
+        async with self._get_lock():
+            by_shard: Dict[int, Set[str]] = {}
+            for token_id in token_ids:
+                shard_id = self.token_to_shard.pop(token_id, None)
+                if shard_id is not None:
+                    by_shard.setdefault(shard_id, set()).add(token_id)
+
+            for shard_id, tokens in by_shard.items():
+                shard = self.shards.get(shard_id)
+                if shard:
+                    await shard.unsubscribe_markets(tokens)
+
+            await self._rebalance()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Aggregated stats + per-shard stats"""
+        shard_stats = [shard.get_stats() for shard in self.shards.values()]
+        last_messages = [s["last_message_time"] for s in shard_stats if s["last_message_time"]]
+        return {
+            "running": self.running,
+            "connected": any(s["connected"] for s in shard_stats),
+            "connections": len(self.shards),
+            "connected_shards": sum(1 for s in shard_stats if s["connected"]),
+            "subscribed_markets": len(self.token_to_shard),
+            "message_count": sum(s["message_count"] for s in shard_stats),
+            "reconnection_count": sum(s["reconnection_count"] for s in shard_stats),
+            "last_message_time": max(last_messages) if last_messages else None,
+            "consecutive_errors": max((s["consecutive_errors"] for s in shard_stats), default=0),
+            "rebalance_count": self.rebalance_count,
+            "shard_restart_count": self.shard_restart_count,
+            "pipeline": self.pipeline.metrics.get_stats(),
+            "shards": shard_stats,
+        }
+
+    def _assign(self, tokens: List[str]) -> Dict[int, List[str]]:
+        """Place tokens on shards (least loaded first, new shard when all are full)"""
+        loads = {shard_id: len(shard.subscribed_token_ids) for shard_id, shard in self.shards.items()}
+        assignments: Dict[int, List[str]] = {}
+
+        for token_id in tokens:
+            open_shards = [sid for sid, load in loads.items() if load < self.tokens_per_connection]
+            if open_shards:
+                shard_id = min(open_shards, key=lambda sid: loads[sid])
+            elif len(loads) < self.max_connections:
+                shard_id = self._create_shard().shard_id
+                loads[shard_id] = 0
+            else:
+                # Every connection is at its cap - overflow onto the least loaded one
+                shard_id = min(loads, key=lambda sid: loads[sid])
+
+            loads[shard_id] += 1
+            self.token_to_shard[token_id] = shard_id
+            assignments.setdefault(shard_id, []).append(token_id)
+
+        return assignments
+
+    async def _subscribe_on_shard(self, shard_id: int, tokens: List[str]) -> None:
+        shard = self.shards[shard_id]
+        await shard.subscribe_markets(set(tokens))
+        if self.running:
+            self._start_shard(shard)
+
+    async def _rebalance(self) -> None:
+        """Close empty shards and drain the smallest shard while fewer connections would do"""
+        for shard_id in [sid for sid, shard in self.shards.items() if not shard.subscribed_token_ids]:
+            await self._stop_shard(shard_id)
+
+        while len(self.shards) > 1:
+            needed = -(-len(self.token_to_shard) // self.tokens_per_connection)  # ceil
+            if len(self.shards) <= needed:
+                break
+
+            smallest_id = min(self.shards, key=lambda sid: len(self.shards[sid].subscribed_token_ids))
+            moved = sorted(self.shards[smallest_id].subscribed_token_ids)
+            free = sum(
+                self.tokens_per_connection - len(shard.subscribed_token_ids)
+                for sid, shard in self.shards.items() if sid != smallest_id
+            )
+            if len(moved) > free:
+                break
+
+            # Subscribe elsewhere before closing the drained shard (no gap in updates)
+            smallest = self.shards.pop(smallest_id)
+            for token_id in moved:
+                self.token_to_shard.pop(token_id, None)
+            for shard_id, tokens in self._assign(moved).items():
+                await self._subscribe_on_shard(shard_id, tokens)
+            smallest.release_markets(set(moved))
+            await self._stop_shard(smallest_id, smallest)
+
+            self.rebalance_count += 1
+            logger.info(f"♻️ WS pool rebalanced: shard {smallest_id} drained ({len(moved)} tokens moved)")
+
+    def _create_shard(self) -> WebSocketClient:
+        shard = WebSocketClient(shard_id=self._next_shard_id, router=self.router, pipeline=self.pipeline)
+        self._next_shard_id += 1
+        self.shards[shard.shard_id] = shard
+        logger.info(f"➕ WS pool: opened shard {shard.shard_id} ({len(self.shards)} connections)")
+        return shard
+
+    def _start_shard(self, shard: WebSocketClient) -> None:
+        task = self._shard_tasks.get(shard.shard_id)
+        if task and not task.done():
+            return
+        shard.consecutive_errors = 0
+        shard.backoff_seconds = 1.0
+        self._shard_tasks[shard.shard_id] = asyncio.create_task(shard.start())
+
+    async def _stop_shard(self, shard_id: int, shard: Optional[WebSocketClient] = None) -> None:
+        shard = shard or self.shards.pop(shard_id, None)
+        task = self._shard_tasks.pop(shard_id, None)
+        if shard:
+            await shard.stop()
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        logger.info(f"➖ WS pool: closed shard {shard_id} ({len(self.shards)} connections)")
+
+    def _supervise(self) -> None:
+        """Restart shards whose client stopped (max errors) while still owning tokens"""
+        for shard in self.shards.values():
+            task = self._shard_tasks.get(shard.shard_id)
+            if shard.subscribed_token_ids and (task is None or task.done()):
+                logger.warning(f"🔁 WS pool: restarting shard {shard.shard_id}")
+                self.shard_restart_count += 1
+                self._start_shard(shard)
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
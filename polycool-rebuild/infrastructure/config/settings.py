@@ -77,10 +77,12 @@ class DatabaseSettings(BaseSettings):
         final_url = urlunparse(new_parsed)
 
         return final_url
-    pool_size: int = Field(3, env="DB_POOL_SIZE")      # Further reduced for PgBouncer compatibility
-    max_overflow: int = Field(5, env="DB_MAX_OVERFLOW")  # Further reduced for PgBouncer compatibility
+    pool_mode: str = Field("queue", env="DB_POOL_MODE")  # 'queue' (pooled) or 'null' (connection per session)
+    pool_size: Optional[int] = Field(None, env="DB_POOL_SIZE")      # None = per-role default (core/database/connection.py)
+    max_overflow: Optional[int] = Field(None, env="DB_MAX_OVERFLOW")  # None = per-role default
     pool_timeout: int = Field(30, env="DB_POOL_TIMEOUT")
-    pool_recycle: int = Field(3600, env="DB_POOL_RECYCLE")
+    pool_recycle: int = Field(1800, env="DB_POOL_RECYCLE")
+    prepared_statements: bool = Field(False, env="DB_PREPARED_STATEMENTS")  # Keep False behind PgBouncer transaction pooling
 
 
 class RedisSettings(BaseSettings):
@@ -92,6 +94,11 @@ class RedisSettings(BaseSettings):
     ttl_markets: int = Field(300, env="CACHE_TTL_MARKETS")  # 5 minutes
     ttl_user_data: int = Field(3600, env="CACHE_TTL_USER_DATA")  # 1 hour
     pubsub_enabled: bool = Field(True, env="REDIS_PUBSUB_ENABLED")  # Enable Pub/Sub
+    near_cache_enabled: bool = Field(True, env="CACHE_NEAR_ENABLED")  # In-process near-cache (needs Pub/Sub)
+    near_cache_ttl: int = Field(30, env="CACHE_NEAR_TTL")  # Max seconds a near-cache entry is served
+    near_cache_max_entries: int = Field(10000, env="CACHE_NEAR_MAX_ENTRIES")
+    dedup_redis_enabled: bool = Field(True, env="DEDUP_REDIS_ENABLED")  # Shared SET NX claims across replicas
+    dedup_max_entries: int = Field(100000, env="DEDUP_MAX_ENTRIES")  # In-process dedup memory cap per consumer
 
     def __init__(self, **data):
         """Override to force loading REDIS_URL from environment"""
@@ -112,6 +119,9 @@ class TelegramSettings(BaseSettings):
     token: Optional[str] = Field(None)  # Required only for bot service
     webhook_url: Optional[str] = Field(None, env="WEBHOOK_URL")
     webhook_secret: str = Field("polycool_webhook_secret_2025_secure_key", env="WEBHOOK_SECRET")
+    notification_senders: int = Field(8, env="NOTIFICATION_SENDERS")  # Concurrent notification senders
+    send_rate_global: float = Field(25.0, env="TELEGRAM_SEND_RATE")  # Messages/s across all chats (Telegram caps ~30)
+    send_rate_per_chat: float = Field(1.0, env="TELEGRAM_SEND_RATE_PER_CHAT")  # Messages/s to one chat
 
     def __init__(self, **data):
         """Override to support both TELEGRAM_BOT_TOKEN and BOT_TOKEN"""
@@ -177,6 +187,21 @@ class DataIngestionSettings(BaseSettings):
     streamer_enabled: bool = Field(True, env="STREAMER_ENABLED")
     indexer_enabled: bool = Field(True, env="INDEXER_ENABLED")
     max_websocket_subscriptions: int = Field(3000, env="WS_MAX_SUBSCRIPTIONS")
+    ws_tokens_per_connection: int = Field(500, env="WS_TOKENS_PER_CONNECTION")
+    ws_max_connections: int = Field(8, env="WS_MAX_CONNECTIONS")
+
+    # Gamma API request scheduler (shared by all pollers of a process)
+    gamma_rate_limit: float = Field(10.0, env="GAMMA_RATE_LIMIT")  # requests/second
+    gamma_rate_burst: int = Field(20, env="GAMMA_RATE_BURST")
+    gamma_max_concurrency: int = Field(8, env="GAMMA_MAX_CONCURRENCY")
+
+    # Local order book mirror (fed by the market WebSocket)
+    orderbook_mirror_enabled: bool = Field(True, env="ORDERBOOK_MIRROR_ENABLED")
+    orderbook_verify_interval: int = Field(60, env="ORDERBOOK_VERIFY_INTERVAL")  # seconds, 0 disables REST hash checks
+
+    # Market listings projection (market_display_items)
+    market_listings_expiry_interval: int = Field(60, env="MARKET_LISTINGS_EXPIRY_INTERVAL")  # seconds between ended-market sweeps
+    market_listings_rebuild_interval: int = Field(900, env="MARKET_LISTINGS_REBUILD_INTERVAL")  # seconds between full reconciles
 
 
 class TradingSettings(BaseSettings):
@@ -184,6 +209,16 @@ class TradingSettings(BaseSettings):
 
     tpsl_monitoring_enabled: bool = Field(True, env="TPSL_MONITORING_ENABLED")
     tpsl_check_interval: int = Field(10, env="TPSL_CHECK_INTERVAL")  # seconds
+    position_sync_enabled: bool = Field(True, env="POSITION_SYNC_ENABLED")  # Periodic blockchain sync of active users
+    position_sync_interval: int = Field(300, env="POSITION_SYNC_INTERVAL")  # seconds between batch syncs
+    position_sync_concurrency: int = Field(8, env="POSITION_SYNC_CONCURRENCY")  # Wallets synced in parallel
+    position_sync_full_diff_interval: int = Field(1800, env="POSITION_SYNC_FULL_DIFF_INTERVAL")  # Max age of an "unchanged" fingerprint
+    clob_client_cache_size: int = Field(1000, env="CLOB_CLIENT_CACHE_SIZE")  # Ready-to-trade ClobClients kept per process
+    clob_client_cache_ttl: int = Field(900, env="CLOB_CLIENT_CACHE_TTL")  # seconds before a cached client is rebuilt
+    copy_trade_concurrency: int = Field(16, env="COPY_TRADE_CONCURRENCY")  # Followers sized/signed/posted in parallel
+    copy_trade_sign_workers: int = Field(4, env="COPY_TRADE_SIGN_WORKERS")  # Order signing thread pool
+    resolution_reconcile_interval: int = Field(1800, env="RESOLUTION_RECONCILE_INTERVAL")  # seconds between resolved-position reconciles
+    resolution_detector_interval: int = Field(3600, env="RESOLUTION_DETECTOR_INTERVAL")  # seconds between closed-positions sweeps
 
 
 class LoggingSettings(BaseSettings):
@@ -0,0 +1,95 @@
+"""
+Rate limiting and latency primitives shared by services
+- TokenBucket: async pacing (Telegram sends, Gamma API requests)
+- LatencyStats: rolling latency window (notification latencies, DB pool checkouts)
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class TokenBucket:
+    """
+    Async token bucket (rate tokens/s, burst = capacity)
+    acquire() waits until a token is available instead of dropping the call.
+    Tokens are reserved up front (the balance may go negative), so concurrent
+    callers queue up without a lock.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, tokens: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = tokens if tokens is not None else self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _reserve(self) -> float:
+        """Take a token, return how long the caller has to wait for it"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+        return max(wait, self.paused_until - now)
+
+    async def acquire(self) -> float:
+        """Wait for a token (and any pause set meanwhile), returns seconds waited"""
+        waited = 0.0
+        wait = self._reserve()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+            wait = self.paused_until - time.monotonic()
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens (e.g. 429 Retry-After)"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate (tokens accrued so far are kept)"""
+        self._refill(time.monotonic())
+        self.rate = rate
+
+    def drain(self) -> None:
+        """Drop the accumulated burst (outstanding reservations are kept)"""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, 0.0)
+
+
+class LatencyStats:
+    """Rolling latency window (count / avg / p95 / max)"""
+
+    def __init__(self, window: int = 500):
+        self.count = 0
+        self.max = 0.0
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.max = max(self.max, seconds)
+        self._samples.append(seconds)
+
+    def avg(self) -> Optional[float]:
+        """Mean of the window in seconds, None if empty"""
+        return sum(self._samples) / len(self._samples) if self._samples else None
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the window in seconds, None if empty"""
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[max(0, int(len(samples) * pct / 100) - 1)]
+
+    def to_dict(self, precision: int = 1) -> Dict[str, Any]:
+        avg, p95 = self.avg(), self.percentile(95)
+        return {
+            'count': self.count,
+            'avg_ms': round(avg * 1000, precision) if avg is not None else None,
+            'p95_ms': round(p95 * 1000, precision) if p95 is not None else None,
+            'max_ms': round(self.max * 1000, precision),
+        }
@@ -0,0 +1,11 @@
+-- Migration: Add content_hash column to markets table
+-- Date: October 16, 2026
+-- Description: Fingerprint of the normalized poller fields, used by the Gamma pollers
+--              to skip rewriting markets whose content has not changed
+
+-- Add content_hash column to markets table
+ALTER TABLE markets
+ADD COLUMN IF NOT EXISTS content_hash VARCHAR(40);
+
+-- Add comment
+COMMENT ON COLUMN markets.content_hash IS 'SHA-1 of the normalized fields written by the Gamma pollers (change detection)';
@@ -0,0 +1,52 @@
+-- Migration: Add full-text and trigram search indexes to markets table
+-- Date: October 16, 2026
+-- Description: Weighted tsvector (title A, event title B) for prefix search and a trigram
+--              index on the lowercased title for typo-tolerant matches, both limited to
+--              open markets. Used by MarketService.search_markets (bot /search and API /search)
+
+-- Trigram operators (similarity, word_similarity, <%)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Search document, maintained by Postgres on every poller upsert
+ALTER TABLE markets
+ADD COLUMN IF NOT EXISTS search_vector tsvector
+GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(event_title, '')), 'B')
+) STORED;
+
+COMMENT ON COLUMN markets.search_vector IS 'Full-text search document: title (weight A) + event title (weight B)';
+
+-- Prefix / full-text matches (search_vector @@ to_tsquery('simple', 'bitcoin:* & 1:*'))
+CREATE INDEX IF NOT EXISTS idx_markets_search_vector
+ON markets USING GIN (search_vector)
+WHERE is_active = true AND is_resolved = false;
+
+-- Typo-tolerant matches ('bitcon' <% lower(title))
+CREATE INDEX IF NOT EXISTS idx_markets_title_trgm
+ON markets USING GIN (lower(title) gin_trgm_ops)
+WHERE is_active = true AND is_resolved = false;
+
+ANALYZE markets;
+
+-- =================================================
+-- VERIFICATION QUERIES
+-- =================================================
+
+-- Check column was added
+-- SELECT column_name, data_type, is_generated
+-- FROM information_schema.columns
+-- WHERE table_name = 'markets'
+-- AND column_name = 'search_vector';
+
+-- Check indexes were created
+-- SELECT indexname, indexdef
+-- FROM pg_indexes
+-- WHERE tablename = 'markets'
+-- AND indexname IN ('idx_markets_search_vector', 'idx_markets_title_trgm');
+
+-- Check the search uses the indexes (Bitmap Index Scan on both)
+-- EXPLAIN ANALYZE
+-- SELECT id, title FROM markets
+-- WHERE is_active = true AND is_resolved = false
+-- AND (search_vector @@ to_tsquery('simple', 'bitcoin:*') OR 'bitcon' <% lower(title));
@@ -0,0 +1,79 @@
+-- =================================================
+-- MIGRATION: Create Market Display Items Table
+-- Date: October 16, 2026
+-- Description: Precomputed listing projection - one row per event group (2+ open markets
+--              sharing an event title) or standalone open market, with aggregated volume /
+--              liquidity and the sort keys of every listing. Trending and category listings
+--              page through it with keyset cursors instead of regrouping markets per request.
+--              Maintained by core/services/market_service/market_listings.py
+--              (poller upserts, ended-market sweeps, periodic reconcile)
+-- =================================================
+
+CREATE TABLE IF NOT EXISTS market_display_items (
+    item_key TEXT PRIMARY KEY,
+    item_type VARCHAR(20) NOT NULL,
+    category VARCHAR(50),
+    event_title TEXT,
+    event_id VARCHAR(100),
+    event_slug VARCHAR(255),
+    market_ids JSONB NOT NULL,
+    market_count INTEGER NOT NULL,
+    total_volume DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_liquidity DOUBLE PRECISION NOT NULL DEFAULT 0,
+    newest_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    ends_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
+);
+
+-- Keyset indexes: (sort key, item_key) per listing, scanned forward or backward
+CREATE INDEX IF NOT EXISTS idx_display_items_volume ON market_display_items(total_volume, item_key);
+CREATE INDEX IF NOT EXISTS idx_display_items_liquidity ON market_display_items(total_liquidity, item_key);
+CREATE INDEX IF NOT EXISTS idx_display_items_newest ON market_display_items(newest_at, item_key);
+CREATE INDEX IF NOT EXISTS idx_display_items_ends ON market_display_items(ends_at, item_key);
+CREATE INDEX IF NOT EXISTS idx_display_items_category_volume ON market_display_items(category, total_volume, item_key);
+CREATE INDEX IF NOT EXISTS idx_display_items_category_liquidity ON market_display_items(category, total_liquidity, item_key);
+CREATE INDEX IF NOT EXISTS idx_display_items_category_newest ON market_display_items(category, newest_at, item_key);
+CREATE INDEX IF NOT EXISTS idx_display_items_category_ends ON market_display_items(category, ends_at, item_key);
+
+-- Finds the item holding a market when its event title changes
+CREATE INDEX IF NOT EXISTS idx_display_items_market_ids ON market_display_items USING GIN (market_ids);
+
+-- Group lookups by event title on incremental refreshes
+CREATE INDEX IF NOT EXISTS idx_markets_event_title ON markets(event_title);
+
+-- Keyset indexes for ungrouped listings over open markets
+CREATE INDEX IF NOT EXISTS idx_markets_open_volume ON markets(volume, id)
+WHERE is_active = true AND is_resolved = false;
+CREATE INDEX IF NOT EXISTS idx_markets_open_liquidity ON markets(liquidity, id)
+WHERE is_active = true AND is_resolved = false;
+CREATE INDEX IF NOT EXISTS idx_markets_open_created ON markets(created_at, id)
+WHERE is_active = true AND is_resolved = false;
+CREATE INDEX IF NOT EXISTS idx_markets_open_end_date ON markets(end_date, id)
+WHERE is_active = true AND is_resolved = false;
+
+-- Comments
+COMMENT ON TABLE market_display_items IS 'Listing projection of open markets: event groups and standalone markets with aggregated stats';
+COMMENT ON COLUMN market_display_items.item_key IS '''event:'' || event_title for markets sharing an event title, ''market:'' || id otherwise';
+COMMENT ON COLUMN market_display_items.market_ids IS 'Open markets of the item, by volume desc';
+COMMENT ON COLUMN market_display_items.ends_at IS 'Earliest end_date of the item markets (item is refreshed once it passes)';
+
+-- No backfill here: the workers build the projection on startup (MarketListings.rebuild)
+
+-- =================================================
+-- VERIFICATION QUERIES
+-- =================================================
+
+-- Items per type
+-- SELECT item_type, COUNT(*), SUM(market_count) FROM market_display_items GROUP BY item_type;
+
+-- Check the keyset indexes are used (Index Scan Backward on idx_display_items_volume)
+-- EXPLAIN ANALYZE
+-- SELECT item_key FROM market_display_items
+-- WHERE (total_volume, item_key) < (100000, 'event:x')
+-- ORDER BY total_volume DESC, item_key DESC LIMIT 10;
+
+-- Open markets missing from the projection (should be 0 after a reconcile)
+-- SELECT COUNT(*) FROM markets m
+-- WHERE m.is_active = true AND m.is_resolved = false AND m.end_date > NOW()
+--   AND (COALESCE(m.liquidity, 0) = 0 OR m.liquidity >= 100)
+--   AND NOT EXISTS (SELECT 1 FROM market_display_items d WHERE d.market_ids ? m.id);
@@ -0,0 +1,45 @@
+-- =================================================
+-- MIGRATION: Create Market Tokens Table
+-- Date: October 16, 2026
+-- Description: Normalized CLOB token -> market projection so token resolution
+--              (leader trades, blockchain sync, WebSocket updates) is a primary-key
+--              lookup instead of a JSONB-contains / LIKE scan over markets.
+--              Maintained by the market bulk upsert (data_ingestion/poller/market_upserter.py)
+-- =================================================
+
+CREATE TABLE IF NOT EXISTS market_tokens (
+    token_id VARCHAR(100) PRIMARY KEY,
+    market_id VARCHAR(100) NOT NULL REFERENCES markets(id) ON DELETE CASCADE,
+    outcome_index INTEGER NOT NULL,
+    condition_id VARCHAR(100),
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_market_tokens_market ON market_tokens(market_id);
+
+-- Backfill from existing markets (a token listed twice keeps the most recently updated market)
+INSERT INTO market_tokens (token_id, market_id, outcome_index, condition_id)
+SELECT DISTINCT ON (t.token_id)
+    t.token_id, m.id, (t.ordinality - 1)::int, m.condition_id
+FROM markets m
+CROSS JOIN LATERAL jsonb_array_elements_text(m.clob_token_ids) WITH ORDINALITY AS t(token_id, ordinality)
+WHERE jsonb_typeof(m.clob_token_ids) = 'array'
+    AND t.token_id <> ''
+ORDER BY t.token_id, m.updated_at DESC NULLS LAST
+ON CONFLICT (token_id) DO NOTHING;
+
+-- Comments
+COMMENT ON TABLE market_tokens IS 'One row per CLOB token id: market, outcome index and condition id. Projection of markets.clob_token_ids.';
+COMMENT ON COLUMN market_tokens.outcome_index IS 'Position of the token in markets.clob_token_ids (same index as markets.outcomes)';
+
+-- =================================================
+-- VERIFICATION QUERIES
+-- =================================================
+
+-- Tokens per market (should be 2 for binary markets)
+-- SELECT market_id, COUNT(*) FROM market_tokens GROUP BY market_id ORDER BY 2 DESC LIMIT 10;
+
+-- Markets with token ids but no projection rows
+-- SELECT COUNT(*) FROM markets m
+-- WHERE jsonb_typeof(m.clob_token_ids) = 'array'
+--   AND NOT EXISTS (SELECT 1 FROM market_tokens t WHERE t.market_id = m.id);
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Market Search Benchmark - ILIKE scan vs full-text / trigram index
+Runs each query against the configured database (DATABASE_URL) with the cache off
+and reports p50 / p95 latency of the search_markets() paths used by bot and API /search.
+Requires migrations/add_market_search_index.sql for the indexed path.
+
+Usage:
+    python scripts/benchmark_market_search.py [--queries bitcoin "trump election"] [--repeat 20] [--pages 3]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.database.connection import init_db, close_db
+from core.services.market_service.market_service import MarketService
+
+DEFAULT_QUERIES = [
+    "bitcoin", "bitcoin 1", "btc", "trump", "trump election", "fed rate",
+    "nba", "super bowl", "ethereum price", "bitcon",  # last one: typo
+]
+
+
+def percentile(timings, pct: float) -> float:
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run(search, queries, repeat: int, pages: int):
+    """Latencies (s) of every query x page x repeat, plus results of the first page per query"""
+    timings = []
+    results = {}
+    for query in queries:
+        for page in range(pages):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                items, total = await search(query, page=page, page_size=10, group_by_events=True)
+                timings.append(time.perf_counter() - start)
+                if page == 0:
+                    results[query] = (len(items), total)
+    return timings, results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark market search latency")
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=3)
+    args = parser.parse_args()
+
+    await init_db()
+    try:
+        service = MarketService(cache_manager=None)  # Measure the database, not Redis
+
+        ilike_timings, ilike_results = await run(service._search_markets_ilike, args.queries, args.repeat, args.pages)
+        index_timings, index_results = await run(service.search_markets, args.queries, args.repeat, args.pages)
+        if service._search_index_available is False:
+            print("⚠️ Search index missing: both runs used the ILIKE scan (apply add_market_search_index.sql)")
+
+        print(f"{'query':<20} {'ilike groups':>13} {'index groups':>13}")
+        for query in args.queries:
+            print(f"{query:<20} {ilike_results[query][1]:>13} {index_results[query][1]:>13}")
+
+        print()
+        print(f"{'path':<8} {'calls':>6} {'p50':>10} {'p95':>10} {'max':>10}")
+        for name, timings in (("ilike", ilike_timings), ("index", index_timings)):
+            print(
+                f"{name:<8} {len(timings):>6} {statistics.median(timings) * 1000:>8.1f}ms "
+                f"{percentile(timings, 95) * 1000:>8.1f}ms {max(timings) * 1000:>8.1f}ms"
+            )
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
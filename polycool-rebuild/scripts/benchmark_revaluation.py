@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Revaluation Benchmark - Row-by-row P&L loop vs the vectorized revaluation engine
+Synthetic positions, no database: measures the CPU side of a market price tick
+(the engine then issues one SELECT + one UPDATE whatever the number of positions).
+
+Usage:
+    python scripts/benchmark_revaluation.py [--sizes 10000 100000] [--markets 2000] [--repeat 5]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.services.position.outcome_helper import find_outcome_index
+from core.services.position.revaluation import PositionRevaluationEngine
+
+
+def build_rows(positions: int, markets: int, seed: int = 42):
+    """(id, user_id, market_id, outcome, entry_price, amount, current_price, outcomes) like the engine SELECT"""
+    rng = random.Random(seed)
+    market_outcomes = {
+        str(m): (['UP', 'DOWN'] if m % 10 == 0 else ['YES', 'NO'])
+        for m in range(markets)
+    }
+    rows = []
+    for position_id in range(positions):
+        market_id = str(rng.randrange(markets))
+        outcomes = market_outcomes[market_id]
+        rows.append((
+            position_id,
+            rng.randrange(positions // 10 + 1),
+            market_id,
+            rng.choice(outcomes),
+            round(rng.uniform(0.05, 0.95), 4),
+            round(rng.uniform(1, 500), 2),
+            round(rng.uniform(0.05, 0.95), 4),
+            outcomes,
+        ))
+    prices_by_market = {}
+    for market_id in market_outcomes:
+        yes = round(rng.uniform(0.01, 0.99), 4)
+        prices_by_market[market_id] = [yes, round(1 - yes, 4)]
+    return rows, prices_by_market
+
+
+def row_by_row(rows, prices_by_market, min_change_pct: float = 0.1):
+    """Previous per-position path: outcome lookup, change check and P&L in Python"""
+    updates = []
+    for position_id, _, market_id, outcome, entry_price, amount, current_price, outcomes in rows:
+        prices = prices_by_market[market_id]
+        index = find_outcome_index(outcome, outcomes)
+        if index is None or index >= len(prices):
+            continue
+        new_price = float(prices[index])
+        if current_price and current_price > 0:
+            if abs((new_price - current_price) / current_price) * 100 < min_change_pct:
+                continue
+        pnl_amount = (new_price - entry_price) * amount
+        pnl_percentage = (new_price - entry_price) / entry_price * 100 if entry_price > 0 else 0.0
+        updates.append((position_id, new_price, pnl_amount, pnl_percentage))
+    return updates
+
+
+def vectorized(engine: PositionRevaluationEngine, rows, prices_by_market):
+    mask, ids, new_prices, pnl_amount, pnl_percentage = engine.plan(rows, engine.price_vector(rows, prices_by_market))
+    return ids
+
+
+def best_of(repeat: int, fn, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark bulk position revaluation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--markets", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'positions':>10} {'row-by-row':>12} {'vectorized':>12} {'speedup':>8} {'updated':>9}")
+    for size in args.sizes:
+        rows, prices_by_market = build_rows(size, args.markets)
+        engine = PositionRevaluationEngine()
+
+        loop_time, loop_updates = best_of(args.repeat, row_by_row, rows, prices_by_market)
+        vector_time, vector_ids = best_of(args.repeat, vectorized, engine, rows, prices_by_market)
+
+        if len(loop_updates) != len(vector_ids):
+            print(f"⚠️ Result mismatch at {size}: {len(loop_updates)} vs {len(vector_ids)} updates")
+
+        print(
+            f"{size:>10} {loop_time * 1000:>10.1f}ms {vector_time * 1000:>10.1f}ms "
+            f"{loop_time / vector_time:>7.1f}x {len(vector_ids):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -94,6 +94,8 @@ async def detailed_health_check():
             "version": settings.version,
             "environment": settings.environment,
         }
+        from core.database.connection import get_pool_stats
+        health_status["db_pool"] = get_pool_stats()
         return health_status
 
     except Exception as e:
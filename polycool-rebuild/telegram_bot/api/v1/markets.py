@@ -73,6 +73,7 @@ class TrendingMarketsResponse(BaseModel):
     """Response wrapper for trending markets with total count"""
     markets: List[MarketGroupResponse]
     total_count: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page
 
 
 class SearchMarketsResponse(BaseModel):
@@ -95,27 +96,30 @@ async def get_trending_markets(
     page: int = Query(0, ge=0),
     page_size: int = Query(10, ge=1, le=50),
     group_by_events: bool = Query(True),
-    filter_type: Optional[str] = Query(None, description="Filter type: 'yes', 'no', or None")
+    filter_type: Optional[str] = Query(None, description="Sort: 'volume', 'liquidity', 'newest', 'endingsoon' or None"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)")
 ):
     """
     Get trending markets
 
     Args:
-        page: Page number (0-based)
+        page: Page number (0-based), ignored when cursor is given
         page_size: Number of markets per page
         group_by_events: Whether to group markets by events
-        filter_type: Filter by outcome type
+        filter_type: Sort order
+        cursor: Keyset cursor of the page
 
     Returns:
-        TrendingMarketsResponse with markets list and total_count
+        TrendingMarketsResponse with markets list, total_count and next_cursor
     """
     try:
         market_service = get_market_service()
-        markets, total_count = await market_service.get_trending_markets(
+        markets, total_count, next_cursor = await market_service.get_market_listing(
             page=page,
             page_size=page_size,
             group_by_events=group_by_events,
-            filter_type=filter_type
+            filter_type=filter_type,
+            cursor=cursor
         )
 
         # Convert to response format (supports both event groups and individual markets)
@@ -149,7 +153,8 @@ async def get_trending_markets(
 
         return TrendingMarketsResponse(
             markets=response_items,
-            total_count=total_count if total_count >= 0 else None
+            total_count=total_count if total_count >= 0 else None,
+            next_cursor=next_cursor
         )
 
     except Exception as e:
@@ -160,30 +165,36 @@ async def get_trending_markets(
 @router.get("/categories/{category}", response_model=List[MarketResponse])
 async def get_category_markets(
     category: str,
+    response: Response,
     page: int = Query(0, ge=0),
     page_size: int = Query(10, ge=1, le=50),
-    filter_type: Optional[str] = Query(None, description="Filter type: 'yes', 'no', or None")
+    filter_type: Optional[str] = Query(None, description="Sort: 'volume', 'liquidity', 'newest', 'endingsoon' or None"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset pagination)")
 ):
     """
     Get markets by category
 
     Args:
         category: Market category
-        page: Page number (0-based)
+        page: Page number (0-based), ignored when cursor is given
         page_size: Number of markets per page
-        filter_type: Filter by outcome type
+        filter_type: Sort order
+        cursor: Keyset cursor of the page
 
     Returns:
-        List of markets in the category
+        List of markets in the category (cursor of the next page in the X-Next-Cursor header)
     """
     try:
         market_service = get_market_service()
-        markets, _ = await market_service.get_category_markets(
+        markets, _, next_cursor = await market_service.get_market_listing(
             category=category,
             page=page,
             page_size=page_size,
-            filter_type=filter_type
+            filter_type=filter_type,
+            cursor=cursor
         )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         # Convert to response format
         response_markets = []
@@ -217,10 +228,11 @@ async def search_markets(
     group_by_events: bool = Query(True)
 ):
     """
-    Search markets by title (all terms must be in title)
+    Search markets by title (all terms must match, by prefix or close typo)
+    Ranked by relevance and volume
 
     Args:
-        query_text: Search query (all terms must be in title)
+        query_text: Search query (all terms must match the title or event title)
         page: Page number (0-based)
         page_size: Number of markets per page
         group_by_events: Whether to group markets by events
@@ -839,6 +851,75 @@ class UpdateMarketRequest(BaseModel):
     resolved_outcome: Optional[str] = None
 
 
+class MarketPriceUpdate(BaseModel):
+    """One market of a batch price update"""
+    id: str
+    outcome_prices: List[float]
+    last_mid_price: Optional[float] = None
+    last_trade_price: Optional[float] = None
+
+
+class BatchPriceUpdateRequest(BaseModel):
+    """Request model for batch price updates (WebSocket streamer write-behind)"""
+    updates: List[MarketPriceUpdate]
+
+
+@router.post("/prices/batch")
+async def update_market_prices_batch(request: BatchPriceUpdateRequest):
+    """
+    Update prices of many markets in one call (used by WebSocket streamer when SKIP_DB=true)
+    One multi-row UPDATE for markets and one for positions
+
+    Args:
+        request: BatchPriceUpdateRequest with latest prices per market
+
+    Returns:
+        Updated market IDs and number of markets with active positions
+    """
+    try:
+        from data_ingestion.streamer.market_updater.handlers.market_update_handler import MarketUpdateHandler
+        from data_ingestion.streamer.market_updater.position.position_update_handler import PositionUpdateHandler
+        from core.services.cache_manager import CacheManager
+
+        updates = [
+            {
+                'market_id': update.id,
+                'prices': update.outcome_prices,
+                'last_trade_price': update.last_trade_price,
+            }
+            for update in request.updates
+            if update.outcome_prices
+        ]
+        updated_ids = await MarketUpdateHandler().update_prices_bulk(updates)
+
+        # ✅ CRITICAL: Update positions for these markets (microservices coherence)
+        updated = set(updated_ids)
+        prices_by_market = {u['market_id']: u['prices'] for u in updates if u['market_id'] in updated}
+        positions_by_market = {}
+        if prices_by_market:
+            try:
+                positions_by_market = await PositionUpdateHandler().update_positions_for_markets(prices_by_market)
+            except Exception as pos_error:
+                # Non-fatal: log but don't fail the market update
+                logger.warning(f"⚠️ Failed to update positions for {len(prices_by_market)} markets: {pos_error}")
+
+        # API client cache keys (used by bot when SKIP_DB=true)
+        try:
+            cache_manager = CacheManager()
+            await cache_manager.delete_many([f"api:market:{market_id}" for market_id in updated_ids])
+        except Exception as cache_error:
+            logger.warning(f"⚠️ Cache invalidation failed: {cache_error}")
+
+        return {
+            "updated_ids": updated_ids,
+            "markets_with_positions": len(positions_by_market),
+        }
+
+    except Exception as e:
+        logger.error(f"Error batch updating market prices: {e}")
+        raise HTTPException(status_code=500, detail=f"Error batch updating market prices: {str(e)}")
+
+
 @router.put("/{market_id}", response_model=MarketResponse)
 async def update_market(market_id: str, request: UpdateMarketRequest):
     """
@@ -866,6 +947,7 @@ async def update_market(market_id: str, request: UpdateMarketRequest):
 
             if not market:
                 raise HTTPException(status_code=404, detail="Market not found")
+            was_settled = bool(market.is_resolved and market.resolved_outcome)
 
             # Prepare update data
             update_data = {}
@@ -903,6 +985,22 @@ async def update_market(market_id: str, request: UpdateMarketRequest):
             )
             updated_market = result.scalar_one_or_none()
 
+            # Resolved markets leave the listings (event groups / standalone markets)
+            if request.is_resolved is not None:
+                try:
+                    from core.services.market_service.market_listings import get_market_listings
+                    await get_market_listings().refresh_markets([market_id])
+                except Exception as e:
+                    logger.warning(f"⚠️ Market listings refresh failed for market {market_id}: {e}")
+
+            # Resolved with an outcome: redeemable positions are created by the resolution consumer
+            if not was_settled and updated_market and updated_market.is_resolved and updated_market.resolved_outcome:
+                try:
+                    from core.services.redeem.resolution_events import publish_market_resolved
+                    await publish_market_resolved([market_id], source="api")
+                except Exception as e:
+                    logger.warning(f"⚠️ Resolution event failed for market {market_id}: {e}")
+
             # ✅ CRITICAL: Update positions for this market when prices change (microservices coherence)
             # This ensures positions are updated in DB when market prices change via WebSocket
             # The API service (SKIP_DB=false) handles position updates directly
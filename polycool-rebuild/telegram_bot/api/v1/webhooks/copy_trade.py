@@ -18,6 +18,7 @@ from core.services.redis_pubsub import get_redis_pubsub_service
 from core.services.copy_trading.leader_position_tracker import get_leader_position_tracker
 from core.services.smart_trading import SmartWalletPositionTracker
 from core.services.market_service import get_market_service
+from core.services.deduplicator import get_deduplicator
 from data_ingestion.indexer.watched_addresses.manager import get_watched_addresses_manager
 from infrastructure.config.settings import settings
 from infrastructure.logging.logger import get_logger
@@ -77,6 +78,14 @@ async def receive_copy_trade_webhook(
         WebhookResponse with status
     """
     try:
+        # Drop indexer redeliveries before any lookup
+        if not await get_deduplicator('copy_trade_webhook', ttl=600).claim(event.tx_id):
+            logger.debug(f"⏭️ [WEBHOOK_SKIP] Duplicate webhook for tx {event.tx_id[:20]}...")
+            return WebhookResponse(
+                status="ignored",
+                message="Duplicate event"
+            )
+
         # Fast check: Is this address watched?
         # Refresh cache periodically to catch new addresses
         watched_manager = get_watched_addresses_manager()
@@ -348,17 +357,20 @@ async def _resolve_outcome_from_position_id(position_id: str) -> Optional[str]:
     try:
         from core.database.connection import get_db
         from core.database.models import Market
-        from sqlalchemy import select, or_
+        from core.services.market_service.token_resolver import get_token_resolver
+        from sqlalchemy import select
+
+        # position_id -> market via the market_tokens projection (primary-key lookup)
+        token_info = await get_token_resolver().resolve(position_id)
+        if not token_info:
+            logger.debug(f"⚠️ [RESOLVE_OUTCOME] No market found for position_id ...{position_id[-20:]}")
+            return None
 
         async with get_db() as db:
-            # Find market containing this position_id in clob_token_ids
             result = await db.execute(
                 select(Market)
                 .where(
-                    or_(
-                        Market.clob_token_ids.contains([position_id]),
-                        Market.clob_token_ids.contains([str(position_id)]),
-                    ),
+                    Market.id == token_info.market_id,
                     Market.is_active == True
                 )
             )
@@ -368,15 +380,9 @@ async def _resolve_outcome_from_position_id(position_id: str) -> Optional[str]:
                 logger.debug(f"⚠️ [RESOLVE_OUTCOME] No market found for position_id ...{position_id[-20:]}")
                 return None
 
-            # Find index of position_id in clob_token_ids
             clob_token_ids = matching_market.clob_token_ids or []
             outcomes = matching_market.outcomes or []
-
-            token_index = -1
-            for i, token_id in enumerate(clob_token_ids):
-                if str(token_id) == str(position_id):
-                    token_index = i
-                    break
+            token_index = token_info.outcome_index
 
             if token_index >= 0 and token_index < len(outcomes):
                 outcome_str = outcomes[token_index]
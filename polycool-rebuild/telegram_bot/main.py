@@ -35,7 +35,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"🔍 Database URL: {settings.database.effective_url}")
     if os.getenv("SKIP_DB", "false").lower() != "true":
         from core.database.connection import init_db
-        await init_db()
+        await init_db(role="api")
         logger.info("✅ Database initialized")
     else:
         logger.warning("⚠️ Database initialization SKIPPED (SKIP_DB=true)")
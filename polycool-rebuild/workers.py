@@ -40,6 +40,7 @@ async def _start_tpsl_monitor(tasks: list) -> Optional[object]:
 
     from core.services.trading.tpsl_monitor import TPSLMonitor, set_tpsl_monitor
 
+    # Prices are checked on receipt via the trigger index; the periodic sweep is a safety net
     check_interval = max(settings.trading.tpsl_check_interval, 30)
     monitor = TPSLMonitor(check_interval=check_interval)
     set_tpsl_monitor(monitor)
@@ -55,7 +56,8 @@ async def _start_notification_service(tasks: list) -> Optional[object]:
 
         notification_service = get_notification_service()
         await notification_service.start_processing()
-        tasks.append(asyncio.create_task(notification_service._process_notifications_loop(), name="notification_processor"))
+        # start_processing() owns the dispatcher + sender pool tasks
+        tasks.append(notification_service.processing_task)
         logging.getLogger(__name__).info("✅ Notification service launched")
         return notification_service
     except Exception as e:
@@ -109,6 +111,80 @@ async def _start_watched_addresses_sync(tasks: list) -> None:
     tasks.append(asyncio.create_task(_sync_loop(), name="watched_addresses_sync"))
 
 
+async def _start_db_pool_metrics(tasks: list) -> None:
+    """Start periodic logging of database pool metrics."""
+    from core.database.connection import get_pool_stats
+
+    async def _metrics_loop() -> None:
+        logger = logging.getLogger(__name__)
+        while True:
+            await asyncio.sleep(60)
+            try:
+                stats = get_pool_stats()
+                logger.info(
+                    "📊 DB pool (%s/%s): in_use=%s overflow=%s checkout avg=%sms p95=%sms timeouts=%s",
+                    stats.get('mode'), stats.get('role'), stats.get('in_use'), stats.get('overflow'),
+                    stats.get('checkout_ms_avg'), stats.get('checkout_ms_p95'), stats.get('checkout_timeouts'),
+                )
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.error("❌ DB pool metrics failed: %s", exc)
+
+    tasks.append(asyncio.create_task(_metrics_loop(), name="db_pool_metrics"))
+
+
+async def _start_position_sync(tasks: list) -> None:
+    """Start periodic blockchain position sync of active users."""
+    if not settings.trading.position_sync_enabled or os.getenv("SKIP_DB", "true").lower() == "true":
+        return
+
+    from core.services.position.sync_service import get_position_sync_service
+
+    async def _sync_loop() -> None:
+        service = get_position_sync_service()
+        logger = logging.getLogger(__name__)
+        while True:
+            await asyncio.sleep(settings.trading.position_sync_interval)
+            try:
+                batch = await service.sync_active_users()
+                logger.info(
+                    "✅ Position sync: %s wallets, %s diffed, %s unchanged, %s errors in %sms",
+                    batch.wallets, batch.diffed, batch.unchanged, batch.errors, batch.duration_ms,
+                )
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.error("❌ Position sync failed: %s", exc, exc_info=True)
+
+    tasks.append(asyncio.create_task(_sync_loop(), name="position_sync"))
+
+
+async def _start_market_listings_maintenance(tasks: list) -> None:
+    """Start the market listings projection upkeep (rebuild on startup, ended-market sweeps, periodic reconcile)."""
+    if not settings.data_ingestion.poller_enabled or os.getenv("SKIP_DB", "true").lower() == "true":
+        return
+
+    from core.services.market_service.market_listings import get_market_listings
+
+    async def _maintenance_loop() -> None:
+        listings = get_market_listings()
+        logger = logging.getLogger(__name__)
+        expiry_interval = settings.data_ingestion.market_listings_expiry_interval
+        rebuild_every = max(1, settings.data_ingestion.market_listings_rebuild_interval // expiry_interval)
+        cycle = 0
+        while True:
+            try:
+                if cycle % rebuild_every == 0:
+                    await listings.rebuild()
+                else:
+                    written, removed = await listings.refresh_expired()
+                    if written or removed:
+                        logger.debug("✅ Market listings sweep: %s written, %s removed", written, removed)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.error("❌ Market listings maintenance failed: %s", exc, exc_info=True)
+            cycle += 1
+            await asyncio.sleep(expiry_interval)
+
+    tasks.append(asyncio.create_task(_maintenance_loop(), name="market_listings_maintenance"))
+
+
 async def _start_leader_balance_updater(tasks: list) -> None:
     """Start periodic leader balance updates (hourly)."""
     from core.services.copy_trading.leader_balance_updater import get_leader_balance_updater
@@ -132,7 +208,7 @@ async def _start_leader_balance_updater(tasks: list) -> None:
 
 
 async def _start_market_resolution_detector(tasks: list) -> Optional[object]:
-    """Start market resolution detector (checks closed_positions every 20 min)."""
+    """Start market resolution detector (low-frequency closed_positions sweep)."""
     try:
         from core.services.market.resolution_detector import get_resolution_detector
 
@@ -146,6 +222,22 @@ async def _start_market_resolution_detector(tasks: list) -> Optional[object]:
         return None
 
 
+async def _start_resolution_event_consumer() -> Optional[object]:
+    """Start the resolution event consumer (resolved positions on market resolution + periodic reconcile)."""
+    if os.getenv("SKIP_DB", "true").lower() == "true":
+        return None
+    try:
+        from core.services.redeem.resolution_events import get_resolution_event_consumer
+
+        consumer = get_resolution_event_consumer()
+        await consumer.start()
+        logging.getLogger(__name__).info("✅ Resolution event consumer launched")
+        return consumer
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logging.getLogger(__name__).error("❌ Failed to start resolution event consumer: %s", exc, exc_info=True)
+        return None
+
+
 async def _is_db_empty() -> bool:
     """Check if markets table is empty"""
     try:
@@ -204,9 +296,9 @@ async def _start_poller(tasks: list) -> Optional[tuple]:
         resolutions_poller = GammaAPIPollerResolutions(interval=900)
         tasks.append(asyncio.create_task(resolutions_poller.start_polling(), name="poller_resolutions"))
 
-        # 5. Price (30s interval) - layered strategy
+        # 5. Price (5s tick) - per-market deadlines by tier (TP/SL 3s ... long tail 10min)
         from data_ingestion.poller.price_poller import PricePoller
-        price_poller = PricePoller(interval=30)
+        price_poller = PricePoller(interval=5)
         tasks.append(asyncio.create_task(price_poller.start_polling(), name="poller_price"))
 
         # 6. Keyword (5min interval) - priority markets with keywords
@@ -232,7 +324,7 @@ async def _run_workers() -> None:
     if os.getenv("SKIP_DB", "true").lower() != "true":
         from core.database.connection import init_db
         try:
-            await init_db()
+            await init_db(role="workers")
             logger.info("✅ Database initialized")
         except Exception as e:
             logger.error(f"❌ Database initialization failed: {e}")
@@ -268,10 +360,14 @@ async def _run_workers() -> None:
         logger.warning("⚠️ Skipping Copy Trading Listener startup (Redis PubSub not connected)")
         copy_trading_listener = None
     websocket_subscription_listener = await _start_websocket_subscription_listener()
+    await _start_db_pool_metrics(background_tasks)
     await _start_watched_addresses_sync(background_tasks)
     await _start_leader_balance_updater(background_tasks)
+    await _start_position_sync(background_tasks)
     resolution_detector = await _start_market_resolution_detector(background_tasks)
+    resolution_consumer = await _start_resolution_event_consumer()
     pollers = await _start_poller(background_tasks)
+    await _start_market_listings_maintenance(background_tasks)
 
     stop_event = asyncio.Event()
 
@@ -316,6 +412,10 @@ async def _run_workers() -> None:
             with suppress(Exception):
                 await resolution_detector.stop()
 
+        if resolution_consumer:
+            with suppress(Exception):
+                await resolution_consumer.stop()
+
         if tpsl_monitor:
             with suppress(Exception):
                 await tpsl_monitor.stop()
@@ -334,11 +434,14 @@ async def _run_workers() -> None:
             with suppress(asyncio.CancelledError):
                 await task
 
+        with suppress(Exception):
+            from core.services.position.sync_service import get_position_sync_service
+            await get_position_sync_service().close()
+
         with suppress(Exception):
             await redis_pubsub.disconnect()
 
-        cache_manager.redis.close()
-        cache_manager.redis.connection_pool.disconnect()
+        await cache_manager.close()
 
 
 def main() -> None:
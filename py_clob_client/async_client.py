@@ -0,0 +1,19 @@
+from .client_base import BaseClobClient
+from .http_helpers.helpers import async_run_operation
+
+
+class AsyncClobClient(BaseClobClient):
+    """
+    asyncio variant of ClobClient
+    Same constructor and methods (built by the same BaseClobClient operations);
+    network methods are coroutines running on the pooled async transport
+    (http_helpers.transport). Signing and order building are CPU-only.
+    from_client() wraps an existing ClobClient without re-deriving keys.
+    """
+
+    @classmethod
+    def _bind_operation(cls, func):
+        @cls._wraps(func)
+        async def method(self, *args, **kwargs):
+            return await async_run_operation(func(self, *args, **kwargs))
+        return method
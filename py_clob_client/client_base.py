@@ -0,0 +1,794 @@
+"""
+Transport-independent core of the CLOB clients
+
+Every network method is written once here as an operation: a generator that
+builds the request(s) - URL, L1/L2 headers, body - yields them, receives the
+parsed responses and returns the result. ClobClient runs operations on the
+pooled sync transport, AsyncClobClient on the async one; only the transport
+differs.
+"""
+import functools
+import logging
+from typing import Optional
+
+from .order_builder.builder import OrderBuilder
+from .headers.headers import create_level_1_headers, create_level_2_headers
+from .signer import Signer
+from .config import get_contract_config
+
+from .endpoints import (
+    CANCEL,
+    CANCEL_ORDERS,
+    CANCEL_MARKET_ORDERS,
+    CANCEL_ALL,
+    CREATE_API_KEY,
+    DELETE_API_KEY,
+    DERIVE_API_KEY,
+    GET_API_KEYS,
+    CLOSED_ONLY,
+    GET_LAST_TRADE_PRICE,
+    GET_ORDER,
+    GET_ORDER_BOOK,
+    MID_POINT,
+    ORDERS,
+    POST_ORDER,
+    POST_ORDERS,
+    PRICE,
+    TIME,
+    TRADES,
+    GET_NOTIFICATIONS,
+    DROP_NOTIFICATIONS,
+    GET_BALANCE_ALLOWANCE,
+    UPDATE_BALANCE_ALLOWANCE,
+    IS_ORDER_SCORING,
+    GET_TICK_SIZE,
+    GET_NEG_RISK,
+    GET_FEE_RATE,
+    ARE_ORDERS_SCORING,
+    GET_SIMPLIFIED_MARKETS,
+    GET_MARKETS,
+    GET_MARKET,
+    GET_SAMPLING_SIMPLIFIED_MARKETS,
+    GET_SAMPLING_MARKETS,
+    GET_MARKET_TRADES_EVENTS,
+    GET_LAST_TRADES_PRICES,
+    MID_POINTS,
+    GET_ORDER_BOOKS,
+    GET_PRICES,
+    GET_SPREAD,
+    GET_SPREADS,
+)
+from .clob_types import (
+    ApiCreds,
+    TradeParams,
+    OpenOrderParams,
+    OrderArgs,
+    RequestArgs,
+    DropNotificationParams,
+    OrderBookSummary,
+    BalanceAllowanceParams,
+    OrderScoringParams,
+    TickSize,
+    CreateOrderOptions,
+    OrdersScoringParams,
+    OrderType,
+    PartialCreateOrderOptions,
+    BookParams,
+    MarketOrderArgs,
+    PostOrdersArgs,
+)
+from .exceptions import PolyException
+from .http_helpers.helpers import (
+    DELETE,
+    GET,
+    POST,
+    Request,
+    add_query_trade_params,
+    add_query_open_orders_params,
+    drop_notifications_query_params,
+    add_balance_allowance_params_to_url,
+    add_order_scoring_params_to_url,
+)
+
+from .constants import L0, L1, L1_AUTH_UNAVAILABLE, L2, L2_AUTH_UNAVAILABLE, END_CURSOR
+from .utilities import (
+    parse_raw_orderbook_summary,
+    generate_orderbook_summary_hash,
+    order_to_json,
+    is_tick_size_smaller,
+    price_valid,
+)
+
+
+def operation(func):
+    """
+    Marks a generator method `_name` as the network operation behind the
+    public client method `name` (bound per transport by the subclasses)
+    """
+    func._clob_operation = func.__name__.lstrip("_")
+    return func
+
+
+class BaseClobClient:
+    """
+    State, auth levels and request building shared by ClobClient and AsyncClobClient
+    Subclasses implement _bind_operation() to expose each operation on their transport.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for func in list(vars(BaseClobClient).values()):
+            name = getattr(func, "_clob_operation", None)
+            if name and name not in vars(cls):
+                setattr(cls, name, cls._bind_operation(func))
+
+    @classmethod
+    def _bind_operation(cls, func):
+        raise NotImplementedError
+
+    @staticmethod
+    def _wraps(func):
+        """functools.wraps for a bound operation (public name, same docstring)"""
+        def decorator(method):
+            method = functools.wraps(func)(method)
+            method.__name__ = func._clob_operation
+            method.__qualname__ = func._clob_operation
+            return method
+        return decorator
+
+    def __init__(
+        self,
+        host,
+        chain_id: int = None,
+        key: str = None,
+        creds: ApiCreds = None,
+        signature_type: int = None,
+        funder: str = None,
+    ):
+        """
+        Initializes the clob client
+        The client can be started in 3 modes:
+        1) Level 0: Requires only the clob host url
+                    Allows access to open CLOB endpoints
+
+        2) Level 1: Requires the host, chain_id and a private key.
+                    Allows access to L1 authenticated endpoints + all unauthenticated endpoints
+
+        3) Level 2: Requires the host, chain_id, a private key, and Credentials.
+                    Allows access to all endpoints
+        """
+        self.host = host[0:-1] if host.endswith("/") else host
+        self.chain_id = chain_id
+        self.signer = Signer(key, chain_id) if key else None
+        self.creds = creds
+        self.mode = self._get_client_mode()
+
+        if self.signer:
+            self.builder = OrderBuilder(
+                self.signer, sig_type=signature_type, funder=funder
+            )
+
+        # local cache
+        self._tick_sizes = {}
+        self._neg_risk = {}
+        self._fee_rates = {}
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @classmethod
+    def from_client(cls, client: "BaseClobClient"):
+        """
+        Builds a client on this transport sharing the signer, creds, order
+        builder and market caches of an existing client (no key re-derivation)
+        """
+        new_client = cls.__new__(cls)
+        new_client.__dict__.update(client.__dict__)
+        new_client.logger = logging.getLogger(cls.__name__)
+        return new_client
+
+    def get_address(self):
+        """
+        Returns the public address of the signer
+        """
+        return self.signer.address() if self.signer else None
+
+    def get_collateral_address(self):
+        """
+        Returns the collateral token address
+        """
+        contract_config = get_contract_config(self.chain_id)
+        if contract_config:
+            return contract_config.collateral
+
+    def get_conditional_address(self):
+        """
+        Returns the conditional token address
+        """
+        contract_config = get_contract_config(self.chain_id)
+        if contract_config:
+            return contract_config.conditional_tokens
+
+    def get_exchange_address(self, neg_risk=False):
+        """
+        Returns the exchange address
+        """
+        contract_config = get_contract_config(self.chain_id, neg_risk)
+        if contract_config:
+            return contract_config.exchange
+
+    @operation
+    def _get_ok(self):
+        """
+        Health check: Confirms that the server is up
+        Does not need authentication
+        """
+        return (yield Request(GET, "{}/".format(self.host)))
+
+    @operation
+    def _get_server_time(self):
+        """
+        Returns the current timestamp on the server
+        Does not need authentication
+        """
+        return (yield Request(GET, "{}{}".format(self.host, TIME)))
+
+    @operation
+    def _create_api_key(self, nonce: int = None) -> ApiCreds:
+        """
+        Creates a new CLOB API key for the given
+        """
+        self.assert_level_1_auth()
+
+        endpoint = "{}{}".format(self.host, CREATE_API_KEY)
+        headers = create_level_1_headers(self.signer, nonce)
+
+        creds_raw = yield Request(POST, endpoint, headers=headers)
+        try:
+            creds = ApiCreds(
+                api_key=creds_raw["apiKey"],
+                api_secret=creds_raw["secret"],
+                api_passphrase=creds_raw["passphrase"],
+            )
+        except:
+            self.logger.error("Couldn't parse created CLOB creds")
+            return None
+        return creds
+
+    @operation
+    def _derive_api_key(self, nonce: int = None) -> ApiCreds:
+        """
+        Derives an already existing CLOB API key for the given address and nonce
+        """
+        self.assert_level_1_auth()
+
+        endpoint = "{}{}".format(self.host, DERIVE_API_KEY)
+        headers = create_level_1_headers(self.signer, nonce)
+
+        creds_raw = yield Request(GET, endpoint, headers=headers)
+        try:
+            creds = ApiCreds(
+                api_key=creds_raw["apiKey"],
+                api_secret=creds_raw["secret"],
+                api_passphrase=creds_raw["passphrase"],
+            )
+        except:
+            self.logger.error("Couldn't parse derived CLOB creds")
+            return None
+        return creds
+
+    @operation
+    def _create_or_derive_api_creds(self, nonce: int = None) -> ApiCreds:
+        """
+        Creates API creds if not already created for nonce, otherwise derives them
+        """
+        try:
+            return (yield from self._create_api_key(nonce))
+        except Exception:
+            return (yield from self._derive_api_key(nonce))
+
+    def set_api_creds(self, creds: ApiCreds):
+        """
+        Sets client api creds
+        """
+        self.creds = creds
+        self.mode = self._get_client_mode()
+
+    def _level_2_request(self, method: str, request_path: str, body=None, url: str = None) -> Request:
+        """Request signed with the L2 (API key) headers"""
+        self.assert_level_2_auth()
+        request_args = RequestArgs(method=method, request_path=request_path, body=body)
+        headers = create_level_2_headers(self.signer, self.creds, request_args)
+        return Request(method, url or "{}{}".format(self.host, request_path), headers=headers, data=body)
+
+    @operation
+    def _get_api_keys(self):
+        """
+        Gets the available API keys for this address
+        Level 2 Auth required
+        """
+        return (yield self._level_2_request(GET, GET_API_KEYS))
+
+    @operation
+    def _get_closed_only_mode(self):
+        """
+        Gets the closed only mode flag for thsi address
+        Level 2 Auth required
+        """
+        return (yield self._level_2_request(GET, CLOSED_ONLY))
+
+    @operation
+    def _delete_api_key(self):
+        """
+        Deletes an API key
+        Level 2 Auth required
+        """
+        return (yield self._level_2_request(DELETE, DELETE_API_KEY))
+
+    @operation
+    def _get_midpoint(self, token_id):
+        """
+        Get the mid market price for the given market
+        """
+        return (yield Request(GET, "{}{}?token_id={}".format(self.host, MID_POINT, token_id)))
+
+    @operation
+    def _get_midpoints(self, params: list[BookParams]):
+        """
+        Get the mid market prices for a set of token ids
+        """
+        body = [{"token_id": param.token_id} for param in params]
+        return (yield Request(POST, "{}{}".format(self.host, MID_POINTS), data=body))
+
+    @operation
+    def _get_price(self, token_id, side):
+        """
+        Get the market price for the given market
+        """
+        return (yield Request(GET, "{}{}?token_id={}&side={}".format(self.host, PRICE, token_id, side)))
+
+    @operation
+    def _get_prices(self, params: list[BookParams]):
+        """
+        Get the market prices for a set
+        """
+        body = [{"token_id": param.token_id, "side": param.side} for param in params]
+        return (yield Request(POST, "{}{}".format(self.host, GET_PRICES), data=body))
+
+    @operation
+    def _get_spread(self, token_id):
+        """
+        Get the spread for the given market
+        """
+        return (yield Request(GET, "{}{}?token_id={}".format(self.host, GET_SPREAD, token_id)))
+
+    @operation
+    def _get_spreads(self, params: list[BookParams]):
+        """
+        Get the spreads for a set of token ids
+        """
+        body = [{"token_id": param.token_id} for param in params]
+        return (yield Request(POST, "{}{}".format(self.host, GET_SPREADS), data=body))
+
+    @operation
+    def _get_tick_size(self, token_id: str) -> TickSize:
+        if token_id in self._tick_sizes:
+            return self._tick_sizes[token_id]
+
+        result = yield Request(GET, "{}{}?token_id={}".format(self.host, GET_TICK_SIZE, token_id))
+        self._tick_sizes[token_id] = str(result["minimum_tick_size"])
+
+        return self._tick_sizes[token_id]
+
+    @operation
+    def _get_neg_risk(self, token_id: str) -> bool:
+        if token_id in self._neg_risk:
+            return self._neg_risk[token_id]
+
+        result = yield Request(GET, "{}{}?token_id={}".format(self.host, GET_NEG_RISK, token_id))
+        self._neg_risk[token_id] = result["neg_risk"]
+
+        return result["neg_risk"]
+
+    @operation
+    def _get_fee_rate_bps(self, token_id: str) -> int:
+        if token_id in self._fee_rates:
+            return self._fee_rates[token_id]
+
+        result = yield Request(GET, "{}{}?token_id={}".format(self.host, GET_FEE_RATE, token_id))
+        fee_rate = result.get("base_fee") or 0
+        self._fee_rates[token_id] = fee_rate
+
+        return fee_rate
+
+    def _resolve_tick_size(self, token_id: str, tick_size: TickSize = None):
+        min_tick_size = yield from self._get_tick_size(token_id)
+        if tick_size is not None:
+            if is_tick_size_smaller(tick_size, min_tick_size):
+                raise Exception(
+                    "invalid tick size ("
+                    + str(tick_size)
+                    + "), minimum for the market is "
+                    + str(min_tick_size),
+                )
+        else:
+            tick_size = min_tick_size
+        return tick_size
+
+    def _resolve_fee_rate(self, token_id: str, user_fee_rate: int = None):
+        market_fee_rate_bps = yield from self._get_fee_rate_bps(token_id)
+        # If both fee rate on the market and the user supplied fee rate are non-zero, validate that they match
+        # else return the market fee rate
+        if market_fee_rate_bps is not None and market_fee_rate_bps > 0 and user_fee_rate is not None and user_fee_rate > 0 and user_fee_rate != market_fee_rate_bps:
+            raise Exception(f"invalid user provided fee rate: ({user_fee_rate}), fee rate for the market must be {market_fee_rate_bps}")
+        return market_fee_rate_bps
+
+    @staticmethod
+    def _assert_price_valid(price, tick_size: TickSize):
+        if not price_valid(price, tick_size):
+            raise Exception(
+                "price ("
+                + str(price)
+                + "), min: "
+                + str(tick_size)
+                + " - max: "
+                + str(1 - float(tick_size))
+            )
+
+    def _resolve_order_options(
+        self, order_args, options: Optional[PartialCreateOrderOptions], market_order: bool = False
+    ):
+        """
+        Tick size (validated price), neg risk and fee rate of an order
+        Sets order_args.fee_rate_bps (and the matching price of a market order without one)
+        """
+        tick_size = yield from self._resolve_tick_size(
+            order_args.token_id,
+            options.tick_size if options else None,
+        )
+
+        if market_order and (order_args.price is None or order_args.price <= 0):
+            order_args.price = yield from self._calculate_market_price(
+                order_args.token_id,
+                order_args.side,
+                order_args.amount,
+                order_args.order_type,
+            )
+
+        self._assert_price_valid(order_args.price, tick_size)
+
+        if options and options.neg_risk:
+            neg_risk = options.neg_risk
+        else:
+            neg_risk = yield from self._get_neg_risk(order_args.token_id)
+
+        # fee rate
+        order_args.fee_rate_bps = yield from self._resolve_fee_rate(order_args.token_id, order_args.fee_rate_bps)
+
+        return CreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk)
+
+    @operation
+    def _create_order(
+        self, order_args: OrderArgs, options: Optional[PartialCreateOrderOptions] = None
+    ):
+        """
+        Creates and signs an order
+        Level 1 Auth required
+        """
+        self.assert_level_1_auth()
+        create_options = yield from self._resolve_order_options(order_args, options)
+        return self.builder.create_order(order_args, create_options)
+
+    @operation
+    def _create_market_order(
+        self,
+        order_args: MarketOrderArgs,
+        options: Optional[PartialCreateOrderOptions] = None,
+    ):
+        """
+        Creates and signs an order
+        Level 1 Auth required
+        """
+        self.assert_level_1_auth()
+        create_options = yield from self._resolve_order_options(order_args, options, market_order=True)
+        return self.builder.create_market_order(order_args, create_options)
+
+    @operation
+    def _post_orders(self, args: list[PostOrdersArgs]):
+        """
+        Posts orders
+        """
+        self.assert_level_2_auth()
+        body = [
+            order_to_json(arg.order, self.creds.api_key, arg.orderType) for arg in args
+        ]
+        return (yield self._level_2_request(POST, POST_ORDERS, body=body))
+
+    @operation
+    def _post_order(self, order, orderType: OrderType = OrderType.GTC):
+        """
+        Posts the order
+        """
+        self.assert_level_2_auth()
+        body = order_to_json(order, self.creds.api_key, orderType)
+        return (yield self._level_2_request(POST, POST_ORDER, body=body))
+
+    @operation
+    def _create_and_post_order(
+        self, order_args: OrderArgs, options: PartialCreateOrderOptions = None
+    ):
+        """
+        Utility function to create and publish an order
+        """
+        ord = yield from self._create_order(order_args, options)
+        return (yield from self._post_order(ord))
+
+    @operation
+    def _cancel(self, order_id):
+        """
+        Cancels an order
+        Level 2 Auth required
+        """
+        return (yield self._level_2_request(DELETE, CANCEL, body={"orderID": order_id}))
+
+    @operation
+    def _cancel_orders(self, order_ids):
+        """
+        Cancels orders
+        Level 2 Auth required
+        """
+        return (yield self._level_2_request(DELETE, CANCEL_ORDERS, body=order_ids))
+
+    @operation
+    def _cancel_all(self):
+        """
+        Cancels all available orders for the user
+        Level 2 Auth required
+        """
+        return (yield self._level_2_request(DELETE, CANCEL_ALL))
+
+    @operation
+    def _cancel_market_orders(self, market: str = "", asset_id: str = ""):
+        """
+        Cancels orders
+        Level 2 Auth required
+        """
+        body = {"market": market, "asset_id": asset_id}
+        return (yield self._level_2_request(DELETE, CANCEL_MARKET_ORDERS, body=body))
+
+    def _paginate(self, request_path: str, build_url, params, next_cursor):
+        """Collects the `data` of every page of a cursor-paginated L2 endpoint"""
+        signed = self._level_2_request(GET, request_path)
+
+        results = []
+        next_cursor = next_cursor if next_cursor is not None else "MA=="
+        while next_cursor != END_CURSOR:
+            url = build_url("{}{}".format(self.host, request_path), params, next_cursor)
+            response = yield Request(GET, url, headers=signed.headers)
+            next_cursor = response["next_cursor"]
+            results += response["data"]
+
+        return results
+
+    @operation
+    def _get_orders(self, params: OpenOrderParams = None, next_cursor="MA=="):
+        """
+        Gets orders for the API key
+        Requires Level 2 authentication
+        """
+        return (yield from self._paginate(ORDERS, add_query_open_orders_params, params, next_cursor))
+
+    @operation
+    def _get_order_book(self, token_id) -> OrderBookSummary:
+        """
+        Fetches the orderbook for the token_id
+        """
+        raw_obs = yield Request(GET, "{}{}?token_id={}".format(self.host, GET_ORDER_BOOK, token_id))
+        return parse_raw_orderbook_summary(raw_obs)
+
+    @operation
+    def _get_order_books(self, params: list[BookParams]) -> list[OrderBookSummary]:
+        """
+        Fetches the orderbook for a set of token ids
+        """
+        body = [{"token_id": param.token_id} for param in params]
+        raw_obs = yield Request(POST, "{}{}".format(self.host, GET_ORDER_BOOKS), data=body)
+        return [parse_raw_orderbook_summary(r) for r in raw_obs]
+
+    def get_order_book_hash(self, orderbook: OrderBookSummary) -> str:
+        """
+        Calculates the hash for the given orderbook
+        """
+        return generate_orderbook_summary_hash(orderbook)
+
+    @operation
+    def _get_order(self, order_id):
+        """
+        Fetches the order corresponding to the order_id
+        Requires Level 2 authentication
+        """
+        return (yield self._level_2_request(GET, "{}{}".format(GET_ORDER, order_id)))
+
+    @operation
+    def _get_trades(self, params: TradeParams = None, next_cursor="MA=="):
+        """
+        Fetches the trade history for a user
+        Requires Level 2 authentication
+        """
+        return (yield from self._paginate(TRADES, add_query_trade_params, params, next_cursor))
+
+    @operation
+    def _get_last_trade_price(self, token_id):
+        """
+        Fetches the last trade price token_id
+        """
+        return (yield Request(GET, "{}{}?token_id={}".format(self.host, GET_LAST_TRADE_PRICE, token_id)))
+
+    @operation
+    def _get_last_trades_prices(self, params: list[BookParams]):
+        """
+        Fetches the last trades prices for a set of token ids
+        """
+        body = [{"token_id": param.token_id} for param in params]
+        return (yield Request(POST, "{}{}".format(self.host, GET_LAST_TRADES_PRICES), data=body))
+
+    def assert_level_1_auth(self):
+        """
+        Level 1 Poly Auth
+        """
+        if self.mode < L1:
+            raise PolyException(L1_AUTH_UNAVAILABLE)
+
+    def assert_level_2_auth(self):
+        """
+        Level 2 Poly Auth
+        """
+        if self.mode < L2:
+            raise PolyException(L2_AUTH_UNAVAILABLE)
+
+    def _get_client_mode(self):
+        if self.signer is not None and self.creds is not None:
+            return L2
+        if self.signer is not None:
+            return L1
+        return L0
+
+    @operation
+    def _get_notifications(self):
+        """
+        Fetches the notifications for a user
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        url = "{}{}?signature_type={}".format(
+            self.host, GET_NOTIFICATIONS, self.builder.sig_type
+        )
+        return (yield self._level_2_request(GET, GET_NOTIFICATIONS, url=url))
+
+    @operation
+    def _drop_notifications(self, params: DropNotificationParams = None):
+        """
+        Drops the notifications for a user
+        Requires Level 2 authentication
+        """
+        url = drop_notifications_query_params(
+            "{}{}".format(self.host, DROP_NOTIFICATIONS), params
+        )
+        return (yield self._level_2_request(DELETE, DROP_NOTIFICATIONS, url=url))
+
+    def _balance_allowance_request(self, request_path: str, params: BalanceAllowanceParams):
+        signed = self._level_2_request(GET, request_path)
+        if params.signature_type == -1:
+            params.signature_type = self.builder.sig_type
+        url = add_balance_allowance_params_to_url(
+            "{}{}".format(self.host, request_path), params
+        )
+        return Request(GET, url, headers=signed.headers)
+
+    @operation
+    def _get_balance_allowance(self, params: BalanceAllowanceParams = None):
+        """
+        Fetches the balance & allowance for a user
+        Requires Level 2 authentication
+        """
+        return (yield self._balance_allowance_request(GET_BALANCE_ALLOWANCE, params))
+
+    @operation
+    def _update_balance_allowance(self, params: BalanceAllowanceParams = None):
+        """
+        Updates the balance & allowance for a user
+        Requires Level 2 authentication
+        """
+        return (yield self._balance_allowance_request(UPDATE_BALANCE_ALLOWANCE, params))
+
+    @operation
+    def _is_order_scoring(self, params: OrderScoringParams):
+        """
+        Check if the order is currently scoring
+        Requires Level 2 authentication
+        """
+        url = add_order_scoring_params_to_url(
+            "{}{}".format(self.host, IS_ORDER_SCORING), params
+        )
+        return (yield self._level_2_request(GET, IS_ORDER_SCORING, url=url))
+
+    @operation
+    def _are_orders_scoring(self, params: OrdersScoringParams):
+        """
+        Check if the orders are currently scoring
+        Requires Level 2 authentication
+        """
+        return (yield self._level_2_request(POST, ARE_ORDERS_SCORING, body=params.orderIds))
+
+    @operation
+    def _get_sampling_markets(self, next_cursor="MA=="):
+        """
+        Get the current sampling markets
+        """
+        return (yield Request(
+            GET, "{}{}?next_cursor={}".format(self.host, GET_SAMPLING_MARKETS, next_cursor)
+        ))
+
+    @operation
+    def _get_sampling_simplified_markets(self, next_cursor="MA=="):
+        """
+        Get the current sampling simplified markets
+        """
+        return (yield Request(
+            GET,
+            "{}{}?next_cursor={}".format(
+                self.host, GET_SAMPLING_SIMPLIFIED_MARKETS, next_cursor
+            ),
+        ))
+
+    @operation
+    def _get_markets(self, next_cursor="MA=="):
+        """
+        Get the current markets
+        """
+        return (yield Request(GET, "{}{}?next_cursor={}".format(self.host, GET_MARKETS, next_cursor)))
+
+    @operation
+    def _get_simplified_markets(self, next_cursor="MA=="):
+        """
+        Get the current simplified markets
+        """
+        return (yield Request(
+            GET, "{}{}?next_cursor={}".format(self.host, GET_SIMPLIFIED_MARKETS, next_cursor)
+        ))
+
+    @operation
+    def _get_market(self, condition_id):
+        """
+        Get a market by condition_id
+        """
+        return (yield Request(GET, "{}{}{}".format(self.host, GET_MARKET, condition_id)))
+
+    @operation
+    def _get_market_trades_events(self, condition_id):
+        """
+        Get the market's trades events by condition id
+        """
+        return (yield Request(GET, "{}{}{}".format(self.host, GET_MARKET_TRADES_EVENTS, condition_id)))
+
+    @operation
+    def _calculate_market_price(
+        self, token_id: str, side: str, amount: float, order_type: OrderType
+    ) -> float:
+        """
+        Calculates the matching price considering an amount and the current orderbook
+        """
+        book = yield from self._get_order_book(token_id)
+        if book is None:
+            raise Exception("no orderbook")
+        if side == "BUY":
+            if book.asks is None:
+                raise Exception("no match")
+            return self.builder.calculate_buy_market_price(
+                book.asks, amount, order_type
+            )
+        else:
+            if book.bids is None:
+                raise Exception("no match")
+            return self.builder.calculate_sell_market_price(
+                book.bids, amount, order_type
+            )
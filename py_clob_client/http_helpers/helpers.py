@@ -1,3 +1,8 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
 import requests
 
 from py_clob_client.clob_types import (
@@ -10,6 +15,7 @@ from py_clob_client.clob_types import (
 )
 
 from ..exceptions import PolyApiException
+from .transport import MAX_RETRIES, TIMEOUT_SEC, get_async_http_client, get_session
 
 GET = "GET"
 POST = "POST"
@@ -38,18 +44,17 @@ def request(endpoint: str, method: str, headers=None, data=None):
         headers = overloadHeaders(method, headers)
 
         # Retry logic with exponential backoff
-        max_retries = 3
-        timeout_sec = 30  # Increased from 15 to 30 seconds for slower connections
+        max_retries = MAX_RETRIES
+        timeout_sec = TIMEOUT_SEC  # Increased from 15 to 30 seconds for slower connections
 
         for attempt in range(max_retries):
             try:
-                import time
                 start_time = time.time()
-                resp = requests.request(
+                # Pooled session: keep-alive connections are reused across calls
+                resp = get_session().request(
                     method=method, url=endpoint, headers=headers, json=data if data else None,
                     timeout=timeout_sec  # 30 second timeout
                 )
-                elapsed = time.time() - start_time
 
                 if resp.status_code != 200:
                     raise PolyApiException(resp)
@@ -63,7 +68,6 @@ def request(endpoint: str, method: str, headers=None, data=None):
                 elapsed_str = f"{time.time() - start_time:.2f}s"
                 if attempt < max_retries - 1:
                     # Exponential backoff: 1s, 2s, 4s
-                    import time
                     wait_time = 2 ** attempt
                     print(f"⏱️ Request timeout ({elapsed_str}). Attempt {attempt+1}/{max_retries}. Retrying in {wait_time}s...")
                     time.sleep(wait_time)
@@ -76,6 +80,43 @@ def request(endpoint: str, method: str, headers=None, data=None):
         raise PolyApiException(error_msg="Request exception!")
 
 
+async def async_request(endpoint: str, method: str, headers=None, data=None):
+    """
+    Same contract as request(), on the pooled async transport
+    (the timeout backoff yields to the event loop instead of blocking it)
+    """
+    import httpx
+
+    headers = overloadHeaders(method, headers)
+    client = get_async_http_client()
+
+    for attempt in range(MAX_RETRIES):
+        start_time = time.time()
+        try:
+            resp = await client.request(
+                method, endpoint, headers=headers, json=data if data else None
+            )
+        except httpx.TimeoutException:
+            elapsed_str = f"{time.time() - start_time:.2f}s"
+            if attempt < MAX_RETRIES - 1:
+                wait_time = 2 ** attempt
+                print(f"⏱️ Request timeout ({elapsed_str}). Attempt {attempt+1}/{MAX_RETRIES}. Retrying in {wait_time}s...")
+                await asyncio.sleep(wait_time)
+                continue
+            print(f"❌ Request timeout after {MAX_RETRIES} attempts ({elapsed_str} total)")
+            raise PolyApiException(error_msg="Request exception!")
+        except httpx.HTTPError:
+            raise PolyApiException(error_msg="Request exception!")
+
+        if resp.status_code != 200:
+            raise PolyApiException(resp)
+
+        try:
+            return resp.json()
+        except ValueError:
+            return resp.text
+
+
 def post(endpoint, headers=None, data=None):
     return request(endpoint, POST, headers, data)
 
@@ -88,6 +129,50 @@ def delete(endpoint, headers=None, data=None):
     return request(endpoint, DELETE, headers, data)
 
 
+@dataclass
+class Request:
+    """One HTTP call of a client operation (see client_base)"""
+    method: str
+    endpoint: str
+    headers: Optional[dict] = None
+    data: Any = None
+
+
+def run_operation(op):
+    """
+    Runs a client operation (generator of Request) on the pooled sync transport
+    Transport errors are raised inside the operation so it can handle them.
+    """
+    try:
+        req = next(op)
+        while True:
+            try:
+                resp = request(req.endpoint, req.method, req.headers, req.data)
+            except Exception as e:
+                req = op.throw(e)
+            else:
+                req = op.send(resp)
+    except StopIteration as done:
+        return done.value
+
+
+async def async_run_operation(op):
+    """
+    Same as run_operation(), on the pooled async transport
+    """
+    try:
+        req = next(op)
+        while True:
+            try:
+                resp = await async_request(req.endpoint, req.method, req.headers, req.data)
+            except Exception as e:
+                req = op.throw(e)
+            else:
+                req = op.send(resp)
+    except StopIteration as done:
+        return done.value
+
+
 def build_query_params(url: str, param: str, val: str) -> str:
     url_with_params = url
     last = url_with_params[-1]
@@ -0,0 +1,87 @@
+"""
+Shared HTTP transport for the CLOB clients
+
+- Sync: one pooled requests.Session (keep-alive, connection reuse) instead of a
+  new connection + TLS handshake per call
+- Async: one httpx.AsyncClient per event loop (HTTP/2 when the h2 package is
+  installed), used by AsyncClobClient
+"""
+import asyncio
+import importlib.util
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 50
+TIMEOUT_SEC = 30
+MAX_RETRIES = 3
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = {}
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=0,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_async_http_client():
+    """
+    Returns the pooled httpx.AsyncClient of the running event loop
+    (an AsyncClient is bound to the loop it was first used in)
+    """
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            "AsyncClobClient requires httpx: pip install 'py_clob_client[async]'"
+        ) from e
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        # Drop clients of loops that are gone
+        for stale in [l for l in _async_clients if l.is_closed()]:
+            _async_clients.pop(stale, None)
+
+        client = httpx.AsyncClient(
+            http2=http2_available(),
+            timeout=TIMEOUT_SEC,
+            limits=httpx.Limits(
+                max_connections=POOL_MAXSIZE,
+                max_keepalive_connections=POOL_CONNECTIONS,
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_http_client():
+    """
+    Closes the pooled AsyncClient of the running event loop (call on shutdown)
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -1,7 +1,12 @@
+import os
+
 import setuptools
 
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
+# README.md is not shipped with this fork (installed as a path dependency)
+long_description = ""
+if os.path.exists("README.md"):
+    with open("README.md", "r", encoding="utf-8") as fh:
+        long_description = fh.read()
 
 setuptools.setup(
     name="py_clob_client",
@@ -22,6 +27,9 @@ setuptools.setup(
         "python-dotenv",
         "requests",
     ],
+    extras_require={
+        "async": ["httpx[http2]>=0.25.0"],
+    },
     project_urls={
         "Bug Tracker": "https://github.com/Polymarket/py-clob-client/issues",
     },
@@ -889,10 +889,12 @@ class PriceUpdaterService:
     async def _fetch_from_api_fallback(self, token_ids: Set[str]) -> Dict[str, float]:
         """
         Fallback: Fetch from CLOB API (only for tokens not in WebSocket DB)
-        This is SLOW but necessary for edge cases
+        Batched POST /prices (100 tokens per request), chunks run concurrently off the event loop
         """
         try:
+            import asyncio
             from py_clob_client.client import ClobClient
+            from py_clob_client.clob_types import BookParams
             from py_clob_client.constants import POLYGON
 
             # Create client for price fetching
@@ -901,71 +903,37 @@ class PriceUpdaterService:
                 chain_id=POLYGON
             )
 
-            prices = {}
-            success_count = 0
-            error_count = 0
-
-            # PERFORMANCE FIX: Run in thread pool to avoid blocking bot
-            # client.get_price() is SYNCHRONOUS - must run in executor
-            import asyncio
-            from concurrent.futures import ThreadPoolExecutor
-
-            def fetch_single_price(token_id):
-                """Fetch price for single token (run in thread)"""
-                try:
-                    price_data = client.get_price(token_id, side='SELL')
-                    if price_data and 'price' in price_data:
-                        price = float(price_data['price'])
-                        # DEBUG: Log specific token prices for troubleshooting
-                        if '78691508355780992068126282549196202576337491514195625451037885802091808053529' in token_id:
-                            print(f"🐛 DEBUG TOKEN {token_id[:20]}...: SUCCESS price={price}")
-                        return token_id, price, None
-                    # DEBUG: Log failures for specific token
-                    if '78691508355780992068126282549196202576337491514195625451037885802091808053529' in token_id:
-                        print(f"🐛 DEBUG TOKEN {token_id[:20]}...: FAILED - no price data: {price_data}")
-                    return token_id, None, "No price data"
-                except Exception as e:
-                    # DEBUG: Log failures for specific token
-                    if '78691508355780992068126282549196202576337491514195625451037885802091808053529' in token_id:
-                        print(f"🐛 DEBUG TOKEN {token_id[:20]}...: EXCEPTION - {str(e)}")
-                    return token_id, None, str(e)
-
-            # Process in batches with thread pool (smaller batches since these are fallbacks)
-            batch_size = 20  # Smaller batches for fallback
+            batch_size = 100
             token_list = list(token_ids)
+            chunks = [token_list[i:i + batch_size] for i in range(0, len(token_list), batch_size)]
+            semaphore = asyncio.Semaphore(4)
 
-            with ThreadPoolExecutor(max_workers=3) as executor:  # Fewer workers for fallback
-                for i in range(0, len(token_list), batch_size):
-                    batch = token_list[i:i+batch_size]
-
-                    # Run batch in thread pool (non-blocking)
-                    loop = asyncio.get_event_loop()
-                    futures = [
-                        loop.run_in_executor(executor, fetch_single_price, token_id)
-                        for token_id in batch
-                    ]
-
-                    # Wait for batch to complete
-                    results = await asyncio.gather(*futures)
-
-                    # Process results
-                    for token_id, price, error in results:
-                        if price is not None:
-                            prices[token_id] = price
-                            success_count += 1
-                        else:
-                            error_count += 1
-                            if error and '404' not in error and 'No orderbook' not in error:
-                                logger.debug(f"⚠️ Token {token_id[:10]}...: {error[:50]}")
-
-                    # Log progress
-                    if i % 100 == 0 and i > 0:
-                        logger.info(f"📊 Progress: {i}/{len(token_list)} ({success_count} successful)")
+            async def fetch_chunk(chunk):
+                """One /prices request for a chunk of tokens (SELL side, as before)"""
+                async with semaphore:
+                    try:
+                        params = [BookParams(token_id=token_id, side='SELL') for token_id in chunk]
+                        # client.get_prices() is SYNCHRONOUS - must run in executor
+                        loop = asyncio.get_event_loop()
+                        return await loop.run_in_executor(None, client.get_prices, params) or {}
+                    except Exception as e:
+                        logger.debug(f"⚠️ CLOB /prices batch of {len(chunk)} tokens failed: {str(e)[:80]}")
+                        return {}
 
-                    # Small yield between batches
-                    await asyncio.sleep(0.01)
+            prices = {}
+            for result in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+                for token_id, value in result.items():
+                    try:
+                        price = float(value.get('SELL') if isinstance(value, dict) else value)
+                    except (TypeError, ValueError):
+                        continue
+                    prices[str(token_id)] = price
 
-            logger.info(f"📊 Fetched {success_count}/{len(token_ids)} token prices from CLOB API ({error_count} errors/closed markets)")
+            error_count = len(token_ids) - len(prices)
+            logger.info(
+                f"📊 Fetched {len(prices)}/{len(token_ids)} token prices from CLOB API in {len(chunks)} requests "
+                f"({error_count} errors/closed markets)"
+            )
             return prices
 
         except Exception as e: